@@ -0,0 +1,105 @@
+"""Benchmark the progress analytics on a large project.
+
+A project of one million tasks created over a year, three quarters of
+them completed within 40 days of creation, is queried for:
+
+* ``flow``: ``task_flow`` over the last 30 days, as getBurndown and
+  getThroughput read it.
+* ``ages``: ``task_ages`` at the last day, as getTaskAging reads it.
+
+Both aggregate the ``TaskFlow`` rollup rather than the tasks themselves.
+
+Usage:
+    python benchmarks/bench_analytics.py [--tasks 1000000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.database.dates import SECONDS_PER_DAY
+
+FIRST_DAY = 20000
+DAYS = 365
+
+
+def build_database(path: str, task_count: int) -> int:
+    """Create a database file with one large project.
+
+    Args:
+        path (str): Path of the database file.
+        task_count (int): Number of tasks to create.
+
+    Returns:
+        int: ID of the project.
+    """
+    db = TaskDatabase(path)
+    project_id = db.create_project('Bench')
+    assert project_id is not None
+    rng = random.Random(42)
+    rows = []
+    for i in range(task_count):
+        created = (FIRST_DAY + i * DAYS // task_count) * SECONDS_PER_DAY
+        created += rng.randrange(SECONDS_PER_DAY)
+        if rng.random() < 0.75:
+            updated = created + rng.randrange(40 * SECONDS_PER_DAY)
+            rows.append((project_id, f'Task {i}', 'completed', created, updated))
+        else:
+            rows.append((project_id, f'Task {i}', 'open', created, created))
+    with db.connection as conn:
+        conn.executemany(
+            'INSERT INTO Tasks (project_id, description, status, created_at, '
+            'updated_at) VALUES (?, ?, ?, ?, ?)',
+            rows,
+        )
+    db.close()
+    return project_id
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Time a callable.
+
+    Args:
+        run (Callable[[], object]): Callable to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median run time in milliseconds.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tasks.db')
+        project_id = build_database(path, args.tasks)
+        db = TaskDatabase(path)
+        last_day = FIRST_DAY + DAYS - 1
+        flow_ms = median_ms(
+            lambda: db.task_flow(project_id, last_day - 29, last_day), args.repeat
+        )
+        ages_ms = median_ms(lambda: db.task_ages(project_id, last_day), args.repeat)
+        db.close()
+        print(f'{args.tasks} tasks, {os.path.getsize(path) / 1e6:.1f} MB')
+        print(f'{"flow":>6}: {flow_ms:8.3f} ms')
+        print(f'{"ages":>6}: {ages_ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
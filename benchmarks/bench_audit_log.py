@@ -0,0 +1,119 @@
+"""Benchmark the write overhead of the audit log.
+
+Each engine runs the same write workload twice: once as shipped, appending
+an audit log event in the transaction of every write, and once with event
+recording disabled. The workload adds tasks, tags every tenth one and
+completes every other one, one call per write as the tools issue them.
+
+Usage:
+    python benchmarks/bench_audit_log.py [--tasks 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from copilot_task_manager.database import InMemoryTaskDatabase, TaskDatabase, TaskStore
+
+
+class UnloggedTaskDatabase(TaskDatabase):
+    """SQLite engine that records no audit log events."""
+
+    @staticmethod
+    def _record(*args: Any, **kwargs: Any) -> None:
+        """Skip recording the event."""
+
+
+class UnloggedInMemoryTaskDatabase(InMemoryTaskDatabase):
+    """In-memory engine that records no audit log events."""
+
+    def _record(self, *args: Any, **kwargs: Any) -> None:
+        """Skip recording the event."""
+
+
+def run_workload(db: TaskStore, task_count: int) -> int:
+    """Run the write workload against a store.
+
+    Args:
+        db (TaskStore): Empty store.
+        task_count (int): Number of tasks to add.
+
+    Returns:
+        int: Number of writes issued.
+    """
+    project_id = db.create_project('Bench')
+    assert project_id is not None
+    writes = 0
+    for i in range(task_count):
+        task_id = db.add_task(project_id, f'Task number {i}', i % 5 or None)
+        assert task_id is not None
+        writes += 1
+        if i % 10 == 0:
+            db.add_tags(project_id, task_id, ['bench', f'group-{i % 7}'])
+            writes += 1
+        if i % 2:
+            db.mark_task_complete(project_id, task_id)
+            writes += 1
+    return writes
+
+
+def writes_per_second(
+    factory: Callable[[], TaskStore], task_count: int, repeat: int
+) -> float:
+    """Measure the median write throughput of fresh stores.
+
+    Args:
+        factory (Callable[[], TaskStore]): Creates an empty store.
+        task_count (int): Number of tasks per run.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median writes per second.
+    """
+    rates: List[float] = []
+    for _ in range(repeat):
+        db = factory()
+        start = time.perf_counter()
+        writes = run_workload(db, task_count)
+        rates.append(writes / (time.perf_counter() - start))
+        db.close()
+    return statistics.median(rates)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        counter = iter(range(1_000_000))
+
+        def file_path() -> str:
+            return os.path.join(directory, f'tasks-{next(counter)}.db')
+
+        engines = [
+            (
+                'sqlite',
+                lambda: TaskDatabase(file_path()),
+                lambda: UnloggedTaskDatabase(file_path()),
+            ),
+            ('memory', InMemoryTaskDatabase, UnloggedInMemoryTaskDatabase),
+        ]
+        print(f'{args.tasks} tasks per run, median of {args.repeat}')
+        for name, logged, unlogged in engines:
+            without = writes_per_second(unlogged, args.tasks, args.repeat)
+            with_log = writes_per_second(logged, args.tasks, args.repeat)
+            overhead = (without / with_log - 1) * 100
+            print(
+                f'{name:>8}: {without:10.0f} writes/s without, '
+                f'{with_log:10.0f} with the audit log ({overhead:+.1f}%)'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark set-based bulk moves and project copies.
+
+A project of tagged tasks is moved to another project once task by task,
+reading, re-adding and removing each one as a client of the per-task tools
+would, and once with a single ``move_tasks`` call. Copying the project with
+``copy_project`` is timed as well.
+
+Usage:
+    python benchmarks/bench_bulk_move.py [--tasks 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from copilot_task_manager.database import TaskDatabase
+
+
+def seed(db: TaskDatabase, task_count: int) -> Tuple[int, int, List[int]]:
+    """Create a source project of tagged tasks and an empty target project.
+
+    Args:
+        db (TaskDatabase): Empty database.
+        task_count (int): Number of tasks to add.
+
+    Returns:
+        Tuple[int, int, List[int]]: Source and target project IDs and the
+        task IDs.
+    """
+    source = db.create_project('Source')
+    target = db.create_project('Target')
+    assert source is not None and target is not None
+    task_ids: List[int] = []
+    for i in range(task_count):
+        task_id = db.add_task(source, f'Task number {i}', i % 5 or None)
+        assert task_id is not None
+        db.add_tags(source, task_id, [f'group-{i % 7}'])
+        task_ids.append(task_id)
+    return source, target, task_ids
+
+
+def move_one_by_one(db: TaskDatabase, source: int, target: int, ids: List[int]) -> None:
+    """Move tasks with a read, add, tag and remove call per task."""
+    tags: Dict[int, List[str]] = {task_id: [] for task_id in ids}
+    for task_id, tag in db.list_tags(source) or []:
+        tags[task_id].append(tag)
+    for task_id in ids:
+        task = db.get_task(source, task_id)
+        assert task is not None
+        new_id = db.add_task(target, task.description, task.priority, task.due_date)
+        assert new_id is not None
+        db.add_tags(target, new_id, tags[task_id])
+        db.remove_task(source, task_id)
+
+
+def move_in_bulk(db: TaskDatabase, source: int, target: int, ids: List[int]) -> None:
+    """Move tasks with one set-based call."""
+    assert db.move_tasks(source, ids, target) is not None
+
+
+def copy_in_bulk(db: TaskDatabase, source: int, target: int, ids: List[int]) -> None:
+    """Copy the source project with one set-based call."""
+    assert db.copy_project(source, 'Copy') is not None
+
+
+def median_ms(
+    factory: Callable[[], TaskDatabase],
+    operation: Callable[[TaskDatabase, int, int, List[int]], None],
+    task_count: int,
+    repeat: int,
+) -> float:
+    """Measure the median duration of an operation on fresh databases.
+
+    Args:
+        factory (Callable[[], TaskDatabase]): Creates an empty database.
+        operation (Callable[[TaskDatabase, int, int, List[int]], None]): The
+            operation to time, given the seeded projects and task IDs.
+        task_count (int): Number of tasks per run.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median duration in milliseconds.
+    """
+    durations: List[float] = []
+    for _ in range(repeat):
+        db = factory()
+        source, target, ids = seed(db, task_count)
+        start = time.perf_counter()
+        operation(db, source, target, ids)
+        durations.append((time.perf_counter() - start) * 1000)
+        db.close()
+    return statistics.median(durations)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        counter = iter(range(1_000_000))
+
+        def factory() -> TaskDatabase:
+            return TaskDatabase(os.path.join(directory, f'tasks-{next(counter)}.db'))
+
+        print(f'{args.tasks} tagged tasks per run, median of {args.repeat}')
+        for name, operation in (
+            ('per-task move', move_one_by_one),
+            ('moveTasks', move_in_bulk),
+            ('copyProject', copy_in_bulk),
+        ):
+            elapsed = median_ms(factory, operation, args.tasks, args.repeat)
+            print(f'{name:>14}: {elapsed:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
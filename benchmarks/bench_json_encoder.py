@@ -0,0 +1,132 @@
+"""Benchmark JSON encoding of a large task listing.
+
+A 10k-task ``listTasks`` JSON payload is built from raw ``Tasks`` rows in
+two shapes:
+
+* ``rows``: tuple rows, as the tools build them.
+* ``dicts``: one ``dataclasses.asdict`` dict per hydrated ``Task``, the
+  shape a naive structured response would use.
+
+Building the payload and encoding it are timed separately. The encoders
+are the standard library ``json`` module, ``orjson`` (if installed) and
+``formatting.dumps``, which uses the fastest available.
+
+Usage:
+    python benchmarks/bench_json_encoder.py [--tasks 10000] [--repeat 20]
+"""
+
+import argparse
+import dataclasses
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from copilot_task_manager.database.dates import SECONDS_PER_DAY
+from copilot_task_manager.database.task_db import row_to_task
+from copilot_task_manager.server.formatting import JSON_COLUMNS, JSON_ENCODER, dumps
+from copilot_task_manager.server.line_cache import raw_task_row
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def raw_rows(task_count: int) -> List[Sequence[Any]]:
+    """Build raw task rows in ``TASK_COLUMNS`` order.
+
+    Args:
+        task_count (int): Number of rows.
+
+    Returns:
+        List[Sequence[Any]]: Rows of a mix of open and completed tasks.
+    """
+    created = 20000 * SECONDS_PER_DAY
+    return [
+        (
+            i,
+            1,
+            f'Task number {i} with a realistic description',
+            'completed' if i % 3 == 0 else 'open',
+            i % 5 or None,
+            20100 + i % 60 if i % 2 else None,
+            created + i,
+            created + i * 7,
+        )
+        for i in range(1, task_count + 1)
+    ]
+
+
+def row_payload(rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """Build the listing payload from tuple rows."""
+    return {
+        'project': 'Bench',
+        'columns': JSON_COLUMNS,
+        'tasks': [raw_task_row(row) for row in rows],
+    }
+
+
+def dict_payload(rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """Build the listing payload from dicts of hydrated tasks."""
+    return {
+        'project': 'Bench',
+        'tasks': [dataclasses.asdict(row_to_task(row)) for row in rows],
+    }
+
+
+def stdlib_dumps(payload: Any) -> str:
+    """Encode compact JSON with the standard library."""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def orjson_dumps(payload: Any) -> str:
+    """Encode compact JSON with orjson."""
+    return orjson.dumps(payload, default=str).decode()
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Time a callable.
+
+    Args:
+        run (Callable[[], object]): Callable to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median run time in milliseconds.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = raw_rows(args.tasks)
+    encoders: List[Any] = [('json', stdlib_dumps)]
+    if orjson is not None:
+        encoders.append(('orjson', orjson_dumps))
+    encoders.append(('dumps', dumps))
+    print(f'{args.tasks} tasks, median of {args.repeat}, dumps uses {JSON_ENCODER}')
+    for shape, build in (('rows', row_payload), ('dicts', dict_payload)):
+        build_ms = median_ms(lambda: build(rows), args.repeat)
+        payload = build(rows)
+        print(f'{shape:>6}: build {build_ms:8.2f} ms')
+        for name, encode in encoders:
+            if shape == 'dicts' and encode is dumps:
+                continue
+            encode_ms = median_ms(lambda: encode(payload), args.repeat)
+            size = len(encode(payload).encode())
+            print(f'{name:>14}: {encode_ms:8.2f} ms {size / 1e3:8.0f} kB')
+
+
+if __name__ == '__main__':
+    main()
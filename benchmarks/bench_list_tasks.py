@@ -0,0 +1,110 @@
+"""Benchmark listTasks on a large project with and without the line cache.
+
+Three variants are timed on the same project:
+
+* ``hydrate+format``: load ``Task`` objects and format each line, as the
+  listing worked before the line cache.
+* ``cold cache``: ``listTasks`` with an empty line cache.
+* ``warm cache``: ``listTasks`` when every line is already cached.
+
+Usage:
+    python benchmarks/bench_list_tasks.py [--tasks 50000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.formatting import format_task_line
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+def build_tools(task_count: int) -> TaskTools:
+    """Create an in-memory project with many tasks.
+
+    Args:
+        task_count (int): Number of tasks to create.
+
+    Returns:
+        TaskTools: Tool handlers with 'Bench' as the active project.
+    """
+    db = TaskDatabase(':memory:')
+    project_id = db.create_project('Bench')
+    with db.connection as conn:
+        conn.executemany(
+            'INSERT INTO Tasks (project_id, description, status, priority, due_date) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (
+                (
+                    project_id,
+                    f'Implement feature number {i} across the reporting pipeline',
+                    'completed' if i % 3 == 0 else 'open',
+                    i % 5 or None,
+                    '2025-06-01' if i % 2 else None,
+                )
+                for i in range(task_count)
+            ),
+        )
+    tools = TaskTools(db)
+    tools.set_active_project('Bench')
+    return tools
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Time a callable.
+
+    Args:
+        run (Callable[[], object]): Callable to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median run time in milliseconds.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tools = build_tools(args.tasks)
+    db = tools._db
+    project = db.get_project_by_name('Bench')
+    assert project is not None and project.project_id is not None
+    project_id = project.project_id
+
+    def hydrate_and_format() -> str:
+        tasks = db.list_tasks(project_id, 'all') or []
+        return '\n'.join(format_task_line(task) for task in tasks)
+
+    def cold() -> str:
+        tools.line_cache.clear()
+        return asyncio.run(tools.list_tasks(statusFilter='all'))
+
+    def warm() -> str:
+        return asyncio.run(tools.list_tasks(statusFilter='all'))
+
+    assert cold() == hydrate_and_format()
+    baseline = median_ms(hydrate_and_format, args.repeat)
+    cold_ms = median_ms(cold, args.repeat)
+    warm()
+    warm_ms = median_ms(warm, args.repeat)
+    print(f'{args.tasks} tasks')
+    print(f'{"hydrate+format":>15}: {baseline:8.1f} ms')
+    print(f'{"cold cache":>15}: {cold_ms:8.1f} ms')
+    print(f'{"warm cache":>15}: {warm_ms:8.1f} ms ({baseline / warm_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
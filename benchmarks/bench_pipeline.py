@@ -0,0 +1,192 @@
+"""Benchmark pipelined and batched tool calls over stdio.
+
+A server subprocess with an in-memory store and a project of 200 tasks
+answers the same mix of calls, three reads per write, sent:
+
+* ``sequential``: one call at a time, waiting for each response.
+* ``pipelined``: every call on its own line without waiting.
+* ``batched``: every call in one JSON-RPC batch array.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--calls 1000] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+
+def request(request_id: int, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON-RPC request.
+
+    Args:
+        request_id (int): Request ID.
+        method (str): Method name.
+        params (Dict[str, Any]): Parameters.
+
+    Returns:
+        Dict[str, Any]: The request.
+    """
+    return {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+
+
+def tool_call(request_id: int, name: str, **arguments: Any) -> Dict[str, Any]:
+    """Build a tools/call request.
+
+    Args:
+        request_id (int): Request ID.
+        name (str): Tool name.
+        **arguments (Any): Tool arguments.
+
+    Returns:
+        Dict[str, Any]: The request.
+    """
+    return request(request_id, 'tools/call', {'name': name, 'arguments': arguments})
+
+
+def workload(first_id: int, count: int) -> List[Dict[str, Any]]:
+    """Build the call mix.
+
+    Args:
+        first_id (int): ID of the first request.
+        count (int): Number of calls.
+
+    Returns:
+        List[Dict[str, Any]]: Three reads per write.
+    """
+    calls = []
+    for i in range(count):
+        request_id = first_id + i
+        if i % 4 == 3:
+            calls.append(
+                tool_call(
+                    request_id, 'addTask', taskDescription=f'Task {i}', projectName='P'
+                )
+            )
+        elif i % 4 == 2:
+            calls.append(tool_call(request_id, 'listTags', projectName='P'))
+        else:
+            calls.append(tool_call(request_id, 'listTasks', projectName='P'))
+    return calls
+
+
+class Server:
+    """A server subprocess spoken to over its stdin and stdout."""
+
+    def __init__(self) -> None:
+        """Start the server, initialize the session and create a project."""
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'copilot_task_manager.server',
+                '--storage',
+                'memory',
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+        )
+        self.next_id = 1
+        self.send(
+            [
+                request(
+                    0,
+                    'initialize',
+                    {
+                        'protocolVersion': '2025-03-26',
+                        'capabilities': {},
+                        'clientInfo': {'name': 'bench', 'version': '1'},
+                    },
+                )
+            ]
+        )
+        self.receive(1)
+        self.send([{'jsonrpc': '2.0', 'method': 'notifications/initialized'}])
+        setup = [tool_call(self._ids(1), 'createProjectList', projectName='P')]
+        setup += [
+            tool_call(
+                self._ids(1), 'addTask', taskDescription=f'Seed {i}', projectName='P'
+            )
+            for i in range(200)
+        ]
+        self.send([setup])
+        self.receive(1)
+
+    def _ids(self, count: int) -> int:
+        """Reserve request IDs and return the first."""
+        first = self.next_id
+        self.next_id += count
+        return first
+
+    def send(self, lines: List[Any]) -> None:
+        """Write messages or batches, one per line."""
+        assert self.process.stdin is not None
+        self.process.stdin.write(''.join(json.dumps(line) + '\n' for line in lines))
+        self.process.stdin.flush()
+
+    def receive(self, count: int) -> List[Any]:
+        """Read output lines."""
+        assert self.process.stdout is not None
+        return [json.loads(self.process.stdout.readline()) for _ in range(count)]
+
+    def sequential(self, count: int) -> None:
+        """Send calls one at a time."""
+        for call in workload(self._ids(count), count):
+            self.send([call])
+            self.receive(1)
+
+    def pipelined(self, count: int) -> None:
+        """Send every call without waiting."""
+        calls = workload(self._ids(count), count)
+        writer = threading.Thread(target=self.send, args=(calls,))
+        writer.start()
+        self.receive(count)
+        writer.join()
+
+    def batched(self, count: int) -> None:
+        """Send every call in one batch."""
+        self.send([workload(self._ids(count), count)])
+        (responses,) = self.receive(1)
+        assert len(responses) == count
+
+    def close(self) -> None:
+        """End the session and wait for the server to exit."""
+        assert self.process.stdin is not None
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    server = Server()
+    modes = [
+        ('sequential', server.sequential),
+        ('pipelined', server.pipelined),
+        ('batched', server.batched),
+    ]
+    print(f'{args.calls} calls per run, median of {args.repeat}')
+    for name, run in modes:
+        rates: List[float] = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run(args.calls)
+            rates.append(args.calls / (time.perf_counter() - start))
+        print(f'{name:>10}: {statistics.median(rates):8.0f} calls/s')
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark inline rendering against the process render pool.
+
+For each listing size this measures the wall time of rendering the listing
+inline and through a warm :class:`RenderPool`, and the longest stall of the
+event loop while doing so. The crossover is the smallest size at which the
+pool returns sooner than inline rendering; on machines with few cores it
+may not be reached, and the pool's value is then the shorter loop stall.
+
+Usage:
+    python benchmarks/bench_render_pool.py [--workers 4] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+from copilot_task_manager.server.formatting import TaskRow, render_task_lines
+from copilot_task_manager.server.render_pool import RenderPool
+
+SIZES = (1_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000)
+
+
+def make_rows(count: int) -> List[TaskRow]:
+    """Build realistic task rows.
+
+    Args:
+        count (int): Number of rows.
+
+    Returns:
+        List[TaskRow]: Task rows with a mix of optional details.
+    """
+    return [
+        (
+            i,
+            f'Implement feature number {i} across the reporting pipeline',
+            'completed' if i % 3 == 0 else 'open',
+            i % 5 or None,
+            '2025-06-01' if i % 2 else None,
+            '2025-05-20' if i % 3 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+async def measure(pool: RenderPool, rows: List[TaskRow]) -> Tuple[float, float]:
+    """Render once while probing event-loop lag.
+
+    Args:
+        pool (RenderPool): Pool to render with.
+        rows (List[TaskRow]): Rows to render.
+
+    Returns:
+        Tuple[float, float]: Wall time and longest loop stall, in ms.
+    """
+    stall = 0.0
+    done = False
+
+    async def probe() -> None:
+        nonlocal stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0)
+            stall = max(stall, time.perf_counter() - before)
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await pool.render_task_lines(rows)
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed * 1000, stall * 1000
+
+
+async def run(workers: int, repeat: int) -> None:
+    """Run the benchmark and print a result table.
+
+    Args:
+        workers (int): Worker processes in the pool.
+        repeat (int): Repetitions per size; the median is reported.
+    """
+    inline = RenderPool(workers, min_offload_rows=10**9)
+    offload = RenderPool(workers, min_offload_rows=1)
+    await offload.render_task_lines(make_rows(workers))  # warm up workers
+    print(
+        f'{"rows":>8} {"inline ms":>10} {"pool ms":>10} '
+        f'{"inline stall":>13} {"pool stall":>11}'
+    )
+    crossover = None
+    try:
+        for size in SIZES:
+            rows = make_rows(size)
+            assert await offload.render_task_lines(rows) == render_task_lines(rows)
+            inline_runs = [await measure(inline, rows) for _ in range(repeat)]
+            pool_runs = [await measure(offload, rows) for _ in range(repeat)]
+            inline_ms = statistics.median(r[0] for r in inline_runs)
+            pool_ms = statistics.median(r[0] for r in pool_runs)
+            inline_stall = statistics.median(r[1] for r in inline_runs)
+            pool_stall = statistics.median(r[1] for r in pool_runs)
+            print(
+                f'{size:>8} {inline_ms:>10.1f} {pool_ms:>10.1f} '
+                f'{inline_stall:>13.1f} {pool_stall:>11.1f}'
+            )
+            if crossover is None and pool_ms < inline_ms:
+                crossover = size
+    finally:
+        offload.shutdown()
+    print(f'crossover: {crossover if crossover else "not reached"} rows')
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.workers, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark cross-project search against per-project scans.
+
+Projects of generated tasks are searched for a word that about one task in
+a hundred contains, the way a client finds every task mentioning it:
+
+* ``search``: one ``search_tasks`` call over the global full-text index,
+  fetching the first page of 50 matches.
+* ``scan``: one ``find_tasks_by_description`` call per project, as N
+  per-project listings would.
+
+Both engines are measured.
+
+Usage:
+    python benchmarks/bench_search.py [--projects 100] [--tasks 2000] [--repeat 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from copilot_task_manager.database import InMemoryTaskDatabase, TaskDatabase, TaskStore
+from copilot_task_manager.database.search import search_terms
+
+WORDS = (
+    'write review ship plan fix test deploy refactor document update check '
+    'design build migrate clean measure report sync draft merge'
+).split()
+
+
+def descriptions(tasks: int, rng: random.Random) -> List[str]:
+    """Generate task descriptions.
+
+    Args:
+        tasks (int): Number of descriptions.
+        rng (random.Random): Random source.
+
+    Returns:
+        List[str]: Descriptions, about 1% of them mentioning 'invoice'.
+    """
+    result = []
+    for t in range(tasks):
+        words = rng.sample(WORDS, 4)
+        if rng.random() < 0.01:
+            words.append('invoice')
+        result.append(f'{" ".join(words)} {t}')
+    return result
+
+
+def fill(db: TaskStore, projects: int, tasks: int) -> List[int]:
+    """Create projects of generated tasks.
+
+    SQLite rows are inserted in bulk; the triggers index them as usual.
+
+    Args:
+        db (TaskStore): Empty store.
+        projects (int): Number of projects.
+        tasks (int): Tasks per project.
+
+    Returns:
+        List[int]: IDs of the projects.
+    """
+    rng = random.Random(7)
+    ids = []
+    for p in range(projects):
+        project_id = db.create_project(f'Project {p}')
+        assert project_id is not None
+        ids.append(project_id)
+        texts = descriptions(tasks, rng)
+        if isinstance(db, TaskDatabase):
+            now = int(time.time())
+            with db.connection as conn:
+                conn.executemany(
+                    'INSERT INTO Tasks (project_id, description, created_at, '
+                    'updated_at) VALUES (?, ?, ?, ?)',
+                    [(project_id, text, now, now) for text in texts],
+                )
+        else:
+            for text in texts:
+                db.add_task(project_id, text)
+    return ids
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Time a callable.
+
+    Args:
+        run (Callable[[], object]): Callable to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median run time in milliseconds.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    terms = search_terms('invoice')
+    print(f'{args.projects} projects of {args.tasks} tasks, median of {args.repeat}')
+    with tempfile.TemporaryDirectory() as directory:
+        engines = [
+            ('sqlite', TaskDatabase(os.path.join(directory, 'tasks.db'))),
+            ('memory', InMemoryTaskDatabase()),
+        ]
+        for name, db in engines:
+            projects = fill(db, args.projects, args.tasks)
+            search_ms = median_ms(
+                lambda: db.search_tasks(terms, 'all', 50), args.repeat
+            )
+            scan_ms = median_ms(
+                lambda: [
+                    db.find_tasks_by_description(project_id, 'invoice')
+                    for project_id in projects
+                ],
+                args.repeat,
+            )
+            print(f'{name:>8}: search {search_ms:8.2f} ms, scan {scan_ms:8.2f} ms')
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
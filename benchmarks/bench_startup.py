@@ -0,0 +1,113 @@
+"""Benchmark database startup on a large existing database.
+
+Three ways of opening the same file are timed:
+
+* ``script``: re-running every ``CREATE ... IF NOT EXISTS`` script and
+  committing, as startup worked before versioned migrations.
+* ``versioned``: opening a ``TaskDatabase`` whose schema is current, which
+  only reads ``PRAGMA user_version``.
+* ``migrate``: the one-time migration of an unversioned copy of the file.
+
+Usage:
+    python benchmarks/bench_startup.py [--tasks 200000] [--repeat 20]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.database.migrations import MIGRATIONS
+
+
+def build_database(path: str, task_count: int) -> None:
+    """Create a database file with many tasks at the current schema.
+
+    Args:
+        path (str): Path of the database file.
+        task_count (int): Number of tasks to create.
+    """
+    db = TaskDatabase(path)
+    project_id = db.create_project('Bench')
+    with db.connection as conn:
+        conn.executemany(
+            'INSERT INTO Tasks (project_id, description, status, priority) '
+            'VALUES (?, ?, ?, ?)',
+            (
+                (project_id, f'Task number {i}', 'open', i % 5 or None)
+                for i in range(task_count)
+            ),
+        )
+    db.close()
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Time a callable.
+
+    Args:
+        run (Callable[[], object]): Callable to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median run time in milliseconds.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tasks.db')
+        build_database(path, args.tasks)
+
+        def script() -> None:
+            conn = sqlite3.connect(path)
+            conn.execute('PRAGMA foreign_keys = ON')
+            # The scripts startup re-ran before versioning; later migrations
+            # convert or seed data and are not idempotent.
+            for _, migration in MIGRATIONS[:2]:
+                conn.executescript(migration)
+            conn.commit()
+            conn.close()
+
+        def open_database(database_path: str) -> None:
+            db = TaskDatabase(database_path)
+            db.connection
+            db.close()
+
+        migrate_times: List[float] = []
+        copy = os.path.join(directory, 'legacy.db')
+        for _ in range(min(args.repeat, 5)):
+            shutil.copyfile(path, copy)
+            conn = sqlite3.connect(copy)
+            conn.execute('PRAGMA user_version = 0')
+            conn.close()
+            migrate_times.append(median_ms(lambda: open_database(copy), 1))
+        script_ms = median_ms(script, args.repeat)
+        versioned_ms = median_ms(lambda: open_database(path), args.repeat)
+        print(f'{args.tasks} tasks, {os.path.getsize(path) / 1e6:.1f} MB')
+        print(f'{"script":>10}: {script_ms:8.3f} ms')
+        print(
+            f'{"versioned":>10}: {versioned_ms:8.3f} ms '
+            f'({script_ms / versioned_ms:.1f}x)'
+        )
+        print(f'{"migrate":>10}: {statistics.median(migrate_times):8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Replay a recorded traffic log against a fresh server.
+
+Record a log with ``python -m copilot_task_manager.server --record PATH``,
+then replay it in-process (default) or against a server subprocess over
+stdio, at the recorded pace, N times faster or as fast as possible. Each
+replay starts from an empty in-memory store.
+
+Usage:
+    python benchmarks/replay_traffic.py traffic.log [--speed 1|N|max] [--stdio]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Optional
+
+from fastmcp.client.transports import StdioTransport
+
+from copilot_task_manager.server.mcp_server import create_server
+from copilot_task_manager.server.traffic import load_traffic, replay
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """Parse a replay speed.
+
+    Args:
+        value (str): A positive factor, or 'max'.
+
+    Returns:
+        Optional[float]: The factor, or None for maximum speed.
+    """
+    return None if value == 'max' else float(value)
+
+
+def main() -> None:
+    """Parse arguments, replay the log and print the latency report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('log')
+    parser.add_argument('--speed', type=parse_speed, default=1.0)
+    parser.add_argument('--stdio', action='store_true')
+    args = parser.parse_args()
+
+    requests = load_traffic(args.log)
+    target: Any
+    if args.stdio:
+        target = StdioTransport(
+            sys.executable, ['-m', 'copilot_task_manager.server', '--storage', 'memory']
+        )
+    else:
+        target = create_server(storage='memory').mcp
+    report = asyncio.run(replay(target, requests, speed=args.speed))
+    print(f'{len(requests)} requests from {args.log}')
+    print(report.format())
+
+
+if __name__ == '__main__':
+    main()
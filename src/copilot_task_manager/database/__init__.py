@@ -0,0 +1,14 @@
+"""Initialize the database package."""
+
+from .memory import InMemoryTaskDatabase  # noqa: F401
+from .sharding import ShardedTaskDatabase  # noqa: F401
+from .store import MoveResult, TaskStore  # noqa: F401
+from .task_db import TaskDatabase  # noqa: F401
+
+__all__ = [
+    'InMemoryTaskDatabase',
+    'MoveResult',
+    'ShardedTaskDatabase',
+    'TaskDatabase',
+    'TaskStore',
+]
@@ -0,0 +1,183 @@
+"""Progress analytics over task creation and completion days.
+
+Engines keep a rollup of their tasks: the number of tasks per project,
+creation day and completion day, with ``NEVER_COMPLETED`` as the
+completion day of open tasks. The SQLite engine maintains it in the
+``TaskFlow`` table with triggers, so burndown, throughput and aging
+aggregate a few rows per day instead of scanning every task. Days are days
+since the epoch in UTC, as encoded by :mod:`.dates`, and a completed task
+counts as completed on the day of its ``updated_at`` time.
+
+Engines answer with compact, sparse rows, which the helpers here densify
+and summarise for the analytics tools:
+
+* Flow rows ``(day, created, completed, open)`` hold the tasks created and
+  completed on a day and the open tasks at its end, for the days with any
+  change. The row for the day before the range carries everything before
+  the range.
+* Age rows ``(age, count, cumulative)`` count the tasks open at the end of
+  a day by whole days since their creation, youngest first, with the
+  running total for percentiles.
+"""
+
+import math
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .dates import SECONDS_PER_DAY
+
+FlowKey = Tuple[int, int]
+FlowRow = Tuple[int, int, int, int]
+AgeRow = Tuple[int, int, int]
+
+# Completion day of open tasks in the rollup; later than any real day.
+NEVER_COMPLETED = 2**31 - 1
+
+# Upper bounds, in days, of the task aging buckets; the last bucket is open.
+AGE_BUCKETS = (1, 7, 30, 90)
+
+
+def flow_key(row: Sequence[Any]) -> FlowKey:
+    """Return the rollup key of a task.
+
+    Args:
+        row (Sequence[Any]): Task row in ``TASK_COLUMNS`` order.
+
+    Returns:
+        FlowKey: ``(created_day, completed_day)`` of the task.
+    """
+    created_at = row[6] or 0
+    if row[3] != 'completed':
+        return created_at // SECONDS_PER_DAY, NEVER_COMPLETED
+    return created_at // SECONDS_PER_DAY, (row[7] or created_at) // SECONDS_PER_DAY
+
+
+def flow_rows(
+    counts: Iterable[Tuple[FlowKey, int]], start_day: int, end_day: int
+) -> List[FlowRow]:
+    """Aggregate rollup counts into flow rows.
+
+    The in-memory counterpart of :meth:`TaskDatabase.task_flow`.
+
+    Args:
+        counts (Iterable[Tuple[FlowKey, int]]): Tasks per rollup key.
+        start_day (int): First day of the range.
+        end_day (int): Last day of the range.
+
+    Returns:
+        List[FlowRow]: Flow rows ordered by day.
+    """
+    changes: Dict[int, List[int]] = {}
+    for (created_day, completed_day), tasks in counts:
+        if created_day <= end_day:
+            changes.setdefault(max(created_day, start_day - 1), [0, 0])[0] += tasks
+        if completed_day <= end_day:
+            changes.setdefault(max(completed_day, start_day - 1), [0, 0])[1] += tasks
+    days = sorted(changes)
+    balances = accumulate(changes[day][0] - changes[day][1] for day in days)
+    return [
+        (day, changes[day][0], changes[day][1], balance)
+        for day, balance in zip(days, balances)
+    ]
+
+
+def age_rows(counts: Iterable[Tuple[FlowKey, int]], day: int) -> List[AgeRow]:
+    """Aggregate rollup counts into age rows.
+
+    The in-memory counterpart of :meth:`TaskDatabase.task_ages`.
+
+    Args:
+        counts (Iterable[Tuple[FlowKey, int]]): Tasks per rollup key.
+        day (int): Day at whose end the open tasks are aged.
+
+    Returns:
+        List[AgeRow]: Age rows ordered by age.
+    """
+    ages: Dict[int, int] = {}
+    for (created_day, completed_day), tasks in counts:
+        if created_day <= day < completed_day:
+            ages[day - created_day] = ages.get(day - created_day, 0) + tasks
+    ordered = sorted(ages)
+    totals = accumulate(ages[age] for age in ordered)
+    return [(age, ages[age], total) for age, total in zip(ordered, totals)]
+
+
+def dense_flow(
+    rows: Iterable[FlowRow], start_day: int, end_day: int
+) -> Tuple[int, List[int], List[int], List[int]]:
+    """Expand sparse flow rows into one value per day of a range.
+
+    Args:
+        rows (Iterable[FlowRow]): Flow rows ordered by day.
+        start_day (int): First day of the range.
+        end_day (int): Last day of the range.
+
+    Returns:
+        Tuple[int, List[int], List[int], List[int]]: Open tasks before the
+            range, and tasks created, completed and open per day.
+    """
+    length = end_day - start_day + 1
+    created, completed = [0] * length, [0] * length
+    open_tasks: List[int] = []
+    before = 0
+    balance = 0
+    by_day = {row[0]: row for row in rows}
+    if start_day - 1 in by_day:
+        before = balance = by_day[start_day - 1][3]
+    for offset in range(length):
+        row = by_day.get(start_day + offset)
+        if row is not None:
+            created[offset], completed[offset], balance = row[1], row[2], row[3]
+        open_tasks.append(balance)
+    return before, created, completed, open_tasks
+
+
+def bucket_sums(values: List[int], size: int) -> List[int]:
+    """Sum consecutive values in buckets.
+
+    Args:
+        values (List[int]): Values per day.
+        size (int): Days per bucket; the last bucket may be shorter.
+
+    Returns:
+        List[int]: Sum per bucket.
+    """
+    return [sum(values[i : i + size]) for i in range(0, len(values), size)]
+
+
+def age_percentile(rows: List[AgeRow], fraction: float) -> int:
+    """Return a nearest-rank percentile of task ages.
+
+    Args:
+        rows (List[AgeRow]): Age rows ordered by age.
+        fraction (float): Percentile as a fraction, e.g. 0.9.
+
+    Returns:
+        int: Age in days, or 0 for no rows.
+    """
+    if not rows:
+        return 0
+    rank = max(1, math.ceil(fraction * rows[-1][2]))
+    for age, _, cumulative in rows:
+        if cumulative >= rank:
+            return age
+    return rows[-1][0]
+
+
+def age_buckets(rows: Iterable[AgeRow]) -> List[int]:
+    """Count task ages per AGE_BUCKETS bucket.
+
+    Args:
+        rows (Iterable[AgeRow]): Age rows.
+
+    Returns:
+        List[int]: Tasks per bucket, with the open-ended bucket last.
+    """
+    counts = [0] * (len(AGE_BUCKETS) + 1)
+    for age, count, _ in rows:
+        index = next(
+            (i for i, bound in enumerate(AGE_BUCKETS) if age <= bound),
+            len(AGE_BUCKETS),
+        )
+        counts[index] += count
+    return counts
@@ -0,0 +1,89 @@
+"""Integer encoding of dates and timestamps.
+
+Due dates are stored as days since 1970-01-01 and creation and update
+times as whole seconds since the Unix epoch (UTC). Integer columns are
+smaller than ISO 8601 text, compare and range-scan as plain numbers, and
+hydrate without parsing a string per row. Values are converted back to
+``YYYY-MM-DD`` strings and datetimes only when they are presented.
+
+Rendering repeats the same few due and completion dates across many rows,
+so :func:`decode_date` is memoized.
+"""
+
+import time
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+SECONDS_PER_DAY = 86400
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def encode_date(value: Optional[str]) -> Optional[int]:
+    """Encode a ``YYYY-MM-DD`` date as days since the epoch.
+
+    Args:
+        value (Optional[str]): Date in YYYY-MM-DD format.
+
+    Returns:
+        Optional[int]: Days since 1970-01-01, or None if the date is missing.
+
+    Raises:
+        ValueError: If the date is not in YYYY-MM-DD format.
+    """
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').toordinal() - _EPOCH_ORDINAL
+
+
+@lru_cache(maxsize=4096)
+def decode_date(day: Optional[int]) -> Optional[str]:
+    """Decode days since the epoch into a ``YYYY-MM-DD`` date.
+
+    Args:
+        day (Optional[int]): Days since 1970-01-01.
+
+    Returns:
+        Optional[str]: The date, or None if missing.
+    """
+    if day is None:
+        return None
+    return date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+
+
+def now_seconds() -> int:
+    """Return the current time as whole seconds since the epoch.
+
+    Returns:
+        int: Seconds since 1970-01-01 00:00:00 UTC.
+    """
+    return int(time.time())
+
+
+def decode_timestamp(seconds: Optional[int]) -> Optional[datetime]:
+    """Decode seconds since the epoch into a naive UTC datetime.
+
+    Args:
+        seconds (Optional[int]): Seconds since 1970-01-01 00:00:00 UTC.
+
+    Returns:
+        Optional[datetime]: The timestamp, or None if missing.
+    """
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+def timestamp_date(seconds: Optional[int]) -> Optional[str]:
+    """Return the UTC ``YYYY-MM-DD`` date of a timestamp.
+
+    Args:
+        seconds (Optional[int]): Seconds since 1970-01-01 00:00:00 UTC.
+
+    Returns:
+        Optional[str]: The date, or None if missing.
+    """
+    if seconds is None:
+        return None
+    return decode_date(seconds // SECONDS_PER_DAY)
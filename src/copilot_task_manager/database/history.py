@@ -0,0 +1,206 @@
+"""Append-only audit log of task changes.
+
+Every storage engine appends one event per task mutation, in the same
+transaction as the mutation itself, so the log never disagrees with the
+tasks. Events are delta-encoded: each stores only what it changed, as a
+compact JSON object with one-letter keys, and completions and removals
+store no payload at all:
+
+==========  =====================================================
+action      delta
+==========  =====================================================
+add         ``d`` description, ``p`` priority, ``u`` due day
+complete    none
+remove      none
+tag         ``t`` tags added
+untag       ``t`` tags removed
+depend      ``o`` ID of the prerequisite task
+baseline    full state: ``d``, ``p``, ``u``, ``s`` status, ``c``
+            created at, ``m`` updated at, ``t`` tags and ``o``
+            prerequisites
+==========  =====================================================
+
+Replaying the events of a project up to a point in time reconstructs its
+tasks as they were then. Retention folds the events older than a cutoff
+into one ``baseline`` event per surviving task and drops the events of
+tasks removed before the cutoff, so the log stays bounded while listings
+as of any time after the cutoff stay exact.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HistoryEvent = Tuple[int, int, int, str, Optional[str]]
+"""``(event_id, task_id, at, action, delta)``; event IDs increase within a
+project and ``at`` is in epoch seconds."""
+
+ACTIONS = ('add', 'complete', 'remove', 'tag', 'untag', 'depend', 'baseline')
+
+# Minimum seconds between two retention prunes of one engine.
+PRUNE_INTERVAL = 3600.0
+
+# One shared encoder: json.dumps builds a new one per call for non-default
+# separators, which would double the cost of encoding a delta.
+_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def encode_delta(fields: Dict[str, Any]) -> Optional[str]:
+    """Encode the changed fields of an event.
+
+    Args:
+        fields (Dict[str, Any]): Changed fields; None values are left out.
+
+    Returns:
+        Optional[str]: Compact JSON object, or None if nothing is left.
+    """
+    present = {key: value for key, value in fields.items() if value is not None}
+    if not present:
+        return None
+    return _ENCODER.encode(present)
+
+
+def decode_delta(delta: Optional[str]) -> Dict[str, Any]:
+    """Decode the delta of an event.
+
+    Args:
+        delta (Optional[str]): Delta as stored.
+
+    Returns:
+        Dict[str, Any]: The changed fields; empty for no delta.
+    """
+    if not delta:
+        return {}
+    fields: Dict[str, Any] = json.loads(delta)
+    return fields
+
+
+def replay(events: Iterable[HistoryEvent]) -> Dict[int, Dict[str, Any]]:
+    """Reconstruct task states from events.
+
+    Args:
+        events (Iterable[HistoryEvent]): Events ordered by event ID.
+
+    Returns:
+        Dict[int, Dict[str, Any]]: State per existing task ID, with the
+            delta keys plus ``m``, the time of the last change, and ``t`` and
+            ``o`` as sets.
+    """
+    states: Dict[int, Dict[str, Any]] = {}
+    for _, task_id, at, action, delta in events:
+        if action == 'remove':
+            states.pop(task_id, None)
+            continue
+        fields = decode_delta(delta)
+        if action in ('add', 'baseline'):
+            states[task_id] = {
+                'd': fields.get('d', ''),
+                'p': fields.get('p'),
+                'u': fields.get('u'),
+                's': fields.get('s', 'open'),
+                'c': fields.get('c', at),
+                'm': fields.get('m', at),
+                't': set(fields.get('t', ())),
+                'o': set(fields.get('o', ())),
+            }
+            continue
+        state = states.get(task_id)
+        if state is None:
+            continue
+        if action == 'complete':
+            state['s'] = 'completed'
+            state['m'] = at
+        elif action == 'tag':
+            state['t'].update(fields.get('t', ()))
+        elif action == 'untag':
+            state['t'].difference_update(fields.get('t', ()))
+        elif action == 'depend':
+            state['o'].add(fields['o'])
+    return states
+
+
+def rows_as_of(
+    project_id: int, events: Iterable[HistoryEvent], status_filter: str = 'open'
+) -> List[Tuple[Any, ...]]:
+    """Reconstruct the task rows of a project from its events.
+
+    Args:
+        project_id (int): ID of the project the events belong to.
+        events (Iterable[HistoryEvent]): Events up to the point in time,
+            ordered by event ID.
+        status_filter (str, optional): 'open', 'completed' or 'all'.
+            Defaults to 'open'.
+
+    Returns:
+        List[Tuple[Any, ...]]: Rows in ``TASK_COLUMNS`` order, ordered by ID.
+    """
+    states = replay(events)
+    return [
+        (task_id, project_id, s['d'], s['s'], s['p'], s['u'], s['c'], s['m'])
+        for task_id, s in sorted(states.items())
+        if status_filter == 'all' or s['s'] == status_filter
+    ]
+
+
+def fold(events: List[HistoryEvent]) -> Optional[Tuple[int, str, Optional[str]]]:
+    """Fold the events of one task into a single baseline event.
+
+    Args:
+        events (List[HistoryEvent]): Events of the task, ordered by event ID.
+
+    Returns:
+        Optional[Tuple[int, str, Optional[str]]]: ``(at, 'baseline', delta)``
+            of the task's state after the events, or None if the task was
+            removed or never added.
+    """
+    task_id = events[0][1]
+    state = replay(events).get(task_id)
+    if state is None:
+        return None
+    delta = encode_delta(
+        {
+            'd': state['d'],
+            'p': state['p'],
+            'u': state['u'],
+            's': state['s'] if state['s'] != 'open' else None,
+            'c': state['c'],
+            'm': state['m'],
+            't': sorted(state['t']) or None,
+            'o': sorted(state['o']) or None,
+        }
+    )
+    return events[-1][2], 'baseline', delta
+
+
+def plan_prune(
+    events: Iterable[HistoryEvent],
+) -> Tuple[List[int], List[Tuple[int, int, str, Optional[str]]]]:
+    """Plan the folding of events older than a retention cutoff.
+
+    The events of each task are replaced by one baseline event that keeps
+    the ID of the task's last folded event, so it still sorts before the
+    task's newer events. Tasks removed before the cutoff lose all events.
+
+    Args:
+        events (Iterable[HistoryEvent]): Events older than the cutoff,
+            ordered by event ID.
+
+    Returns:
+        Tuple[List[int], List[Tuple[int, int, str, Optional[str]]]]: IDs of
+            the events to delete, and ``(event_id, at, action, delta)``
+            rewrites of the kept events.
+    """
+    by_task: Dict[int, List[HistoryEvent]] = {}
+    for event in events:
+        by_task.setdefault(event[1], []).append(event)
+    deleted: List[int] = []
+    rewrites: List[Tuple[int, int, str, Optional[str]]] = []
+    for task_events in by_task.values():
+        if len(task_events) == 1 and task_events[0][3] in ('add', 'baseline'):
+            continue
+        folded = fold(task_events)
+        if folded is None:
+            deleted.extend(event[0] for event in task_events)
+            continue
+        deleted.extend(event[0] for event in task_events[:-1])
+        rewrites.append((task_events[-1][0],) + folded)
+    return deleted, rewrites
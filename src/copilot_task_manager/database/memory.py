@@ -0,0 +1,1035 @@
+"""In-memory storage engine for Copilot Task Manager MCP.
+
+:class:`InMemoryTaskDatabase` keeps every project and task in dictionaries
+and maintains sorted task-ID indexes per project and per (project, status),
+so listings are slices of ready-made rows instead of queries. It is meant
+for ephemeral agent sessions, tests and benchmarks.
+
+Data can optionally be kept across restarts by snapshotting it to a JSON
+file: the snapshot is loaded on construction, rewritten atomically when a
+write happens more than ``snapshot_interval`` seconds after the last one,
+and written on :meth:`InMemoryTaskDatabase.close`. Snapshots due while an
+event loop runs are serialized and written on a worker thread, so the loop
+keeps serving calls. Each snapshot is synced to disk before it replaces
+the previous one. Writes made since the last snapshot are lost if the
+process dies. Rows hold integer-encoded dates
+and timestamps like the SQLite tables; version 1 snapshots, which held
+text, are converted on load. Task mutations are appended to a per-project
+:mod:`.history` audit log, which the snapshot includes.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import anyio
+
+from ..models import Project, Task
+from .analytics import AgeRow, FlowKey, FlowRow, age_rows, flow_key, flow_rows
+from .dates import decode_timestamp, encode_date, now_seconds
+from .history import PRUNE_INTERVAL, HistoryEvent, encode_delta, plan_prune
+from .search import SearchKey, SearchRow, WordIndex
+from .store import MoveResult
+from .task_db import VALID_STATUS_FILTERS, row_to_task
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2
+
+# SQLite's LIKE folds ASCII letters only; mirror that for conformance.
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+TaskRow = Tuple[Any, ...]
+
+
+def _text_seconds(value: Optional[str]) -> Optional[int]:
+    """Encode a version 1 snapshot timestamp as seconds since the epoch.
+
+    Args:
+        value (Optional[str]): ``YYYY-MM-DD HH:MM:SS`` in UTC.
+
+    Returns:
+        Optional[int]: Seconds since the epoch, or None if missing.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _remove_sorted(ids: List[int], task_id: int) -> None:
+    """Remove an ID from a sorted list if present.
+
+    Args:
+        ids (List[int]): Sorted task IDs.
+        task_id (int): ID to remove.
+    """
+    position = bisect_left(ids, task_id)
+    if position < len(ids) and ids[position] == task_id:
+        del ids[position]
+
+
+def _fsync_directory(directory: str) -> None:
+    """Sync a directory so a file renamed into it survives a crash.
+
+    Windows cannot open directories and makes renames durable itself.
+
+    Args:
+        directory (str): The directory; empty for the current one.
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class InMemoryTaskDatabase:
+    """Dictionary-backed storage for projects and tasks."""
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        *,
+        snapshot_interval: Optional[float] = None,
+        history_retention: Optional[float] = None,
+    ) -> None:
+        """Initialize the engine, loading the snapshot file if it exists.
+
+        Args:
+            snapshot_path (Optional[str], optional): JSON file the data is
+                snapshotted to. Defaults to None, keeping data in memory only.
+            snapshot_interval (Optional[float], optional): Minimum number of
+                seconds between snapshots taken after writes. Defaults to
+                None, snapshotting only on close.
+            history_retention (Optional[float], optional): Seconds of task
+                history kept in full; older events are folded on the first
+                write and then at most every PRUNE_INTERVAL seconds.
+                Defaults to None, keeping all history.
+
+        Raises:
+            ValueError: If snapshot_interval is negative, history_retention
+                is not positive or the snapshot file is not a valid snapshot.
+            OSError: If the snapshot file cannot be read.
+        """
+        if snapshot_interval is not None and snapshot_interval < 0:
+            raise ValueError('Snapshot interval cannot be negative')
+        if history_retention is not None and history_retention <= 0:
+            raise ValueError('History retention must be positive')
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.history_retention = history_retention
+        self._projects: Dict[str, Tuple[int, str, int]] = {}
+        self._project_ids: Dict[int, str] = {}
+        self._tasks: Dict[int, TaskRow] = {}
+        self._project_tasks: Dict[int, List[int]] = {}
+        self._status_tasks: Dict[Tuple[int, str], List[int]] = {}
+        self._prerequisites: Dict[int, Set[int]] = {}
+        self._dependents: Dict[int, Set[int]] = {}
+        self._tags: Dict[int, Set[str]] = {}
+        self._flow: Dict[int, Dict[FlowKey, int]] = {}
+        self._words = WordIndex()
+        self._history: Dict[int, List[HistoryEvent]] = {}
+        self._next_event_id = 1
+        self._last_prune: Optional[float] = None
+        self._next_project_id = 1
+        self._next_task_id = 1
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+        self._snapshot_task: Optional['asyncio.Task[bool]'] = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshots_taken = 0
+        self._snapshots_written = 0
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self._load(snapshot_path)
+
+    @property
+    def dirty(self) -> bool:
+        """Get whether there are writes not yet snapshotted.
+
+        Returns:
+            bool: True if a write happened since the last snapshot.
+        """
+        return self._dirty
+
+    def close(self) -> None:
+        """Snapshot pending writes, if a snapshot file is configured.
+
+        Data captured by a background snapshot that is not on disk yet
+        counts as pending, so the final snapshot supersedes it even if the
+        event loop stops before the worker thread is done.
+        """
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+        with self._snapshot_lock:
+            pending = self._snapshots_written < self._snapshots_taken
+        if self._dirty or pending:
+            self.snapshot()
+
+    def storage_files(self) -> List[str]:
+        """List the snapshot file, if one is configured.
+
+        Returns:
+            List[str]: The snapshot path, or nothing.
+        """
+        return [] if self.snapshot_path is None else [self.snapshot_path]
+
+    def snapshot(self) -> bool:
+        """Write all data to the snapshot file atomically.
+
+        Returns:
+            bool: True if the snapshot was written, False if no snapshot file
+                is configured or writing failed.
+        """
+        if self.snapshot_path is None:
+            return False
+        return self._write_snapshot(*self._take_snapshot())
+
+    async def snapshot_in_thread(self) -> bool:
+        """Like :meth:`snapshot`, but serialize and write on a worker thread.
+
+        The data is captured on the calling thread first, so writes made
+        while the file is written are left for the next snapshot.
+
+        Returns:
+            bool: True if the snapshot was written, False if no snapshot file
+                is configured or writing failed.
+        """
+        if self.snapshot_path is None:
+            return False
+        return await anyio.to_thread.run_sync(
+            self._write_snapshot, *self._take_snapshot()
+        )
+
+    def _take_snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """Capture the data to snapshot and mark it as snapshotted.
+
+        Rows are immutable tuples, so the captured lists stay consistent
+        while the engine keeps changing.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: Sequence number of the snapshot and
+                the data to write.
+        """
+        self._snapshots_taken += 1
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'next_project_id': self._next_project_id,
+            'next_task_id': self._next_task_id,
+            'next_event_id': self._next_event_id,
+            'projects': list(self._projects.values()),
+            'tasks': list(self._tasks.values()),
+            'dependencies': [
+                (task_id, depends_on_id)
+                for task_id, prerequisites in self._prerequisites.items()
+                for depends_on_id in prerequisites
+            ],
+            'tags': [
+                (task_id, tag)
+                for task_id, tags in self._tags.items()
+                for tag in sorted(tags)
+            ],
+            'history': [
+                (project_id,) + event
+                for project_id, events in self._history.items()
+                for event in events
+            ],
+        }
+        return self._snapshots_taken, data
+
+    def _write_snapshot(self, number: int, data: Dict[str, Any]) -> bool:
+        """Write captured data to the snapshot file, on any thread.
+
+        The data is written to a temporary file, synced and renamed over
+        the snapshot, and the directory is synced so the rename survives a
+        crash. A snapshot taken before the one on disk is not written.
+
+        Args:
+            number (int): Sequence number of the snapshot.
+            data (Dict[str, Any]): Data captured by :meth:`_take_snapshot`.
+
+        Returns:
+            bool: True if the snapshot was written or superseded, False if
+                writing failed; the engine is then marked as dirty again.
+        """
+        assert self.snapshot_path is not None
+        temp_path = f'{self.snapshot_path}.tmp'
+        with self._snapshot_lock:
+            if number <= self._snapshots_written:
+                return True
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as handle:
+                    json.dump(data, handle, separators=(',', ':'))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, self.snapshot_path)
+                _fsync_directory(os.path.dirname(self.snapshot_path))
+            except OSError as e:
+                logger.error(f"Failed to write snapshot '{self.snapshot_path}': {e}")
+                self._dirty = True
+                return False
+            self._snapshots_written = number
+        return True
+
+    def create_project(
+        self, project_name: str, project_id: Optional[int] = None
+    ) -> Optional[int]:
+        """Create a new project.
+
+        Args:
+            project_name (str): Unique name of the project.
+            project_id (Optional[int], optional): Explicit ID. Defaults to
+                None, assigning the next free ID.
+
+        Returns:
+            Optional[int]: The new project ID, or None if the name or ID is
+                taken.
+        """
+        if project_name in self._projects:
+            logger.error(f"Failed to create project '{project_name}': name taken")
+            return None
+        if project_id is None:
+            project_id = self._next_project_id
+        elif project_id in self._project_ids:
+            logger.error(f"Failed to create project '{project_name}': ID taken")
+            return None
+        self._projects[project_name] = (project_id, project_name, now_seconds())
+        self._project_ids[project_id] = project_name
+        self._project_tasks[project_id] = []
+        self._next_project_id = max(self._next_project_id, project_id + 1)
+        self._written()
+        return project_id
+
+    def get_project_by_name(self, project_name: str) -> Optional[Project]:
+        """Look up a project by name.
+
+        Args:
+            project_name (str): Name of the project.
+
+        Returns:
+            Optional[Project]: The project, or None if not found.
+        """
+        row = self._projects.get(project_name)
+        if row is None:
+            return None
+        return Project(
+            project_id=row[0],
+            project_name=row[1],
+            created_at=decode_timestamp(row[2]),
+        )
+
+    def add_task(
+        self,
+        project_id: int,
+        description: str,
+        priority: Optional[int] = None,
+        due_date: Optional[str] = None,
+    ) -> Optional[int]:
+        """Add a task to a project.
+
+        Args:
+            project_id (int): ID of the owning project.
+            description (str): Task description.
+            priority (Optional[int], optional): Task priority. Defaults to None.
+            due_date (Optional[str], optional): Due date (YYYY-MM-DD).
+                Defaults to None.
+
+        Returns:
+            Optional[int]: The new task ID, or None if the project is unknown.
+
+        Raises:
+            ValueError: If due_date is not in YYYY-MM-DD format.
+        """
+        if project_id not in self._project_ids:
+            logger.error(f'Failed to add task to project {project_id}: not found')
+            return None
+        due_day = encode_date(due_date)
+        task_id = self._next_task_id
+        self._next_task_id += 1
+        now = now_seconds()
+        self._insert(
+            (task_id, project_id, description, 'open', priority, due_day, now, now)
+        )
+        delta = encode_delta({'d': description, 'p': priority, 'u': due_day})
+        self._record(project_id, task_id, 'add', delta, now)
+        self._written()
+        return task_id
+
+    def get_task(self, project_id: int, task_id: int) -> Optional[Task]:
+        """Fetch a task of a project by ID.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            Optional[Task]: The task, or None if not found.
+        """
+        row = self._row(project_id, task_id)
+        return row_to_task(row) if row is not None else None
+
+    def list_tasks(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Task]]:
+        """List the tasks of a project.
+
+        Args:
+            project_id (int): ID of the project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+
+        Returns:
+            Optional[List[Task]]: Tasks ordered by ID.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        rows = self.list_task_rows(project_id, status_filter)
+        return None if rows is None else [row_to_task(row) for row in rows]
+
+    def list_task_rows(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[TaskRow]]:
+        """List the raw rows of a project's tasks without hydrating them.
+
+        Args:
+            project_id (int): ID of the project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+
+        Returns:
+            Optional[List[TaskRow]]: Rows in ``TASK_COLUMNS`` order, with
+                dates and timestamps still integer-encoded, ordered by ID.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        if status_filter == 'all':
+            ids = self._project_tasks.get(project_id, [])
+        else:
+            ids = self._status_tasks.get((project_id, status_filter), [])
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in ids]
+
+    def find_tasks_by_description(
+        self, project_id: int, fragment: str
+    ) -> Optional[List[Task]]:
+        """Find tasks whose description contains a fragment.
+
+        Matching is case-insensitive for ASCII characters.
+
+        Args:
+            project_id (int): ID of the project.
+            fragment (str): Part of the task description.
+
+        Returns:
+            Optional[List[Task]]: Matching tasks ordered by ID.
+        """
+        needle = fragment.translate(_ASCII_LOWER)
+        tasks = self._tasks
+        return [
+            row_to_task(tasks[task_id])
+            for task_id in self._project_tasks.get(project_id, [])
+            if needle in tasks[task_id][2].translate(_ASCII_LOWER)
+        ]
+
+    def search_tasks(
+        self,
+        terms: Sequence[str],
+        status_filter: str = 'open',
+        limit: int = 50,
+        after: Optional[SearchKey] = None,
+    ) -> Optional[List[SearchRow]]:
+        """Search the task descriptions of every project.
+
+        Args:
+            terms (Sequence[str]): Words produced by ``search_terms``.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+            limit (int, optional): Maximum number of matches. Defaults to 50.
+            after (Optional[SearchKey], optional): ``(project_id, task_id)``
+                of the last match of the previous page. Defaults to None.
+
+        Returns:
+            Optional[List[SearchRow]]: Project name and raw task row of each
+                match, ordered by project ID and task ID.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        tasks = self._tasks
+        rows = (tasks[task_id] for task_id in self._words.match(list(terms)))
+        if status_filter != 'all':
+            rows = (row for row in rows if row[3] == status_filter)
+        if after is not None:
+            rows = (row for row in rows if (row[1], row[0]) > after)
+        page = heapq.nsmallest(limit, rows, key=lambda row: (row[1], row[0]))
+        names = self._project_ids
+        return [(names[row[1]],) + row for row in page]
+
+    def mark_task_complete(self, project_id: int, task_id: int) -> bool:
+        """Mark a task of a project as completed.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            bool: True if the task exists, False otherwise.
+        """
+        row = self._row(project_id, task_id)
+        if row is None:
+            return False
+        self._delete(row)
+        now = now_seconds()
+        self._insert(row[:3] + ('completed',) + row[4:7] + (now,))
+        self._record(project_id, task_id, 'complete', None, now)
+        self._written()
+        return True
+
+    def remove_task(self, project_id: int, task_id: int) -> bool:
+        """Delete a task of a project.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            bool: True if a task was deleted, False otherwise.
+        """
+        row = self._row(project_id, task_id)
+        if row is None:
+            return False
+        self._delete(row)
+        for depends_on_id in self._prerequisites.pop(task_id, ()):
+            self._dependents[depends_on_id].discard(task_id)
+        for dependent_id in self._dependents.pop(task_id, ()):
+            self._prerequisites[dependent_id].discard(task_id)
+        self._tags.pop(task_id, None)
+        self._record(project_id, task_id, 'remove')
+        self._written()
+        return True
+
+    def move_tasks(
+        self,
+        project_id: int,
+        task_ids: Optional[Sequence[int]],
+        target_id: int,
+        *,
+        status_filter: str = 'all',
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> Optional[MoveResult]:
+        """Move the matching tasks of a project to another project.
+
+        The tasks keep their IDs, timestamps, tags and the dependencies
+        among them; dependencies between moved and remaining tasks are
+        dropped. The source project's audit log gets a ``remove`` and the
+        target's a ``baseline`` event per task.
+
+        Args:
+            project_id (int): ID of the project owning the tasks.
+            task_ids (Optional[Sequence[int]]): IDs of the tasks to move; if
+                any is not a task of the project, nothing is moved. None
+                selects every task of the project.
+            target_id (int): ID of the receiving project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'all'.
+            all_of (Sequence[str], optional): Tags a task must all have.
+                Defaults to none.
+            any_of (Sequence[str], optional): Tags of which a task must have
+                at least one. Defaults to none.
+            none_of (Sequence[str], optional): Tags a task must not have.
+                Defaults to none.
+
+        Returns:
+            Optional[MoveResult]: The moved task IDs, the dropped
+                dependencies and any missing task IDs, or None if the
+                receiving project is unknown.
+        """
+        if target_id not in self._project_ids:
+            logger.error(f'Failed to move tasks to project {target_id}: not found')
+            return None
+        if task_ids is None:
+            task_ids = self._project_tasks.get(project_id, [])
+        else:
+            missing = sorted(
+                {
+                    task_id
+                    for task_id in task_ids
+                    if self._row(project_id, task_id) is None
+                }
+            )
+            if missing:
+                return MoveResult(missing=missing)
+        moving: Set[int] = set()
+        for task_id in task_ids:
+            row = self._row(project_id, task_id)
+            if row is None or status_filter not in ('all', row[3]):
+                continue
+            tags = self._tags.get(task_id, set())
+            if (
+                all(tag in tags for tag in all_of)
+                and (not any_of or any(tag in tags for tag in any_of))
+                and not any(tag in tags for tag in none_of)
+            ):
+                moving.add(task_id)
+        moved = sorted(moving)
+        dropped: List[Tuple[int, int]] = []
+        now = now_seconds()
+        for task_id in moved:
+            row = self._tasks[task_id]
+            self._delete(row)
+            self._insert((task_id, target_id) + row[2:])
+            for depends_on_id in list(self._prerequisites.get(task_id, ())):
+                if depends_on_id not in moving:
+                    self._unlink(task_id, depends_on_id)
+                    dropped.append((task_id, depends_on_id))
+            for dependent_id in list(self._dependents.get(task_id, ())):
+                if dependent_id not in moving:
+                    self._unlink(dependent_id, task_id)
+                    dropped.append((dependent_id, task_id))
+            self._record(project_id, task_id, 'remove', None, now)
+        for task_id in moved:
+            self._record(target_id, task_id, 'baseline', self._baseline(task_id), now)
+        self._written()
+        return MoveResult([(task_id, task_id) for task_id in moved], sorted(dropped))
+
+    def copy_project(self, project_id: int, project_name: str) -> Optional[int]:
+        """Create a project holding a copy of every task of another one.
+
+        The copies get new IDs and timestamps and keep the status,
+        priority, due date, tags and dependencies of the originals. Each
+        copied task gets a ``baseline`` audit log event.
+
+        Args:
+            project_id (int): ID of the project to copy.
+            project_name (str): Unique name of the new project.
+
+        Returns:
+            Optional[int]: The new project ID, or None if the project is
+                unknown or the name is taken.
+        """
+        if project_id not in self._project_ids:
+            logger.error(f'Failed to copy project {project_id}: not found')
+            return None
+        copy_id = self.create_project(project_name)
+        if copy_id is None:
+            return None
+        copies: Dict[int, int] = {}
+        for task_id in self._project_tasks[project_id]:
+            copies[task_id] = self._next_task_id
+            self._next_task_id += 1
+        now = now_seconds()
+        for task_id, copy_task_id in copies.items():
+            row = self._tasks[task_id]
+            self._insert((copy_task_id, copy_id) + row[2:6] + (now, now))
+            tags = self._tags.get(task_id)
+            if tags:
+                self._tags[copy_task_id] = set(tags)
+            for depends_on_id in self._prerequisites.get(task_id, ()):
+                self._link(copy_task_id, copies[depends_on_id])
+        for copy_task_id in copies.values():
+            delta = self._baseline(copy_task_id)
+            self._record(copy_id, copy_task_id, 'baseline', delta, now)
+        self._written()
+        return copy_id
+
+    def add_dependency(self, project_id: int, task_id: int, depends_on_id: int) -> bool:
+        """Record that a task depends on another task of the same project.
+
+        Args:
+            project_id (int): ID of the project owning both tasks.
+            task_id (int): ID of the dependent task.
+            depends_on_id (int): ID of the prerequisite task.
+
+        Returns:
+            bool: True if the dependency was added, False if it already
+                exists or a task is not in the project.
+        """
+        if self._row(project_id, task_id) is None:
+            return False
+        if self._row(project_id, depends_on_id) is None:
+            return False
+        prerequisites = self._prerequisites.setdefault(task_id, set())
+        if depends_on_id in prerequisites:
+            return False
+        self._link(task_id, depends_on_id)
+        self._record(project_id, task_id, 'depend', encode_delta({'o': depends_on_id}))
+        self._written()
+        return True
+
+    def list_dependencies(self, project_id: int) -> Optional[List[Tuple[int, int]]]:
+        """List the dependency edges between a project's tasks.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: ``(task_id, depends_on_id)``
+                pairs.
+        """
+        return [
+            (task_id, depends_on_id)
+            for task_id in self._project_tasks.get(project_id, [])
+            for depends_on_id in sorted(self._prerequisites.get(task_id, ()))
+        ]
+
+    def add_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Tag a task of a project. Tags the task already has are ignored.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+            tags (Sequence[str]): Tags to add.
+
+        Returns:
+            bool: True if the task exists, False otherwise.
+        """
+        if self._row(project_id, task_id) is None:
+            return False
+        current = self._tags.get(task_id, set())
+        added = [tag for tag in dict.fromkeys(tags) if tag not in current]
+        if added:
+            self._tags.setdefault(task_id, set()).update(added)
+            self._record(project_id, task_id, 'tag', encode_delta({'t': added}))
+            self._written()
+        return True
+
+    def remove_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Remove tags from a task of a project. Missing tags are ignored.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+            tags (Sequence[str]): Tags to remove.
+
+        Returns:
+            bool: True if the task exists, False otherwise.
+        """
+        if self._row(project_id, task_id) is None:
+            return False
+        current = self._tags.get(task_id, set())
+        removed = [tag for tag in dict.fromkeys(tags) if tag in current]
+        if removed:
+            current.difference_update(removed)
+            if not current:
+                del self._tags[task_id]
+            self._record(project_id, task_id, 'untag', encode_delta({'t': removed}))
+            self._written()
+        return True
+
+    def list_tags(self, project_id: int) -> Optional[List[Tuple[int, str]]]:
+        """List the tags of a project's tasks.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            Optional[List[Tuple[int, str]]]: ``(task_id, tag)`` pairs ordered
+                by task ID and tag.
+        """
+        return [
+            (task_id, tag)
+            for task_id in self._project_tasks.get(project_id, [])
+            for tag in sorted(self._tags.get(task_id, ()))
+        ]
+
+    def task_flow(
+        self, project_id: int, start_day: int, end_day: int
+    ) -> Optional[List[FlowRow]]:
+        """Count the tasks of a project created and completed per day.
+
+        Args:
+            project_id (int): ID of the project.
+            start_day (int): First day of the range, in days since the epoch.
+            end_day (int): Last day of the range.
+
+        Returns:
+            Optional[List[FlowRow]]: Flow rows ordered by day, see
+                :mod:`.analytics`.
+        """
+        return flow_rows(self._flow.get(project_id, {}).items(), start_day, end_day)
+
+    def task_ages(self, project_id: int, day: int) -> Optional[List[AgeRow]]:
+        """Count the open tasks of a project by age at the end of a day.
+
+        Args:
+            project_id (int): ID of the project.
+            day (int): Day the ages are taken at, in days since the epoch.
+
+        Returns:
+            Optional[List[AgeRow]]: Age rows ordered by age, see
+                :mod:`.analytics`.
+        """
+        return age_rows(self._flow.get(project_id, {}).items(), day)
+
+    def list_history(
+        self,
+        project_id: int,
+        task_id: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Optional[List[HistoryEvent]]:
+        """List the audit log events of a project or one of its tasks.
+
+        Args:
+            project_id (int): ID of the project.
+            task_id (Optional[int], optional): Only events of this task,
+                which may since have been removed. Defaults to None.
+            until (Optional[int], optional): Only events at or before this
+                time, in epoch seconds. Defaults to None.
+
+        Returns:
+            Optional[List[HistoryEvent]]: Events ordered by event ID.
+        """
+        return [
+            event
+            for event in self._history.get(project_id, [])
+            if (task_id is None or event[1] == task_id)
+            and (until is None or event[2] <= until)
+        ]
+
+    def prune_history(self, cutoff: int) -> Optional[int]:
+        """Fold the audit log events older than a cutoff.
+
+        See :func:`.history.plan_prune`.
+
+        Args:
+            cutoff (int): Events before this time, in epoch seconds, are
+                folded.
+
+        Returns:
+            Optional[int]: Number of events deleted.
+        """
+        removed = 0
+        for project_id, events in self._history.items():
+            deleted, rewrites = plan_prune(
+                event for event in events if event[2] < cutoff
+            )
+            if not deleted and not rewrites:
+                continue
+            dropped = set(deleted)
+            replaced = {rewrite[0]: rewrite for rewrite in rewrites}
+            kept: List[HistoryEvent] = []
+            for event in events:
+                if event[0] in dropped:
+                    continue
+                rewrite = replaced.get(event[0])
+                if rewrite is not None:
+                    event = (event[0], event[1]) + rewrite[1:]
+                kept.append(event)
+            self._history[project_id] = kept
+            self._dirty = True
+            removed += len(deleted)
+        return removed
+
+    def _record(
+        self,
+        project_id: int,
+        task_id: int,
+        action: str,
+        delta: Optional[str] = None,
+        at: Optional[int] = None,
+    ) -> None:
+        """Append an audit log event.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the changed task.
+            action (str): One of ``history.ACTIONS``.
+            delta (Optional[str], optional): Encoded changed fields.
+                Defaults to None.
+            at (Optional[int], optional): Time of the change in epoch
+                seconds. Defaults to None, meaning now.
+        """
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        self._history.setdefault(project_id, []).append(
+            (event_id, task_id, now_seconds() if at is None else at, action, delta)
+        )
+
+    def _baseline(self, task_id: int) -> Optional[str]:
+        """Encode the full state of a task as a ``baseline`` event delta.
+
+        Args:
+            task_id (int): ID of the task.
+
+        Returns:
+            Optional[str]: Delta with the keys of :func:`.history.fold`.
+        """
+        row = self._tasks[task_id]
+        return encode_delta(
+            {
+                'd': row[2],
+                'p': row[4],
+                'u': row[5],
+                's': row[3] if row[3] != 'open' else None,
+                'c': row[6],
+                'm': row[7],
+                't': sorted(self._tags.get(task_id, ())) or None,
+                'o': sorted(self._prerequisites.get(task_id, ())) or None,
+            }
+        )
+
+    def _link(self, task_id: int, depends_on_id: int) -> None:
+        """Add a dependency edge to the adjacency sets.
+
+        Args:
+            task_id (int): ID of the dependent task.
+            depends_on_id (int): ID of the prerequisite task.
+        """
+        self._prerequisites.setdefault(task_id, set()).add(depends_on_id)
+        self._dependents.setdefault(depends_on_id, set()).add(task_id)
+
+    def _unlink(self, task_id: int, depends_on_id: int) -> None:
+        """Remove a dependency edge from the adjacency sets.
+
+        Args:
+            task_id (int): ID of the dependent task.
+            depends_on_id (int): ID of the prerequisite task.
+        """
+        self._prerequisites[task_id].discard(depends_on_id)
+        self._dependents[depends_on_id].discard(task_id)
+
+    def _row(self, project_id: int, task_id: int) -> Optional[TaskRow]:
+        """Return the row of a task if it belongs to the project.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            Optional[TaskRow]: The row, or None if not found.
+        """
+        row = self._tasks.get(task_id)
+        return row if row is not None and row[1] == project_id else None
+
+    def _insert(self, row: TaskRow) -> None:
+        """Store a row and add it to the sorted indexes.
+
+        Args:
+            row (TaskRow): Row in ``TASK_COLUMNS`` order.
+        """
+        task_id, project_id, status = row[0], row[1], row[3]
+        self._tasks[task_id] = row
+        self._words.add(task_id, row[2])
+        flow = self._flow.setdefault(project_id, {})
+        key = flow_key(row)
+        flow[key] = flow.get(key, 0) + 1
+        for ids in (
+            self._project_tasks.setdefault(project_id, []),
+            self._status_tasks.setdefault((project_id, status), []),
+        ):
+            if not ids or ids[-1] < task_id:
+                ids.append(task_id)
+            else:
+                insort(ids, task_id)
+
+    def _delete(self, row: TaskRow) -> None:
+        """Drop a row and remove it from the sorted indexes.
+
+        Args:
+            row (TaskRow): Row in ``TASK_COLUMNS`` order.
+        """
+        task_id, project_id, status = row[0], row[1], row[3]
+        del self._tasks[task_id]
+        self._words.remove(task_id, row[2])
+        flow = self._flow[project_id]
+        key = flow_key(row)
+        flow[key] -= 1
+        if not flow[key]:
+            del flow[key]
+        _remove_sorted(self._project_tasks[project_id], task_id)
+        _remove_sorted(self._status_tasks[(project_id, status)], task_id)
+
+    def _written(self) -> None:
+        """Record a write, prune history and snapshot when due."""
+        self._dirty = True
+        if self.history_retention is not None:
+            now = time.monotonic()
+            if self._last_prune is None or now - self._last_prune >= PRUNE_INTERVAL:
+                self._last_prune = now
+                self.prune_history(now_seconds() - int(self.history_retention))
+        if (
+            self.snapshot_interval is not None
+            and time.monotonic() - self._last_snapshot >= self.snapshot_interval
+        ):
+            self._snapshot_when_due()
+
+    def _snapshot_when_due(self) -> None:
+        """Snapshot on a worker thread if an event loop runs, else now.
+
+        While a background snapshot is being written, further writes wait
+        for the next interval after it.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.snapshot()
+            return
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = loop.create_task(self.snapshot_in_thread())
+
+    def _load(self, path: str) -> None:
+        """Load data from a snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a valid snapshot.
+            OSError: If the file cannot be read.
+        """
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict) or data.get('version') not in (
+            1,
+            SNAPSHOT_VERSION,
+        ):
+            raise ValueError(f"Unsupported snapshot file '{path}'")
+        text = data['version'] == 1
+        for project_id, project_name, created_at in data['projects']:
+            if text:
+                created_at = _text_seconds(created_at)
+            self._projects[project_name] = (project_id, project_name, created_at)
+            self._project_ids[project_id] = project_name
+            self._project_tasks[project_id] = []
+        for row in data['tasks']:
+            if text:
+                row[5:8] = [
+                    encode_date(row[5]),
+                    _text_seconds(row[6]),
+                    _text_seconds(row[7]),
+                ]
+            self._insert(tuple(row))
+        for task_id, depends_on_id in data.get('dependencies', []):
+            self._prerequisites.setdefault(task_id, set()).add(depends_on_id)
+            self._dependents.setdefault(depends_on_id, set()).add(task_id)
+        for task_id, tag in data.get('tags', []):
+            self._tags.setdefault(task_id, set()).add(tag)
+        for project_id, *event in data.get('history', []):
+            self._history.setdefault(project_id, []).append(tuple(event))
+        self._next_event_id = data.get('next_event_id', 1)
+        self._next_project_id = data['next_project_id']
+        self._next_task_id = data['next_task_id']
+        logger.info(
+            f'Loaded {len(self._projects)} projects and {len(self._tasks)} tasks '
+            f"from snapshot '{path}'"
+        )
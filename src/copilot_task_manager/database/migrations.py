@@ -0,0 +1,355 @@
+"""Versioned schema migrations keyed on ``PRAGMA user_version``.
+
+Each migration is a ``(version, script)`` pair applied in order. The
+version of a database is stored in its ``user_version`` header field, so
+opening an up-to-date database costs a single pragma read however many
+tables, indexes and triggers the schema has.
+
+Pending migrations run in one ``BEGIN IMMEDIATE`` transaction together
+with the ``user_version`` update: a crash or error leaves the database at
+its previous version, and two processes starting at once cannot both
+migrate. Scripts use ``IF NOT EXISTS`` so databases created before
+versioning (``user_version`` 0) are adopted in place.
+
+Migration 3 converts dates and timestamps from text to integers (see
+:mod:`.dates`) by adding, converting, dropping and renaming columns rather
+than rebuilding the tables, which would cascade-delete dependent rows.
+The integer columns have no default, so inserts supply the timestamps.
+Migration 5 creates the audit log (see :mod:`.history`) clustered on
+``(project_id, event_id)``, so appending an event writes one b-tree, and
+seeds it with an ``add`` and, for completed tasks, a ``complete`` event per
+existing task. Migration 6 adds the ``TaskFlow`` rollup the progress analytics
+(see :mod:`.analytics`) aggregate over. Triggers keep it current by
+applying each row change as a -1 and a +1 upsert, so the counts stay
+right whatever order the triggers of one statement fire in; keys whose
+count drops to zero are kept. Migration 7 adds ``TaskSearch``, an FTS5
+index over the descriptions of every project (see :mod:`.search`). It
+reads the descriptions from ``Tasks`` rather than storing a copy, and
+triggers add, update and remove its entries. Migration 8 limits the
+``updated_at`` trigger to changes of a task's own fields, so moving a task
+to another project keeps its timestamps and completion day.
+"""
+
+import sqlite3
+from typing import Iterator, Sequence, Tuple
+
+Migration = Tuple[int, str]
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    (
+        1,
+        """
+CREATE TABLE IF NOT EXISTS Projects (
+    project_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_name TEXT UNIQUE NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS Tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    priority INTEGER,
+    due_date TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (project_id) REFERENCES Projects (project_id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS update_task_updated_at
+AFTER UPDATE ON Tasks
+FOR EACH ROW
+BEGIN
+    UPDATE Tasks SET updated_at = CURRENT_TIMESTAMP WHERE task_id = OLD.task_id;
+END;
+""",
+    ),
+    (
+        2,
+        """
+CREATE TABLE IF NOT EXISTS TaskDependencies (
+    task_id INTEGER NOT NULL,
+    depends_on_id INTEGER NOT NULL,
+    PRIMARY KEY (task_id, depends_on_id),
+    FOREIGN KEY (task_id) REFERENCES Tasks (task_id) ON DELETE CASCADE,
+    FOREIGN KEY (depends_on_id) REFERENCES Tasks (task_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on
+ON TaskDependencies (depends_on_id);
+""",
+    ),
+    (
+        3,
+        """
+DROP TRIGGER IF EXISTS update_task_updated_at;
+
+ALTER TABLE Projects ADD COLUMN created_ts INTEGER;
+UPDATE Projects SET created_ts = CAST(strftime('%s', created_at) AS INTEGER);
+ALTER TABLE Projects DROP COLUMN created_at;
+ALTER TABLE Projects RENAME COLUMN created_ts TO created_at;
+
+ALTER TABLE Tasks ADD COLUMN due_day INTEGER;
+ALTER TABLE Tasks ADD COLUMN created_ts INTEGER;
+ALTER TABLE Tasks ADD COLUMN updated_ts INTEGER;
+UPDATE Tasks SET
+    due_day = CAST(julianday(due_date) - 2440587.5 AS INTEGER),
+    created_ts = CAST(strftime('%s', created_at) AS INTEGER),
+    updated_ts = CAST(strftime('%s', updated_at) AS INTEGER);
+ALTER TABLE Tasks DROP COLUMN due_date;
+ALTER TABLE Tasks DROP COLUMN created_at;
+ALTER TABLE Tasks DROP COLUMN updated_at;
+ALTER TABLE Tasks RENAME COLUMN due_day TO due_date;
+ALTER TABLE Tasks RENAME COLUMN created_ts TO created_at;
+ALTER TABLE Tasks RENAME COLUMN updated_ts TO updated_at;
+
+CREATE TRIGGER update_task_updated_at
+AFTER UPDATE ON Tasks
+FOR EACH ROW
+BEGIN
+    UPDATE Tasks SET updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE task_id = OLD.task_id;
+END;
+""",
+    ),
+    (
+        4,
+        """
+CREATE TABLE IF NOT EXISTS TaskTags (
+    task_id INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, tag),
+    FOREIGN KEY (task_id) REFERENCES Tasks (task_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON TaskTags (tag);
+""",
+    ),
+    (
+        5,
+        """
+CREATE TABLE IF NOT EXISTS TaskHistory (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    at INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    delta TEXT,
+    PRIMARY KEY (project_id, event_id)
+) WITHOUT ROWID;
+
+INSERT INTO TaskHistory (project_id, event_id, task_id, at, action, delta)
+SELECT project_id,
+    ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY seq, task_id),
+    task_id, at, action, delta
+FROM (
+    SELECT 0 AS seq, project_id, task_id, COALESCE(created_at, 0) AS at,
+        'add' AS action,
+        json_patch(
+            '{}', json_object('d', description, 'p', priority, 'u', due_date)
+        ) AS delta
+    FROM Tasks
+    UNION ALL
+    SELECT 1, project_id, task_id, COALESCE(updated_at, created_at, 0),
+        'complete', NULL
+    FROM Tasks WHERE status = 'completed'
+);
+""",
+    ),
+    (
+        6,
+        """
+CREATE TABLE IF NOT EXISTS TaskFlow (
+    project_id INTEGER NOT NULL,
+    created_day INTEGER NOT NULL,
+    completed_day INTEGER NOT NULL,
+    tasks INTEGER NOT NULL,
+    PRIMARY KEY (project_id, created_day, completed_day)
+) WITHOUT ROWID;
+
+INSERT INTO TaskFlow (project_id, created_day, completed_day, tasks)
+SELECT project_id, created_day, completed_day, COUNT(*) FROM (
+    SELECT project_id, COALESCE(created_at, 0) / 86400 AS created_day,
+        CASE WHEN status = 'completed'
+        THEN COALESCE(updated_at, created_at, 0) / 86400
+        ELSE 2147483647 END AS completed_day
+    FROM Tasks
+) GROUP BY project_id, created_day, completed_day;
+
+CREATE TRIGGER IF NOT EXISTS task_flow_insert
+AFTER INSERT ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskFlow (project_id, created_day, completed_day, tasks)
+    VALUES (NEW.project_id, COALESCE(NEW.created_at, 0) / 86400,
+        CASE WHEN NEW.status = 'completed'
+        THEN COALESCE(NEW.updated_at, NEW.created_at, 0) / 86400
+        ELSE 2147483647 END, 1)
+    ON CONFLICT DO UPDATE SET tasks = tasks + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_flow_update
+AFTER UPDATE OF project_id, status, created_at, updated_at ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskFlow (project_id, created_day, completed_day, tasks)
+    VALUES (OLD.project_id, COALESCE(OLD.created_at, 0) / 86400,
+        CASE WHEN OLD.status = 'completed'
+        THEN COALESCE(OLD.updated_at, OLD.created_at, 0) / 86400
+        ELSE 2147483647 END, -1)
+    ON CONFLICT DO UPDATE SET tasks = tasks - 1;
+    INSERT INTO TaskFlow (project_id, created_day, completed_day, tasks)
+    VALUES (NEW.project_id, COALESCE(NEW.created_at, 0) / 86400,
+        CASE WHEN NEW.status = 'completed'
+        THEN COALESCE(NEW.updated_at, NEW.created_at, 0) / 86400
+        ELSE 2147483647 END, 1)
+    ON CONFLICT DO UPDATE SET tasks = tasks + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_flow_delete
+AFTER DELETE ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskFlow (project_id, created_day, completed_day, tasks)
+    VALUES (OLD.project_id, COALESCE(OLD.created_at, 0) / 86400,
+        CASE WHEN OLD.status = 'completed'
+        THEN COALESCE(OLD.updated_at, OLD.created_at, 0) / 86400
+        ELSE 2147483647 END, -1)
+    ON CONFLICT DO UPDATE SET tasks = tasks - 1;
+END;
+""",
+    ),
+    (
+        7,
+        """
+CREATE VIRTUAL TABLE IF NOT EXISTS TaskSearch USING fts5(
+    description,
+    content = 'Tasks',
+    content_rowid = 'task_id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+INSERT INTO TaskSearch (TaskSearch) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS task_search_insert
+AFTER INSERT ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskSearch (rowid, description)
+    VALUES (NEW.task_id, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_search_update
+AFTER UPDATE OF description ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskSearch (TaskSearch, rowid, description)
+    VALUES ('delete', OLD.task_id, OLD.description);
+    INSERT INTO TaskSearch (rowid, description)
+    VALUES (NEW.task_id, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_search_delete
+AFTER DELETE ON Tasks
+FOR EACH ROW
+BEGIN
+    INSERT INTO TaskSearch (TaskSearch, rowid, description)
+    VALUES ('delete', OLD.task_id, OLD.description);
+END;
+""",
+    ),
+    (
+        8,
+        """
+DROP TRIGGER IF EXISTS update_task_updated_at;
+
+CREATE TRIGGER update_task_updated_at
+AFTER UPDATE OF description, status, priority, due_date ON Tasks
+FOR EACH ROW
+BEGIN
+    UPDATE Tasks SET updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE task_id = OLD.task_id;
+END;
+""",
+    ),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def split_statements(script: str) -> Iterator[str]:
+    """Split an SQL script into complete statements.
+
+    Unlike ``executescript``, the statements can then run inside an open
+    transaction. Trigger bodies are kept whole.
+
+    Args:
+        script (str): Semicolon-separated SQL statements.
+
+    Yields:
+        str: Each statement, including its terminating semicolon.
+    """
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ''
+    if statement.strip():
+        raise sqlite3.ProgrammingError(f'Incomplete SQL statement: {statement!r}')
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version of a database.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+
+    Returns:
+        int: The ``user_version`` of the database.
+    """
+    version: int = conn.execute('PRAGMA user_version').fetchone()[0]
+    return version
+
+
+def migrate(
+    conn: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS
+) -> int:
+    """Bring a database up to the latest schema version.
+
+    Args:
+        conn (sqlite3.Connection): Open connection outside a transaction.
+        migrations (Sequence[Migration], optional): Migrations ordered by
+            version. Defaults to MIGRATIONS.
+
+    Returns:
+        int: Number of migrations applied.
+
+    Raises:
+        sqlite3.DatabaseError: If the database is newer than the latest
+            migration, or a migration fails; nothing is applied then.
+    """
+    latest = migrations[-1][0] if migrations else 0
+    if schema_version(conn) == latest:
+        return 0
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Re-read under the write lock: another process may have migrated.
+        current = schema_version(conn)
+        if current > latest:
+            raise sqlite3.DatabaseError(
+                f'Database schema version {current} is newer than the '
+                f'supported version {latest}'
+            )
+        pending = [script for version, script in migrations if version > current]
+        for script in pending:
+            for statement in split_statements(script):
+                conn.execute(statement)
+        conn.execute(f'PRAGMA user_version = {latest:d}')
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(pending)
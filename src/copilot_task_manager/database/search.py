@@ -0,0 +1,124 @@
+"""Full-text search of task descriptions across projects.
+
+A search query is split into words, and a task matches when every query
+word is the beginning of a word of its description, ignoring case and
+accents: "doc" matches "Write the Docs". Matches are ordered by project ID,
+then task ID, so results come grouped by project, and pages continue after
+the ``(project_id, task_id)`` key of the last match of the previous page.
+
+The SQLite engine answers from the ``TaskSearch`` FTS5 table, a global
+index over the descriptions of every project kept current by triggers;
+the in-memory engine keeps a :class:`WordIndex`. Both split text the way
+the FTS5 ``unicode61`` tokenizer with ``remove_diacritics 2`` does.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Key of a match: (project_id, task_id).
+SearchKey = Tuple[int, int]
+# Project name followed by the task's row in ``TASK_COLUMNS`` order.
+SearchRow = Tuple[Any, ...]
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def search_terms(text: str) -> List[str]:
+    """Split text into lower-cased words without accents.
+
+    Args:
+        text (str): Query or description.
+
+    Returns:
+        List[str]: Distinct words in order of first occurrence.
+    """
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return list(dict.fromkeys(_WORD_RE.findall(folded)))
+
+
+def fts_query(terms: Iterable[str]) -> str:
+    """Build an FTS5 query matching every term as a word prefix.
+
+    Args:
+        terms (Iterable[str]): Words produced by :func:`search_terms`.
+
+    Returns:
+        str: Quoted prefix queries joined by implicit AND.
+    """
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_key(row: SearchRow) -> SearchKey:
+    """Return the ordering key of a search row.
+
+    Args:
+        row (SearchRow): Project name and task row.
+
+    Returns:
+        SearchKey: ``(project_id, task_id)``.
+    """
+    return row[2], row[1]
+
+
+class WordIndex:
+    """Inverted index from description words to task IDs."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: Dict[str, Set[int]] = {}
+        self._words: List[str] = []
+
+    def add(self, task_id: int, text: str) -> None:
+        """Index the words of a task description.
+
+        Args:
+            task_id (int): ID of the task.
+            text (str): Description of the task.
+        """
+        for word in search_terms(text):
+            ids = self._postings.get(word)
+            if ids is None:
+                ids = self._postings[word] = set()
+                insort(self._words, word)
+            ids.add(task_id)
+
+    def remove(self, task_id: int, text: str) -> None:
+        """Unindex the words of a task description.
+
+        Args:
+            task_id (int): ID of the task.
+            text (str): Description the task was indexed with.
+        """
+        for word in search_terms(text):
+            ids = self._postings.get(word)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
+
+    def match(self, terms: List[str]) -> Set[int]:
+        """Find the tasks with a word starting with each term.
+
+        Args:
+            terms (List[str]): Words produced by :func:`search_terms`.
+
+        Returns:
+            Set[int]: IDs of the matching tasks; empty for no terms.
+        """
+        matches: Optional[Set[int]] = None
+        for term in terms:
+            words = self._words
+            ids: Set[int] = set()
+            for position in range(bisect_left(words, term), len(words)):
+                if not words[position].startswith(term):
+                    break
+                ids |= self._postings[words[position]]
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return set()
+        return matches or set()
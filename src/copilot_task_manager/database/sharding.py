@@ -0,0 +1,547 @@
+"""Sharded SQLite storage: one database file per project or hash bucket.
+
+SQLite serializes writers per database file. With many active projects
+in one shared ``tasks.db`` every write contends on the same lock. The
+:class:`ShardedTaskDatabase` spreads projects over several shard files and
+keeps a small catalog database mapping each ``project_name`` to its shard:
+
+* ``catalog.db`` allocates project IDs and records the shard of each project.
+  It is only written when a project is created.
+* ``shard_*.db`` files are ordinary :class:`TaskDatabase` files. They are
+  opened lazily and kept in a bounded LRU of open handles.
+
+It offers the same methods as :class:`TaskDatabase`, so the tool layer does
+not need to know which layout is in use.
+"""
+
+import heapq
+import logging
+import os
+import sqlite3
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models import Project, Task
+from .analytics import AgeRow, FlowRow
+from .dates import decode_timestamp, now_seconds
+from .history import HistoryEvent
+from .migrations import migrate
+from .search import SearchKey, SearchRow, search_key
+from .store import MoveResult
+from .task_db import VALID_STATUS_FILTERS, TaskDatabase
+
+logger = logging.getLogger(__name__)
+
+CATALOG_MIGRATIONS = (
+    (
+        1,
+        """
+CREATE TABLE IF NOT EXISTS ProjectShards (
+    project_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_name TEXT UNIQUE NOT NULL,
+    shard TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+""",
+    ),
+    (
+        2,
+        """
+ALTER TABLE ProjectShards ADD COLUMN created_ts INTEGER;
+UPDATE ProjectShards SET created_ts = CAST(strftime('%s', created_at) AS INTEGER);
+ALTER TABLE ProjectShards DROP COLUMN created_at;
+ALTER TABLE ProjectShards RENAME COLUMN created_ts TO created_at;
+""",
+    ),
+)
+
+DEFAULT_MAX_OPEN_SHARDS = 64
+
+
+class ShardedTaskDatabase:
+    """Task storage spread over one SQLite file per project or hash bucket."""
+
+    def __init__(
+        self,
+        shard_dir: str,
+        *,
+        buckets: Optional[int] = None,
+        max_open_shards: int = DEFAULT_MAX_OPEN_SHARDS,
+        history_retention: Optional[float] = None,
+    ) -> None:
+        """Initialize the sharded storage.
+
+        Nothing is opened until the first operation.
+
+        Args:
+            shard_dir (str): Directory holding the catalog and shard files.
+            buckets (Optional[int], optional): Number of hash buckets. If
+                None, every project gets its own shard file. Defaults to None.
+            max_open_shards (int, optional): Maximum number of shard
+                connections kept open. Defaults to DEFAULT_MAX_OPEN_SHARDS.
+            history_retention (Optional[float], optional): Seconds of task
+                history each shard keeps in full. Defaults to None, keeping
+                all history.
+
+        Raises:
+            ValueError: If buckets, max_open_shards or history_retention is
+                not positive.
+        """
+        if buckets is not None and buckets < 1:
+            raise ValueError('Bucket count must be positive')
+        if max_open_shards < 1:
+            raise ValueError('Maximum open shards must be positive')
+        if history_retention is not None and history_retention <= 0:
+            raise ValueError('History retention must be positive')
+        self.shard_dir = shard_dir
+        self.buckets = buckets
+        self.max_open_shards = max_open_shards
+        self.history_retention = history_retention
+        self._catalog: Optional[sqlite3.Connection] = None
+        self._shards: 'OrderedDict[str, TaskDatabase]' = OrderedDict()
+        self._project_shards: Dict[int, str] = {}
+
+    @property
+    def catalog(self) -> sqlite3.Connection:
+        """Get the catalog connection, creating the catalog if needed.
+
+        Returns:
+            sqlite3.Connection: The catalog database connection.
+        """
+        if self._catalog is None:
+            os.makedirs(self.shard_dir, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.shard_dir, 'catalog.db'))
+            migrate(conn, CATALOG_MIGRATIONS)
+            self._catalog = conn
+        return self._catalog
+
+    @property
+    def open_shards(self) -> List[str]:
+        """Get the keys of the currently open shards, least recent first.
+
+        Returns:
+            List[str]: Open shard keys.
+        """
+        return list(self._shards)
+
+    def close(self) -> None:
+        """Close the catalog and every open shard."""
+        for shard in self._shards.values():
+            shard.close()
+        self._shards.clear()
+        if self._catalog is not None:
+            self._catalog.close()
+            self._catalog = None
+
+    def storage_files(self) -> List[str]:
+        """List the catalog and every shard file, open or not.
+
+        Returns:
+            List[str]: Paths of the database files in the shard directory.
+        """
+        try:
+            names = sorted(os.listdir(self.shard_dir))
+        except OSError:
+            return []
+        return [
+            os.path.join(self.shard_dir, name) for name in names if name.endswith('.db')
+        ]
+
+    def shard_key(self, project_id: int, project_name: str) -> str:
+        """Compute the shard a project belongs to.
+
+        Args:
+            project_id (int): Catalog ID of the project.
+            project_name (str): Name of the project.
+
+        Returns:
+            str: Shard key, also used as the shard file's base name.
+        """
+        if self.buckets is None:
+            return f'project_{project_id}'
+        bucket = zlib.crc32(project_name.encode('utf-8')) % self.buckets
+        return f'bucket_{bucket}'
+
+    def _shard(self, key: str) -> TaskDatabase:
+        """Get a shard by key, opening it and evicting the LRU shard if needed.
+
+        Args:
+            key (str): Shard key.
+
+        Returns:
+            TaskDatabase: The shard database.
+        """
+        shard = self._shards.get(key)
+        if shard is not None:
+            self._shards.move_to_end(key)
+            return shard
+        shard = TaskDatabase(
+            os.path.join(self.shard_dir, f'shard_{key}.db'),
+            history_retention=self.history_retention,
+        )
+        self._shards[key] = shard
+        while len(self._shards) > self.max_open_shards:
+            _, evicted = self._shards.popitem(last=False)
+            evicted.close()
+        return shard
+
+    def _shard_for_project(self, project_id: int) -> Optional[TaskDatabase]:
+        """Get the shard holding a project.
+
+        Args:
+            project_id (int): Catalog ID of the project.
+
+        Returns:
+            Optional[TaskDatabase]: The shard, or None if the project is
+                unknown or the catalog cannot be read.
+        """
+        key = self._project_shards.get(project_id)
+        if key is None:
+            try:
+                row = self.catalog.execute(
+                    'SELECT shard FROM ProjectShards WHERE project_id = ?',
+                    (project_id,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f'Failed to look up shard of project {project_id}: {e}')
+                return None
+            if row is None or row[0] is None:
+                return None
+            key = str(row[0])
+            self._project_shards[project_id] = key
+        return self._shard(key)
+
+    def _shard_keys(self) -> Optional[List[str]]:
+        """List the keys of every shard holding a project.
+
+        Returns:
+            Optional[List[str]]: Shard keys, or None if the catalog cannot be
+                read.
+        """
+        try:
+            return [
+                row[0]
+                for row in self.catalog.execute(
+                    'SELECT DISTINCT shard FROM ProjectShards WHERE shard IS NOT NULL'
+                )
+            ]
+        except sqlite3.Error as e:
+            logger.error(f'Failed to list shards: {e}')
+            return None
+
+    def create_project(self, project_name: str) -> Optional[int]:
+        """Create a new project in the catalog and in its shard.
+
+        Args:
+            project_name (str): Unique name of the project.
+
+        Returns:
+            Optional[int]: The new project ID, or None on failure.
+        """
+        registered = self._register(project_name)
+        if registered is None:
+            return None
+        project_id, key = registered
+        if self._shard(key).create_project(project_name, project_id) is None:
+            self._unregister(project_id)
+            return None
+        self._project_shards[project_id] = key
+        return project_id
+
+    def _register(self, project_name: str) -> Optional[Tuple[int, str]]:
+        """Allocate a project ID and shard in the catalog.
+
+        Args:
+            project_name (str): Unique name of the project.
+
+        Returns:
+            Optional[Tuple[int, str]]: The project ID and shard key, or None
+                if the name is taken or the catalog cannot be written.
+        """
+        try:
+            with self.catalog as conn:
+                cursor = conn.execute(
+                    'INSERT INTO ProjectShards (project_name, created_at) '
+                    'VALUES (?, ?)',
+                    (project_name, now_seconds()),
+                )
+                project_id = cursor.lastrowid
+                assert project_id is not None
+                key = self.shard_key(project_id, project_name)
+                conn.execute(
+                    'UPDATE ProjectShards SET shard = ? WHERE project_id = ?',
+                    (key, project_id),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to register project '{project_name}': {e}")
+            return None
+        return project_id, key
+
+    def _unregister(self, project_id: int) -> None:
+        """Drop a project whose shard could not create it from the catalog.
+
+        Args:
+            project_id (int): Catalog ID of the project.
+        """
+        with self.catalog as conn:
+            conn.execute(
+                'DELETE FROM ProjectShards WHERE project_id = ?', (project_id,)
+            )
+
+    def get_project_by_name(self, project_name: str) -> Optional[Project]:
+        """Look up a project by name in the catalog.
+
+        Args:
+            project_name (str): Name of the project.
+
+        Returns:
+            Optional[Project]: The project, or None if not found or on error.
+        """
+        try:
+            row = self.catalog.execute(
+                'SELECT project_id, project_name, shard, created_at '
+                'FROM ProjectShards WHERE project_name = ?',
+                (project_name,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to look up project '{project_name}': {e}")
+            return None
+        if row is None or row[2] is None:
+            return None
+        self._project_shards[row[0]] = row[2]
+        return Project(
+            project_id=row[0],
+            project_name=row[1],
+            created_at=decode_timestamp(row[3]),
+        )
+
+    def add_task(
+        self,
+        project_id: int,
+        description: str,
+        priority: Optional[int] = None,
+        due_date: Optional[str] = None,
+    ) -> Optional[int]:
+        """Add a task to a project. See :meth:`TaskDatabase.add_task`."""
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.add_task(project_id, description, priority, due_date)
+
+    def get_task(self, project_id: int, task_id: int) -> Optional[Task]:
+        """Fetch a task of a project. See :meth:`TaskDatabase.get_task`."""
+        shard = self._shard_for_project(project_id)
+        return shard.get_task(project_id, task_id) if shard is not None else None
+
+    def list_tasks(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Task]]:
+        """List the tasks of a project. See :meth:`TaskDatabase.list_tasks`."""
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.list_tasks(project_id, status_filter)
+
+    def list_task_rows(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Tuple[Any, ...]]]:
+        """List raw task rows. See :meth:`TaskDatabase.list_task_rows`."""
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.list_task_rows(project_id, status_filter)
+
+    def find_tasks_by_description(
+        self, project_id: int, fragment: str
+    ) -> Optional[List[Task]]:
+        """Find tasks by description fragment.
+
+        See :meth:`TaskDatabase.find_tasks_by_description`.
+        """
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.find_tasks_by_description(project_id, fragment)
+
+    def search_tasks(
+        self,
+        terms: Sequence[str],
+        status_filter: str = 'open',
+        limit: int = 50,
+        after: Optional[SearchKey] = None,
+    ) -> Optional[List[SearchRow]]:
+        """Search the task descriptions of every shard.
+
+        Each shard answers from its own full-text index; the pages are
+        merged by ``(project_id, task_id)``, which catalog IDs keep unique.
+        See :meth:`TaskDatabase.search_tasks`.
+        """
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        keys = self._shard_keys()
+        if keys is None:
+            return None
+        pages = []
+        for key in keys:
+            page = self._shard(key).search_tasks(terms, status_filter, limit, after)
+            if page is None:
+                return None
+            pages.append(page)
+        return list(heapq.merge(*pages, key=search_key))[:limit]
+
+    def mark_task_complete(self, project_id: int, task_id: int) -> bool:
+        """Mark a task as completed. See :meth:`TaskDatabase.mark_task_complete`."""
+        shard = self._shard_for_project(project_id)
+        return shard is not None and shard.mark_task_complete(project_id, task_id)
+
+    def remove_task(self, project_id: int, task_id: int) -> bool:
+        """Delete a task. See :meth:`TaskDatabase.remove_task`."""
+        shard = self._shard_for_project(project_id)
+        return shard is not None and shard.remove_task(project_id, task_id)
+
+    def move_tasks(
+        self,
+        project_id: int,
+        task_ids: Optional[Sequence[int]],
+        target_id: int,
+        *,
+        status_filter: str = 'all',
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> Optional[MoveResult]:
+        """Move the matching tasks to another project.
+
+        Between projects of different shards, the target shard is attached
+        to the source shard's connection so the move is still one
+        transaction, and the tasks get new IDs in the target shard. See
+        :meth:`TaskDatabase.move_tasks`.
+        """
+        target = self._shard_for_project(target_id)
+        source = self._shard_for_project(project_id)
+        if source is None or target is None:
+            return None
+        return source.move_tasks(
+            project_id,
+            task_ids,
+            target_id,
+            status_filter=status_filter,
+            all_of=all_of,
+            any_of=any_of,
+            none_of=none_of,
+            target=target,
+        )
+
+    def copy_project(self, project_id: int, project_name: str) -> Optional[int]:
+        """Copy a project and its tasks into a new project.
+
+        The copy is created in the shard its name and new ID map to, which
+        is attached to the source shard's connection if it is another one.
+        See :meth:`TaskDatabase.copy_project`.
+        """
+        source = self._shard_for_project(project_id)
+        if source is None:
+            return None
+        registered = self._register(project_name)
+        if registered is None:
+            return None
+        copy_id, key = registered
+        target = self._shard(key)
+        if (
+            source.copy_project(project_id, project_name, copy_id, target=target)
+            is None
+        ):
+            self._unregister(copy_id)
+            return None
+        self._project_shards[copy_id] = key
+        return copy_id
+
+    def add_dependency(self, project_id: int, task_id: int, depends_on_id: int) -> bool:
+        """Add a task dependency. See :meth:`TaskDatabase.add_dependency`."""
+        shard = self._shard_for_project(project_id)
+        return shard is not None and shard.add_dependency(
+            project_id, task_id, depends_on_id
+        )
+
+    def list_dependencies(self, project_id: int) -> Optional[List[Tuple[int, int]]]:
+        """List task dependencies. See :meth:`TaskDatabase.list_dependencies`."""
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.list_dependencies(project_id)
+
+    def add_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Tag a task. See :meth:`TaskDatabase.add_tags`."""
+        shard = self._shard_for_project(project_id)
+        return shard is not None and shard.add_tags(project_id, task_id, tags)
+
+    def remove_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Remove tags from a task. See :meth:`TaskDatabase.remove_tags`."""
+        shard = self._shard_for_project(project_id)
+        return shard is not None and shard.remove_tags(project_id, task_id, tags)
+
+    def list_tags(self, project_id: int) -> Optional[List[Tuple[int, str]]]:
+        """List task tags. See :meth:`TaskDatabase.list_tags`."""
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.list_tags(project_id)
+
+    def task_flow(
+        self, project_id: int, start_day: int, end_day: int
+    ) -> Optional[List[FlowRow]]:
+        """Count created and completed tasks per day.
+
+        See :meth:`TaskDatabase.task_flow`.
+        """
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.task_flow(project_id, start_day, end_day)
+
+    def task_ages(self, project_id: int, day: int) -> Optional[List[AgeRow]]:
+        """Count open tasks by age. See :meth:`TaskDatabase.task_ages`."""
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.task_ages(project_id, day)
+
+    def list_history(
+        self,
+        project_id: int,
+        task_id: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Optional[List[HistoryEvent]]:
+        """List audit log events. See :meth:`TaskDatabase.list_history`."""
+        shard = self._shard_for_project(project_id)
+        if shard is None:
+            return None
+        return shard.list_history(project_id, task_id, until)
+
+    def prune_history(self, cutoff: int) -> Optional[int]:
+        """Fold old audit log events of every shard.
+
+        See :meth:`TaskDatabase.prune_history`.
+
+        Args:
+            cutoff (int): Events before this time, in epoch seconds, are
+                folded.
+
+        Returns:
+            Optional[int]: Number of events deleted, or None on error.
+        """
+        keys = self._shard_keys()
+        if keys is None:
+            return None
+        removed = 0
+        for key in keys:
+            pruned = self._shard(key).prune_history(cutoff)
+            if pruned is None:
+                return None
+            removed += pruned
+        return removed
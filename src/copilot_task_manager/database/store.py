@@ -0,0 +1,143 @@
+"""Storage interface shared by every task storage engine.
+
+The tool layer only talks to a :class:`TaskStore`, so the SQLite engine,
+the sharded SQLite layout and the in-memory engine are interchangeable.
+Engines follow the same error contract: failures are logged and reported
+as ``None`` or ``False``, and only an invalid status filter raises.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+from ..models import Project, Task
+from .analytics import AgeRow, FlowRow
+from .history import HistoryEvent
+from .search import SearchKey, SearchRow
+
+
+@dataclass(frozen=True)
+class MoveResult:
+    """Outcome of :meth:`TaskStore.move_tasks`, read in its transaction.
+
+    Attributes:
+        pairs (List[Tuple[int, int]]): ``(old_id, new_id)`` pairs of the
+            moved tasks ordered by ID.
+        dropped (List[Tuple[int, int]]): ``(task_id, depends_on_id)``
+            dependencies between moved and remaining tasks that were dropped,
+            with the IDs they had before the move.
+        missing (List[int]): Requested task IDs not in the project, in
+            ascending order; if any, nothing was moved.
+    """
+
+    pairs: List[Tuple[int, int]] = field(default_factory=list)
+    dropped: List[Tuple[int, int]] = field(default_factory=list)
+    missing: List[int] = field(default_factory=list)
+
+
+@runtime_checkable
+class TaskStore(Protocol):
+    """Operations a task storage engine provides."""
+
+    def close(self) -> None:
+        """Release the engine's resources."""
+
+    def storage_files(self) -> List[str]:
+        """List the files the engine persists data to."""
+
+    def create_project(self, project_name: str) -> Optional[int]:
+        """Create a new project and return its ID, or None on failure."""
+
+    def get_project_by_name(self, project_name: str) -> Optional[Project]:
+        """Look up a project by name."""
+
+    def add_task(
+        self,
+        project_id: int,
+        description: str,
+        priority: Optional[int] = None,
+        due_date: Optional[str] = None,
+    ) -> Optional[int]:
+        """Add a task to a project and return its ID, or None on failure."""
+
+    def get_task(self, project_id: int, task_id: int) -> Optional[Task]:
+        """Fetch a task of a project by ID."""
+
+    def list_tasks(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Task]]:
+        """List the tasks of a project ordered by ID."""
+
+    def list_task_rows(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Tuple[Any, ...]]]:
+        """List a project's tasks as rows in ``TASK_COLUMNS`` order."""
+
+    def find_tasks_by_description(
+        self, project_id: int, fragment: str
+    ) -> Optional[List[Task]]:
+        """Find tasks whose description contains a fragment."""
+
+    def search_tasks(
+        self,
+        terms: Sequence[str],
+        status_filter: str = 'open',
+        limit: int = 50,
+        after: Optional[SearchKey] = None,
+    ) -> Optional[List[SearchRow]]:
+        """Search the task descriptions of every project, one page at a time."""
+
+    def mark_task_complete(self, project_id: int, task_id: int) -> bool:
+        """Mark a task as completed; return whether a task was updated."""
+
+    def remove_task(self, project_id: int, task_id: int) -> bool:
+        """Delete a task; return whether a task was deleted."""
+
+    def move_tasks(
+        self,
+        project_id: int,
+        task_ids: Optional[Sequence[int]],
+        target_id: int,
+        *,
+        status_filter: str = 'all',
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> Optional[MoveResult]:
+        """Move matching tasks to another project, all or none of the IDs."""
+
+    def copy_project(self, project_id: int, project_name: str) -> Optional[int]:
+        """Copy a project and its tasks; return the new project's ID."""
+
+    def add_dependency(self, project_id: int, task_id: int, depends_on_id: int) -> bool:
+        """Record a dependency; return whether it was added."""
+
+    def list_dependencies(self, project_id: int) -> Optional[List[Tuple[int, int]]]:
+        """List a project's ``(task_id, depends_on_id)`` dependency edges."""
+
+    def add_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Tag a task; return whether the task exists."""
+
+    def remove_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Remove tags from a task; return whether the task exists."""
+
+    def list_tags(self, project_id: int) -> Optional[List[Tuple[int, str]]]:
+        """List a project's ``(task_id, tag)`` pairs."""
+
+    def task_flow(
+        self, project_id: int, start_day: int, end_day: int
+    ) -> Optional[List[FlowRow]]:
+        """Count a project's tasks created, completed and open per day."""
+
+    def task_ages(self, project_id: int, day: int) -> Optional[List[AgeRow]]:
+        """Count a project's open tasks by age at the end of a day."""
+
+    def list_history(
+        self,
+        project_id: int,
+        task_id: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Optional[List[HistoryEvent]]:
+        """List a project's audit log events ordered by event ID."""
+
+    def prune_history(self, cutoff: int) -> Optional[int]:
+        """Fold audit log events older than cutoff; return events deleted."""
@@ -0,0 +1,1154 @@
+"""SQLite persistence layer for Copilot Task Manager MCP.
+
+This module encapsulates every interaction with the SQLite database:
+connection management, schema initialization and CRUD operations on the
+``Projects``, ``Tasks``, ``TaskDependencies``, ``TaskTags`` and
+``TaskHistory`` tables, whose schema is versioned by :mod:`.migrations`.
+Every task mutation appends an event to the :mod:`.history` audit log in
+the same transaction. Database errors are logged and reported
+to callers as ``None`` or ``False`` so the tool layer can turn them into
+user-friendly messages.
+"""
+
+import contextlib
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..models import Project, Task
+from .analytics import AgeRow, FlowRow
+from .dates import decode_date, decode_timestamp, encode_date, now_seconds
+from .history import PRUNE_INTERVAL, HistoryEvent, encode_delta, plan_prune
+from .migrations import migrate
+from .search import SearchKey, SearchRow, fts_query
+from .store import MoveResult
+
+logger = logging.getLogger(__name__)
+
+TASK_COLUMNS = (
+    'task_id, project_id, description, status, priority, due_date, '
+    'created_at, updated_at'
+)
+
+VALID_STATUS_FILTERS = ('open', 'completed', 'all')
+
+# Dependencies between a task in temp.TaskCopy and one outside it.
+_SEVERED = (
+    'task_id IN (SELECT old_id FROM temp.TaskCopy) '
+    'AND depends_on_id NOT IN (SELECT old_id FROM temp.TaskCopy) '
+    'OR depends_on_id IN (SELECT old_id FROM temp.TaskCopy) '
+    'AND task_id NOT IN (SELECT old_id FROM temp.TaskCopy)'
+)
+
+
+def row_to_task(row: Any) -> Task:
+    """Convert a ``Tasks`` row selected with ``TASK_COLUMNS`` into a Task.
+
+    The integer-encoded due date and timestamps are decoded here.
+
+    Args:
+        row (Any): Row tuple in ``TASK_COLUMNS`` order.
+
+    Returns:
+        Task: The hydrated task.
+    """
+    return Task(
+        task_id=row[0],
+        project_id=row[1],
+        description=row[2],
+        status=row[3],
+        priority=row[4],
+        due_date=decode_date(row[5]),
+        created_at=decode_timestamp(row[6]),
+        updated_at=decode_timestamp(row[7]),
+    )
+
+
+class TaskDatabase:
+    """SQLite-backed storage for projects and tasks."""
+
+    def __init__(
+        self, db_path: str = 'tasks.db', *, history_retention: Optional[float] = None
+    ) -> None:
+        """Initialize the database wrapper.
+
+        The connection is opened lazily on first use so that creating a
+        server does not touch the filesystem.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file, or
+                ``':memory:'``. Defaults to 'tasks.db'.
+            history_retention (Optional[float], optional): Seconds of task
+                history kept in full; older events are folded on the first
+                write and then at most every PRUNE_INTERVAL seconds.
+                Defaults to None, keeping all history.
+
+        Raises:
+            ValueError: If history_retention is not positive.
+        """
+        if history_retention is not None and history_retention <= 0:
+            raise ValueError('History retention must be positive')
+        self.db_path = db_path
+        self.history_retention = history_retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_prune: Optional[float] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the open connection, connecting and initializing if needed.
+
+        Returns:
+            sqlite3.Connection: The database connection.
+        """
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database connection and migrate the schema if needed.
+
+        Returns:
+            sqlite3.Connection: A ready-to-use connection.
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA foreign_keys = ON')
+        migrate(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection if it is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def storage_files(self) -> List[str]:
+        """List the files the database persists data to.
+
+        Returns:
+            List[str]: The database file, or nothing for ``':memory:'``.
+        """
+        return [] if self.db_path == ':memory:' else [self.db_path]
+
+    def create_project(
+        self, project_name: str, project_id: Optional[int] = None
+    ) -> Optional[int]:
+        """Create a new project.
+
+        Args:
+            project_name (str): Unique name of the project.
+            project_id (Optional[int], optional): Explicit ID, used when IDs
+                are allocated elsewhere (e.g. by a shard catalog).
+                Defaults to None, letting SQLite assign one.
+
+        Returns:
+            Optional[int]: The new project ID, or None on failure.
+        """
+        try:
+            with self.connection as conn:
+                cursor = conn.execute(
+                    'INSERT INTO Projects (project_id, project_name, created_at) '
+                    'VALUES (?, ?, ?)',
+                    (project_id, project_name, now_seconds()),
+                )
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            logger.error(f"Failed to create project '{project_name}': {e}")
+            return None
+
+    def get_project_by_name(self, project_name: str) -> Optional[Project]:
+        """Look up a project by name.
+
+        Args:
+            project_name (str): Name of the project.
+
+        Returns:
+            Optional[Project]: The project, or None if not found or on error.
+        """
+        try:
+            row = self.connection.execute(
+                'SELECT project_id, project_name, created_at '
+                'FROM Projects WHERE project_name = ?',
+                (project_name,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to look up project '{project_name}': {e}")
+            return None
+        if row is None:
+            return None
+        return Project(
+            project_id=row[0],
+            project_name=row[1],
+            created_at=decode_timestamp(row[2]),
+        )
+
+    def add_task(
+        self,
+        project_id: int,
+        description: str,
+        priority: Optional[int] = None,
+        due_date: Optional[str] = None,
+    ) -> Optional[int]:
+        """Add a task to a project.
+
+        Args:
+            project_id (int): ID of the owning project.
+            description (str): Task description.
+            priority (Optional[int], optional): Task priority. Defaults to None.
+            due_date (Optional[str], optional): Due date (YYYY-MM-DD).
+                Defaults to None.
+
+        Returns:
+            Optional[int]: The new task ID, or None on failure.
+
+        Raises:
+            ValueError: If due_date is not in YYYY-MM-DD format.
+        """
+        now = now_seconds()
+        due_day = encode_date(due_date)
+        try:
+            with self.connection as conn:
+                cursor = conn.execute(
+                    'INSERT INTO Tasks (project_id, description, priority, due_date, '
+                    'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                    (project_id, description, priority, due_day, now, now),
+                )
+                task_id = cursor.lastrowid
+                assert task_id is not None
+                delta = encode_delta({'d': description, 'p': priority, 'u': due_day})
+                self._record(conn, project_id, task_id, 'add', delta, now)
+            self._wrote()
+            return task_id
+        except sqlite3.Error as e:
+            logger.error(f'Failed to add task to project {project_id}: {e}')
+            return None
+
+    def get_task(self, project_id: int, task_id: int) -> Optional[Task]:
+        """Fetch a task of a project by ID.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            Optional[Task]: The task, or None if not found or on error.
+        """
+        try:
+            row = self.connection.execute(
+                f'SELECT {TASK_COLUMNS} FROM Tasks '
+                'WHERE project_id = ? AND task_id = ?',
+                (project_id, task_id),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to fetch task {task_id}: {e}')
+            return None
+        return row_to_task(row) if row is not None else None
+
+    def list_tasks(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Task]]:
+        """List the tasks of a project.
+
+        Args:
+            project_id (int): ID of the project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+
+        Returns:
+            Optional[List[Task]]: Tasks ordered by ID, or None on error.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        rows = self.list_task_rows(project_id, status_filter)
+        return None if rows is None else [row_to_task(row) for row in rows]
+
+    def list_task_rows(
+        self, project_id: int, status_filter: str = 'open'
+    ) -> Optional[List[Tuple[Any, ...]]]:
+        """List the raw rows of a project's tasks without hydrating them.
+
+        Args:
+            project_id (int): ID of the project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+
+        Returns:
+            Optional[List[Tuple[Any, ...]]]: Rows in ``TASK_COLUMNS`` order,
+                with dates and timestamps still integer-encoded, ordered by
+                ID, or None on error.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        query = f'SELECT {TASK_COLUMNS} FROM Tasks WHERE project_id = ?'
+        params: List[Any] = [project_id]
+        if status_filter != 'all':
+            query += ' AND status = ?'
+            params.append(status_filter)
+        query += ' ORDER BY task_id'
+        try:
+            return self.connection.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to list tasks for project {project_id}: {e}')
+            return None
+
+    def find_tasks_by_description(
+        self, project_id: int, fragment: str
+    ) -> Optional[List[Task]]:
+        """Find tasks whose description contains a fragment.
+
+        Matching is case-insensitive for ASCII characters.
+
+        Args:
+            project_id (int): ID of the project.
+            fragment (str): Part of the task description.
+
+        Returns:
+            Optional[List[Task]]: Matching tasks ordered by ID, or None on error.
+        """
+        escaped = fragment.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        try:
+            rows = self.connection.execute(
+                f'SELECT {TASK_COLUMNS} FROM Tasks '
+                "WHERE project_id = ? AND description LIKE ? ESCAPE '\\' "
+                'ORDER BY task_id',
+                (project_id, f'%{escaped}%'),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to search tasks in project {project_id}: {e}')
+            return None
+        return [row_to_task(row) for row in rows]
+
+    def search_tasks(
+        self,
+        terms: Sequence[str],
+        status_filter: str = 'open',
+        limit: int = 50,
+        after: Optional[SearchKey] = None,
+    ) -> Optional[List[SearchRow]]:
+        """Search the task descriptions of every project.
+
+        A single query over the ``TaskSearch`` full-text index; see
+        :mod:`.search` for the matching rules.
+
+        Args:
+            terms (Sequence[str]): Words produced by ``search_terms``.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+            limit (int, optional): Maximum number of matches. Defaults to 50.
+            after (Optional[SearchKey], optional): ``(project_id, task_id)``
+                of the last match of the previous page. Defaults to None.
+
+        Returns:
+            Optional[List[SearchRow]]: Project name and raw task row of each
+                match, ordered by project ID and task ID, or None on error.
+
+        Raises:
+            ValueError: If status_filter is invalid.
+        """
+        if status_filter not in VALID_STATUS_FILTERS:
+            raise ValueError(f"Invalid status filter '{status_filter}'")
+        if not terms:
+            return []
+        columns = ', '.join(f't.{column}' for column in TASK_COLUMNS.split(', '))
+        query = (
+            f'SELECT p.project_name, {columns} FROM TaskSearch '
+            'JOIN Tasks t ON t.task_id = TaskSearch.rowid '
+            'JOIN Projects p ON p.project_id = t.project_id '
+            'WHERE TaskSearch MATCH ?'
+        )
+        params: List[Any] = [fts_query(terms)]
+        if status_filter != 'all':
+            query += ' AND t.status = ?'
+            params.append(status_filter)
+        if after is not None:
+            query += ' AND (t.project_id, t.task_id) > (?, ?)'
+            params.extend(after)
+        query += ' ORDER BY t.project_id, t.task_id LIMIT ?'
+        params.append(limit)
+        try:
+            return self.connection.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to search tasks: {e}')
+            return None
+
+    def mark_task_complete(self, project_id: int, task_id: int) -> bool:
+        """Mark a task of a project as completed.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            bool: True if a task was updated, False otherwise.
+        """
+        try:
+            with self.connection as conn:
+                cursor = conn.execute(
+                    "UPDATE Tasks SET status = 'completed' "
+                    'WHERE project_id = ? AND task_id = ?',
+                    (project_id, task_id),
+                )
+                if cursor.rowcount > 0:
+                    self._record(conn, project_id, task_id, 'complete')
+            self._wrote()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f'Failed to mark task {task_id} complete: {e}')
+            return False
+
+    def remove_task(self, project_id: int, task_id: int) -> bool:
+        """Delete a task of a project.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+
+        Returns:
+            bool: True if a task was deleted, False otherwise.
+        """
+        try:
+            with self.connection as conn:
+                cursor = conn.execute(
+                    'DELETE FROM Tasks WHERE project_id = ? AND task_id = ?',
+                    (project_id, task_id),
+                )
+                if cursor.rowcount > 0:
+                    self._record(conn, project_id, task_id, 'remove')
+            self._wrote()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f'Failed to remove task {task_id}: {e}')
+            return False
+
+    def move_tasks(
+        self,
+        project_id: int,
+        task_ids: Optional[Sequence[int]],
+        target_id: int,
+        *,
+        status_filter: str = 'all',
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+        target: Optional['TaskDatabase'] = None,
+    ) -> Optional[MoveResult]:
+        """Move the matching tasks of a project to another project.
+
+        The tasks keep their timestamps, tags and the dependencies among
+        them; dependencies between moved and remaining tasks are dropped.
+        The source project's audit log gets a ``remove`` event and the
+        target's a ``baseline`` event per task. The task IDs are checked,
+        the tasks selected and each table changed by one set-based
+        statement, all in one transaction.
+
+        Args:
+            project_id (int): ID of the project owning the tasks.
+            task_ids (Optional[Sequence[int]]): IDs of the tasks to move; if
+                any is not a task of the project, nothing is moved. None
+                selects every task of the project.
+            target_id (int): ID of the receiving project.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'all'.
+            all_of (Sequence[str], optional): Tags a task must all have.
+                Defaults to none.
+            any_of (Sequence[str], optional): Tags of which a task must have
+                at least one. Defaults to none.
+            none_of (Sequence[str], optional): Tags a task must not have.
+                Defaults to none.
+            target (Optional[TaskDatabase], optional): Database holding the
+                receiving project, if another file. It is attached for the
+                transaction and the tasks get new IDs in it. Defaults to
+                None, moving the tasks within this database under their IDs.
+
+        Returns:
+            Optional[MoveResult]: The moved task IDs, the dropped
+                dependencies and any missing task IDs, or None on error.
+        """
+        ids = None if task_ids is None else json.dumps(list(task_ids))
+        try:
+            with self._attached(target) as schema:
+                with self.connection as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    if ids is not None:
+                        missing = [
+                            row[0]
+                            for row in conn.execute(
+                                'SELECT DISTINCT value FROM json_each(?) '
+                                'WHERE value NOT IN (SELECT task_id FROM main.Tasks '
+                                'WHERE project_id = ?) ORDER BY value',
+                                (ids, project_id),
+                            )
+                        ]
+                        if missing:
+                            return MoveResult(missing=missing)
+                    at = now_seconds()
+                    pairs = self._select_tasks(
+                        conn,
+                        project_id,
+                        ids,
+                        None if schema == 'main' else schema,
+                        status_filter=status_filter,
+                        all_of=all_of,
+                        any_of=any_of,
+                        none_of=none_of,
+                    )
+                    self._record_removals(conn, project_id, at)
+                    dropped = conn.execute(
+                        'SELECT task_id, depends_on_id FROM main.TaskDependencies '
+                        f'WHERE {_SEVERED} ORDER BY task_id, depends_on_id'
+                    ).fetchall()
+                    if schema == 'main':
+                        conn.execute(f'DELETE FROM TaskDependencies WHERE {_SEVERED}')
+                        conn.execute(
+                            'UPDATE Tasks SET project_id = ? '
+                            'WHERE task_id IN (SELECT old_id FROM temp.TaskCopy)',
+                            (target_id,),
+                        )
+                    else:
+                        self._copy_tasks(conn, schema, target_id)
+                        conn.execute(
+                            'DELETE FROM main.Tasks '
+                            'WHERE task_id IN (SELECT old_id FROM temp.TaskCopy)'
+                        )
+                    self._record_baselines(conn, schema, target_id, at)
+            self._wrote()
+            return MoveResult(pairs, dropped)
+        except sqlite3.Error as e:
+            logger.error(
+                f'Failed to move tasks of project {project_id} to {target_id}: {e}'
+            )
+            return None
+
+    def copy_project(
+        self,
+        project_id: int,
+        project_name: str,
+        new_project_id: Optional[int] = None,
+        *,
+        target: Optional['TaskDatabase'] = None,
+    ) -> Optional[int]:
+        """Create a project holding a copy of every task of another one.
+
+        The copies get new IDs and timestamps and keep the status,
+        priority, due date, tags and dependencies of the originals. Each
+        copied task gets a ``baseline`` audit log event. Each table is
+        changed by one set-based statement, all in one transaction.
+
+        Args:
+            project_id (int): ID of the project to copy.
+            project_name (str): Unique name of the new project.
+            new_project_id (Optional[int], optional): Explicit ID of the new
+                project, see :meth:`create_project`. Defaults to None.
+            target (Optional[TaskDatabase], optional): Database the new
+                project is created in, if another file. It is attached for
+                the transaction. Defaults to None, using this database.
+
+        Returns:
+            Optional[int]: The new project ID, or None if the project does
+                not exist or on failure.
+        """
+        try:
+            with self._attached(target) as schema:
+                with self.connection as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    at = now_seconds()
+                    cursor = conn.execute(
+                        f'INSERT INTO {schema}.Projects '
+                        '(project_id, project_name, created_at) '
+                        'SELECT ?, ?, ? FROM main.Projects WHERE project_id = ?',
+                        (new_project_id, project_name, at, project_id),
+                    )
+                    if cursor.rowcount == 0:
+                        logger.error(f'Failed to copy project {project_id}: not found')
+                        return None
+                    copy_id = cursor.lastrowid
+                    assert copy_id is not None
+                    self._select_tasks(conn, project_id, None, schema)
+                    self._copy_tasks(conn, schema, copy_id, at)
+                    self._record_baselines(conn, schema, copy_id, at)
+            self._wrote()
+            return copy_id
+        except sqlite3.Error as e:
+            logger.error(
+                f"Failed to copy project {project_id} to '{project_name}': {e}"
+            )
+            return None
+
+    def add_dependency(self, project_id: int, task_id: int, depends_on_id: int) -> bool:
+        """Record that a task depends on another task of the same project.
+
+        Args:
+            project_id (int): ID of the project owning both tasks.
+            task_id (int): ID of the dependent task.
+            depends_on_id (int): ID of the prerequisite task.
+
+        Returns:
+            bool: True if the dependency was added, False if it already
+                exists, a task is not in the project, or on error.
+        """
+        try:
+            with self.connection as conn:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO TaskDependencies (task_id, depends_on_id) '
+                    'SELECT t.task_id, d.task_id FROM Tasks t, Tasks d '
+                    'WHERE t.project_id = ? AND t.task_id = ? '
+                    'AND d.project_id = ? AND d.task_id = ?',
+                    (project_id, task_id, project_id, depends_on_id),
+                )
+                if cursor.rowcount > 0:
+                    delta = encode_delta({'o': depends_on_id})
+                    self._record(conn, project_id, task_id, 'depend', delta)
+            self._wrote()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f'Failed to add dependency {task_id} -> {depends_on_id}: {e}')
+            return False
+
+    def list_dependencies(self, project_id: int) -> Optional[List[Tuple[int, int]]]:
+        """List the dependency edges between a project's tasks.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: ``(task_id, depends_on_id)``
+                pairs, or None on error.
+        """
+        try:
+            return self.connection.execute(
+                'SELECT d.task_id, d.depends_on_id FROM TaskDependencies d '
+                'JOIN Tasks t ON t.task_id = d.task_id WHERE t.project_id = ? '
+                'ORDER BY d.task_id, d.depends_on_id',
+                (project_id,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to list dependencies of project {project_id}: {e}')
+            return None
+
+    def add_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Tag a task of a project. Tags the task already has are ignored.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+            tags (Sequence[str]): Tags to add.
+
+        Returns:
+            bool: True if the task exists, False if not or on error.
+        """
+        try:
+            with self.connection as conn:
+                if not self._owns_task(conn, project_id, task_id):
+                    return False
+                added = [
+                    tag
+                    for tag in tags
+                    if conn.execute(
+                        'INSERT OR IGNORE INTO TaskTags (task_id, tag) VALUES (?, ?)',
+                        (task_id, tag),
+                    ).rowcount
+                ]
+                if added:
+                    delta = encode_delta({'t': added})
+                    self._record(conn, project_id, task_id, 'tag', delta)
+            self._wrote()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f'Failed to tag task {task_id}: {e}')
+            return False
+
+    def remove_tags(self, project_id: int, task_id: int, tags: Sequence[str]) -> bool:
+        """Remove tags from a task of a project. Missing tags are ignored.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+            tags (Sequence[str]): Tags to remove.
+
+        Returns:
+            bool: True if the task exists, False if not or on error.
+        """
+        try:
+            with self.connection as conn:
+                if not self._owns_task(conn, project_id, task_id):
+                    return False
+                removed = [
+                    tag
+                    for tag in tags
+                    if conn.execute(
+                        'DELETE FROM TaskTags WHERE task_id = ? AND tag = ?',
+                        (task_id, tag),
+                    ).rowcount
+                ]
+                if removed:
+                    delta = encode_delta({'t': removed})
+                    self._record(conn, project_id, task_id, 'untag', delta)
+            self._wrote()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f'Failed to untag task {task_id}: {e}')
+            return False
+
+    def list_tags(self, project_id: int) -> Optional[List[Tuple[int, str]]]:
+        """List the tags of a project's tasks.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            Optional[List[Tuple[int, str]]]: ``(task_id, tag)`` pairs ordered
+                by task ID and tag, or None on error.
+        """
+        try:
+            return self.connection.execute(
+                'SELECT g.task_id, g.tag FROM TaskTags g '
+                'JOIN Tasks t ON t.task_id = g.task_id WHERE t.project_id = ? '
+                'ORDER BY g.task_id, g.tag',
+                (project_id,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to list tags of project {project_id}: {e}')
+            return None
+
+    def task_flow(
+        self, project_id: int, start_day: int, end_day: int
+    ) -> Optional[List[FlowRow]]:
+        """Count the tasks of a project created and completed per day.
+
+        Aggregates the ``TaskFlow`` rollup; a window sum turns the daily
+        balance into the open tasks at the end of each day.
+
+        Args:
+            project_id (int): ID of the project.
+            start_day (int): First day of the range, in days since the epoch.
+            end_day (int): Last day of the range.
+
+        Returns:
+            Optional[List[FlowRow]]: Flow rows ordered by day, see
+                :mod:`.analytics`, or None on error.
+        """
+        try:
+            return self.connection.execute(
+                """
+                WITH changes(day, created, completed) AS (
+                    SELECT MAX(created_day, :start_day - 1), SUM(tasks), 0
+                    FROM TaskFlow
+                    WHERE project_id = :project_id AND created_day <= :end_day
+                    GROUP BY 1
+                    UNION ALL
+                    SELECT MAX(completed_day, :start_day - 1), 0, SUM(tasks)
+                    FROM TaskFlow
+                    WHERE project_id = :project_id AND completed_day <= :end_day
+                    GROUP BY 1
+                )
+                SELECT day, SUM(created), SUM(completed),
+                    SUM(SUM(created) - SUM(completed)) OVER (ORDER BY day)
+                FROM changes GROUP BY day
+                HAVING SUM(created) != 0 OR SUM(completed) != 0
+                ORDER BY day
+                """,
+                {'project_id': project_id, 'start_day': start_day, 'end_day': end_day},
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to count task flow of project {project_id}: {e}')
+            return None
+
+    def task_ages(self, project_id: int, day: int) -> Optional[List[AgeRow]]:
+        """Count the open tasks of a project by age at the end of a day.
+
+        Aggregates the ``TaskFlow`` rollup; a window sum adds the running
+        total.
+
+        Args:
+            project_id (int): ID of the project.
+            day (int): Day the ages are taken at, in days since the epoch.
+
+        Returns:
+            Optional[List[AgeRow]]: Age rows ordered by age, see
+                :mod:`.analytics`, or None on error.
+        """
+        try:
+            return self.connection.execute(
+                """
+                SELECT :day - created_day, SUM(tasks),
+                    SUM(SUM(tasks)) OVER (ORDER BY created_day DESC)
+                FROM TaskFlow
+                WHERE project_id = :project_id AND created_day <= :day
+                    AND completed_day > :day
+                GROUP BY created_day HAVING SUM(tasks) > 0
+                ORDER BY created_day DESC
+                """,
+                {'project_id': project_id, 'day': day},
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to age tasks of project {project_id}: {e}')
+            return None
+
+    def list_history(
+        self,
+        project_id: int,
+        task_id: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Optional[List[HistoryEvent]]:
+        """List the audit log events of a project or one of its tasks.
+
+        Args:
+            project_id (int): ID of the project.
+            task_id (Optional[int], optional): Only events of this task,
+                which may since have been removed. Defaults to None.
+            until (Optional[int], optional): Only events at or before this
+                time, in epoch seconds. Defaults to None.
+
+        Returns:
+            Optional[List[HistoryEvent]]: Events ordered by event ID, or
+                None on error.
+        """
+        query = (
+            'SELECT event_id, task_id, at, action, delta FROM TaskHistory '
+            'WHERE project_id = ?'
+        )
+        params: List[Any] = [project_id]
+        if task_id is not None:
+            query += ' AND task_id = ?'
+            params.append(task_id)
+        if until is not None:
+            query += ' AND at <= ?'
+            params.append(until)
+        try:
+            return self.connection.execute(
+                query + ' ORDER BY event_id', params
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to list history of project {project_id}: {e}')
+            return None
+
+    def prune_history(self, cutoff: int) -> Optional[int]:
+        """Fold the audit log events older than a cutoff.
+
+        See :func:`.history.plan_prune`.
+
+        Args:
+            cutoff (int): Events before this time, in epoch seconds, are
+                folded.
+
+        Returns:
+            Optional[int]: Number of events deleted, or None on error.
+        """
+        try:
+            with self.connection as conn:
+                by_project: Dict[int, List[HistoryEvent]] = {}
+                for project_id, *event in conn.execute(
+                    'SELECT project_id, event_id, task_id, at, action, delta '
+                    'FROM TaskHistory WHERE at < ? ORDER BY project_id, event_id',
+                    (cutoff,),
+                ):
+                    by_project.setdefault(project_id, []).append(tuple(event))
+                count = 0
+                for project_id, events in by_project.items():
+                    deleted, rewrites = plan_prune(events)
+                    conn.executemany(
+                        'DELETE FROM TaskHistory '
+                        'WHERE project_id = ? AND event_id = ?',
+                        [(project_id, event_id) for event_id in deleted],
+                    )
+                    conn.executemany(
+                        'UPDATE TaskHistory SET at = ?, action = ?, delta = ? '
+                        'WHERE project_id = ? AND event_id = ?',
+                        [
+                            (at, action, delta, project_id, event_id)
+                            for event_id, at, action, delta in rewrites
+                        ],
+                    )
+                    count += len(deleted)
+            return count
+        except sqlite3.Error as e:
+            logger.error(f'Failed to prune task history: {e}')
+            return None
+
+    @staticmethod
+    def _record(
+        conn: sqlite3.Connection,
+        project_id: int,
+        task_id: int,
+        action: str,
+        delta: Optional[str] = None,
+        at: Optional[int] = None,
+    ) -> None:
+        """Append an audit log event inside the caller's transaction.
+
+        Args:
+            conn (sqlite3.Connection): Connection with an open transaction.
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the changed task.
+            action (str): One of ``history.ACTIONS``.
+            delta (Optional[str], optional): Encoded changed fields.
+                Defaults to None.
+            at (Optional[int], optional): Time of the change in epoch
+                seconds. Defaults to None, meaning now.
+        """
+        conn.execute(
+            'INSERT INTO TaskHistory '
+            '(project_id, event_id, task_id, at, action, delta) '
+            'SELECT ?1, COALESCE(MAX(event_id), 0) + 1, ?2, ?3, ?4, ?5 '
+            'FROM TaskHistory WHERE project_id = ?1',
+            (project_id, task_id, now_seconds() if at is None else at, action, delta),
+        )
+
+    @contextlib.contextmanager
+    def _attached(self, other: Optional['TaskDatabase']) -> Iterator[str]:
+        """Attach another database file to the connection while in use.
+
+        Args:
+            other (Optional[TaskDatabase]): Database to attach. None or this
+                database attaches nothing.
+
+        Yields:
+            str: Schema name of the other database, 'main' if it is this one.
+        """
+        if other is None or other is self:
+            yield 'main'
+            return
+        other.connection  # Opening the other database migrates it.
+        conn = self.connection
+        conn.execute('ATTACH DATABASE ? AS target', (other.db_path,))
+        try:
+            yield 'target'
+        finally:
+            conn.execute('DETACH DATABASE target')
+
+    @staticmethod
+    def _select_tasks(
+        conn: sqlite3.Connection,
+        project_id: int,
+        task_ids: Optional[str],
+        renumber_in: Optional[str],
+        *,
+        status_filter: str = 'all',
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> List[Tuple[int, int]]:
+        """Fill the ``temp.TaskCopy`` table with the tasks to move or copy.
+
+        Args:
+            conn (sqlite3.Connection): Connection with an open transaction.
+            project_id (int): ID of the project owning the tasks.
+            task_ids (Optional[str]): JSON array of the task IDs, or None for
+                every task of the project.
+            renumber_in (Optional[str]): Schema the tasks get new IDs in,
+                following its ``Tasks`` sequence, or None to keep their IDs.
+            status_filter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'all'.
+            all_of (Sequence[str], optional): Tags a task must all have.
+                Defaults to none.
+            any_of (Sequence[str], optional): Tags of which a task must have
+                at least one. Defaults to none.
+            none_of (Sequence[str], optional): Tags a task must not have.
+                Defaults to none.
+
+        Returns:
+            List[Tuple[int, int]]: ``(old_id, new_id)`` pairs ordered by ID.
+        """
+        conn.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS TaskCopy '
+            '(old_id INTEGER PRIMARY KEY, new_id INTEGER NOT NULL)'
+        )
+        conn.execute('DELETE FROM temp.TaskCopy')
+        params: Dict[str, Any] = {'project_id': project_id, 'task_ids': task_ids}
+        new_id = 'task_id'
+        if renumber_in is not None:
+            row = conn.execute(
+                f'SELECT seq FROM {renumber_in}.sqlite_sequence ' "WHERE name = 'Tasks'"
+            ).fetchone()
+            params['base'] = row[0] if row is not None else 0
+            new_id = ':base + ROW_NUMBER() OVER (ORDER BY task_id)'
+        query = (
+            f'INSERT INTO temp.TaskCopy (old_id, new_id) SELECT task_id, {new_id} '
+            'FROM main.Tasks WHERE project_id = :project_id'
+        )
+        if task_ids is not None:
+            query += ' AND task_id IN (SELECT value FROM json_each(:task_ids))'
+        if status_filter != 'all':
+            params['status'] = status_filter
+            query += ' AND status = :status'
+        tagged = (
+            'task_id IN (SELECT task_id FROM main.TaskTags '
+            'WHERE tag IN (SELECT value FROM json_each(:{})))'
+        )
+        if all_of:
+            required = sorted(set(all_of))
+            params['all_of'] = json.dumps(required)
+            params['all_count'] = len(required)
+            query += (
+                ' AND task_id IN (SELECT task_id FROM main.TaskTags '
+                'WHERE tag IN (SELECT value FROM json_each(:all_of)) '
+                'GROUP BY task_id HAVING COUNT(*) = :all_count)'
+            )
+        if any_of:
+            params['any_of'] = json.dumps(list(any_of))
+            query += ' AND ' + tagged.format('any_of')
+        if none_of:
+            params['none_of'] = json.dumps(list(none_of))
+            query += ' AND NOT ' + tagged.format('none_of')
+        conn.execute(query, params)
+        return conn.execute(
+            'SELECT old_id, new_id FROM temp.TaskCopy ORDER BY old_id'
+        ).fetchall()
+
+    @staticmethod
+    def _copy_tasks(
+        conn: sqlite3.Connection, schema: str, project_id: int, at: Optional[int] = None
+    ) -> None:
+        """Copy the ``temp.TaskCopy`` tasks with their tags and dependencies.
+
+        Only dependencies among the copied tasks are copied.
+
+        Args:
+            conn (sqlite3.Connection): Connection with an open transaction.
+            schema (str): Schema the copies are written to.
+            project_id (int): ID of the project receiving the copies.
+            at (Optional[int], optional): Creation time of the copies in
+                epoch seconds. Defaults to None, keeping the originals'
+                timestamps.
+        """
+        conn.execute(
+            f'INSERT INTO {schema}.Tasks (task_id, project_id, description, status, '
+            'priority, due_date, created_at, updated_at) '
+            'SELECT c.new_id, :project_id, t.description, t.status, t.priority, '
+            't.due_date, COALESCE(:at, t.created_at), COALESCE(:at, t.updated_at) '
+            'FROM temp.TaskCopy c JOIN main.Tasks t ON t.task_id = c.old_id '
+            'ORDER BY c.old_id',
+            {'project_id': project_id, 'at': at},
+        )
+        conn.execute(
+            f'INSERT INTO {schema}.TaskTags (task_id, tag) '
+            'SELECT c.new_id, g.tag FROM temp.TaskCopy c '
+            'JOIN main.TaskTags g ON g.task_id = c.old_id'
+        )
+        conn.execute(
+            f'INSERT INTO {schema}.TaskDependencies (task_id, depends_on_id) '
+            'SELECT c.new_id, p.new_id FROM main.TaskDependencies d '
+            'JOIN temp.TaskCopy c ON c.old_id = d.task_id '
+            'JOIN temp.TaskCopy p ON p.old_id = d.depends_on_id'
+        )
+
+    @staticmethod
+    def _record_removals(conn: sqlite3.Connection, project_id: int, at: int) -> None:
+        """Append a ``remove`` event per ``temp.TaskCopy`` task.
+
+        Args:
+            conn (sqlite3.Connection): Connection with an open transaction.
+            project_id (int): ID of the project the tasks leave.
+            at (int): Time of the change in epoch seconds.
+        """
+        conn.execute(
+            'INSERT INTO TaskHistory '
+            '(project_id, event_id, task_id, at, action, delta) '
+            'SELECT :project_id, :base + ROW_NUMBER() OVER (ORDER BY old_id), '
+            "old_id, :at, 'remove', NULL FROM temp.TaskCopy",
+            {
+                'project_id': project_id,
+                'base': TaskDatabase._last_event_id(conn, 'main', project_id),
+                'at': at,
+            },
+        )
+
+    @staticmethod
+    def _record_baselines(
+        conn: sqlite3.Connection, schema: str, project_id: int, at: int
+    ) -> None:
+        """Append a ``baseline`` event per ``temp.TaskCopy`` task.
+
+        The deltas are built in SQL with the keys and order of
+        :func:`.history.fold`: unset fields, the open status and empty tag
+        and prerequisite lists are left out.
+
+        Args:
+            conn (sqlite3.Connection): Connection with an open transaction.
+            schema (str): Schema holding the tasks under their new IDs.
+            project_id (int): ID of the project now owning the tasks.
+            at (int): Time of the change in epoch seconds.
+        """
+        conn.execute(
+            f"""
+            INSERT INTO {schema}.TaskHistory
+                (project_id, event_id, task_id, at, action, delta)
+            SELECT :project_id, :base + ROW_NUMBER() OVER (ORDER BY t.task_id),
+                t.task_id, :at, 'baseline',
+                json_patch('{{}}', json_object(
+                    'd', t.description, 'p', t.priority, 'u', t.due_date,
+                    's', NULLIF(t.status, 'open'),
+                    'c', t.created_at, 'm', t.updated_at,
+                    't', json(NULLIF((
+                        SELECT json_group_array(tag) FROM (
+                            SELECT g.tag FROM {schema}.TaskTags g
+                            WHERE g.task_id = t.task_id ORDER BY g.tag
+                        )
+                    ), '[]')),
+                    'o', json(NULLIF((
+                        SELECT json_group_array(depends_on_id) FROM (
+                            SELECT d.depends_on_id FROM {schema}.TaskDependencies d
+                            WHERE d.task_id = t.task_id ORDER BY d.depends_on_id
+                        )
+                    ), '[]'))
+                ))
+            FROM temp.TaskCopy c JOIN {schema}.Tasks t ON t.task_id = c.new_id
+            """,
+            {
+                'project_id': project_id,
+                'base': TaskDatabase._last_event_id(conn, schema, project_id),
+                'at': at,
+            },
+        )
+
+    @staticmethod
+    def _last_event_id(conn: sqlite3.Connection, schema: str, project_id: int) -> int:
+        """Return the ID of a project's last audit log event.
+
+        Args:
+            conn (sqlite3.Connection): Open connection.
+            schema (str): Schema holding the audit log.
+            project_id (int): ID of the project.
+
+        Returns:
+            int: The event ID, or 0 if the project has no events.
+        """
+        event_id: int = conn.execute(
+            f'SELECT COALESCE(MAX(event_id), 0) FROM {schema}.TaskHistory '
+            'WHERE project_id = ?',
+            (project_id,),
+        ).fetchone()[0]
+        return event_id
+
+    def _wrote(self) -> None:
+        """Apply the history retention policy if a prune is due."""
+        if self.history_retention is None:
+            return
+        now = time.monotonic()
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        self.prune_history(now_seconds() - int(self.history_retention))
+
+    @staticmethod
+    def _owns_task(conn: sqlite3.Connection, project_id: int, task_id: int) -> bool:
+        """Check that a task belongs to a project.
+
+        Args:
+            conn (sqlite3.Connection): Open connection.
+            project_id (int): ID of the project.
+            task_id (int): ID of the task.
+
+        Returns:
+            bool: True if the task exists in the project.
+        """
+        row = conn.execute(
+            'SELECT 1 FROM Tasks WHERE project_id = ? AND task_id = ?',
+            (project_id, task_id),
+        ).fetchone()
+        return row is not None
@@ -0,0 +1,14 @@
+"""Initialize the indexes package."""
+
+from .dependencies import DependencyCycleError, DependencyGraph  # noqa: F401
+from .ordering import NextTaskIndex  # noqa: F401
+from .tags import TagIndex  # noqa: F401
+from .trigram import TrigramIndex  # noqa: F401
+
+__all__ = [
+    'DependencyCycleError',
+    'DependencyGraph',
+    'NextTaskIndex',
+    'TagIndex',
+    'TrigramIndex',
+]
@@ -0,0 +1,209 @@
+"""Dependency graph of a project's tasks with an incremental ready set.
+
+A task is *ready* when it is open and none of its prerequisites is open.
+:class:`DependencyGraph` keeps, for every open task, the number of open
+prerequisites blocking it, so completing or removing a task only touches
+its dependents (O(out-degree)) instead of re-deriving readiness for the
+whole project. New edges are checked for cycles with a search over the
+prerequisites reachable from the new prerequisite.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a new dependency would close a cycle."""
+
+    def __init__(self, path: List[int]) -> None:
+        """Initialize the error.
+
+        Args:
+            path (List[int]): Task IDs along the cycle, starting and ending
+                with the same task.
+        """
+        super().__init__(' -> '.join(str(task_id) for task_id in path))
+        self.path = path
+
+
+class DependencyGraph:
+    """Task dependencies of one project with incrementally tracked readiness."""
+
+    def __init__(
+        self,
+        tasks: Iterable[Tuple[int, bool]] = (),
+        edges: Iterable[Tuple[int, int]] = (),
+    ) -> None:
+        """Initialize the graph.
+
+        Args:
+            tasks (Iterable[Tuple[int, bool]], optional): Initial
+                ``(task_id, is_open)`` pairs. Defaults to empty.
+            edges (Iterable[Tuple[int, int]], optional): Initial
+                ``(task_id, depends_on_id)`` pairs between known tasks.
+                Defaults to empty.
+        """
+        self._prerequisites: Dict[int, Set[int]] = {}
+        self._dependents: Dict[int, Set[int]] = {}
+        self._open: Set[int] = set()
+        self._blockers: Dict[int, int] = {}
+        self._ready: Set[int] = set()
+        for task_id, is_open in tasks:
+            self.add_task(task_id, is_open)
+        for task_id, depends_on in edges:
+            self._link(task_id, depends_on)
+
+    def __contains__(self, task_id: object) -> bool:
+        """Return True if the task is in the graph."""
+        return task_id in self._prerequisites
+
+    def add_task(self, task_id: int, is_open: bool = True) -> None:
+        """Add a task without dependencies. Known IDs are ignored.
+
+        Args:
+            task_id (int): ID of the task.
+            is_open (bool, optional): Whether the task is open.
+                Defaults to True.
+        """
+        if task_id in self._prerequisites:
+            return
+        self._prerequisites[task_id] = set()
+        self._dependents[task_id] = set()
+        if is_open:
+            self._open.add(task_id)
+            self._blockers[task_id] = 0
+            self._ready.add(task_id)
+
+    def has_dependency(self, task_id: int, depends_on: int) -> bool:
+        """Return True if task_id directly depends on depends_on."""
+        return depends_on in self._prerequisites.get(task_id, ())
+
+    def prerequisites(self, task_id: int) -> List[int]:
+        """Return the direct prerequisites of a task, ordered by ID."""
+        return sorted(self._prerequisites.get(task_id, ()))
+
+    def add_dependency(self, task_id: int, depends_on: int) -> None:
+        """Make a task depend on another one.
+
+        Args:
+            task_id (int): ID of the dependent task.
+            depends_on (int): ID of the prerequisite task.
+
+        Raises:
+            KeyError: If either task is not in the graph.
+            DependencyCycleError: If the edge would close a cycle,
+                including a task depending on itself.
+        """
+        for known in (task_id, depends_on):
+            if known not in self._prerequisites:
+                raise KeyError(known)
+        path = self._path(depends_on, task_id)
+        if path is not None:
+            raise DependencyCycleError([task_id] + path)
+        self._link(task_id, depends_on)
+
+    def remove_dependency(self, task_id: int, depends_on: int) -> None:
+        """Drop a dependency edge. Unknown edges are ignored.
+
+        Args:
+            task_id (int): ID of the dependent task.
+            depends_on (int): ID of the prerequisite task.
+        """
+        prerequisites = self._prerequisites.get(task_id)
+        if prerequisites is None or depends_on not in prerequisites:
+            return
+        prerequisites.discard(depends_on)
+        self._dependents[depends_on].discard(task_id)
+        if depends_on in self._open and task_id in self._open:
+            self._blockers[task_id] -= 1
+            if self._blockers[task_id] == 0:
+                self._ready.add(task_id)
+
+    def complete(self, task_id: int) -> None:
+        """Mark a task as completed, unblocking its dependents.
+
+        Args:
+            task_id (int): ID of the task. Unknown or completed tasks are
+                ignored.
+        """
+        if task_id not in self._open:
+            return
+        self._open.discard(task_id)
+        self._ready.discard(task_id)
+        del self._blockers[task_id]
+        self._unblock_dependents(task_id)
+
+    def remove(self, task_id: int) -> None:
+        """Remove a task and its edges. Unknown IDs are ignored.
+
+        Args:
+            task_id (int): ID of the task.
+        """
+        if task_id not in self._prerequisites:
+            return
+        self.complete(task_id)
+        for prerequisite in self._prerequisites.pop(task_id):
+            self._dependents[prerequisite].discard(task_id)
+        for dependent in self._dependents.pop(task_id):
+            self._prerequisites[dependent].discard(task_id)
+
+    def ready(self) -> List[int]:
+        """Return the IDs of the ready tasks.
+
+        Returns:
+            List[int]: Open tasks without open prerequisites, ordered by ID.
+        """
+        return sorted(self._ready)
+
+    def _link(self, task_id: int, depends_on: int) -> None:
+        """Add an edge between known tasks and update readiness.
+
+        Args:
+            task_id (int): ID of the dependent task.
+            depends_on (int): ID of the prerequisite task.
+        """
+        prerequisites = self._prerequisites[task_id]
+        if depends_on in prerequisites:
+            return
+        prerequisites.add(depends_on)
+        self._dependents[depends_on].add(task_id)
+        if depends_on in self._open and task_id in self._open:
+            self._blockers[task_id] += 1
+            self._ready.discard(task_id)
+
+    def _unblock_dependents(self, task_id: int) -> None:
+        """Release the dependents of a task that is no longer open.
+
+        Args:
+            task_id (int): ID of the completed or removed task.
+        """
+        for dependent in self._dependents[task_id]:
+            if dependent in self._open:
+                self._blockers[dependent] -= 1
+                if self._blockers[dependent] == 0:
+                    self._ready.add(dependent)
+
+    def _path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Find a prerequisite path from one task to another.
+
+        Args:
+            start (int): Task to search from.
+            goal (int): Task to reach through prerequisites.
+
+        Returns:
+            Optional[List[int]]: Task IDs from start to goal, or None.
+        """
+        parents: Dict[int, int] = {start: start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            if current == goal:
+                path = [current]
+                while current != start:
+                    current = parents[current]
+                    path.append(current)
+                return path[::-1]
+            for prerequisite in self._prerequisites[current]:
+                if prerequisite not in parents:
+                    parents[prerequisite] = current
+                    stack.append(prerequisite)
+        return None
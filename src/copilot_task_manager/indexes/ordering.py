@@ -0,0 +1,102 @@
+"""Priority/due-date ordering of open tasks.
+
+:class:`NextTaskIndex` keeps the open tasks of a project in a sorted list
+keyed on ``(priority, due_date, task_id)``, so "what's next?" is a slice of
+the first k entries instead of a sort of the whole project. Adding and
+removing a task is a binary search plus a list insertion or deletion.
+
+Lower priority numbers come first (priority 1 is the most urgent), then
+earlier due dates. Tasks without a priority or due date sort after the
+ones that have them, and ties are broken by ascending task ID. Due dates
+are the integer day numbers stored by the database, so keys compare as
+plain numbers.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+OrderKey = Tuple[bool, int, bool, int, int]
+
+
+def order_key(
+    task_id: int, priority: Optional[int], due_date: Optional[int]
+) -> OrderKey:
+    """Compute the sort key of a task.
+
+    Args:
+        task_id (int): ID of the task.
+        priority (Optional[int]): Task priority; lower is more urgent.
+        due_date (Optional[int]): Due date as days since the epoch.
+
+    Returns:
+        OrderKey: Key placing missing priorities and due dates last.
+    """
+    return (
+        priority is None,
+        priority if priority is not None else 0,
+        due_date is None,
+        due_date if due_date is not None else 0,
+        task_id,
+    )
+
+
+class NextTaskIndex:
+    """Incrementally maintained ordering of a project's open tasks."""
+
+    def __init__(
+        self, items: Iterable[Tuple[int, Optional[int], Optional[int]]] = ()
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            items (Iterable[Tuple[int, Optional[int], Optional[int]]],
+                optional): Initial ``(task_id, priority, due_date)`` triples.
+                Defaults to empty.
+        """
+        keys = {task_id: order_key(task_id, p, d) for task_id, p, d in items}
+        self._keys: Dict[int, OrderKey] = keys
+        self._ordered: List[OrderKey] = sorted(keys.values())
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._keys)
+
+    def __contains__(self, task_id: object) -> bool:
+        """Return True if the task is indexed."""
+        return task_id in self._keys
+
+    def add(
+        self, task_id: int, priority: Optional[int], due_date: Optional[int]
+    ) -> None:
+        """Index a task, replacing any previous entry for the same ID.
+
+        Args:
+            task_id (int): ID of the task.
+            priority (Optional[int]): Task priority.
+            due_date (Optional[int]): Due date as days since the epoch.
+        """
+        self.remove(task_id)
+        key = order_key(task_id, priority, due_date)
+        self._keys[task_id] = key
+        insort(self._ordered, key)
+
+    def remove(self, task_id: int) -> None:
+        """Remove a task from the index. Unknown IDs are ignored.
+
+        Args:
+            task_id (int): ID of the task.
+        """
+        key = self._keys.pop(task_id, None)
+        if key is not None:
+            del self._ordered[bisect_left(self._ordered, key)]
+
+    def top(self, k: int) -> List[int]:
+        """Return the IDs of the k most urgent tasks.
+
+        Args:
+            k (int): Maximum number of tasks.
+
+        Returns:
+            List[int]: Task IDs, most urgent first.
+        """
+        return [key[-1] for key in self._ordered[: max(k, 0)]]
@@ -0,0 +1,192 @@
+"""Per-project tag index with bitmap set algebra.
+
+:class:`TagIndex` keeps, for every tag of a project, a bitmap of the tasks
+carrying it: a Python integer whose bit ``n`` is set when the task in slot
+``n`` has the tag. Slots are numbered per project and handed to tasks as
+they get their first tag, reusing the slots of tasks that lost their last
+one, so bitmaps are as wide as the number of tagged tasks of the project,
+however large the task IDs grow. Bitmaps take one bit per task instead of
+a set entry per task, and combining tags with AND, OR and NOT is a single
+word-wise integer operation per tag instead of a join per tag.
+
+:meth:`TagIndex.select` evaluates a filter of required, alternative and
+excluded tags into the set of matching task IDs, which callers intersect
+with the rows they list.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+def bitmap_members(bitmap: int) -> Set[int]:
+    """Return the positions of the set bits of a bitmap.
+
+    Args:
+        bitmap (int): Non-negative bitmap.
+
+    Returns:
+        Set[int]: Positions of the set bits, i.e. the task slots.
+    """
+    bits = bin(bitmap)[:1:-1]
+    return {position for position, bit in enumerate(bits) if bit == '1'}
+
+
+class TagIndex:
+    """Tags of one project's tasks as bitmaps of task slots keyed by tag."""
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()) -> None:
+        """Initialize the index.
+
+        Args:
+            items (Iterable[Tuple[int, str]], optional): Initial
+                ``(task_id, tag)`` pairs. Defaults to empty.
+        """
+        self._bitmaps: Dict[str, int] = {}
+        self._task_tags: Dict[int, Set[str]] = {}
+        self._slots: Dict[int, int] = {}
+        self._task_ids: List[int] = []
+        self._free_slots: List[int] = []
+        for task_id, tag in items:
+            self.add(task_id, tag)
+
+    def __len__(self) -> int:
+        """Return the number of distinct tags."""
+        return len(self._bitmaps)
+
+    def add(self, task_id: int, tag: str) -> bool:
+        """Tag a task.
+
+        Args:
+            task_id (int): ID of the task.
+            tag (str): Tag to add.
+
+        Returns:
+            bool: True if the task did not have the tag yet.
+        """
+        tags = self._task_tags.setdefault(task_id, set())
+        if tag in tags:
+            return False
+        tags.add(tag)
+        slot = self._slots.get(task_id)
+        if slot is None:
+            slot = self._take_slot(task_id)
+        self._bitmaps[tag] = self._bitmaps.get(tag, 0) | (1 << slot)
+        return True
+
+    def discard(self, task_id: int, tag: str) -> bool:
+        """Remove a tag from a task.
+
+        Args:
+            task_id (int): ID of the task.
+            tag (str): Tag to remove.
+
+        Returns:
+            bool: True if the task had the tag.
+        """
+        tags = self._task_tags.get(task_id)
+        if tags is None or tag not in tags:
+            return False
+        tags.discard(tag)
+        slot = self._slots[task_id]
+        if not tags:
+            del self._task_tags[task_id]
+            del self._slots[task_id]
+            self._free_slots.append(slot)
+        bitmap = self._bitmaps[tag] & ~(1 << slot)
+        if bitmap:
+            self._bitmaps[tag] = bitmap
+        else:
+            del self._bitmaps[tag]
+        return True
+
+    def remove(self, task_id: int) -> None:
+        """Remove every tag of a task. Unknown IDs are ignored.
+
+        Args:
+            task_id (int): ID of the task.
+        """
+        for tag in list(self._task_tags.get(task_id, ())):
+            self.discard(task_id, tag)
+
+    def tags_of(self, task_id: int) -> List[str]:
+        """Get the tags of a task.
+
+        Args:
+            task_id (int): ID of the task.
+
+        Returns:
+            List[str]: Tags in alphabetical order.
+        """
+        return sorted(self._task_tags.get(task_id, ()))
+
+    def tags(self) -> List[Tuple[str, int]]:
+        """List the tags in use with the number of tasks carrying each.
+
+        Returns:
+            List[Tuple[str, int]]: ``(tag, task count)`` pairs in
+                alphabetical order.
+        """
+        return [
+            (tag, bin(bitmap).count('1'))
+            for tag, bitmap in sorted(self._bitmaps.items())
+        ]
+
+    def select(
+        self,
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> Tuple[Optional[Set[int]], Set[int]]:
+        """Evaluate a tag filter.
+
+        Args:
+            all_of (Sequence[str], optional): Tags a task must all have.
+                Defaults to none.
+            any_of (Sequence[str], optional): Tags of which a task must have
+                at least one. Defaults to none.
+            none_of (Sequence[str], optional): Tags a task must not have.
+                Defaults to none.
+
+        Returns:
+            Tuple[Optional[Set[int]], Set[int]]: The task IDs matching the
+                required tags (None when no tag is required, meaning every
+                task) and the task IDs to exclude.
+        """
+        bitmaps = self._bitmaps
+        included: Optional[int] = None
+        for tag in all_of:
+            bitmap = bitmaps.get(tag, 0)
+            included = bitmap if included is None else included & bitmap
+        if any_of:
+            alternatives = 0
+            for tag in any_of:
+                alternatives |= bitmaps.get(tag, 0)
+            included = alternatives if included is None else included & alternatives
+        excluded = 0
+        for tag in none_of:
+            excluded |= bitmaps.get(tag, 0)
+        if included is not None:
+            return self._members(included & ~excluded), set()
+        return None, self._members(excluded)
+
+    def _take_slot(self, task_id: int) -> int:
+        """Give a task a bit position, reusing a free one if any.
+
+        Args:
+            task_id (int): ID of a task without tags.
+
+        Returns:
+            int: The task's bit position.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._task_ids[slot] = task_id
+        else:
+            slot = len(self._task_ids)
+            self._task_ids.append(task_id)
+        self._slots[task_id] = slot
+        return slot
+
+    def _members(self, bitmap: int) -> Set[int]:
+        """Return the IDs of the tasks whose slots are set in a bitmap."""
+        task_ids = self._task_ids
+        return {task_ids[slot] for slot in bitmap_members(bitmap)}
@@ -0,0 +1,128 @@
+"""Trigram index for ranked fuzzy matching of task descriptions.
+
+Each description is broken into lower-cased character trigrams per word
+(padded the same way as PostgreSQL's ``pg_trgm``) and stored in an inverted
+index. A query only touches the posting lists of its own trigrams, so
+ranking candidates costs time proportional to the matching tasks rather than
+to the whole project.
+"""
+
+import heapq
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Compute the trigram set of a piece of text.
+
+    Args:
+        text (str): Text to split into trigrams.
+
+    Returns:
+        FrozenSet[str]: Trigrams of every word, padded with two leading and
+            one trailing space.
+    """
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(first: str, second: str) -> float:
+    """Compute the trigram similarity between two strings.
+
+    Args:
+        first (str): First string.
+        second (str): Second string.
+
+    Returns:
+        float: Dice coefficient of the two trigram sets, between 0 and 1.
+    """
+    a, b = trigrams(first), trigrams(second)
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class TrigramIndex:
+    """Incrementally maintained inverted trigram index over task texts."""
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()) -> None:
+        """Initialize the index.
+
+        Args:
+            items (Iterable[Tuple[int, str]], optional): Initial
+                ``(task_id, description)`` pairs. Defaults to empty.
+        """
+        self._postings: Dict[str, Set[int]] = {}
+        self._grams: Dict[int, FrozenSet[str]] = {}
+        for task_id, text in items:
+            self.add(task_id, text)
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._grams)
+
+    def __contains__(self, task_id: object) -> bool:
+        """Return True if the task is indexed."""
+        return task_id in self._grams
+
+    def add(self, task_id: int, text: str) -> None:
+        """Index a task, replacing any previous entry for the same ID.
+
+        Args:
+            task_id (int): ID of the task.
+            text (str): Description to index.
+        """
+        self.remove(task_id)
+        grams = trigrams(text)
+        self._grams[task_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(task_id)
+
+    def remove(self, task_id: int) -> None:
+        """Remove a task from the index. Unknown IDs are ignored.
+
+        Args:
+            task_id (int): ID of the task.
+        """
+        grams = self._grams.pop(task_id, None)
+        if grams is None:
+            return
+        for gram in grams:
+            posting = self._postings[gram]
+            posting.discard(task_id)
+            if not posting:
+                del self._postings[gram]
+
+    def search(
+        self, query: str, limit: int = 5, min_score: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """Rank indexed tasks by trigram similarity to a query.
+
+        Args:
+            query (str): Free-text query, e.g. a misspelled description.
+            limit (int, optional): Maximum number of results. Defaults to 5.
+            min_score (float, optional): Minimum similarity for a result.
+                Defaults to 0.0.
+
+        Returns:
+            List[Tuple[int, float]]: ``(task_id, score)`` pairs, best first.
+                Ties are broken by ascending task ID.
+        """
+        query_grams = trigrams(query)
+        if not query_grams or limit <= 0:
+            return []
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for task_id in self._postings.get(gram, ()):
+                shared[task_id] = shared.get(task_id, 0) + 1
+        scored = []
+        for task_id, count in shared.items():
+            score = 2 * count / (len(query_grams) + len(self._grams[task_id]))
+            if score >= min_score:
+                scored.append((task_id, score))
+        return heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
@@ -1,12 +1,15 @@
 """Main entry point for running the Copilot Task Manager MCP server."""
 
+import argparse
 import asyncio
 import logging
 import signal
 import sys
-from typing import Any, Callable
+from typing import Any, Dict, List, Optional
 
-from .mcp_server import create_server
+from .health import DEFAULT_SLO_LOOP_LAG_MS, DEFAULT_SLO_P99_MS
+from .mcp_server import STORAGE_ENGINES, TaskManagerMCPServer, create_server
+from .traffic import TrafficRecorder
 
 
 def setup_logging() -> None:
@@ -17,54 +20,135 @@ def setup_logging() -> None:
     )
 
 
-def handle_shutdown(
-    server: Any, loop: asyncio.AbstractEventLoop
-) -> Callable[[Any, Any], None]:
-    """Create a shutdown handler.
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line.
 
     Args:
-        server: The MCP server instance.
-        loop: The asyncio event loop.
+        argv (Optional[List[str]], optional): Arguments without the program
+            name. Defaults to None, using sys.argv.
 
     Returns:
-        Callable: A signal handler function.
+        argparse.Namespace: The parsed options.
     """
+    parser = argparse.ArgumentParser(description='Task Manager MCP Server')
+    parser.add_argument('--storage', choices=STORAGE_ENGINES, default='sqlite')
+    parser.add_argument('--db-path', default='tasks.db')
+    parser.add_argument(
+        '--snapshot-path',
+        metavar='PATH',
+        help='JSON snapshot file loaded and saved by --storage memory '
+        '(default: keep data in memory only)',
+    )
+    parser.add_argument(
+        '--history-days',
+        type=float,
+        metavar='DAYS',
+        help='fold task history older than DAYS days (default: keep all)',
+    )
+    parser.add_argument(
+        '--slo-p99-ms',
+        type=float,
+        default=DEFAULT_SLO_P99_MS,
+        metavar='MS',
+        help='p99 tool call latency objective reported by getHealth '
+        '(default: %(default)g)',
+    )
+    parser.add_argument(
+        '--slo-loop-lag-ms',
+        type=float,
+        default=DEFAULT_SLO_LOOP_LAG_MS,
+        metavar='MS',
+        help='event loop lag objective reported by getHealth ' '(default: %(default)g)',
+    )
+    parser.add_argument(
+        '--record',
+        metavar='PATH',
+        help='write every incoming request and its arrival time to PATH',
+    )
+    return parser.parse_args(argv)
 
-    def _handler(*args: Any) -> None:
-        """Handle shutdown signals.
 
-        Args:
-            *args: Signal arguments (unused).
-        """
-        logging.info('Shutting down MCP server...')
-        asyncio.create_task(server.stop())
-        loop.stop()
-        sys.exit(0)
+async def serve(server: TaskManagerMCPServer) -> bool:
+    """Serve over stdio until the input ends or a stop signal arrives.
 
-    return _handler
+    SIGINT and SIGTERM cancel the server, which still releases its storage
+    on the way out, so pending writes and snapshots are not lost.
 
+    Args:
+        server (TaskManagerMCPServer): The server to run.
 
-def main() -> None:
-    """Run the MCP server."""
+    Returns:
+        bool: True if a stop signal ended the server.
+    """
+    loop = asyncio.get_running_loop()
+    serving = loop.create_task(server.serve_stdio())
+    stopped: List[int] = []
+
+    def handle_shutdown(signum: int) -> None:
+        stopped.append(signum)
+        serving.cancel()
+
+    def handle_signal(signum: int, frame: Any) -> None:
+        loop.call_soon_threadsafe(handle_shutdown, signum)
+
+    signals = (signal.SIGINT, signal.SIGTERM)
+    previous: Dict[int, Any] = {}
+    for signum in signals:
+        try:
+            loop.add_signal_handler(signum, handle_shutdown, signum)
+        except NotImplementedError:  # event loops on Windows
+            previous[signum] = signal.signal(signum, handle_signal)
+    try:
+        await serving
+    except asyncio.CancelledError:
+        if not stopped:
+            raise
+    finally:
+        for signum in signals:
+            if signum in previous:
+                signal.signal(signum, previous[signum])
+            else:
+                loop.remove_signal_handler(signum)
+    return bool(stopped)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the MCP server.
+
+    Args:
+        argv (Optional[List[str]], optional): Arguments without the program
+            name. Defaults to None, using sys.argv.
+    """
+    args = parse_args(argv)
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info('Starting Task Manager MCP Server...')
 
-    server = create_server()
-    loop = asyncio.get_event_loop()
-
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, handle_shutdown(server, loop))
-    signal.signal(signal.SIGTERM, handle_shutdown(server, loop))
+    server = create_server(
+        storage=args.storage,
+        db_path=args.db_path,
+        snapshot_path=args.snapshot_path,
+        history_retention_days=args.history_days,
+        slo_p99_ms=args.slo_p99_ms,
+        slo_loop_lag_ms=args.slo_loop_lag_ms,
+    )
+    recorder = None
+    if args.record:
+        recorder = TrafficRecorder(args.record)
+        recorder.install(server.mcp)
+        logger.info(f'Recording requests to {args.record}')
 
     try:
-        loop.run_until_complete(server.start())
-        loop.run_forever()
+        if asyncio.run(serve(server)):
+            logger.info('Shutting down MCP server...')
+    except KeyboardInterrupt:
+        logger.info('Shutting down MCP server...')
     except Exception as e:
         logger.error(f'Server error: {e}')
         sys.exit(1)
     finally:
-        loop.close()
+        if recorder is not None:
+            recorder.close()
 
 
 if __name__ == '__main__':
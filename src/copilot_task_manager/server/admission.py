@@ -0,0 +1,452 @@
+"""Admission control for tool calls: load shedding and per-client rate limits.
+
+Every tool call passes through an :class:`AdmissionController` before it
+runs. The controller
+
+* rate-limits each client with a token bucket, so one runaway agent loop
+  cannot crowd out the others,
+* runs at most ``max_concurrent`` calls at a time and queues at most
+  ``max_queue`` more, so waiting calls cannot fill memory,
+* serves queued reads before queued writes, and when the queue is full
+  lets an arriving read displace the newest queued write.
+
+A call may also have to wait for its turn among its session's earlier
+calls (see :mod:`.call_order`). :meth:`AdmissionController.slot` takes that
+turn as ``turn`` and checks the rate and queue bound before waiting for it,
+so calls waiting for their turn count as queued and are shed like any
+other queued call.
+
+Calls that are not admitted fail fast with :class:`ServerBusy`, which
+carries a retry hint the tool layer reports as
+``'Error: Server busy, retry after N ms.'``.
+
+Clients without a client ID are identified by their session, which gets a
+random ID on first sight. Objects keeping per-session state register with
+:func:`watch_sessions` to have it discarded when the session is gone.
+"""
+
+import asyncio
+import time
+import uuid
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Protocol,
+)
+
+from fastmcp.server.dependencies import get_context
+
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_CLIENT_RATE = 20.0
+DEFAULT_CLIENT_BURST = 40
+
+# Buckets of idle clients are dropped once this many clients are tracked.
+MAX_TRACKED_CLIENTS = 1024
+
+# Service time assumed for retry hints before any call has completed.
+INITIAL_SERVICE_SECONDS = 0.01
+
+
+class SessionState(Protocol):
+    """State kept per client session."""
+
+    def discard(self, session_id: str) -> None:
+        """Forget the state of a session that is gone."""
+
+
+_session_ids: 'weakref.WeakKeyDictionary[Any, str]' = weakref.WeakKeyDictionary()
+_session_states: 'weakref.WeakSet[SessionState]' = weakref.WeakSet()
+
+
+def watch_sessions(state: SessionState) -> None:
+    """Discard a session's entries in an object once the session is gone.
+
+    Only a weak reference to the object is kept.
+
+    Args:
+        state (SessionState): Object keeping state per session ID.
+    """
+    _session_states.add(state)
+
+
+def session_id(session: Any) -> str:
+    """Get the stable ID of a session object.
+
+    Unlike the object's address, the ID is never reused by a later session.
+
+    Args:
+        session (Any): The MCP session.
+
+    Returns:
+        str: ``'session-'`` and a random hex string, the same for the
+            lifetime of the session.
+    """
+    key = _session_ids.get(session)
+    if key is None:
+        key = f'session-{uuid.uuid4().hex}'
+        _session_ids[session] = key
+        weakref.finalize(session, _session_ended, key)
+    return key
+
+
+def _session_ended(key: str) -> None:
+    """Discard the state of a garbage-collected session."""
+    for state in list(_session_states):
+        state.discard(key)
+
+
+def current_client_id() -> str:
+    """Identify the client making the current MCP request.
+
+    Returns:
+        str: The client ID sent in the request metadata, else the ID of the
+            client's session, else ``'local'`` outside an MCP request.
+    """
+    try:
+        context = get_context()
+        return context.client_id or session_id(context.session)
+    except (LookupError, RuntimeError, ValueError):
+        return 'local'
+
+
+class ServerBusy(Exception):
+    """Raised when a call is shed or rate-limited."""
+
+    def __init__(self, retry_after_ms: int) -> None:
+        """Initialize the error.
+
+        Args:
+            retry_after_ms (int): Suggested wait before retrying, in ms.
+        """
+        super().__init__(f'Server busy, retry after {retry_after_ms} ms.')
+        self.retry_after_ms = retry_after_ms
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: int, now: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens.
+            now (float): Current clock reading in seconds.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take one token if available.
+
+        Args:
+            now (float): Current clock reading in seconds.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise the seconds until one
+                becomes available.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Return True if the bucket would be full at the given time."""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class AdmissionController:
+    """Bounded admission queue with per-client token-bucket rate limits."""
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        client_rate: Optional[float] = DEFAULT_CLIENT_RATE,
+        client_burst: int = DEFAULT_CLIENT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            max_concurrent (int, optional): Calls allowed to run at once.
+                Defaults to DEFAULT_MAX_CONCURRENT.
+            max_queue (int, optional): Calls allowed to wait for a slot;
+                0 sheds every call that cannot run immediately.
+                Defaults to DEFAULT_MAX_QUEUE.
+            client_rate (Optional[float], optional): Sustained calls per
+                second allowed per client; None disables rate limiting.
+                Defaults to DEFAULT_CLIENT_RATE.
+            client_burst (int, optional): Calls a client may make in a burst
+                above its rate. Defaults to DEFAULT_CLIENT_BURST.
+            clock (Callable[[], float], optional): Monotonic clock in
+                seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If a limit is out of range.
+        """
+        if max_concurrent < 1:
+            raise ValueError('Maximum concurrent requests must be positive')
+        if max_queue < 0:
+            raise ValueError('Maximum queued requests cannot be negative')
+        if client_rate is not None and client_rate <= 0:
+            raise ValueError('Client rate limit must be positive')
+        if client_burst < 1:
+            raise ValueError('Client burst must be positive')
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.rejected = 0
+        self._clock = clock
+        self._active = 0
+        self._reads: Deque['asyncio.Future[None]'] = deque()
+        self._writes: Deque['asyncio.Future[None]'] = deque()
+        self._turns = 0
+        self._turn_writes: Deque[asyncio.Event] = deque()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._service_seconds = INITIAL_SERVICE_SECONDS
+
+    def discard(self, client_id: str) -> None:
+        """Forget the rate limit state of a client.
+
+        Args:
+            client_id (str): Identity of the client.
+        """
+        self._buckets.pop(client_id, None)
+
+    @property
+    def active(self) -> int:
+        """Get the number of running calls.
+
+        Returns:
+            int: Calls currently holding a slot.
+        """
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Get the number of calls waiting for a slot.
+
+        Returns:
+            int: Queued reads and writes, including calls waiting for their
+                turn.
+        """
+        return len(self._reads) + len(self._writes) + self._turns
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        client_id: str,
+        *,
+        write: bool = False,
+        turn: Optional[AsyncContextManager[None]] = None,
+    ) -> AsyncIterator[None]:
+        """Hold a call slot for the duration of a tool call.
+
+        Args:
+            client_id (str): Identity of the calling client.
+            write (bool, optional): Whether the call writes data.
+                Defaults to False.
+            turn (Optional[AsyncContextManager[None]], optional): The call's
+                turn among earlier calls, held around the slot. The call is
+                counted as queued while it waits for its turn, and a write
+                can be displaced then. Defaults to None.
+
+        Yields:
+            None: Once the call is admitted.
+
+        Raises:
+            ServerBusy: If the client is over its rate limit, the queue is
+                full, or the call was displaced while queued.
+        """
+        self._check_rate(client_id)
+        if turn is None:
+            await self._wait_for_slot(write)
+            async with self._held():
+                yield
+            return
+        self._admit(write)
+        displaced = asyncio.Event()
+        if write:
+            self._turn_writes.append(displaced)
+        self._turns += 1
+        waiting = True
+        try:
+            async with turn:
+                waiting = False
+                if displaced.is_set():
+                    raise ServerBusy(self._retry_after_ms())
+                self._end_turn_wait(displaced)
+                await self._wait_for_slot(write, admitted=True)
+                async with self._held():
+                    yield
+        finally:
+            if waiting:
+                self._end_turn_wait(displaced)
+
+    def _end_turn_wait(self, displaced: asyncio.Event) -> None:
+        """Stop counting a call as waiting for its turn.
+
+        Args:
+            displaced (asyncio.Event): Set if the call was displaced, which
+                already stopped counting it.
+        """
+        if displaced.is_set():
+            return
+        self._turns -= 1
+        if displaced in self._turn_writes:
+            self._turn_writes.remove(displaced)
+
+    @asynccontextmanager
+    async def _held(self) -> AsyncIterator[None]:
+        """Time a call holding a slot and release the slot afterwards."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * elapsed
+            self.release()
+
+    async def acquire(self, client_id: str, *, write: bool = False) -> None:
+        """Wait for a call slot.
+
+        Args:
+            client_id (str): Identity of the calling client.
+            write (bool, optional): Whether the call writes data.
+                Defaults to False.
+
+        Raises:
+            ServerBusy: If the client is over its rate limit or the queue
+                is full.
+        """
+        self._check_rate(client_id)
+        await self._wait_for_slot(write)
+
+    def _admit(self, write: bool) -> None:
+        """Check that an arriving call fits the queue.
+
+        When the queue is full, an arriving read displaces the newest write
+        waiting for a slot, else the newest write waiting for its turn. A
+        write displaced before its turn fails once the turn comes, without
+        taking a slot.
+
+        Args:
+            write (bool): Whether the call writes data.
+
+        Raises:
+            ServerBusy: If the queue is full and the call cannot displace a
+                queued write.
+        """
+        if self._active < self.max_concurrent and not self.queued:
+            return
+        if self.queued >= self.max_queue:
+            if write or not (self._writes or self._turn_writes):
+                self._reject()
+            if self._writes:
+                self._writes.pop().set_exception(ServerBusy(self._retry_after_ms()))
+            else:
+                self._turn_writes.pop().set()
+                self._turns -= 1
+            self.rejected += 1
+
+    async def _wait_for_slot(self, write: bool, *, admitted: bool = False) -> None:
+        """Take a free slot or wait in the queue for one.
+
+        Args:
+            write (bool): Whether the call writes data.
+            admitted (bool, optional): Whether the call already passed the
+                queue bound while waiting for its turn. Defaults to False.
+
+        Raises:
+            ServerBusy: If the queue is full, or the call was displaced
+                while queued.
+        """
+        if self._active < self.max_concurrent and not (self._reads or self._writes):
+            self._active += 1
+            return
+        if not admitted:
+            self._admit(write)
+        waiter: 'asyncio.Future[None]' = asyncio.get_running_loop().create_future()
+        (self._writes if write else self._reads).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                for queue in (self._reads, self._writes):
+                    if waiter in queue:
+                        queue.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next queued read, then write."""
+        for queue in (self._reads, self._writes):
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self._active -= 1
+
+    def _check_rate(self, client_id: str) -> None:
+        """Take a token from the client's bucket.
+
+        Args:
+            client_id (str): Identity of the calling client.
+
+        Raises:
+            ServerBusy: If the bucket is empty.
+        """
+        if self.client_rate is None:
+            return
+        now = self._clock()
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_CLIENTS:
+                self._buckets = {
+                    key: kept
+                    for key, kept in self._buckets.items()
+                    if not kept.is_full(now)
+                }
+            bucket = TokenBucket(self.client_rate, self.client_burst, now)
+            self._buckets[client_id] = bucket
+        wait = bucket.take(now)
+        if wait > 0:
+            self.rejected += 1
+            raise ServerBusy(max(1, round(wait * 1000)))
+
+    def _retry_after_ms(self) -> int:
+        """Estimate how long the current queue takes to drain.
+
+        Returns:
+            int: Suggested wait in milliseconds, at least 1.
+        """
+        rounds = self.queued / self.max_concurrent + 1
+        return max(1, round(rounds * self._service_seconds * 1000))
+
+    def _reject(self) -> None:
+        """Shed the arriving call.
+
+        Raises:
+            ServerBusy: Always.
+        """
+        self.rejected += 1
+        raise ServerBusy(self._retry_after_ms())
@@ -0,0 +1,88 @@
+"""Arrival-order sequencing of pipelined tool calls.
+
+The MCP server starts a task for every incoming request without waiting
+for earlier ones, so a client pipelining ``addTask`` and ``listTasks``, or
+sending them in one batch, could see the listing run first.
+:class:`CallOrder` keeps the effects of each session's calls in arrival
+order while letting independent reads overlap:
+
+* reads run concurrently with the reads that arrived next to them,
+* a write starts only after every call that arrived before it finished,
+* a read starts only after the last write that arrived before it.
+
+Calls of different sessions are not ordered against each other, so one
+client's pending write never holds up another client's reads.
+
+Calls register their arrival synchronously when they enter
+:meth:`CallOrder.call`, before their first suspension, so the order is the
+order in which the server dispatched the requests.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, List, Optional
+
+
+class _Chain:
+    """Calls of one session still in flight."""
+
+    __slots__ = ('last_write', 'reads', 'calls')
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self.last_write: Optional['asyncio.Future[None]'] = None
+        self.reads: List['asyncio.Future[None]'] = []
+        self.calls = 0
+
+
+class CallOrder:
+    """Readers-writer sequencing of each session's calls in arrival order."""
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self.waited = 0
+        self._chains: Dict[Hashable, _Chain] = {}
+
+    def __len__(self) -> int:
+        """Return the number of sessions with calls in flight."""
+        return len(self._chains)
+
+    @asynccontextmanager
+    async def call(self, write: bool, session: Hashable = None) -> AsyncIterator[None]:
+        """Hold the call's turn while it runs.
+
+        Args:
+            write (bool): Whether the call writes.
+            session (Hashable, optional): Session the call belongs to; only
+                calls of the same session are ordered. Defaults to None.
+
+        Yields:
+            None: Once every earlier call the call must follow finished.
+        """
+        chain = self._chains.get(session)
+        if chain is None:
+            chain = self._chains[session] = _Chain()
+        chain.calls += 1
+        done: 'asyncio.Future[None]' = asyncio.get_running_loop().create_future()
+        earlier = [chain.last_write] if chain.last_write is not None else []
+        if write:
+            earlier += chain.reads
+            chain.last_write = done
+            chain.reads = []
+        else:
+            chain.reads.append(done)
+        try:
+            pending = [future for future in earlier if not future.done()]
+            if pending:
+                self.waited += 1
+                await asyncio.wait(pending)
+            yield
+        finally:
+            done.set_result(None)
+            if not write and done in chain.reads:
+                chain.reads.remove(done)
+            if chain.last_write is done:
+                chain.last_write = None
+            chain.calls -= 1
+            if not chain.calls:
+                del self._chains[session]
@@ -0,0 +1,188 @@
+"""In-process change feed: fan-out of write events to subscribers.
+
+Every successful write publishes a :class:`ChangeEvent` to a
+:class:`ChangeFeed`, which hands it to each :class:`Subscription` without
+waiting. Subscribers consume events at their own pace from a bounded
+buffer, so a slow dashboard can never stall writes or grow memory:
+
+* ``'drop_oldest'`` keeps the newest ``buffer_size`` events and counts the
+  dropped ones,
+* ``'coalesce'`` keeps only the latest pending event of each project, for
+  consumers that only need to know *that* a project changed.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Hashable, List, Optional
+
+OVERFLOW_POLICIES = ('drop_oldest', 'coalesce')
+DEFAULT_BUFFER_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A write to a project."""
+
+    project_id: int
+    project_name: str
+    version: int
+    action: str
+    task_id: Optional[int] = None
+
+
+class Subscription:
+    """Bounded buffer of change events for one consumer."""
+
+    def __init__(self, feed: 'ChangeFeed', buffer_size: int, policy: str) -> None:
+        """Initialize an empty subscription.
+
+        Args:
+            feed (ChangeFeed): Feed the subscription is attached to.
+            buffer_size (int): Maximum number of pending events.
+            policy (str): Overflow policy, one of ``OVERFLOW_POLICIES``.
+        """
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._feed = feed
+        self._pending: 'OrderedDict[Hashable, ChangeEvent]' = OrderedDict()
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return len(self._pending)
+
+    def __aiter__(self) -> AsyncIterator[ChangeEvent]:
+        """Iterate over events until the subscription is closed."""
+        return self._iterate()
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """Buffer an event, applying the overflow policy.
+
+        Args:
+            event (ChangeEvent): The published event.
+        """
+        if self.closed:
+            return
+        key: Hashable
+        if self.policy == 'coalesce':
+            key = event.project_id
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+        else:
+            key = self._sequence
+            self._sequence += 1
+        if len(self._pending) >= self.buffer_size:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = event
+        self._wakeup.set()
+
+    def get_nowait(self) -> Optional[ChangeEvent]:
+        """Take the oldest pending event without waiting.
+
+        Returns:
+            Optional[ChangeEvent]: The event, or None if none is pending.
+        """
+        if not self._pending:
+            return None
+        return self._pending.popitem(last=False)[1]
+
+    async def get(self) -> Optional[ChangeEvent]:
+        """Wait for the next event.
+
+        Returns:
+            Optional[ChangeEvent]: The oldest pending event, or None once the
+                subscription is closed and drained.
+        """
+        while not self._pending:
+            if self.closed:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self._pending.popitem(last=False)[1]
+
+    def close(self) -> None:
+        """Detach from the feed; pending events can still be read."""
+        if not self.closed:
+            self.closed = True
+            self._feed.unsubscribe(self)
+            self._wakeup.set()
+
+    async def _iterate(self) -> AsyncIterator[ChangeEvent]:
+        """Yield events until the subscription is closed and drained."""
+        while True:
+            event = await self.get()
+            if event is None:
+                return
+            yield event
+
+
+class ChangeFeed:
+    """Publishes change events to every subscription."""
+
+    def __init__(self) -> None:
+        """Initialize a feed without subscribers."""
+        self.published = 0
+        self._subscriptions: List[Subscription] = []
+
+    @property
+    def subscribers(self) -> int:
+        """Get the number of open subscriptions.
+
+        Returns:
+            int: Open subscriptions.
+        """
+        return len(self._subscriptions)
+
+    def subscribe(
+        self, buffer_size: int = DEFAULT_BUFFER_SIZE, policy: str = 'drop_oldest'
+    ) -> Subscription:
+        """Open a subscription receiving every later event.
+
+        Args:
+            buffer_size (int, optional): Maximum number of pending events.
+                Defaults to DEFAULT_BUFFER_SIZE.
+            policy (str, optional): What to do when events arrive faster than
+                they are consumed: 'drop_oldest' or 'coalesce'.
+                Defaults to 'drop_oldest'.
+
+        Returns:
+            Subscription: The new subscription.
+
+        Raises:
+            ValueError: If buffer_size or policy is invalid.
+        """
+        if buffer_size < 1:
+            raise ValueError('Buffer size must be positive')
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{policy}'. "
+                f"Use one of: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        subscription = Subscription(self, buffer_size, policy)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription.
+
+        Args:
+            subscription (Subscription): Subscription to detach.
+        """
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Deliver an event to every subscription without blocking.
+
+        Args:
+            event (ChangeEvent): The event to publish.
+        """
+        self.published += 1
+        for subscription in self._subscriptions:
+            subscription.deliver(event)
@@ -0,0 +1,223 @@
+"""Response formatting helpers for the task management tools.
+
+The strings produced here follow the formats fixed in the API specification
+(``.aidocs/api-spec.md``). Listings can also be returned in a ``compact``
+form (one tab-separated row per task) or as a ``json`` payload holding one
+array per task under a shared column list; both cost fewer bytes and need
+no regex parsing on the client.
+
+JSON is encoded with ``orjson`` when it is installed and with the standard
+library otherwise; both produce the same compact text for the payloads
+built here, whose task rows are plain tuples.
+"""
+
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from ..database.dates import decode_date, decode_timestamp, timestamp_date
+from ..database.history import HistoryEvent, decode_delta
+from ..models import Task
+
+_fast_dumps: Optional[Callable[[Any], bytes]]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _fast_dumps = None
+else:
+
+    def _fast_dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+
+TaskRow = Tuple[Optional[int], str, str, Optional[int], Optional[str], Optional[str]]
+
+RESPONSE_FORMATS = ('text', 'compact', 'json')
+# Name of the JSON encoder used by dumps().
+JSON_ENCODER = 'json' if _fast_dumps is None else 'orjson'
+COMPACT_HEADER = 'id\tdone\tpriority\tdue\tdescription'
+# Column names of the task arrays in JSON payloads, in TaskRow order.
+JSON_COLUMNS = ['id', 'description', 'status', 'priority', 'dueDate', 'completedOn']
+
+
+def task_row(task: Task) -> TaskRow:
+    """Reduce a task to the plain tuple needed to render its line.
+
+    Rows are cheap to pickle, so they can be rendered in worker processes.
+
+    Args:
+        task (Task): Task to reduce.
+
+    Returns:
+        TaskRow: ``(task_id, description, status, priority, due_date,
+            completed_on)``, where completed_on is the completion date of a
+            completed task and None otherwise.
+    """
+    completed_on = None
+    if task.status == 'completed' and task.updated_at is not None:
+        completed_on = task.updated_at.date().isoformat()
+    return (
+        task.task_id,
+        task.description,
+        task.status,
+        task.priority,
+        task.due_date,
+        completed_on,
+    )
+
+
+def render_task_row(row: TaskRow) -> str:
+    """Render a task row as a markdown-like to-do line.
+
+    Args:
+        row (TaskRow): Row produced by :func:`task_row`.
+
+    Returns:
+        str: ``[marker] (ID: id) description (Priority: P, Due: D,
+            Completed: C)`` with absent details omitted.
+    """
+    task_id, description, status, priority, due_date, completed_on = row
+    marker = '[x]' if status == 'completed' else '[ ]'
+    details: List[str] = []
+    if priority is not None:
+        details.append(f'Priority: {priority}')
+    if due_date:
+        details.append(f'Due: {due_date}')
+    if completed_on:
+        details.append(f'Completed: {completed_on}')
+    suffix = f' ({", ".join(details)})' if details else ''
+    return f'{marker} (ID: {task_id}) {description}{suffix}'
+
+
+def render_task_lines(rows: Sequence[TaskRow]) -> List[str]:
+    """Render task rows as to-do lines.
+
+    This is a module-level function so it can run in a worker process.
+
+    Args:
+        rows (Sequence[TaskRow]): Rows produced by :func:`task_row`.
+
+    Returns:
+        List[str]: One to-do line per row.
+    """
+    return [render_task_row(row) for row in rows]
+
+
+def render_compact_row(row: TaskRow) -> str:
+    """Render a task row as a terse tab-separated line.
+
+    The description is the last field, so splitting a line on tabs at most
+    four times recovers it intact.
+
+    Args:
+        row (TaskRow): Row produced by :func:`task_row`.
+
+    Returns:
+        str: ``id, x or -, priority, due date, description`` separated by
+            tabs, with absent details left empty.
+    """
+    task_id, description, status, priority, due_date, _ = row
+    done = 'x' if status == 'completed' else '-'
+    return (
+        f'{task_id}\t{done}\t{"" if priority is None else priority}\t'
+        f'{due_date or ""}\t{description}'
+    )
+
+
+def dumps(payload: Any) -> str:
+    """Serialize a response payload as compact JSON.
+
+    Uses the fast encoder if one is installed. Payloads it cannot encode,
+    such as integers beyond 64 bits, fall back to the standard library.
+
+    Args:
+        payload (Any): JSON-serializable payload.
+
+    Returns:
+        str: JSON text without insignificant whitespace.
+    """
+    if _fast_dumps is not None:
+        try:
+            return _fast_dumps(payload).decode()
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+def format_task_line(task: Task) -> str:
+    """Format a task as a markdown-like to-do line.
+
+    Args:
+        task (Task): Task to format.
+
+    Returns:
+        str: ``[marker] (ID: id) description (details)``.
+    """
+    return render_task_row(task_row(task))
+
+
+def format_task_ref(task: Task) -> str:
+    """Format the short reference used in confirmation messages.
+
+    Args:
+        task (Task): Task to reference.
+
+    Returns:
+        str: ``(ID: id) description``.
+    """
+    return f'(ID: {task.task_id}) {task.description}'
+
+
+def render_history_event(event: HistoryEvent) -> str:
+    """Render an audit log event as one line of a task's history.
+
+    Args:
+        event (HistoryEvent): Event as listed by the storage engine.
+
+    Returns:
+        str: ``YYYY-MM-DD HH:MM:SS what happened``, in UTC. Creations and
+            folded baselines show the task line as it was then.
+    """
+    _, task_id, at, action, delta = event
+    stamp = decode_timestamp(at)
+    when = stamp.isoformat(sep=' ') if stamp is not None else '?'
+    fields = decode_delta(delta)
+    if action in ('add', 'baseline'):
+        status = fields.get('s', 'open')
+        row: TaskRow = (
+            task_id,
+            fields.get('d', ''),
+            status,
+            fields.get('p'),
+            decode_date(fields.get('u')),
+            timestamp_date(fields.get('m', at)) if status == 'completed' else None,
+        )
+        verb = 'created' if action == 'add' else 'earlier history folded'
+        what = f'{verb}: {render_task_row(row)}'
+        if action == 'baseline' and fields.get('t'):
+            what += f' [tags: {", ".join(fields["t"])}]'
+    elif action in ('tag', 'untag'):
+        what = f'{action}ged: {", ".join(fields.get("t", ()))}'
+    elif action == 'depend':
+        what = f'now depends on (ID: {fields.get("o")})'
+    else:
+        what = {'complete': 'completed', 'remove': 'removed'}.get(action, action)
+    return f'{when} {what}'
+
+
+def format_candidates(
+    candidates: Sequence[Tuple[Task, float]], separator: str = '; '
+) -> str:
+    """Format ranked fuzzy-match candidates.
+
+    Args:
+        candidates (Sequence[Tuple[Task, float]]): Tasks with their scores,
+            best first.
+        separator (str, optional): Separator between candidates.
+            Defaults to '; '.
+
+    Returns:
+        str: ``(ID: id) description [score]`` entries joined by separator.
+    """
+    return separator.join(
+        f'{format_task_ref(task)} [{score:.2f}]' for task, score in candidates
+    )
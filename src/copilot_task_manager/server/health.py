@@ -0,0 +1,285 @@
+"""Health and service level reporting for the long-running server.
+
+A server that runs all day degrades slowly: a growing write-ahead log, a
+cache that stops hitting, a blocking call stalling the event loop. The
+:class:`HealthMonitor` keeps the measurements the ``getHealth`` tool
+reports:
+
+* a :class:`LatencyWindow` of the most recent tool call latencies, from
+  which rolling percentiles are computed,
+* a :class:`LoopLagProbe`, a background task that sleeps for a fixed
+  interval and records how late it wakes up; a busy or blocked event loop
+  wakes it late,
+* the service level objectives (SLOs) the measurements are compared with.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_WINDOW = 1024
+DEFAULT_LAG_INTERVAL = 0.5
+DEFAULT_LAG_WINDOW = 120
+DEFAULT_SLO_P99_MS = 250.0
+DEFAULT_SLO_LOOP_LAG_MS = 100.0
+
+LATENCY_PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Return a nearest-rank percentile of sorted samples.
+
+    Args:
+        ordered (Sequence[float]): Non-empty samples in ascending order.
+        fraction (float): Percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The smallest sample with at least ``fraction`` of the
+            samples at or below it.
+    """
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def file_sizes(paths: Iterable[str]) -> Tuple[int, int]:
+    """Sum the sizes of storage files and of their write-ahead logs.
+
+    Args:
+        paths (Iterable[str]): Storage files; missing files count as empty.
+
+    Returns:
+        Tuple[int, int]: Bytes in the files and bytes in their ``-wal``
+            and ``-journal`` companions.
+    """
+    data = log = 0
+    for path in paths:
+        data += _size(path)
+        log += _size(f'{path}-wal') + _size(f'{path}-journal')
+    return data, log
+
+
+def _size(path: str) -> int:
+    """Return the size of a file in bytes, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class LatencyWindow:
+    """Rolling window of the most recent call latencies."""
+
+    def __init__(self, size: int = DEFAULT_LATENCY_WINDOW) -> None:
+        """Initialize an empty window.
+
+        Args:
+            size (int, optional): Number of latencies kept.
+                Defaults to DEFAULT_LATENCY_WINDOW.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        if size < 1:
+            raise ValueError('Latency window size must be positive')
+        self.count = 0
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return the number of latencies in the window."""
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency, dropping the oldest once the window is full.
+
+        Args:
+            seconds (float): Duration of a call in seconds.
+        """
+        self.count += 1
+        self._samples.append(seconds)
+
+    def percentiles(
+        self, fractions: Sequence[float] = LATENCY_PERCENTILES
+    ) -> Optional[List[float]]:
+        """Compute percentiles of the latencies in the window.
+
+        Args:
+            fractions (Sequence[float], optional): Percentiles as fractions.
+                Defaults to LATENCY_PERCENTILES.
+
+        Returns:
+            Optional[List[float]]: One latency in seconds per fraction, or
+                None if no call was recorded.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return [percentile(ordered, fraction) for fraction in fractions]
+
+
+class LoopLagProbe:
+    """Background task measuring how late the event loop runs timers."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_LAG_INTERVAL,
+        *,
+        window: int = DEFAULT_LAG_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a stopped probe.
+
+        Args:
+            interval (float, optional): Seconds between probes.
+                Defaults to DEFAULT_LAG_INTERVAL.
+            window (int, optional): Number of lag samples kept.
+                Defaults to DEFAULT_LAG_WINDOW.
+            clock (Callable[[], float], optional): Monotonic clock in
+                seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If interval or window is not positive.
+        """
+        if interval <= 0:
+            raise ValueError('Lag probe interval must be positive')
+        if window < 1:
+            raise ValueError('Lag window size must be positive')
+        self.interval = interval
+        self._clock = clock
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional['asyncio.Task[None]'] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the probe task is running.
+
+        Returns:
+            bool: True between start and stop.
+        """
+        return self._task is not None and not self._task.done()
+
+    @property
+    def last(self) -> Optional[float]:
+        """Get the most recent lag.
+
+        Returns:
+            Optional[float]: Lag in seconds, or None before the first probe.
+        """
+        return self._samples[-1] if self._samples else None
+
+    @property
+    def worst(self) -> Optional[float]:
+        """Get the largest lag in the window.
+
+        Returns:
+            Optional[float]: Lag in seconds, or None before the first probe.
+        """
+        return max(self._samples) if self._samples else None
+
+    def start(self) -> None:
+        """Start probing on the running event loop, if not already started."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing and wait for the probe task to finish."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def record(self, lag: float) -> None:
+        """Add a lag sample.
+
+        Args:
+            lag (float): Seconds a timer fired after it was due.
+        """
+        self._samples.append(max(0.0, lag))
+
+    async def _run(self) -> None:
+        """Sleep for the interval repeatedly, recording each late wake-up."""
+        while True:
+            due = self._clock() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(self._clock() - due)
+
+
+class HealthMonitor:
+    """Uptime, call latencies and event loop lag compared with SLOs."""
+
+    def __init__(
+        self,
+        *,
+        slo_p99_ms: float = DEFAULT_SLO_P99_MS,
+        slo_loop_lag_ms: float = DEFAULT_SLO_LOOP_LAG_MS,
+        latency_window: int = DEFAULT_LATENCY_WINDOW,
+        lag_interval: float = DEFAULT_LAG_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the monitor; uptime is counted from now.
+
+        Args:
+            slo_p99_ms (float, optional): Target 99th percentile tool call
+                latency in milliseconds. Defaults to DEFAULT_SLO_P99_MS.
+            slo_loop_lag_ms (float, optional): Target maximum event loop lag
+                in milliseconds. Defaults to DEFAULT_SLO_LOOP_LAG_MS.
+            latency_window (int, optional): Number of recent calls the
+                latency percentiles cover. Defaults to DEFAULT_LATENCY_WINDOW.
+            lag_interval (float, optional): Seconds between event loop lag
+                probes. Defaults to DEFAULT_LAG_INTERVAL.
+            clock (Callable[[], float], optional): Monotonic clock in
+                seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If an SLO target, the window or the interval is not
+                positive.
+        """
+        if slo_p99_ms <= 0 or slo_loop_lag_ms <= 0:
+            raise ValueError('SLO targets must be positive')
+        self.slo_p99_ms = slo_p99_ms
+        self.slo_loop_lag_ms = slo_loop_lag_ms
+        self.latencies = LatencyWindow(latency_window)
+        self.loop_lag = LoopLagProbe(lag_interval, clock=clock)
+        self._clock = clock
+        self._started = clock()
+
+    @property
+    def uptime(self) -> float:
+        """Get the seconds since the monitor was created.
+
+        Returns:
+            float: Uptime in seconds.
+        """
+        return self._clock() - self._started
+
+    def now(self) -> float:
+        """Read the monitor's clock, for timing calls.
+
+        Returns:
+            float: Current clock reading in seconds.
+        """
+        return self._clock()
+
+    def breaches(self) -> List[str]:
+        """List the SLOs the current measurements miss.
+
+        Returns:
+            List[str]: One description per missed SLO, empty if healthy.
+        """
+        missed: List[str] = []
+        latencies = self.latencies.percentiles((0.99,))
+        if latencies is not None and latencies[0] * 1000 > self.slo_p99_ms:
+            missed.append(
+                f'p99 latency {latencies[0] * 1000:.1f} ms > {self.slo_p99_ms:g} ms'
+            )
+        worst = self.loop_lag.worst
+        if worst is not None and worst * 1000 > self.slo_loop_lag_ms:
+            missed.append(
+                f'event loop lag {worst * 1000:.1f} ms > {self.slo_loop_lag_ms:g} ms'
+            )
+        return missed
@@ -0,0 +1,121 @@
+"""Cache of pre-rendered listTasks lines.
+
+Rendering a to-do line is cheap once, but listing a large project renders
+every task on every call. :class:`LineCache` keeps the rendered line of
+each task together with the version it was rendered from, so a listing of
+unchanged tasks becomes a join of cached strings and only new or modified
+tasks are rendered.
+
+The version is the task's ``(updated_at, status)`` pair read from the raw
+database row. ``updated_at`` is maintained by a trigger on every update;
+the status is included because timestamps only have second precision,
+so a task completed in the same second it was created would otherwise
+keep its stale ``[ ]`` line. Writes made through the tools also
+invalidate entries explicitly.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..database.dates import decode_date, timestamp_date
+from .formatting import TaskRow
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+CacheKey = Tuple[int, int]
+Version = Tuple[Any, Any]
+
+
+def raw_task_row(row: Sequence[Any]) -> TaskRow:
+    """Convert a raw ``Tasks`` row into a render row.
+
+    Only the integer-encoded due date and completion day are decoded, both
+    through a memoized lookup; no datetimes are built.
+
+    Args:
+        row (Sequence[Any]): Row in ``TASK_COLUMNS`` order.
+
+    Returns:
+        TaskRow: Row suitable for :func:`render_task_row`.
+    """
+    completed_on = timestamp_date(row[7]) if row[3] == 'completed' else None
+    return (row[0], row[2], row[3], row[4], decode_date(row[5]), completed_on)
+
+
+class LineCache:
+    """Bounded cache of rendered task lines keyed by project and task ID."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached lines.
+                When full, the oldest entries are evicted first.
+                Defaults to DEFAULT_MAX_ENTRIES.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError('Maximum cache entries must be positive')
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lines: Dict[CacheKey, Tuple[Version, str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached lines."""
+        return len(self._lines)
+
+    def lookup(
+        self, project_id: int, rows: Sequence[Sequence[Any]]
+    ) -> Tuple[List[Optional[str]], List[int]]:
+        """Look up the cached lines of raw task rows.
+
+        Args:
+            project_id (int): ID of the project the rows belong to.
+            rows (Sequence[Sequence[Any]]): Rows in ``TASK_COLUMNS`` order.
+
+        Returns:
+            Tuple[List[Optional[str]], List[int]]: One line per row (None
+                for misses) and the positions of the missing rows.
+        """
+        get = self._lines.get
+        lines: List[Optional[str]] = []
+        missing: List[int] = []
+        for position, row in enumerate(rows):
+            entry = get((project_id, row[0]))
+            if entry is not None and entry[0] == (row[7], row[3]):
+                lines.append(entry[1])
+            else:
+                lines.append(None)
+                missing.append(position)
+        self.hits += len(rows) - len(missing)
+        self.misses += len(missing)
+        return lines, missing
+
+    def store(self, project_id: int, row: Sequence[Any], line: str) -> None:
+        """Cache the rendered line of a raw task row.
+
+        Args:
+            project_id (int): ID of the project the row belongs to.
+            row (Sequence[Any]): Row in ``TASK_COLUMNS`` order.
+            line (str): The rendered line.
+        """
+        key = (project_id, row[0])
+        self._lines.pop(key, None)
+        while len(self._lines) >= self.max_entries:
+            del self._lines[next(iter(self._lines))]
+        self._lines[key] = ((row[7], row[3]), line)
+
+    def invalidate(self, project_id: int, task_id: int) -> None:
+        """Drop the cached line of a task, if any.
+
+        Args:
+            project_id (int): ID of the project owning the task.
+            task_id (int): ID of the task.
+        """
+        self._lines.pop((project_id, task_id), None)
+
+    def clear(self) -> None:
+        """Drop every cached line."""
+        self._lines.clear()
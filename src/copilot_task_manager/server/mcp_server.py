@@ -10,10 +10,38 @@ import os
 import sys
 from typing import Any, Optional
 
+import anyio
 from fastmcp import FastMCP
+from mcp.server.lowlevel import NotificationOptions
+
+from ..database import (
+    InMemoryTaskDatabase,
+    ShardedTaskDatabase,
+    TaskDatabase,
+    TaskStore,
+)
+from ..database.dates import SECONDS_PER_DAY
+from .admission import (
+    DEFAULT_CLIENT_BURST,
+    DEFAULT_CLIENT_RATE,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_QUEUE,
+    AdmissionController,
+)
+from .change_feed import ChangeFeed
+from .health import DEFAULT_SLO_LOOP_LAG_MS, DEFAULT_SLO_P99_MS, HealthMonitor
+from .notifications import ResourceNotifier
+from .render_pool import RenderPool
+from .resources import TaskResources
+from .sessions import DEFAULT_SESSION_IDLE, SessionStore
+from .stdio import stdio_transport
+from .task_tools import TaskTools
 
 logger = logging.getLogger(__name__)
 
+STORAGE_ENGINES = ('sqlite', 'memory')
+DEFAULT_SNAPSHOT_INTERVAL = 60.0
+
 
 class TaskManagerMCPServer:
     """MCP server implementation for task management."""
@@ -25,6 +53,22 @@ class TaskManagerMCPServer:
         port: int = 3000,
         host: str = 'localhost',
         debug: bool = False,
+        storage: str = 'sqlite',
+        db_path: str = 'tasks.db',
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: Optional[float] = DEFAULT_SNAPSHOT_INTERVAL,
+        shard_dir: Optional[str] = None,
+        shard_buckets: Optional[int] = None,
+        render_workers: int = 0,
+        response_format: str = 'text',
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT,
+        max_queued_requests: int = DEFAULT_MAX_QUEUE,
+        client_rate_limit: Optional[float] = DEFAULT_CLIENT_RATE,
+        client_burst: int = DEFAULT_CLIENT_BURST,
+        session_idle_timeout: Optional[float] = DEFAULT_SESSION_IDLE,
+        history_retention_days: Optional[float] = None,
+        slo_p99_ms: float = DEFAULT_SLO_P99_MS,
+        slo_loop_lag_ms: float = DEFAULT_SLO_LOOP_LAG_MS,
     ) -> None:
         """Initialize the MCP server.
 
@@ -33,9 +77,55 @@ class TaskManagerMCPServer:
             port (int, optional): Port to run the server on. Defaults to 3000.
             host (str, optional): Host to bind to. Defaults to 'localhost'.
             debug (bool, optional): Enable debug mode. Defaults to False.
+            storage (str, optional): Storage engine, 'sqlite' or 'memory'.
+                Defaults to 'sqlite'.
+            db_path (str, optional): Path to the SQLite database file.
+                Defaults to 'tasks.db'.
+            snapshot_path (Optional[str], optional): JSON snapshot file of
+                the in-memory engine; None keeps data in memory only.
+                Defaults to None.
+            snapshot_interval (Optional[float], optional): Minimum seconds
+                between in-memory snapshots taken after writes; None
+                snapshots only on stop. Defaults to DEFAULT_SNAPSHOT_INTERVAL.
+            shard_dir (Optional[str], optional): Directory for sharded
+                storage. If set, projects are spread over one SQLite file per
+                project (or hash bucket) and db_path is ignored.
+                Defaults to None.
+            shard_buckets (Optional[int], optional): Number of hash buckets
+                for sharded storage; None means one file per project.
+                Defaults to None.
+            render_workers (int, optional): Worker processes used to render
+                large listings off the event loop; 0 renders inline.
+                Defaults to 0.
+            response_format (str, optional): Default format of listing
+                responses: 'text', 'compact' or 'json'. Defaults to 'text'.
+            max_concurrent_requests (int, optional): Tool calls allowed to
+                run at once. Defaults to DEFAULT_MAX_CONCURRENT.
+            max_queued_requests (int, optional): Tool calls allowed to wait
+                for a slot before calls are shed with a "server busy" error.
+                Defaults to DEFAULT_MAX_QUEUE.
+            client_rate_limit (Optional[float], optional): Sustained tool
+                calls per second allowed per client; None disables rate
+                limiting. Defaults to DEFAULT_CLIENT_RATE.
+            client_burst (int, optional): Tool calls a client may make in a
+                burst above its rate. Defaults to DEFAULT_CLIENT_BURST.
+            session_idle_timeout (Optional[float], optional): Seconds after
+                which the active project of an idle client session is
+                forgotten; None keeps it. Defaults to DEFAULT_SESSION_IDLE.
+            history_retention_days (Optional[float], optional): Days of task
+                history kept in full before older events are folded; None
+                keeps all history. Defaults to None.
+            slo_p99_ms (float, optional): Target 99th percentile tool call
+                latency reported by getHealth, in milliseconds.
+                Defaults to DEFAULT_SLO_P99_MS.
+            slo_loop_lag_ms (float, optional): Target maximum event loop lag
+                reported by getHealth, in milliseconds.
+                Defaults to DEFAULT_SLO_LOOP_LAG_MS.
 
         Raises:
-            ValueError: If server_name is empty or invalid.
+            ValueError: If server_name is empty or invalid, storage or
+                response_format is unknown, or an admission, session,
+                history or SLO limit is out of range.
         """
         self._validate_server_name(server_name)
         self.server_name = server_name
@@ -45,6 +135,51 @@ class TaskManagerMCPServer:
         self._is_running = False
         self.mcp = FastMCP(server_name)
         self._server_task: Optional[asyncio.Task[None]] = None
+        self.db: TaskStore
+        retention = (
+            history_retention_days * SECONDS_PER_DAY
+            if history_retention_days is not None
+            else None
+        )
+        if storage == 'memory':
+            self.db = InMemoryTaskDatabase(
+                snapshot_path,
+                snapshot_interval=snapshot_interval,
+                history_retention=retention,
+            )
+        elif storage != 'sqlite':
+            raise ValueError(
+                f"Unknown storage engine '{storage}'. "
+                f"Use one of: {', '.join(STORAGE_ENGINES)}"
+            )
+        elif shard_dir is not None:
+            self.db = ShardedTaskDatabase(
+                shard_dir, buckets=shard_buckets, history_retention=retention
+            )
+        else:
+            self.db = TaskDatabase(db_path, history_retention=retention)
+        self.render_pool = RenderPool(render_workers) if render_workers > 0 else None
+        self.admission = AdmissionController(
+            max_concurrent=max_concurrent_requests,
+            max_queue=max_queued_requests,
+            client_rate=client_rate_limit,
+            client_burst=client_burst,
+        )
+        self.health = HealthMonitor(
+            slo_p99_ms=slo_p99_ms, slo_loop_lag_ms=slo_loop_lag_ms
+        )
+        self.change_feed = ChangeFeed()
+        self.notifier = ResourceNotifier(self.change_feed)
+        self.tools = TaskTools(
+            self.db,
+            self.render_pool,
+            response_format=response_format,
+            admission=self.admission,
+            change_feed=self.change_feed,
+            sessions=SessionStore(max_idle=session_idle_timeout),
+            health=self.health,
+        )
+        self.resources = TaskResources(self.db, self.tools)
         self._setup_tools()
 
     @staticmethod
@@ -105,8 +240,10 @@ class TaskManagerMCPServer:
         return self._debug
 
     def _setup_tools(self) -> None:
-        """Register all MCP tools with their handlers."""
-        # Tools will be registered here in future steps
+        """Register all MCP tools and resources with their handlers."""
+        self.tools.register(self.mcp)
+        self.resources.register(self.mcp)
+        self.notifier.register(self.mcp)
 
     def _check_stdio_available(self) -> bool:
         """Check if stdio communication is available.
@@ -147,12 +284,51 @@ class TaskManagerMCPServer:
             # whether to use stdio or TCP based on the environment
             # Note: In VS Code it will auto-use stdio
             await self.mcp.start()
+            self.health.loop_lag.start()
             self._is_running = True
 
         except Exception as e:
             logger.error(f'Failed to start server: {e}')
             raise
 
+    async def serve_stdio(
+        self,
+        stdin: Optional['anyio.AsyncFile[str]'] = None,
+        stdout: Optional['anyio.AsyncFile[str]'] = None,
+    ) -> None:
+        """Serve one client over stdio until its input ends.
+
+        Uses :func:`.stdio.stdio_transport`, which accepts JSON-RPC batches
+        and coalesces output writes. Resources are released on return.
+
+        Args:
+            stdin (Optional[anyio.AsyncFile[str]], optional): Input lines.
+                Defaults to None, reading the process' stdin.
+            stdout (Optional[anyio.AsyncFile[str]], optional): Output.
+                Defaults to None, writing the process' stdout.
+
+        Raises:
+            RuntimeError: If server is already running.
+        """
+        if self._is_running:
+            raise RuntimeError('Server is already running')
+
+        self._is_running = True
+        server = self.mcp._mcp_server
+        self.health.loop_lag.start()
+        try:
+            async with stdio_transport(stdin, stdout) as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options(
+                        NotificationOptions(tools_changed=True)
+                    ),
+                )
+        finally:
+            await self._release()
+            self._is_running = False
+
     async def stop(self) -> None:
         """Stop the MCP server.
 
@@ -169,6 +345,7 @@ class TaskManagerMCPServer:
 
             # Clean up server
             await self.mcp.stop()
+            await self._release()
             self._is_running = False
 
         except Exception as e:
@@ -176,6 +353,14 @@ class TaskManagerMCPServer:
             self._is_running = False
             raise
 
+    async def _release(self) -> None:
+        """Stop the lag probe and close the notifier, storage and render pool."""
+        await self.health.loop_lag.stop()
+        await self.notifier.close()
+        self.db.close()
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+
 
 def create_server(
     server_name: str = 'TaskManagerServerV3',
@@ -183,6 +368,22 @@ def create_server(
     port: int = 3000,
     host: str = 'localhost',
     debug: bool = False,
+    storage: str = 'sqlite',
+    db_path: str = 'tasks.db',
+    snapshot_path: Optional[str] = None,
+    snapshot_interval: Optional[float] = DEFAULT_SNAPSHOT_INTERVAL,
+    shard_dir: Optional[str] = None,
+    shard_buckets: Optional[int] = None,
+    render_workers: int = 0,
+    response_format: str = 'text',
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT,
+    max_queued_requests: int = DEFAULT_MAX_QUEUE,
+    client_rate_limit: Optional[float] = DEFAULT_CLIENT_RATE,
+    client_burst: int = DEFAULT_CLIENT_BURST,
+    session_idle_timeout: Optional[float] = DEFAULT_SESSION_IDLE,
+    history_retention_days: Optional[float] = None,
+    slo_p99_ms: float = DEFAULT_SLO_P99_MS,
+    slo_loop_lag_ms: float = DEFAULT_SLO_LOOP_LAG_MS,
 ) -> TaskManagerMCPServer:
     """Create a new instance of the TaskManagerMCPServer.
 
@@ -191,16 +392,74 @@ def create_server(
         port (int, optional): Port to run the server on. Defaults to 3000.
         host (str, optional): Host to bind to. Defaults to 'localhost'.
         debug (bool, optional): Enable debug mode. Defaults to False.
+        storage (str, optional): Storage engine, 'sqlite' or 'memory'.
+            Defaults to 'sqlite'.
+        db_path (str, optional): Path to the SQLite database file.
+            Defaults to 'tasks.db'.
+        snapshot_path (Optional[str], optional): JSON snapshot file of the
+            in-memory engine; None keeps data in memory only. Defaults to None.
+        snapshot_interval (Optional[float], optional): Minimum seconds between
+            in-memory snapshots taken after writes; None snapshots only on
+            stop. Defaults to DEFAULT_SNAPSHOT_INTERVAL.
+        shard_dir (Optional[str], optional): Directory for sharded storage
+            (one SQLite file per project or hash bucket). Defaults to None.
+        shard_buckets (Optional[int], optional): Number of hash buckets for
+            sharded storage; None means one file per project.
+            Defaults to None.
+        render_workers (int, optional): Worker processes used to render large
+            listings off the event loop; 0 renders inline. Defaults to 0.
+        response_format (str, optional): Default format of listing responses:
+            'text', 'compact' or 'json'. Defaults to 'text'.
+        max_concurrent_requests (int, optional): Tool calls allowed to run at
+            once. Defaults to DEFAULT_MAX_CONCURRENT.
+        max_queued_requests (int, optional): Tool calls allowed to wait for a
+            slot before calls are shed with a "server busy" error.
+            Defaults to DEFAULT_MAX_QUEUE.
+        client_rate_limit (Optional[float], optional): Sustained tool calls
+            per second allowed per client; None disables rate limiting.
+            Defaults to DEFAULT_CLIENT_RATE.
+        client_burst (int, optional): Tool calls a client may make in a burst
+            above its rate. Defaults to DEFAULT_CLIENT_BURST.
+        session_idle_timeout (Optional[float], optional): Seconds after which
+            the active project of an idle client session is forgotten; None
+            keeps it. Defaults to DEFAULT_SESSION_IDLE.
+        history_retention_days (Optional[float], optional): Days of task
+            history kept in full before older events are folded; None keeps
+            all history. Defaults to None.
+        slo_p99_ms (float, optional): Target 99th percentile tool call latency
+            reported by getHealth, in milliseconds. Defaults to
+            DEFAULT_SLO_P99_MS.
+        slo_loop_lag_ms (float, optional): Target maximum event loop lag
+            reported by getHealth, in milliseconds. Defaults to
+            DEFAULT_SLO_LOOP_LAG_MS.
 
     Returns:
         TaskManagerMCPServer: A new server instance.
 
     Raises:
-        ValueError: If server_name is empty or invalid.
+        ValueError: If server_name is empty or invalid, storage or
+            response_format is unknown, or an admission, session, history or
+            SLO limit is out of range.
     """
     return TaskManagerMCPServer(
         server_name,
         port=port,
         host=host,
         debug=debug,
+        storage=storage,
+        db_path=db_path,
+        snapshot_path=snapshot_path,
+        snapshot_interval=snapshot_interval,
+        shard_dir=shard_dir,
+        shard_buckets=shard_buckets,
+        render_workers=render_workers,
+        response_format=response_format,
+        max_concurrent_requests=max_concurrent_requests,
+        max_queued_requests=max_queued_requests,
+        client_rate_limit=client_rate_limit,
+        client_burst=client_burst,
+        session_idle_timeout=session_idle_timeout,
+        history_retention_days=history_retention_days,
+        slo_p99_ms=slo_p99_ms,
+        slo_loop_lag_ms=slo_loop_lag_ms,
     )
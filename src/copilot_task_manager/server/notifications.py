@@ -0,0 +1,117 @@
+"""MCP resource-update notifications driven by the change feed.
+
+Clients subscribe to a project's task resources with the MCP
+``resources/subscribe`` request. :class:`ResourceNotifier` consumes a
+coalescing subscription of the :class:`ChangeFeed` and sends
+``notifications/resources/updated`` to every session subscribed to a
+resource of a changed project, so clients re-read a project only when it
+changed instead of polling ``listTasks``. Over the SSE transport the
+notifications travel on the session's event stream.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional
+
+from fastmcp import FastMCP
+from pydantic import AnyUrl
+
+from .change_feed import ChangeFeed, Subscription
+from .resources import task_resource_uri
+
+logger = logging.getLogger(__name__)
+
+# Projects changing faster than notifications are sent are coalesced, so
+# the buffer only needs room for the projects changed in one burst.
+NOTIFY_BUFFER_SIZE = 1024
+
+
+class ResourceNotifier:
+    """Sends resource-update notifications to subscribed sessions."""
+
+    def __init__(self, feed: ChangeFeed) -> None:
+        """Initialize without subscribed sessions.
+
+        Args:
+            feed (ChangeFeed): Feed of the writes to notify about.
+        """
+        self.sent = 0
+        self._feed = feed
+        self._sessions: Dict[str, 'weakref.WeakSet[Any]'] = {}
+        self._subscription: Optional[Subscription] = None
+        self._task: Optional['asyncio.Task[None]'] = None
+
+    def register(self, mcp: FastMCP[Any]) -> None:
+        """Handle resource subscribe and unsubscribe requests of a server.
+
+        Args:
+            mcp (FastMCP): The FastMCP server receiving the requests.
+        """
+        server = mcp._mcp_server
+
+        async def subscribe(uri: AnyUrl) -> None:
+            self.subscribe(str(uri), server.request_context.session)
+
+        async def unsubscribe(uri: AnyUrl) -> None:
+            self.unsubscribe(str(uri), server.request_context.session)
+
+        server.subscribe_resource()(subscribe)  # type: ignore[no-untyped-call]
+        server.unsubscribe_resource()(unsubscribe)  # type: ignore[no-untyped-call]
+
+    def subscribe(self, uri: str, session: Any) -> None:
+        """Notify a session about changes of a resource.
+
+        Must be called from the event loop, which runs the forwarding task.
+
+        Args:
+            uri (str): URI of the resource.
+            session (Any): MCP session with ``send_resource_updated``.
+        """
+        self._sessions.setdefault(uri, weakref.WeakSet()).add(session)
+        if self._task is None or self._task.done():
+            self._subscription = self._feed.subscribe(
+                NOTIFY_BUFFER_SIZE, policy='coalesce'
+            )
+            self._task = asyncio.ensure_future(self._forward(self._subscription))
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Stop notifying a session about a resource.
+
+        Args:
+            uri (str): URI of the resource.
+            session (Any): Previously subscribed session.
+        """
+        sessions = self._sessions.get(uri)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._sessions[uri]
+
+    async def close(self) -> None:
+        """Stop forwarding events."""
+        if self._subscription is not None:
+            self._subscription.close()
+        if self._task is not None:
+            await self._task
+        self._subscription = None
+        self._task = None
+
+    async def _forward(self, subscription: Subscription) -> None:
+        """Send a notification for every event until the feed is closed.
+
+        Args:
+            subscription (Subscription): Coalescing feed subscription.
+        """
+        async for event in subscription:
+            prefix = task_resource_uri(event.project_name, '')
+            for uri, sessions in list(self._sessions.items()):
+                if not uri.startswith(prefix):
+                    continue
+                for session in list(sessions):
+                    try:
+                        await session.send_resource_updated(AnyUrl(uri))
+                        self.sent += 1
+                    except Exception as e:
+                        logger.warning(f'Dropping subscriber of {uri}: {e}')
+                        self.unsubscribe(uri, session)
@@ -0,0 +1,94 @@
+"""Process pool for rendering large tool outputs off the event loop.
+
+Rendering a large listing is pure-Python string work that holds the GIL,
+so running it in a thread would still stall the asyncio loop serving
+other requests. :class:`RenderPool` instead sends plain row tuples to a
+``ProcessPoolExecutor`` and gets rendered text back.
+
+Small outputs are rendered inline because pickling rows and text across
+processes costs more than formatting them. The crossover point is measured
+by ``benchmarks/bench_render_pool.py``.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from .formatting import TaskRow, render_task_lines
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows inline rendering beats the inter-process round trip.
+DEFAULT_MIN_OFFLOAD_ROWS = 20_000
+
+
+class RenderPool:
+    """Offloads rendering of large task listings to worker processes."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        min_offload_rows: int = DEFAULT_MIN_OFFLOAD_ROWS,
+    ) -> None:
+        """Initialize the pool. Worker processes start on first offload.
+
+        Args:
+            max_workers (int): Number of worker processes.
+            min_offload_rows (int, optional): Smallest listing that is sent
+                to the workers. Defaults to DEFAULT_MIN_OFFLOAD_ROWS.
+
+        Raises:
+            ValueError: If max_workers or min_offload_rows is not positive.
+        """
+        if max_workers < 1:
+            raise ValueError('Render workers must be positive')
+        if min_offload_rows < 1:
+            raise ValueError('Minimum offload rows must be positive')
+        self.max_workers = max_workers
+        self.min_offload_rows = min_offload_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def started(self) -> bool:
+        """Get whether the worker processes have been started.
+
+        Returns:
+            bool: True once the first listing has been offloaded.
+        """
+        return self._executor is not None
+
+    async def render_task_lines(self, rows: Sequence[TaskRow]) -> List[str]:
+        """Render task rows, in worker processes if the listing is large.
+
+        Large listings are split into one contiguous chunk per worker and
+        the rendered chunks are concatenated in order.
+
+        Args:
+            rows (Sequence[TaskRow]): Rows to render.
+
+        Returns:
+            List[str]: One to-do line per row.
+        """
+        if len(rows) < self.min_offload_rows:
+            return render_task_lines(rows)
+        if self._executor is None:
+            logger.info(f'Starting render pool with {self.max_workers} workers')
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        size = -(-len(rows) // self.max_workers)
+        chunks = [rows[i : i + size] for i in range(0, len(rows), size)]
+        rendered = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, render_task_lines, chunk)
+                for chunk in chunks
+            )
+        )
+        return [line for lines in rendered for line in lines]
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if they were started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
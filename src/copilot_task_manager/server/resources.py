@@ -0,0 +1,162 @@
+"""Task listings exposed as cacheable MCP resources.
+
+``tasks://{project}/{status}`` (status ``open``, ``completed`` or ``all``)
+returns the JSON listing of a project together with an ``etag``, and
+``tasks://{project}/{status}/etag`` returns only the tag. Tags are derived
+from the project's write version, so a client holding a listing reads the
+tag to revalidate without touching the database and re-reads the listing
+only when the tag changed. Tags include a per-process token, so versions
+restarting at zero after a restart never revive an old tag.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Tuple
+from urllib.parse import quote
+
+from fastmcp import FastMCP
+
+from ..database import TaskStore
+from ..database.task_db import VALID_STATUS_FILTERS
+from .formatting import dumps
+from .task_tools import TaskTools
+
+TASKS_URI = 'tasks://{project}/{status}'
+ETAG_URI = 'tasks://{project}/{status}/etag'
+
+
+def task_resource_uri(project_name: str, status: str = 'open') -> str:
+    """Return the URI of a project's task listing resource.
+
+    Args:
+        project_name (str): Name of the project.
+        status (str, optional): 'open', 'completed' or 'all'.
+            Defaults to 'open'.
+
+    Returns:
+        str: ``tasks://{project}/{status}`` with the name percent-encoded.
+    """
+    return f"tasks://{quote(project_name, safe='')}/{status}"
+
+
+class TaskResources:
+    """Read handlers for the task listing resources."""
+
+    def __init__(self, db: TaskStore, tools: TaskTools) -> None:
+        """Initialize the handlers.
+
+        Args:
+            db (TaskStore): Storage the projects are looked up in.
+            tools (TaskTools): Tool handlers rendering the listings and
+                tracking write versions.
+        """
+        self._db = db
+        self._tools = tools
+        self._instance = os.urandom(8).hex()
+        self._bodies: Dict[Tuple[int, str], Tuple[str, str]] = {}
+
+    def register(self, mcp: FastMCP[Any]) -> None:
+        """Register the resource templates with a FastMCP instance.
+
+        Args:
+            mcp (FastMCP): The FastMCP server to register the resources with.
+        """
+        mcp.add_resource_fn(
+            self.read_tasks,
+            TASKS_URI,
+            name='tasks',
+            description=(
+                "Tasks of a project as JSON, for status 'open', 'completed' or "
+                "'all', with an etag that changes on every write to the project."
+            ),
+            mime_type='application/json',
+        )
+        mcp.add_resource_fn(
+            self.read_etag,
+            ETAG_URI,
+            name='tasks-etag',
+            description=(
+                'Current etag of a task listing resource; re-read the listing '
+                'only when it differs from the etag of the copy held.'
+            ),
+            mime_type='text/plain',
+        )
+
+    def etag(self, project_id: int, status: str) -> str:
+        """Derive the tag of a listing from the project's write version.
+
+        Args:
+            project_id (int): ID of the project.
+            status (str): Status filter of the listing.
+
+        Returns:
+            str: Hex tag, changing with every write to the project.
+        """
+        version = self._tools.project_version(project_id)
+        key = f'{self._instance}:{project_id}:{status}:{version}'
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+    async def read_tasks(self, project: str, status: str) -> str:
+        """Read a task listing resource.
+
+        Args:
+            project (str): Name of the project.
+            status (str): 'open', 'completed' or 'all'.
+
+        Returns:
+            str: JSON listing with an ``etag`` field.
+
+        Raises:
+            ValueError: If the project or status is unknown, or the listing
+                fails.
+        """
+        project_id = self._project_id(project, status)
+        etag = self.etag(project_id, status)
+        cached = self._bodies.get((project_id, status))
+        if cached is not None and cached[0] == etag:
+            return cached[1]
+        listing = await self._tools.list_tasks(project, status, 'json')
+        if not listing.startswith('{'):
+            raise ValueError(listing)
+        body = dumps({'etag': etag, **json.loads(listing)})
+        self._bodies[(project_id, status)] = (etag, body)
+        return body
+
+    async def read_etag(self, project: str, status: str) -> str:
+        """Read the current tag of a task listing resource.
+
+        Args:
+            project (str): Name of the project.
+            status (str): 'open', 'completed' or 'all'.
+
+        Returns:
+            str: The tag ``read_tasks`` would return now.
+
+        Raises:
+            ValueError: If the project or status is unknown.
+        """
+        return self.etag(self._project_id(project, status), status)
+
+    def _project_id(self, project_name: str, status: str) -> int:
+        """Look up the project of a resource URI.
+
+        Args:
+            project_name (str): Name of the project.
+            status (str): Status filter of the resource.
+
+        Returns:
+            int: ID of the project.
+
+        Raises:
+            ValueError: If the project or status is unknown.
+        """
+        if status not in VALID_STATUS_FILTERS:
+            raise ValueError(
+                f"Invalid status '{status}'. "
+                f"Use one of: {', '.join(VALID_STATUS_FILTERS)}"
+            )
+        found = self._db.get_project_by_name(project_name)
+        if found is None or found.project_id is None:
+            raise ValueError(f"Project '{project_name}' not found.")
+        return found.project_id
@@ -0,0 +1,138 @@
+"""Per-session state of MCP clients.
+
+The active project used to be a single value for the whole process, so
+clients sharing one server overwrote each other's choice.
+:class:`SessionStore` keeps the active project per session, keyed by the
+ID returned by :func:`~.admission.current_client_id`. The tools register
+the store with :func:`~.admission.watch_sessions`, so the entry of a
+session is discarded once the session object is gone.
+
+Entries are kept in least-recently-used order, so idle sessions are
+evicted from the front in amortised O(1), and the number of sessions is
+capped. Each entry is a slotted object holding the project ID, name and
+last access time.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+DEFAULT_SESSION_IDLE = 3600.0
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class _Session:
+    """Active project of one session."""
+
+    __slots__ = ('project_id', 'project_name', 'last_seen')
+
+    def __init__(self, project_id: int, project_name: str, last_seen: float) -> None:
+        """Initialize the entry.
+
+        Args:
+            project_id (int): ID of the active project.
+            project_name (str): Name of the active project.
+            last_seen (float): Clock reading of the last access.
+        """
+        self.project_id = project_id
+        self.project_name = project_name
+        self.last_seen = last_seen
+
+
+class SessionStore:
+    """Active projects of client sessions with idle eviction."""
+
+    def __init__(
+        self,
+        *,
+        max_idle: Optional[float] = DEFAULT_SESSION_IDLE,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty store.
+
+        Args:
+            max_idle (Optional[float], optional): Seconds after which an
+                unused session is forgotten; None keeps sessions until the
+                store is full. Defaults to DEFAULT_SESSION_IDLE.
+            max_sessions (int, optional): Sessions kept at most; the least
+                recently used one is evicted beyond that.
+                Defaults to DEFAULT_MAX_SESSIONS.
+            clock (Callable[[], float], optional): Monotonic clock in
+                seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If a limit is out of range.
+        """
+        if max_idle is not None and max_idle <= 0:
+            raise ValueError('Session idle timeout must be positive')
+        if max_sessions < 1:
+            raise ValueError('Maximum sessions must be positive')
+        self.max_idle = max_idle
+        self.max_sessions = max_sessions
+        self.evicted = 0
+        self._clock = clock
+        self._sessions: 'OrderedDict[str, _Session]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of tracked sessions."""
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Tuple[int, str]]:
+        """Get the active project of a session and mark it as used.
+
+        Args:
+            session_id (str): ID of the session.
+
+        Returns:
+            Optional[Tuple[int, str]]: ID and name of the active project, or
+                None if the session has none or was evicted.
+        """
+        now = self._clock()
+        self._evict_idle(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        session.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return session.project_id, session.project_name
+
+    def set(self, session_id: str, project_id: int, project_name: str) -> None:
+        """Set the active project of a session.
+
+        Args:
+            session_id (str): ID of the session.
+            project_id (int): ID of the project.
+            project_name (str): Name of the project.
+        """
+        now = self._clock()
+        self._evict_idle(now)
+        self._sessions[session_id] = _Session(project_id, project_name, now)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session.
+
+        Args:
+            session_id (str): ID of the session.
+        """
+        self._sessions.pop(session_id, None)
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop the sessions idle for longer than max_idle.
+
+        Args:
+            now (float): Current clock reading in seconds.
+        """
+        if self.max_idle is None:
+            return
+        cutoff = now - self.max_idle
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_seen > cutoff:
+                return
+            self._sessions.popitem(last=False)
+            self.evicted += 1
@@ -0,0 +1,62 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+When several clients refresh the same project at once, each read would
+repeat the same query and rendering. :class:`SingleFlight` lets the first
+caller for a key start the work and every caller arriving while it is in
+flight await the same result, so a burst of N identical reads costs one.
+
+Keys must capture everything the result depends on. The tool layer uses
+the tool name, the normalised arguments and the project's write version,
+so a read that starts after a write never joins a read started before it.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Shares one in-flight coroutine between callers with the same key."""
+
+    def __init__(self) -> None:
+        """Initialize with no reads in flight."""
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, 'asyncio.Task[Any]'] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of keys currently being computed.
+
+        Returns:
+            int: Number of in-flight keys.
+        """
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run factory for key, or join the run already in flight for it.
+
+        The shared run is shielded, so a cancelled caller does not cancel
+        the result the other callers are waiting for.
+
+        Args:
+            key (Hashable): Identity of the read.
+            factory (Callable[[], Awaitable[T]]): Starts the read.
+
+        Returns:
+            T: The result of the shared run.
+
+        Raises:
+            Exception: Whatever the shared run raised, to every caller.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        result: T = await asyncio.shield(task)
+        return result
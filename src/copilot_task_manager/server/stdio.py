@@ -0,0 +1,325 @@
+"""Stdio transport with JSON-RPC batches and coalesced output.
+
+A drop-in replacement for ``mcp.server.stdio.stdio_server`` that, on top
+of one message per line:
+
+* accepts JSON-RPC batch arrays. Every message of a batch is handed to the
+  server on its own, so the server dispatches the calls concurrently, and
+  the responses are written back as one array once the last one is ready.
+  Elements that are not valid messages get an "Invalid Request" error in
+  the batch response, and a batch of notifications only gets no response.
+* writes through a buffered stream. The writer takes every response that
+  is ready, joins them and flushes once, instead of flushing every message,
+  so pipelined calls that finish together cost one write.
+
+Ordering between pipelined or batched calls is kept by the tools, see
+:mod:`.call_order`.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import sys
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from io import TextIOWrapper
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+from .formatting import dumps
+
+# Responses that may wait for the writer before the server blocks on it.
+MAX_PENDING_WRITES = 256
+
+RequestId = Union[str, int]
+Outgoing = Union[SessionMessage, str]
+
+
+@dataclass
+class _Batch:
+    """Responses of one batch, collected until every request answered."""
+
+    pending: Set[RequestId] = field(default_factory=set)
+    responses: List[str] = field(default_factory=list)
+
+    def line(self) -> str:
+        """Return the batch response as one output line."""
+        return f"[{','.join(self.responses)}]\n"
+
+
+def invalid_request(request_id: Optional[RequestId] = None) -> str:
+    """Serialize an "Invalid Request" error response.
+
+    Args:
+        request_id (Optional[RequestId], optional): ID of the request, if it
+            could be read. Defaults to None.
+
+    Returns:
+        str: The JSON-RPC error response.
+    """
+    return dumps(
+        {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'error': {'code': types.INVALID_REQUEST, 'message': 'Invalid Request'},
+        }
+    )
+
+
+def _serialize(message: SessionMessage) -> str:
+    """Serialize an outgoing message.
+
+    Args:
+        message (SessionMessage): Message written by the server.
+
+    Returns:
+        str: The JSON-RPC message.
+    """
+    return message.message.model_dump_json(by_alias=True, exclude_none=True)
+
+
+class RequestTracker:
+    """Tracks unanswered requests and groups batch responses."""
+
+    def __init__(self) -> None:
+        """Initialize with no requests in flight."""
+        self._batches: Dict[RequestId, _Batch] = {}
+        self._unanswered: Set[RequestId] = set()
+        self._answered: Optional[anyio.Event] = None
+
+    async def wait_answered(self) -> None:
+        """Wait until every request read so far has been answered."""
+        if self._unanswered:
+            self._answered = anyio.Event()
+            await self._answered.wait()
+
+    def read(self, line: str) -> Tuple[List[Union[SessionMessage, Exception]], str]:
+        """Parse one input line.
+
+        Args:
+            line (str): One line of input.
+
+        Returns:
+            Tuple[List[Union[SessionMessage, Exception]], str]: Messages for
+                the server, and output to write at once: the error response
+                of a batch none of whose requests reach the server, or "".
+        """
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            return [e], ''
+        if not isinstance(payload, list):
+            message = self._validate(payload)
+            if not isinstance(message, Exception):
+                self._track(message)
+            return [message], ''
+        if not payload:
+            return [], f'{invalid_request()}\n'
+        batch = _Batch()
+        messages: List[Union[SessionMessage, Exception]] = []
+        for item in payload:
+            message = self._validate(item)
+            if isinstance(message, Exception):
+                item_id = item.get('id') if isinstance(item, dict) else None
+                if not isinstance(item_id, (str, int)) or isinstance(item_id, bool):
+                    item_id = None
+                batch.responses.append(invalid_request(item_id))
+                continue
+            request_id = self._track(message)
+            if request_id is not None:
+                batch.pending.add(request_id)
+                self._batches[request_id] = batch
+            messages.append(message)
+        if not batch.pending and batch.responses:
+            return messages, batch.line()
+        return messages, ''
+
+    def write(self, message: SessionMessage) -> str:
+        """Return the output of one message written by the server.
+
+        Args:
+            message (SessionMessage): Message written by the server.
+
+        Returns:
+            str: The message as a line, the completed response of its batch,
+                or "" while other requests of its batch are pending.
+        """
+        root = message.message.root
+        if isinstance(root, (types.JSONRPCResponse, types.JSONRPCError)):
+            self._unanswered.discard(root.id)
+            if not self._unanswered and self._answered is not None:
+                self._answered.set()
+            batch = self._batches.pop(root.id, None)
+            if batch is not None:
+                batch.pending.discard(root.id)
+                batch.responses.append(_serialize(message))
+                return '' if batch.pending else batch.line()
+        return _serialize(message) + '\n'
+
+    def _track(self, message: SessionMessage) -> Optional[RequestId]:
+        """Remember a request until it is answered.
+
+        Args:
+            message (SessionMessage): Message read from the client.
+
+        Returns:
+            Optional[RequestId]: ID of the request, or None for other messages.
+        """
+        root = message.message.root
+        if not isinstance(root, types.JSONRPCRequest):
+            return None
+        self._unanswered.add(root.id)
+        return root.id
+
+    @staticmethod
+    def _validate(payload: Any) -> Union[SessionMessage, Exception]:
+        """Validate one JSON-RPC message.
+
+        Args:
+            payload (Any): Parsed JSON value.
+
+        Returns:
+            Union[SessionMessage, Exception]: The message, or the validation
+                error, which the server logs like the stock transport does.
+        """
+        try:
+            return SessionMessage(types.JSONRPCMessage.model_validate(payload))
+        except Exception as e:
+            return e
+
+
+async def thread_lines(stream: TextIO) -> AsyncIterator[str]:
+    """Read lines of a blocking stream on a daemon thread.
+
+    Unlike a worker thread of ``anyio.wrap_file``, a read in progress does
+    not hold up cancelling the reader, nor exiting the process afterwards.
+    The thread reads the next line only once the previous one was taken.
+
+    Args:
+        stream (TextIO): Blocking text stream, e.g. stdin.
+
+    Yields:
+        str: The lines, until the stream ends.
+    """
+    loop = asyncio.get_running_loop()
+    lines: 'asyncio.Queue[str]' = asyncio.Queue(1)
+
+    def pump() -> None:
+        while True:
+            line = stream.readline()
+            try:
+                asyncio.run_coroutine_threadsafe(lines.put(line), loop).result()
+            except (RuntimeError, concurrent.futures.CancelledError):
+                return  # the loop is closed or shutting down
+            if not line:
+                return
+
+    threading.Thread(target=pump, name='stdin reader', daemon=True).start()
+    while line := await lines.get():
+        yield line
+
+
+@asynccontextmanager
+async def stdio_transport(
+    stdin: Optional['anyio.AsyncFile[str]'] = None,
+    stdout: Optional['anyio.AsyncFile[str]'] = None,
+) -> AsyncIterator[
+    Tuple[
+        MemoryObjectReceiveStream[Union[SessionMessage, Exception]],
+        MemoryObjectSendStream[SessionMessage],
+    ]
+]:
+    """Communicate with an MCP client over stdin and stdout.
+
+    Args:
+        stdin (Optional[anyio.AsyncFile[str]], optional): Input lines.
+            Defaults to None, reading the process' stdin as UTF-8.
+        stdout (Optional[anyio.AsyncFile[str]], optional): Output. Defaults
+            to None, writing the process' stdout as UTF-8.
+
+    Yields:
+        Tuple: The stream of incoming messages and the stream the server
+            writes its messages to, as expected by ``Server.run``.
+    """
+    # Like the stock transport, re-wrap the standard handles as UTF-8 and
+    # leave them open. Stdin is read on a daemon thread so that a stop
+    # signal can cancel the server while it waits for input; the thread
+    # gets its own buffer, as interpreter shutdown locks sys.stdin's.
+    input_lines: AsyncIterable[str]
+    if stdin is None:
+        input_lines = thread_lines(
+            open(sys.stdin.fileno(), encoding='utf-8', closefd=False)
+        )
+    else:
+        input_lines = stdin
+    if stdout is None:
+        stdout = anyio.wrap_file(TextIOWrapper(sys.stdout.buffer, encoding='utf-8'))
+    output = stdout
+
+    read_send, read_stream = anyio.create_memory_object_stream[
+        Union[SessionMessage, Exception]
+    ](0)
+    write_stream, write_receive = anyio.create_memory_object_stream[Outgoing](
+        MAX_PENDING_WRITES
+    )
+    tracker = RequestTracker()
+    reader_scope = anyio.CancelScope()
+
+    async def read_input(errors: MemoryObjectSendStream[Outgoing]) -> None:
+        with reader_scope:
+            async with read_send, errors:
+                async for line in input_lines:
+                    if not line.strip():
+                        continue
+                    messages, immediate = tracker.read(line)
+                    for message in messages:
+                        await read_send.send(message)
+                    if immediate:
+                        await errors.send(immediate)
+                # The session stops writing once its input ends, so answer
+                # the requests in flight first.
+                await tracker.wait_answered()
+
+    async def write_output() -> None:
+        async with write_receive:
+            async for first in write_receive:
+                chunks = [first]
+                while True:
+                    try:
+                        chunks.append(write_receive.receive_nowait())
+                    except anyio.WouldBlock:
+                        break
+                    except anyio.EndOfStream:
+                        break
+                text = ''.join(
+                    chunk if isinstance(chunk, str) else tracker.write(chunk)
+                    for chunk in chunks
+                )
+                if text:
+                    await output.write(text)
+                    await output.flush()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(read_input, write_stream.clone())
+        tg.start_soon(write_output)
+        try:
+            yield read_stream, write_stream
+        finally:
+            reader_scope.cancel()
+            await write_stream.aclose()
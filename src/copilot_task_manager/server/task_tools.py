@@ -0,0 +1,2106 @@
+"""Task management tool handlers for the Copilot Task Manager MCP server.
+
+Each public method of :class:`TaskTools` implements one MCP tool from the API
+specification (``.aidocs/api-spec.md``). Handlers never raise: failures are
+logged and reported back to Copilot as ``'Error: ...'`` strings.
+
+Listing tools accept a ``format`` of ``'text'`` (the specified to-do lines),
+``'compact'`` or ``'json'``; the server-wide default is set on
+:class:`TaskTools`.
+
+Identical ``listTasks`` calls that overlap share one read through
+:class:`SingleFlight`, keyed on the normalised arguments and the project's
+write version. When an :class:`AdmissionController` is given, every
+registered tool call but ``getHealth`` is admitted through it first. The
+latency of every registered call is recorded by the :class:`HealthMonitor`
+that ``getHealth`` reports from.
+"""
+
+import functools
+import inspect
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastmcp import FastMCP
+
+from ..database import TaskStore
+from ..database.analytics import (
+    AGE_BUCKETS,
+    age_buckets,
+    age_percentile,
+    bucket_sums,
+    dense_flow,
+)
+from ..database.dates import SECONDS_PER_DAY, decode_date, encode_date, now_seconds
+from ..database.history import rows_as_of
+from ..database.search import SearchKey, search_key, search_terms
+from ..indexes import (
+    DependencyCycleError,
+    DependencyGraph,
+    NextTaskIndex,
+    TagIndex,
+    TrigramIndex,
+)
+from ..indexes.trigram import similarity
+from ..models import Project, Task
+from .admission import (
+    AdmissionController,
+    ServerBusy,
+    current_client_id,
+    watch_sessions,
+)
+from .call_order import CallOrder
+from .change_feed import ChangeEvent, ChangeFeed
+from .formatting import (
+    COMPACT_HEADER,
+    JSON_COLUMNS,
+    RESPONSE_FORMATS,
+    dumps,
+    format_candidates,
+    format_task_line,
+    format_task_ref,
+    render_compact_row,
+    render_history_event,
+    render_task_lines,
+    render_task_row,
+    task_row,
+)
+from .health import HealthMonitor, file_sizes
+from .line_cache import LineCache, raw_task_row
+from .render_pool import RenderPool
+from .sessions import SessionStore
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# A fuzzy match is accepted without asking the client to retry only when it
+# is both similar enough and clearly ahead of the runner-up.
+FUZZY_ACCEPT_SCORE = 0.6
+FUZZY_ACCEPT_MARGIN = 0.15
+FUZZY_CANDIDATES = 5
+MAX_FIND_LIMIT = 50
+DEFAULT_NEXT_TASKS = 5
+MAX_NEXT_TASKS = 50
+MAX_TAG_LENGTH = 64
+DEFAULT_RANGE_DAYS = 14
+MAX_RANGE_DAYS = 366
+THROUGHPUT_INTERVALS = {'day': 1, 'week': 7}
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+# listTasks tag filter: (all of, any of, none of) normalised tags.
+TagFilter = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+NO_TAG_FILTER: TagFilter = ((), (), ())
+
+# Tools that write data; queued reads are admitted before them.
+WRITE_TOOLS = frozenset(
+    {
+        'createProjectList',
+        'addTask',
+        'markTaskComplete',
+        'removeTask',
+        'moveTasks',
+        'copyProject',
+        'addDependency',
+        'tagTask',
+        'untagTask',
+    }
+)
+
+# Calls sequenced as writes by CallOrder: writes, and setActiveProject, which
+# changes what the session's later calls operate on.
+ORDERED_WRITES = WRITE_TOOLS | {'setActiveProject'}
+
+# Tools answered without admission, so a saturated server still reports.
+UNADMITTED_TOOLS = frozenset({'getHealth'})
+
+NO_PROJECT_ERROR = (
+    'Error: No project specified and no active project set. '
+    'Use setActiveProject or provide a projectName.'
+)
+
+TOOL_DESCRIPTIONS: Dict[str, str] = {
+    'createProjectList': (
+        'Creates a new, empty task list for a given project name. Use this '
+        'when a user wants to start tracking tasks for a new project or '
+        "initialize a task list for an existing project name that doesn't "
+        'have one yet.'
+    ),
+    'setActiveProject': (
+        'Sets the currently active project for subsequent task operations. '
+        'Once set, other commands like addTask or listTasks will use this '
+        'project by default unless a specific project name is provided in '
+        'those commands. The project must exist.'
+    ),
+    'addTask': (
+        'Adds a new task. If projectName is not provided, the task is added '
+        'to the currently active project (set via setActiveProject). If '
+        'projectName is provided, it overrides the active project for this '
+        'command. An active project must be set or a project name provided. '
+        'Optionally, a priority level and a due date can be included for the '
+        'task.'
+    ),
+    'listTasks': (
+        'Lists tasks. If projectName is not provided, lists tasks for the '
+        'currently active project. If projectName is provided, it overrides '
+        'the active project. An active project must be set or a project name '
+        'provided. Tasks can be optionally filtered by their status (e.g., '
+        "'open', 'completed', or 'all'). Defaults to 'open' tasks if no "
+        "filter is provided. format selects 'text' to-do lines, 'compact' "
+        "tab-separated rows or a 'json' payload. Tasks can also be filtered "
+        'by tag: tags lists tags a task must all have, anyTags tags of which '
+        'it must have at least one, and excludeTags tags it must not have. '
+        'asOf lists the tasks as they were at an earlier UTC time, e.g. '
+        "'2025-05-01T12:00:00'; a date alone means the end of that day. "
+        'asOf cannot be combined with tag filters.'
+    ),
+    'markTaskComplete': (
+        'Marks a specific task as completed. If projectName is not provided, '
+        'operates on the currently active project. If projectName is '
+        'provided, it overrides the active project. An active project must '
+        'be set or a project name provided. The task is identified either by '
+        'its unique numerical ID or by a unique portion of its description. '
+        'Nothing is changed unless the identifier matches exactly one task; '
+        'otherwise the ranked candidates are returned.'
+    ),
+    'removeTask': (
+        'Removes a specific task. If projectName is not provided, operates on '
+        'the currently active project. If projectName is provided, it '
+        'overrides the active project. An active project must be set or a '
+        'project name provided. The task is identified either by its unique '
+        'numerical ID or by a unique portion of its description. Nothing is '
+        'removed unless the identifier matches exactly one task; otherwise '
+        'the ranked candidates are returned.'
+    ),
+    'moveTasks': (
+        'Moves tasks from a project to another existing project '
+        '(targetProjectName) in one step, e.g. to split a project. Moves the '
+        'tasks of the active project unless projectName is provided. Select '
+        "the tasks with taskIds, statusFilter ('open', 'completed' or "
+        "'all', the default) and the tag filters tags, anyTags and "
+        'excludeTags of listTasks; with no filter every task is moved. Tasks '
+        'keep their tags and the dependencies among them; dependencies on '
+        'tasks left behind are dropped.'
+    ),
+    'copyProject': (
+        'Creates a new project (newProjectName) holding a copy of every task '
+        'of an existing project, e.g. to start from a template project. The '
+        'copies get new IDs and keep their status, priority, due date, tags '
+        'and dependencies. Copies the active project unless projectName is '
+        'provided.'
+    ),
+    'findTasks': (
+        'Finds the tasks whose descriptions best match a free-text query, '
+        'tolerating typos and paraphrases. Returns up to limit candidates '
+        'ranked by similarity score (0-1), so the right task ID can be '
+        'picked in a single call. Uses the active project unless projectName '
+        "is provided. format selects 'text', 'compact' or 'json' output."
+    ),
+    'searchTasks': (
+        'Searches the task descriptions of all projects at once. A task '
+        'matches when every word of the query starts a word of its '
+        "description, ignoring case and accents ('doc' matches 'Docs'). "
+        'Results are grouped by project and returned limit at a time; pass '
+        'the returned cursor to get the next page. statusFilter is '
+        "'open' (default), 'completed' or 'all'. format selects 'text', "
+        "'compact' or 'json' output."
+    ),
+    'getNextTasks': (
+        'Returns the k open tasks to work on next, ordered by priority '
+        '(1 is most urgent), then earliest due date, then task ID. Tasks '
+        'without a priority or due date come after those that have one. '
+        'Uses the active project unless projectName is provided. format '
+        "selects 'text', 'compact' or 'json' output."
+    ),
+    'addDependency': (
+        'Records that a task cannot start before another task of the same '
+        'project is completed. Both tasks are identified by their ID or a '
+        'unique portion of their description. Dependencies that would form '
+        'a cycle are rejected. Uses the active project unless projectName '
+        'is provided.'
+    ),
+    'tagTask': (
+        'Adds one or more tags (labels such as an area, sprint or owner) to '
+        'a task, identified by its ID or a unique portion of its '
+        'description. Tags are case-insensitive. Uses the active project '
+        'unless projectName is provided.'
+    ),
+    'untagTask': (
+        'Removes one or more tags from a task, identified by its ID or a '
+        'unique portion of its description. Uses the active project unless '
+        'projectName is provided.'
+    ),
+    'listTags': (
+        'Lists the tags used in a project with the number of tasks carrying '
+        'each. Uses the active project unless projectName is provided.'
+    ),
+    'getTaskHistory': (
+        'Returns the change history of a task, oldest first: when it was '
+        'created, tagged, untagged, given dependencies, completed or '
+        'removed. The task is identified by its ID (also for removed tasks) '
+        'or a unique portion of its description. Uses the active project '
+        'unless projectName is provided.'
+    ),
+    'getBurndown': (
+        'Returns the burndown of a project: the number of open tasks at the '
+        'end of each day from startDate to endDate (YYYY-MM-DD, UTC, at most '
+        f'{MAX_RANGE_DAYS} days). endDate defaults to today and startDate to '
+        f'{DEFAULT_RANGE_DAYS - 1} days before endDate. Uses the active project '
+        'unless projectName is provided.'
+    ),
+    'getThroughput': (
+        'Returns the number of tasks created and completed in a project per '
+        "interval ('day' or 'week', counted from startDate) from startDate "
+        'to endDate, with the same date defaults as getBurndown. Uses the '
+        'active project unless projectName is provided.'
+    ),
+    'getTaskAging': (
+        'Returns how long the open tasks of a project have been open at the '
+        'end of a day (asOfDate, YYYY-MM-DD, default today): the median, '
+        '90th percentile and maximum age in days, and the number of tasks '
+        'per age bucket. Uses the active project unless projectName is '
+        'provided.'
+    ),
+    'listReadyTasks': (
+        'Lists the open tasks that are ready to start: tasks with no open '
+        'prerequisites (see addDependency), ordered by ID. Uses the active '
+        "project unless projectName is provided. format selects 'text', "
+        "'compact' or 'json' output."
+    ),
+    'getHealth': (
+        'Reports the health of the task manager server: uptime, event loop '
+        'lag, running and queued calls, database and write-ahead log size, '
+        'cache hit ratios and the p50/p95/p99 latency of recent tool calls, '
+        'compared with the configured service level objectives. The first '
+        "line is 'Status: ok' or 'Status: degraded' with the missed "
+        'objectives.'
+    ),
+}
+
+
+class _ToolError(Exception):
+    """Raised inside a handler to return a user-facing error message."""
+
+
+class TaskTools:
+    """Handlers for the task management MCP tools."""
+
+    def __init__(
+        self,
+        db: TaskStore,
+        render_pool: Optional[RenderPool] = None,
+        *,
+        response_format: str = 'text',
+        admission: Optional[AdmissionController] = None,
+        change_feed: Optional[ChangeFeed] = None,
+        sessions: Optional[SessionStore] = None,
+        health: Optional[HealthMonitor] = None,
+    ) -> None:
+        """Initialize the tool handlers.
+
+        Args:
+            db (TaskStore): Storage used to persist projects and tasks.
+            render_pool (Optional[RenderPool], optional): Worker pool for
+                rendering large listings. Defaults to None, rendering inline.
+            response_format (str, optional): Format of listings when a call
+                does not choose one: 'text', 'compact' or 'json'.
+                Defaults to 'text'.
+            admission (Optional[AdmissionController], optional): Admission
+                control applied to registered tool calls. Defaults to None,
+                admitting every call.
+            change_feed (Optional[ChangeFeed], optional): Feed every
+                successful write is published to. Defaults to None.
+            sessions (Optional[SessionStore], optional): Store of the active
+                project of each client session. Defaults to None, creating
+                one with default limits.
+            health (Optional[HealthMonitor], optional): Monitor recording
+                call latencies for getHealth. Defaults to None, creating one
+                with the default SLO targets.
+
+        Raises:
+            ValueError: If response_format is not a known format.
+        """
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format '{response_format}'")
+        self.response_format = response_format
+        self.admission = admission
+        self.change_feed = change_feed
+        self._db = db
+        self._render_pool = render_pool
+        self.sessions = sessions if sessions is not None else SessionStore()
+        watch_sessions(self.sessions)
+        if admission is not None:
+            watch_sessions(admission)
+        self.health = health if health is not None else HealthMonitor()
+        self._trigram_indexes: Dict[int, TrigramIndex] = {}
+        self._next_indexes: Dict[int, NextTaskIndex] = {}
+        self._dependency_graphs: Dict[int, DependencyGraph] = {}
+        self._tag_indexes: Dict[int, TagIndex] = {}
+        self.line_cache = LineCache()
+        self.reads = SingleFlight()
+        self.call_order = CallOrder()
+        self._versions: Dict[int, int] = {}
+
+    def register(self, mcp: FastMCP[Any]) -> None:
+        """Register every tool handler with a FastMCP instance.
+
+        Args:
+            mcp (FastMCP): The FastMCP server to register the tools with.
+        """
+        handlers: Dict[str, Callable[..., Any]] = {
+            'createProjectList': self.create_project_list,
+            'setActiveProject': self.set_active_project,
+            'addTask': self.add_task,
+            'listTasks': self.list_tasks,
+            'markTaskComplete': self.mark_task_complete,
+            'removeTask': self.remove_task,
+            'moveTasks': self.move_tasks,
+            'copyProject': self.copy_project,
+            'findTasks': self.find_tasks,
+            'searchTasks': self.search_tasks,
+            'getNextTasks': self.get_next_tasks,
+            'addDependency': self.add_dependency,
+            'listReadyTasks': self.list_ready_tasks,
+            'tagTask': self.tag_task,
+            'untagTask': self.untag_task,
+            'listTags': self.list_tags,
+            'getTaskHistory': self.get_task_history,
+            'getBurndown': self.get_burndown,
+            'getThroughput': self.get_throughput,
+            'getTaskAging': self.get_task_aging,
+            'getHealth': self.get_health,
+        }
+        for name, handler in handlers.items():
+            handler = self._dispatched(
+                name,
+                handler,
+                self.call_order,
+                None if name in UNADMITTED_TOOLS else self.admission,
+                self.health,
+            )
+            mcp.add_tool(handler, name=name, description=TOOL_DESCRIPTIONS[name])
+
+    def create_project_list(self, projectName: str) -> str:
+        """Create a new, empty task list for a project.
+
+        Args:
+            projectName (str): Unique name of the project.
+
+        Returns:
+            str: Confirmation or error message.
+        """
+        name = (projectName or '').strip()
+        if not name:
+            return 'Error: Project name cannot be empty.'
+        try:
+            existing = self._db.get_project_by_name(name)
+            if existing is not None:
+                return (
+                    f"Error: Project list '{name}' already exists "
+                    f'(ID: {existing.project_id}).'
+                )
+            project_id = self._db.create_project(name)
+            if project_id is None:
+                return f"Error: Could not create project list '{name}'."
+            self._bump_version(
+                Project(project_id=project_id, project_name=name), 'project_created'
+            )
+            return f"Project list '{name}' created successfully with ID: {project_id}."
+        except Exception as e:
+            logger.error(f"Unexpected error creating project '{name}': {e}")
+            return f"Error: Could not create project list '{name}': {e}"
+
+    def set_active_project(self, projectName: str) -> str:
+        """Set the project used when a tool call of this session names none.
+
+        Args:
+            projectName (str): Name of an existing project.
+
+        Returns:
+            str: Confirmation or error message.
+        """
+        name = (projectName or '').strip()
+        if not name:
+            return 'Error: Project name cannot be empty.'
+        try:
+            project = self._db.get_project_by_name(name)
+            if project is None:
+                return f"Error: Project '{name}' not found. Cannot set as active."
+            self.sessions.set(
+                current_client_id(), self._project_id(project), project.project_name
+            )
+            return f"Project '{name}' is now the active project."
+        except Exception as e:
+            logger.error(f"Unexpected error activating project '{name}': {e}")
+            return f"Error: Could not set project '{name}' as active: {e}"
+
+    def add_task(
+        self,
+        taskDescription: str,
+        projectName: Optional[str] = None,
+        priority: Optional[int] = None,
+        dueDate: Optional[str] = None,
+    ) -> str:
+        """Add a task to the given or active project.
+
+        Args:
+            taskDescription (str): Description of the task.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            priority (Optional[int], optional): Task priority. Defaults to None.
+            dueDate (Optional[str], optional): Due date (YYYY-MM-DD).
+                Defaults to None.
+
+        Returns:
+            str: Confirmation or error message.
+        """
+        description = (taskDescription or '').strip()
+        if not description:
+            return 'Error: Task description cannot be empty.'
+        try:
+            due_day = self._validate_due_date(dueDate) if dueDate else None
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            task_id = self._db.add_task(project_id, description, priority, dueDate)
+            if task_id is None:
+                return f"Error: Could not add task to '{project.project_name}'."
+            index = self._trigram_indexes.get(project_id)
+            if index is not None:
+                index.add(task_id, description)
+            next_index = self._next_indexes.get(project_id)
+            if next_index is not None:
+                next_index.add(task_id, priority, due_day)
+            graph = self._dependency_graphs.get(project_id)
+            if graph is not None:
+                graph.add_task(task_id)
+            self._bump_version(project, 'task_added', task_id)
+            return (
+                f"Task added to '{project.project_name}' (ID: {task_id}): "
+                f'[ ] {description} (Priority: {priority}, Due: {dueDate}).'
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error adding task: {e}')
+            return f'Error: Could not add task: {e}'
+
+    async def list_tasks(
+        self,
+        projectName: Optional[str] = None,
+        statusFilter: str = 'open',
+        format: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        anyTags: Optional[List[str]] = None,
+        excludeTags: Optional[List[str]] = None,
+        asOf: Optional[str] = None,
+    ) -> str:
+        """List the tasks of the given or active project.
+
+        Args:
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            statusFilter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+            format (Optional[str], optional): 'text', 'compact' or 'json'.
+                Defaults to None, using the server-wide format.
+            tags (Optional[List[str]], optional): Tags a task must all have.
+                Defaults to None.
+            anyTags (Optional[List[str]], optional): Tags of which a task
+                must have at least one. Defaults to None.
+            excludeTags (Optional[List[str]], optional): Tags a task must not
+                have. Defaults to None.
+            asOf (Optional[str], optional): ISO 8601 UTC time to list the
+                tasks as of, reconstructed from their history; a date alone
+                means the end of that day. Defaults to None, listing the
+                current tasks.
+
+        Returns:
+            str: The listing in the requested format, or an info/error
+                message. An empty listing is a message in text and compact
+                format and an empty ``tasks`` array in JSON.
+        """
+        status = (statusFilter or 'open').strip().lower()
+        if status not in ('open', 'completed', 'all'):
+            return (
+                f"Error: Invalid status filter '{statusFilter}'. "
+                "Use 'open', 'completed' or 'all'."
+            )
+        try:
+            response_format = self._response_format(format)
+            tag_filter: TagFilter = (
+                tuple(self._normalize_tags(tags or [])),
+                tuple(self._normalize_tags(anyTags or [])),
+                tuple(self._normalize_tags(excludeTags or [])),
+            )
+            as_of = self._parse_as_of(asOf) if asOf else None
+            if as_of is not None and any(tag_filter):
+                return 'Error: asOf cannot be combined with tag filters.'
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            key = (
+                'listTasks',
+                project_id,
+                status,
+                response_format,
+                tag_filter,
+                as_of,
+                self.project_version(project_id),
+            )
+            return await self.reads.run(
+                key,
+                lambda: self._render_listing(
+                    project, status, response_format, tag_filter, as_of
+                ),
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error listing tasks: {e}')
+            return f'Error: Could not list tasks: {e}'
+
+    def mark_task_complete(
+        self, taskIdOrDescription: str, projectName: Optional[str] = None
+    ) -> str:
+        """Mark a task of the given or active project as completed.
+
+        Args:
+            taskIdOrDescription (str): Task ID or part of its description.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation, info or error message.
+        """
+        identifier = (taskIdOrDescription or '').strip()
+        if not identifier:
+            return 'Error: Task identifier cannot be empty.'
+        try:
+            project = self._get_current_project_context(projectName)
+            task = self._resolve_task(project, identifier)
+            ref = format_task_ref(task)
+            if task.status == 'completed':
+                return (
+                    f"Info: Task '{ref}' in '{project.project_name}' "
+                    'is already marked as complete.'
+                )
+            task_id = self._task_id(task)
+            if not self._db.mark_task_complete(task.project_id, task_id):
+                return f"Error: Could not mark task '{ref}' as complete."
+            self.line_cache.invalidate(task.project_id, task_id)
+            next_index = self._next_indexes.get(task.project_id)
+            if next_index is not None:
+                next_index.remove(task_id)
+            graph = self._dependency_graphs.get(task.project_id)
+            if graph is not None:
+                graph.complete(task_id)
+            self._bump_version(project, 'task_completed', task_id)
+            return f"Task '{ref}' in '{project.project_name}' marked as complete."
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error completing task: {e}')
+            return f'Error: Could not mark task as complete: {e}'
+
+    def remove_task(
+        self, taskIdOrDescription: str, projectName: Optional[str] = None
+    ) -> str:
+        """Remove a task from the given or active project.
+
+        Args:
+            taskIdOrDescription (str): Task ID or part of its description.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation or error message.
+        """
+        identifier = (taskIdOrDescription or '').strip()
+        if not identifier:
+            return 'Error: Task identifier cannot be empty.'
+        try:
+            project = self._get_current_project_context(projectName)
+            task = self._resolve_task(project, identifier)
+            ref = format_task_ref(task)
+            task_id = self._task_id(task)
+            if not self._db.remove_task(task.project_id, task_id):
+                return f"Error: Could not remove task '{ref}'."
+            self.line_cache.invalidate(task.project_id, task_id)
+            index = self._trigram_indexes.get(task.project_id)
+            if index is not None:
+                index.remove(task_id)
+            next_index = self._next_indexes.get(task.project_id)
+            if next_index is not None:
+                next_index.remove(task_id)
+            graph = self._dependency_graphs.get(task.project_id)
+            if graph is not None:
+                graph.remove(task_id)
+            tag_index = self._tag_indexes.get(task.project_id)
+            if tag_index is not None:
+                tag_index.remove(task_id)
+            self._bump_version(project, 'task_removed', task_id)
+            return f"Task '{ref}' removed from '{project.project_name}'."
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error removing task: {e}')
+            return f'Error: Could not remove task: {e}'
+
+    def move_tasks(
+        self,
+        targetProjectName: str,
+        projectName: Optional[str] = None,
+        taskIds: Optional[List[int]] = None,
+        statusFilter: str = 'all',
+        tags: Optional[List[str]] = None,
+        anyTags: Optional[List[str]] = None,
+        excludeTags: Optional[List[str]] = None,
+    ) -> str:
+        """Move the selected tasks of the given or active project.
+
+        Args:
+            targetProjectName (str): Name of the receiving project.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            taskIds (Optional[List[int]], optional): IDs of the tasks to
+                move. Defaults to None, selecting by the other filters only.
+            statusFilter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'all'.
+            tags (Optional[List[str]], optional): Tags a task must all have.
+                Defaults to None.
+            anyTags (Optional[List[str]], optional): Tags of which a task
+                must have at least one. Defaults to None.
+            excludeTags (Optional[List[str]], optional): Tags a task must not
+                have. Defaults to None.
+
+        Returns:
+            str: Confirmation, info or error message.
+        """
+        target_name = (targetProjectName or '').strip()
+        if not target_name:
+            return 'Error: Target project name cannot be empty.'
+        status = (statusFilter or 'all').strip().lower()
+        if status not in ('open', 'completed', 'all'):
+            return (
+                f"Error: Invalid status filter '{statusFilter}'. "
+                "Use 'open', 'completed' or 'all'."
+            )
+        try:
+            tag_filter: TagFilter = (
+                tuple(self._normalize_tags(tags or [])),
+                tuple(self._normalize_tags(anyTags or [])),
+                tuple(self._normalize_tags(excludeTags or [])),
+            )
+            source = self._get_current_project_context(projectName)
+            target = self._get_current_project_context(target_name)
+            source_id = self._project_id(source)
+            target_id = self._project_id(target)
+            if source_id == target_id:
+                return f"Error: Tasks are already in '{target.project_name}'."
+            # The IDs are checked, the tasks selected and the dropped
+            # dependencies read in the storage engine's move transaction.
+            result = self._db.move_tasks(
+                source_id,
+                taskIds,
+                target_id,
+                status_filter=status,
+                all_of=tag_filter[0],
+                any_of=tag_filter[1],
+                none_of=tag_filter[2],
+            )
+            if result is None:
+                return (
+                    f"Error: Could not move tasks from '{source.project_name}' "
+                    f"to '{target.project_name}'."
+                )
+            if result.missing:
+                return (
+                    f'Error: Task (ID: {result.missing[0]}) not found in '
+                    f"'{source.project_name}'."
+                )
+            pairs = result.pairs
+            if not pairs:
+                return f"No tasks matching the filter found in '{source.project_name}'."
+            dropped = len(result.dropped)
+            for task_id, _ in pairs:
+                self.line_cache.invalidate(source_id, task_id)
+            self._drop_indexes(source_id)
+            self._drop_indexes(target_id)
+            self._bump_version(source, 'tasks_moved')
+            self._bump_version(target, 'tasks_moved')
+            noun = 'task' if len(pairs) == 1 else 'tasks'
+            message = (
+                f'Moved {len(pairs)} {noun} from '
+                f"'{source.project_name}' to '{target.project_name}'."
+            )
+            if dropped:
+                message += f' Dropped {dropped} dependencies on tasks left behind.'
+            renumbered = [pair for pair in pairs if pair[0] != pair[1]]
+            if renumbered:
+                ids = ', '.join(f'{old} -> {new}' for old, new in renumbered)
+                message += f' New task IDs: {ids}.'
+            return message
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error moving tasks: {e}')
+            return f'Error: Could not move tasks: {e}'
+
+    def copy_project(
+        self, newProjectName: str, projectName: Optional[str] = None
+    ) -> str:
+        """Copy the given or active project and its tasks to a new project.
+
+        Args:
+            newProjectName (str): Unique name of the new project.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation or error message.
+        """
+        name = (newProjectName or '').strip()
+        if not name:
+            return 'Error: Project name cannot be empty.'
+        try:
+            source = self._get_current_project_context(projectName)
+            existing = self._db.get_project_by_name(name)
+            if existing is not None:
+                return (
+                    f"Error: Project list '{name}' already exists "
+                    f'(ID: {existing.project_id}).'
+                )
+            copy_id = self._db.copy_project(self._project_id(source), name)
+            if copy_id is None:
+                return f"Error: Could not copy '{source.project_name}' to '{name}'."
+            copy = Project(project_id=copy_id, project_name=name)
+            self._bump_version(copy, 'project_copied')
+            rows = self._db.list_task_rows(copy_id, 'all')
+            count = len(rows) if rows is not None else 0
+            noun = 'task' if count == 1 else 'tasks'
+            return (
+                f"Project '{source.project_name}' copied to '{name}' "
+                f'(ID: {copy_id}) with {count} {noun}.'
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error copying project: {e}')
+            return f'Error: Could not copy project: {e}'
+
+    def find_tasks(
+        self,
+        query: str,
+        projectName: Optional[str] = None,
+        limit: int = FUZZY_CANDIDATES,
+        format: Optional[str] = None,
+    ) -> str:
+        """Rank the tasks of a project by similarity to a free-text query.
+
+        Args:
+            query (str): Free-text description of the task.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            limit (int, optional): Maximum number of candidates.
+                Defaults to FUZZY_CANDIDATES.
+            format (Optional[str], optional): 'text', 'compact' or 'json'.
+                Defaults to None, using the server-wide format.
+
+        Returns:
+            str: The candidates, best first, in the requested format
+                (``task line [score]`` per line in text format), or an
+                info/error message.
+        """
+        text = (query or '').strip()
+        if not text:
+            return 'Error: Query cannot be empty.'
+        if not 1 <= limit <= MAX_FIND_LIMIT:
+            return f'Error: Limit must be between 1 and {MAX_FIND_LIMIT}.'
+        try:
+            response_format = self._response_format(format)
+            project = self._get_current_project_context(projectName)
+            candidates = self._rank_candidates(project, text, limit)
+            if response_format == 'json':
+                return dumps(
+                    {
+                        'project': project.project_name,
+                        'query': text,
+                        'columns': JSON_COLUMNS + ['score'],
+                        'matches': [
+                            task_row(task) + (round(score, 4),)
+                            for task, score in candidates
+                        ],
+                    }
+                )
+            if not candidates:
+                return (
+                    f"No tasks matching '{text}' found in " f"'{project.project_name}'."
+                )
+            if response_format == 'compact':
+                return '\n'.join(
+                    [f'score\t{COMPACT_HEADER}']
+                    + [
+                        f'{score:.2f}\t{render_compact_row(task_row(task))}'
+                        for task, score in candidates
+                    ]
+                )
+            return '\n'.join(
+                f'{format_task_line(task)} [{score:.2f}]' for task, score in candidates
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error finding tasks: {e}')
+            return f'Error: Could not find tasks: {e}'
+
+    def search_tasks(
+        self,
+        query: str,
+        statusFilter: str = 'open',
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        cursor: Optional[str] = None,
+        format: Optional[str] = None,
+    ) -> str:
+        """Search the tasks of every project by description words.
+
+        Args:
+            query (str): Words the descriptions must contain, as prefixes.
+            statusFilter (str, optional): 'open', 'completed' or 'all'.
+                Defaults to 'open'.
+            limit (int, optional): Maximum number of tasks per page.
+                Defaults to DEFAULT_SEARCH_LIMIT.
+            cursor (Optional[str], optional): Cursor returned with the
+                previous page. Defaults to None, starting at the first page.
+            format (Optional[str], optional): 'text', 'compact' or 'json'.
+                Defaults to None, using the server-wide format.
+
+        Returns:
+            str: The page of matches grouped by project, with the cursor of
+                the next page if there is one, or an info/error message.
+        """
+        text = (query or '').strip()
+        if not text:
+            return 'Error: Query cannot be empty.'
+        terms = search_terms(text)
+        if not terms:
+            return 'Error: Query must contain at least one word.'
+        status = (statusFilter or 'open').strip().lower()
+        if status not in ('open', 'completed', 'all'):
+            return (
+                f"Error: Invalid status filter '{statusFilter}'. "
+                "Use 'open', 'completed' or 'all'."
+            )
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return f'Error: Limit must be between 1 and {MAX_SEARCH_LIMIT}.'
+        try:
+            response_format = self._response_format(format)
+            after = self._parse_cursor(cursor) if cursor else None
+            rows = self._db.search_tasks(terms, status, limit + 1, after)
+            if rows is None:
+                return 'Error: Could not search tasks.'
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = '{}:{}'.format(*search_key(rows[-1]))
+            groups: Dict[str, List[Tuple[Any, ...]]] = {}
+            for row in rows:
+                groups.setdefault(row[0], []).append(raw_task_row(row[1:]))
+            if response_format == 'json':
+                return dumps(
+                    {
+                        'query': text,
+                        'statusFilter': status,
+                        'columns': JSON_COLUMNS,
+                        'projects': [
+                            {'project': name, 'tasks': tasks}
+                            for name, tasks in groups.items()
+                        ],
+                        'nextCursor': next_cursor,
+                    }
+                )
+            label = '' if status == 'all' else f'{status} '
+            if not rows:
+                more = ' after the cursor' if after is not None else ''
+                return f"No {label}tasks matching '{text}' found{more}."
+            if response_format == 'compact':
+                lines = [f'project\t{COMPACT_HEADER}'] + [
+                    f'{name}\t{render_compact_row(task)}'
+                    for name, tasks in groups.items()
+                    for task in tasks
+                ]
+                if next_cursor is not None:
+                    lines.append(f'cursor\t{next_cursor}')
+                return '\n'.join(lines)
+            lines = []
+            for name, tasks in groups.items():
+                lines.append(f"Project '{name}':")
+                lines.extend(render_task_row(task) for task in tasks)
+            if next_cursor is not None:
+                lines.append(f"More matches: pass cursor '{next_cursor}'.")
+            return '\n'.join(lines)
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error searching tasks: {e}')
+            return f'Error: Could not search tasks: {e}'
+
+    def get_next_tasks(
+        self,
+        projectName: Optional[str] = None,
+        k: int = DEFAULT_NEXT_TASKS,
+        format: Optional[str] = None,
+    ) -> str:
+        """Return the most urgent open tasks of the given or active project.
+
+        Args:
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            k (int, optional): Maximum number of tasks.
+                Defaults to DEFAULT_NEXT_TASKS.
+            format (Optional[str], optional): 'text', 'compact' or 'json'.
+                Defaults to None, using the server-wide format.
+
+        Returns:
+            str: Up to k open tasks, most urgent first, in the requested
+                format, or an info/error message.
+        """
+        if not 1 <= k <= MAX_NEXT_TASKS:
+            return f'Error: k must be between 1 and {MAX_NEXT_TASKS}.'
+        try:
+            response_format = self._response_format(format)
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            rows = []
+            for task_id in self._get_next_index(project_id).top(k):
+                task = self._db.get_task(project_id, task_id)
+                if task is not None:
+                    rows.append(task_row(task))
+            if response_format == 'json':
+                return dumps(
+                    {
+                        'project': project.project_name,
+                        'columns': JSON_COLUMNS,
+                        'tasks': rows,
+                    }
+                )
+            if not rows:
+                return f"No open tasks found for project '{project.project_name}'."
+            if response_format == 'compact':
+                return '\n'.join(
+                    [COMPACT_HEADER] + [render_compact_row(row) for row in rows]
+                )
+            return '\n'.join(render_task_lines(rows))
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error getting next tasks: {e}')
+            return f'Error: Could not get next tasks: {e}'
+
+    def add_dependency(
+        self,
+        taskIdOrDescription: str,
+        dependsOnTaskIdOrDescription: str,
+        projectName: Optional[str] = None,
+    ) -> str:
+        """Make a task of the given or active project depend on another one.
+
+        Args:
+            taskIdOrDescription (str): ID or part of the description of the
+                dependent task.
+            dependsOnTaskIdOrDescription (str): ID or part of the description
+                of the prerequisite task.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation, info or error message.
+        """
+        identifier = (taskIdOrDescription or '').strip()
+        prerequisite_identifier = (dependsOnTaskIdOrDescription or '').strip()
+        if not identifier or not prerequisite_identifier:
+            return 'Error: Task identifier cannot be empty.'
+        try:
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            task = self._resolve_task(project, identifier)
+            prerequisite = self._resolve_task(
+                project, prerequisite_identifier, strict=True
+            )
+            task_id = self._task_id(task)
+            prerequisite_id = self._task_id(prerequisite)
+            ref = format_task_ref(task)
+            prerequisite_ref = format_task_ref(prerequisite)
+            graph = self._get_dependency_graph(project_id)
+            if graph.has_dependency(task_id, prerequisite_id):
+                return f"Info: Task '{ref}' already depends on '{prerequisite_ref}'."
+            try:
+                graph.add_dependency(task_id, prerequisite_id)
+            except DependencyCycleError as e:
+                cycle = ' -> '.join(f'(ID: {step})' for step in e.path)
+                return f'Error: Dependency would create a cycle: {cycle}.'
+            if not self._db.add_dependency(project_id, task_id, prerequisite_id):
+                graph.remove_dependency(task_id, prerequisite_id)
+                return f"Error: Could not add dependency to task '{ref}'."
+            self._bump_version(project, 'dependency_added', task_id)
+            return (
+                f"Task '{ref}' in '{project.project_name}' now depends on "
+                f"'{prerequisite_ref}'."
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error adding dependency: {e}')
+            return f'Error: Could not add dependency: {e}'
+
+    def tag_task(
+        self,
+        taskIdOrDescription: str,
+        tags: List[str],
+        projectName: Optional[str] = None,
+    ) -> str:
+        """Add tags to a task of the given or active project.
+
+        Args:
+            taskIdOrDescription (str): Task ID or part of its description.
+            tags (List[str]): Tags to add.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation listing the task's tags, or an error message.
+        """
+        return self._change_tags(taskIdOrDescription, tags, projectName, add=True)
+
+    def untag_task(
+        self,
+        taskIdOrDescription: str,
+        tags: List[str],
+        projectName: Optional[str] = None,
+    ) -> str:
+        """Remove tags from a task of the given or active project.
+
+        Args:
+            taskIdOrDescription (str): Task ID or part of its description.
+            tags (List[str]): Tags to remove.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Confirmation listing the task's tags, or an error message.
+        """
+        return self._change_tags(taskIdOrDescription, tags, projectName, add=False)
+
+    def list_tags(self, projectName: Optional[str] = None) -> str:
+        """List the tags used in the given or active project.
+
+        Args:
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: One ``tag (count)`` entry per tag, or an info/error message.
+        """
+        try:
+            project = self._get_current_project_context(projectName)
+            counts = self._get_tag_index(self._project_id(project)).tags()
+            if not counts:
+                return f"No tags found for project '{project.project_name}'."
+            entries = ', '.join(f'{tag} ({count})' for tag, count in counts)
+            return f"Tags in '{project.project_name}': {entries}"
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error listing tags: {e}')
+            return f'Error: Could not list tags: {e}'
+
+    def get_task_history(
+        self, taskIdOrDescription: str, projectName: Optional[str] = None
+    ) -> str:
+        """Show the audit log of a task of the given or active project.
+
+        Args:
+            taskIdOrDescription (str): Task ID, also of a removed task, or
+                part of its description.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: One line per change, oldest first, or an info/error message.
+        """
+        identifier = (taskIdOrDescription or '').strip()
+        if not identifier:
+            return 'Error: Task identifier cannot be empty.'
+        try:
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            if identifier.isdigit():
+                task_id = int(identifier)
+            else:
+                task = self._resolve_task(project, identifier, strict=False)
+                task_id = self._task_id(task)
+            events = self._db.list_history(project_id, task_id)
+            if events is None:
+                return f'Error: Could not read the history of task (ID: {task_id}).'
+            if not events:
+                return (
+                    f'No history found for task (ID: {task_id}) in '
+                    f"'{project.project_name}'."
+                )
+            return '\n'.join(
+                [f"History of task (ID: {task_id}) in '{project.project_name}':"]
+                + [render_history_event(event) for event in events]
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error reading task history: {e}')
+            return f'Error: Could not read task history: {e}'
+
+    def get_burndown(
+        self,
+        startDate: Optional[str] = None,
+        endDate: Optional[str] = None,
+        projectName: Optional[str] = None,
+    ) -> str:
+        """Report the open tasks at the end of each day of a date range.
+
+        Args:
+            startDate (Optional[str], optional): First day, YYYY-MM-DD.
+                Defaults to None, meaning DEFAULT_RANGE_DAYS before endDate.
+            endDate (Optional[str], optional): Last day, YYYY-MM-DD.
+                Defaults to None, meaning today.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: The series after a header line, or an error message.
+        """
+        try:
+            start_day, end_day = self._day_range(startDate, endDate)
+            project = self._get_current_project_context(projectName)
+            flow = self._db.task_flow(self._project_id(project), start_day, end_day)
+            if flow is None:
+                return (
+                    'Error: Could not compute the burndown of '
+                    f"'{project.project_name}'."
+                )
+            before, _, _, open_tasks = dense_flow(flow, start_day, end_day)
+            return (
+                f"Burndown of '{project.project_name}' from {decode_date(start_day)} "
+                f'to {decode_date(end_day)}, open tasks at the end of each day '
+                f'({before} before):\n' + ', '.join(map(str, open_tasks))
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error computing burndown: {e}')
+            return f'Error: Could not compute burndown: {e}'
+
+    def get_throughput(
+        self,
+        startDate: Optional[str] = None,
+        endDate: Optional[str] = None,
+        interval: str = 'day',
+        projectName: Optional[str] = None,
+    ) -> str:
+        """Report the tasks created and completed per interval of a range.
+
+        Args:
+            startDate (Optional[str], optional): First day, YYYY-MM-DD.
+                Defaults to None, meaning DEFAULT_RANGE_DAYS before endDate.
+            endDate (Optional[str], optional): Last day, YYYY-MM-DD.
+                Defaults to None, meaning today.
+            interval (str, optional): 'day' or 'week'; weeks start on
+                startDate and the last one may be shorter. Defaults to 'day'.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Created and completed series after a header line, or an
+                error message.
+        """
+        size = THROUGHPUT_INTERVALS.get(interval)
+        if size is None:
+            return (
+                f"Error: Invalid interval '{interval}'. "
+                f"Use one of: {', '.join(THROUGHPUT_INTERVALS)}"
+            )
+        try:
+            start_day, end_day = self._day_range(startDate, endDate)
+            project = self._get_current_project_context(projectName)
+            flow = self._db.task_flow(self._project_id(project), start_day, end_day)
+            if flow is None:
+                return (
+                    'Error: Could not compute the throughput of '
+                    f"'{project.project_name}'."
+                )
+            _, created, completed, _ = dense_flow(flow, start_day, end_day)
+            return '\n'.join(
+                [
+                    f"Throughput of '{project.project_name}' per {interval} from "
+                    f'{decode_date(start_day)} to {decode_date(end_day)}:',
+                    'created: ' + ', '.join(map(str, bucket_sums(created, size))),
+                    'completed: ' + ', '.join(map(str, bucket_sums(completed, size))),
+                    f'total: {sum(created)} created, {sum(completed)} completed',
+                ]
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error computing throughput: {e}')
+            return f'Error: Could not compute throughput: {e}'
+
+    def get_task_aging(
+        self, asOfDate: Optional[str] = None, projectName: Optional[str] = None
+    ) -> str:
+        """Report how long the open tasks of a project have been open.
+
+        Args:
+            asOfDate (Optional[str], optional): Day at whose end the tasks
+                are aged, YYYY-MM-DD. Defaults to None, meaning today.
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+
+        Returns:
+            str: Age percentiles and buckets, or an info/error message.
+        """
+        try:
+            day = (
+                self._parse_day(asOfDate, 'asOfDate')
+                if asOfDate
+                else now_seconds() // SECONDS_PER_DAY
+            )
+            project = self._get_current_project_context(projectName)
+            ages = self._db.task_ages(self._project_id(project), day)
+            if ages is None:
+                return f"Error: Could not age the tasks of '{project.project_name}'."
+            if not ages:
+                return (
+                    f"No open tasks in '{project.project_name}' at the end of "
+                    f'{decode_date(day)}.'
+                )
+            lows = (0,) + tuple(bound + 1 for bound in AGE_BUCKETS)
+            labels = [f'{low}-{high}' for low, high in zip(lows, AGE_BUCKETS)]
+            labels.append(f'>{AGE_BUCKETS[-1]}')
+            buckets = ', '.join(
+                f'{label}: {count}' for label, count in zip(labels, age_buckets(ages))
+            )
+            return '\n'.join(
+                [
+                    f'Aging of the {ages[-1][2]} open tasks in '
+                    f"'{project.project_name}' at the end of {decode_date(day)}, "
+                    'in days since creation:',
+                    f'p50: {age_percentile(ages, 0.5)}, '
+                    f'p90: {age_percentile(ages, 0.9)}, max: {ages[-1][0]}',
+                    buckets,
+                ]
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error aging tasks: {e}')
+            return f'Error: Could not age tasks: {e}'
+
+    def get_health(self) -> str:
+        """Report the server's health and compare it with the SLO targets.
+
+        Returns:
+            str: One line each for the status, uptime, event loop lag,
+                queue, storage, cache hit ratios and call latencies.
+        """
+        try:
+            health = self.health
+            breaches = health.breaches()
+            lines = [
+                'Status: ' + ('degraded: ' + '; '.join(breaches) if breaches else 'ok'),
+                f'Uptime: {self._format_duration(health.uptime)}',
+            ]
+            lag = health.loop_lag
+            if lag.last is None or lag.worst is None:
+                lines.append('Event loop lag: not measured yet')
+            else:
+                lines.append(
+                    f'Event loop lag: {lag.last * 1000:.1f} ms, max '
+                    f'{lag.worst * 1000:.1f} ms (SLO {health.slo_loop_lag_ms:g} ms)'
+                )
+            admission = self.admission
+            if admission is None:
+                lines.append('Queue: admission control off')
+            else:
+                lines.append(
+                    f'Queue: {admission.active}/{admission.max_concurrent} running, '
+                    f'{admission.queued}/{admission.max_queue} queued, '
+                    f'{admission.rejected} rejected'
+                )
+            data, log = file_sizes(self._db.storage_files())
+            lines.append(f'Storage: {data} bytes, WAL {log} bytes')
+            cache = self.line_cache
+            reads = self.reads
+            lines.append(
+                'Cache hit ratios: lines '
+                f'{self._ratio(cache.hits, cache.hits + cache.misses)} '
+                f'({len(cache)} cached), shared reads '
+                f'{self._ratio(reads.shared, reads.calls + reads.shared)}'
+            )
+            latencies = health.latencies.percentiles()
+            if latencies is None:
+                lines.append('Latency: no calls yet')
+            else:
+                p50, p95, p99 = (value * 1000 for value in latencies)
+                lines.append(
+                    f'Latency of the last {len(health.latencies)} of '
+                    f'{health.latencies.count} calls: p50 {p50:.1f} ms, '
+                    f'p95 {p95:.1f} ms, p99 {p99:.1f} ms '
+                    f'(SLO p99 {health.slo_p99_ms:g} ms)'
+                )
+            return '\n'.join(lines)
+        except Exception as e:
+            logger.error(f'Unexpected error reporting health: {e}')
+            return f'Error: Could not report health: {e}'
+
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
+        """Format a duration as days, hours, minutes and seconds.
+
+        Args:
+            seconds (float): Duration in seconds.
+
+        Returns:
+            str: E.g. ``'2d 03:04:05'`` or ``'00:00:07'``.
+        """
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        clock = f'{hours:02d}:{minutes:02d}:{secs:02d}'
+        return f'{days}d {clock}' if days else clock
+
+    @staticmethod
+    def _ratio(hits: int, total: int) -> str:
+        """Format a hit ratio as a percentage.
+
+        Args:
+            hits (int): Number of hits.
+            total (int): Number of lookups.
+
+        Returns:
+            str: E.g. ``'97.5%'``, or ``'n/a'`` before the first lookup.
+        """
+        return f'{hits / total:.1%}' if total else 'n/a'
+
+    async def list_ready_tasks(
+        self, projectName: Optional[str] = None, format: Optional[str] = None
+    ) -> str:
+        """List the open tasks without open prerequisites.
+
+        Args:
+            projectName (Optional[str], optional): Project overriding the
+                active one. Defaults to None.
+            format (Optional[str], optional): 'text', 'compact' or 'json'.
+                Defaults to None, using the server-wide format.
+
+        Returns:
+            str: The ready tasks ordered by ID in the requested format, or
+                an info/error message.
+        """
+        try:
+            response_format = self._response_format(format)
+            project = self._get_current_project_context(projectName)
+            project_id = self._project_id(project)
+            ready = set(self._get_dependency_graph(project_id).ready())
+            rows = self._db.list_task_rows(project_id, 'open')
+            if rows is None:
+                return f"Error: Could not list tasks for '{project.project_name}'."
+            return await self._format_rows(
+                project,
+                [row for row in rows if row[0] in ready],
+                response_format,
+                {},
+                f"No ready tasks found for project '{project.project_name}'.",
+            )
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error listing ready tasks: {e}')
+            return f'Error: Could not list ready tasks: {e}'
+
+    @staticmethod
+    def _dispatched(
+        name: str,
+        handler: Callable[..., Any],
+        order: CallOrder,
+        admission: Optional[AdmissionController],
+        health: HealthMonitor,
+    ) -> Callable[..., Any]:
+        """Wrap a tool handler so calls keep their order, are admitted and timed.
+
+        Pipelined and batched calls wait for the earlier calls of the same
+        client session they must follow. With admission enabled, the rate
+        limit and queue bound are checked before that wait, and the call
+        counts as queued while it waits. The recorded latency spans
+        the wait and the call, as the client sees it. The wrapper keeps the
+        handler's signature, so FastMCP derives the same tool schema from it.
+
+        Args:
+            name (str): Tool name.
+            handler (Callable[..., Any]): Sync or async tool handler.
+            order (CallOrder): Call sequencing shared by every tool.
+            admission (Optional[AdmissionController]): Admission control to
+                apply, if any.
+            health (HealthMonitor): Monitor recording the call latencies.
+
+        Returns:
+            Callable[..., Any]: Async handler returning the handler's result
+                or a "server busy" error message.
+        """
+        write = name in WRITE_TOOLS
+        ordered_write = name in ORDERED_WRITES
+
+        async def run(kwargs: Dict[str, Any]) -> Any:
+            result = handler(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        @functools.wraps(handler)
+        async def dispatched(**kwargs: Any) -> Any:
+            started = health.now()
+            client_id = current_client_id()
+            turn = order.call(ordered_write, client_id)
+            try:
+                if admission is None:
+                    async with turn:
+                        return await run(kwargs)
+                try:
+                    async with admission.slot(client_id, write=write, turn=turn):
+                        return await run(kwargs)
+                except ServerBusy as e:
+                    logger.warning(f'Rejected {name} call: {e}')
+                    return f'Error: {e}'
+            finally:
+                health.latencies.record(health.now() - started)
+
+        return dispatched
+
+    @staticmethod
+    def _validate_due_date(due_date: str) -> int:
+        """Validate a due date string.
+
+        Args:
+            due_date (str): Date expected in YYYY-MM-DD format.
+
+        Returns:
+            int: The date encoded as days since the epoch.
+
+        Raises:
+            _ToolError: If the date is not a valid YYYY-MM-DD date.
+        """
+        try:
+            due_day = encode_date(due_date)
+        except ValueError:
+            raise _ToolError(
+                f"Error: Invalid due date '{due_date}'. Expected format YYYY-MM-DD."
+            ) from None
+        assert due_day is not None
+        return due_day
+
+    @staticmethod
+    def _normalize_tags(tags: Sequence[str]) -> List[str]:
+        """Normalise tags to lower case without surrounding whitespace.
+
+        Args:
+            tags (Sequence[str]): Tags as given by the client.
+
+        Returns:
+            List[str]: Distinct normalised tags in the given order.
+
+        Raises:
+            _ToolError: If a tag is empty or longer than MAX_TAG_LENGTH.
+        """
+        normalized: List[str] = []
+        for tag in tags:
+            value = (tag or '').strip().lower()
+            if not value:
+                raise _ToolError('Error: Tags cannot be empty.')
+            if len(value) > MAX_TAG_LENGTH:
+                raise _ToolError(
+                    f"Error: Tag '{value}' is longer than {MAX_TAG_LENGTH} characters."
+                )
+            if value not in normalized:
+                normalized.append(value)
+        return normalized
+
+    @staticmethod
+    def _parse_as_of(value: str) -> int:
+        """Parse the asOf time of a listing.
+
+        Args:
+            value (str): ISO 8601 date or time; times without an offset are
+                UTC and a date alone means the end of that day.
+
+        Returns:
+            int: The time in epoch seconds.
+
+        Raises:
+            _ToolError: If the value is not an ISO 8601 date or time.
+        """
+        text = value.strip()
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            raise _ToolError(
+                f"Error: Invalid asOf '{value}'. Expected an ISO 8601 date or "
+                'time such as 2025-05-01T12:00:00.'
+            ) from None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        seconds = int(parsed.timestamp())
+        if len(text) == len('YYYY-MM-DD'):
+            seconds += SECONDS_PER_DAY - 1
+        return seconds
+
+    @staticmethod
+    def _parse_day(value: str, name: str) -> int:
+        """Parse a date argument of the analytics tools.
+
+        Args:
+            value (str): Date expected in YYYY-MM-DD format.
+            name (str): Name of the argument, for the error message.
+
+        Returns:
+            int: The date encoded as days since the epoch.
+
+        Raises:
+            _ToolError: If the date is not a valid YYYY-MM-DD date.
+        """
+        try:
+            day = encode_date(value.strip())
+        except ValueError:
+            raise _ToolError(
+                f"Error: Invalid {name} '{value}'. Expected format YYYY-MM-DD."
+            ) from None
+        assert day is not None
+        return day
+
+    def _day_range(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> Tuple[int, int]:
+        """Resolve the date range of the analytics tools.
+
+        Args:
+            start_date (Optional[str]): First day, or None for
+                DEFAULT_RANGE_DAYS before the last day.
+            end_date (Optional[str]): Last day, or None for today.
+
+        Returns:
+            Tuple[int, int]: First and last day in days since the epoch.
+
+        Raises:
+            _ToolError: If a date is invalid, the range is reversed or it
+                spans more than MAX_RANGE_DAYS days.
+        """
+        end_day = (
+            self._parse_day(end_date, 'endDate')
+            if end_date
+            else now_seconds() // SECONDS_PER_DAY
+        )
+        start_day = (
+            self._parse_day(start_date, 'startDate')
+            if start_date
+            else end_day - DEFAULT_RANGE_DAYS + 1
+        )
+        if start_day > end_day:
+            raise _ToolError('Error: startDate must not be after endDate.')
+        if end_day - start_day >= MAX_RANGE_DAYS:
+            raise _ToolError(
+                f'Error: Date ranges are limited to {MAX_RANGE_DAYS} days.'
+            )
+        return start_day, end_day
+
+    def _change_tags(
+        self,
+        identifier: str,
+        tags: List[str],
+        project_name: Optional[str],
+        *,
+        add: bool,
+    ) -> str:
+        """Add or remove tags of a task for tagTask and untagTask.
+
+        Args:
+            identifier (str): Task ID or part of its description.
+            tags (List[str]): Tags as given by the client.
+            project_name (Optional[str]): Project overriding the active one.
+            add (bool): True to add the tags, False to remove them.
+
+        Returns:
+            str: Confirmation listing the task's tags, or an error message.
+        """
+        identifier = (identifier or '').strip()
+        if not identifier:
+            return 'Error: Task identifier cannot be empty.'
+        verb = 'tag' if add else 'untag'
+        try:
+            normalized = self._normalize_tags(tags or [])
+            if not normalized:
+                return 'Error: No tags given.'
+            project = self._get_current_project_context(project_name)
+            task = self._resolve_task(project, identifier)
+            ref = format_task_ref(task)
+            task_id = self._task_id(task)
+            index = self._get_tag_index(task.project_id)
+            write = self._db.add_tags if add else self._db.remove_tags
+            if not write(task.project_id, task_id, normalized):
+                return f"Error: Could not {verb} task '{ref}'."
+            for tag in normalized:
+                if add:
+                    index.add(task_id, tag)
+                else:
+                    index.discard(task_id, tag)
+            self._bump_version(project, f'task_{verb}ged', task_id)
+            current = ', '.join(index.tags_of(task_id)) or 'none'
+            return f"Task '{ref}' in '{project.project_name}' tags: {current}."
+        except _ToolError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f'Unexpected error changing tags: {e}')
+            return f'Error: Could not {verb} task: {e}'
+
+    def project_version(self, project_id: int) -> int:
+        """Get the write version of a project.
+
+        The version starts at 0 and is incremented by every write made
+        through these tools, so equal versions mean equal task data.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            int: Number of writes made to the project.
+        """
+        return self._versions.get(project_id, 0)
+
+    def _bump_version(
+        self, project: Project, action: str, task_id: Optional[int] = None
+    ) -> None:
+        """Record a write to a project and publish it to the change feed.
+
+        Args:
+            project (Project): The written project.
+            action (str): What changed, e.g. 'task_added'.
+            task_id (Optional[int], optional): ID of the written task.
+                Defaults to None.
+        """
+        project_id = self._project_id(project)
+        version = self._versions.get(project_id, 0) + 1
+        self._versions[project_id] = version
+        if self.change_feed is not None:
+            self.change_feed.publish(
+                ChangeEvent(project_id, project.project_name, version, action, task_id)
+            )
+
+    def _drop_indexes(self, project_id: int) -> None:
+        """Drop the in-memory indexes of a project after a bulk change.
+
+        They are rebuilt from the database on next use.
+
+        Args:
+            project_id (int): ID of the project.
+        """
+        caches: Tuple[Dict[int, Any], ...] = (
+            self._trigram_indexes,
+            self._next_indexes,
+            self._dependency_graphs,
+            self._tag_indexes,
+        )
+        for cache in caches:
+            cache.pop(project_id, None)
+
+    def _response_format(self, response_format: Optional[str]) -> str:
+        """Resolve the format of a listing response.
+
+        Args:
+            response_format (Optional[str]): Format requested by the call.
+
+        Returns:
+            str: The requested format, or the server-wide format if None.
+
+        Raises:
+            _ToolError: If the requested format is unknown.
+        """
+        if response_format is None:
+            return self.response_format
+        normalized = response_format.strip().lower()
+        if normalized not in RESPONSE_FORMATS:
+            raise _ToolError(
+                f"Error: Invalid format '{response_format}'. "
+                "Use 'text', 'compact' or 'json'."
+            )
+        return normalized
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> SearchKey:
+        """Parse a searchTasks page cursor.
+
+        Args:
+            cursor (str): ``project_id:task_id`` of the last match of the
+                previous page.
+
+        Returns:
+            SearchKey: The parsed key.
+
+        Raises:
+            _ToolError: If the cursor is malformed.
+        """
+        project_id, _, task_id = cursor.strip().partition(':')
+        if not (project_id.isdigit() and task_id.isdigit()):
+            raise _ToolError(f"Error: Invalid cursor '{cursor}'.")
+        return int(project_id), int(task_id)
+
+    @staticmethod
+    def _project_id(project: Project) -> int:
+        """Return the ID of a stored project.
+
+        Args:
+            project (Project): A project loaded from the database.
+
+        Returns:
+            int: The project ID.
+        """
+        assert project.project_id is not None
+        return project.project_id
+
+    @staticmethod
+    def _task_id(task: Task) -> int:
+        """Return the ID of a stored task.
+
+        Args:
+            task (Task): A task loaded from the database.
+
+        Returns:
+            int: The task ID.
+        """
+        assert task.task_id is not None
+        return task.task_id
+
+    def _get_current_project_context(self, project_name: Optional[str]) -> Project:
+        """Resolve the project a tool call operates on.
+
+        Args:
+            project_name (Optional[str]): Explicit project name, if provided.
+
+        Returns:
+            Project: The explicitly named project, or the active project of
+                the calling session.
+
+        Raises:
+            _ToolError: If the project is unknown or none is available.
+        """
+        name = (project_name or '').strip()
+        if name:
+            project = self._db.get_project_by_name(name)
+            if project is None:
+                raise _ToolError(f"Error: Project '{name}' not found.")
+            return project
+        active = self.sessions.get(current_client_id())
+        if active is None:
+            raise _ToolError(NO_PROJECT_ERROR)
+        return Project(project_id=active[0], project_name=active[1])
+
+    async def _render_listing(
+        self,
+        project: Project,
+        status: str,
+        response_format: str,
+        tag_filter: TagFilter = NO_TAG_FILTER,
+        as_of: Optional[int] = None,
+    ) -> str:
+        """Read and render the tasks of a project for listTasks.
+
+        Args:
+            project (Project): Project to list.
+            status (str): Validated status filter.
+            response_format (str): Validated response format.
+            tag_filter (TagFilter, optional): Normalised tags a task must all
+                have, must have at least one of, and must not have.
+                Defaults to no filter.
+            as_of (Optional[int], optional): Epoch seconds to reconstruct
+                the listing at from the audit log. Defaults to None, listing
+                the current tasks.
+
+        Returns:
+            str: The listing, or an info/error message.
+        """
+        project_id = self._project_id(project)
+        label = '' if status == 'all' else f'{status} '
+        payload: Dict[str, Any] = {'statusFilter': status}
+        empty_message = f"No {label}tasks found for project '{project.project_name}'."
+        if as_of is not None:
+            events = self._db.list_history(project_id, until=as_of)
+            if events is None:
+                return f"Error: Could not read the history of '{project.project_name}'."
+            past_rows = rows_as_of(project_id, events, status)
+            stamp = datetime.fromtimestamp(as_of, timezone.utc)
+            when = stamp.replace(tzinfo=None).isoformat()
+            payload['asOf'] = when
+            empty_message = empty_message[:-1] + f' as of {when}.'
+            return await self._format_rows(
+                project, past_rows, response_format, payload, empty_message
+            )
+        rows = self._db.list_task_rows(project_id, status)
+        if rows is None:
+            return f"Error: Could not list tasks for '{project.project_name}'."
+        if any(tag_filter):
+            included, excluded = self._get_tag_index(project_id).select(*tag_filter)
+            rows = [
+                row
+                for row in rows
+                if (included is None or row[0] in included) and row[0] not in excluded
+            ]
+            all_of, any_of, none_of = tag_filter
+            payload['tagFilter'] = {
+                'tags': list(all_of),
+                'anyTags': list(any_of),
+                'excludeTags': list(none_of),
+            }
+            empty_message = (
+                f'No {label}tasks matching the tag filter found for project '
+                f"'{project.project_name}'."
+            )
+        return await self._format_rows(
+            project, rows, response_format, payload, empty_message
+        )
+
+    async def _format_rows(
+        self,
+        project: Project,
+        rows: Sequence[Sequence[Any]],
+        response_format: str,
+        payload: Dict[str, Any],
+        empty_message: str,
+    ) -> str:
+        """Format raw task rows of a project in a response format.
+
+        Text lines come from the line cache; lines missing from it are
+        rendered, in the render pool if one is configured.
+
+        Args:
+            project (Project): Project the rows belong to.
+            rows (Sequence[Sequence[Any]]): Rows in ``TASK_COLUMNS`` order.
+            response_format (str): Validated response format.
+            payload (Dict[str, Any]): Extra fields of the JSON payload.
+            empty_message (str): Returned for no rows in text and compact
+                format.
+
+        Returns:
+            str: The formatted rows.
+        """
+        if response_format == 'json':
+            return dumps(
+                {
+                    'project': project.project_name,
+                    **payload,
+                    'columns': JSON_COLUMNS,
+                    'tasks': [raw_task_row(row) for row in rows],
+                }
+            )
+        if not rows:
+            return empty_message
+        if response_format == 'compact':
+            return '\n'.join(
+                [COMPACT_HEADER]
+                + [render_compact_row(raw_task_row(row)) for row in rows]
+            )
+        project_id = self._project_id(project)
+        lines, missing = self.line_cache.lookup(project_id, rows)
+        if missing:
+            stale = [rows[position] for position in missing]
+            render_rows = [raw_task_row(row) for row in stale]
+            if self._render_pool is not None:
+                rendered = await self._render_pool.render_task_lines(render_rows)
+            else:
+                rendered = render_task_lines(render_rows)
+            for position, row, line in zip(missing, stale, rendered):
+                lines[position] = line
+                self.line_cache.store(project_id, row, line)
+        return '\n'.join(lines)  # type: ignore[arg-type]
+
+    def _get_dependency_graph(self, project_id: int) -> DependencyGraph:
+        """Return the dependency graph of a project, building it on first use.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            DependencyGraph: Graph over all tasks of the project.
+
+        Raises:
+            _ToolError: If the project's tasks or dependencies cannot be
+                loaded.
+        """
+        graph = self._dependency_graphs.get(project_id)
+        if graph is None:
+            rows = self._db.list_task_rows(project_id, 'all')
+            edges = self._db.list_dependencies(project_id)
+            if rows is None or edges is None:
+                raise _ToolError('Error: Could not load task dependencies.')
+            graph = DependencyGraph(((row[0], row[3] == 'open') for row in rows), edges)
+            self._dependency_graphs[project_id] = graph
+        return graph
+
+    def _get_tag_index(self, project_id: int) -> TagIndex:
+        """Return the tag index of a project, building it on first use.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            TagIndex: Bitmaps of the project's tags.
+
+        Raises:
+            _ToolError: If the project's tags cannot be loaded.
+        """
+        index = self._tag_indexes.get(project_id)
+        if index is None:
+            pairs = self._db.list_tags(project_id)
+            if pairs is None:
+                raise _ToolError('Error: Could not load task tags.')
+            index = TagIndex(pairs)
+            self._tag_indexes[project_id] = index
+        return index
+
+    def _get_trigram_index(self, project_id: int) -> TrigramIndex:
+        """Return the trigram index of a project, building it on first use.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            TrigramIndex: Index over all task descriptions of the project.
+
+        Raises:
+            _ToolError: If the project's tasks cannot be loaded.
+        """
+        index = self._trigram_indexes.get(project_id)
+        if index is None:
+            tasks = self._db.list_tasks(project_id, 'all')
+            if tasks is None:
+                raise _ToolError('Error: Could not load tasks for matching.')
+            index = TrigramIndex(
+                (self._task_id(task), task.description) for task in tasks
+            )
+            self._trigram_indexes[project_id] = index
+        return index
+
+    def _get_next_index(self, project_id: int) -> NextTaskIndex:
+        """Return the open-task ordering of a project, building it on first use.
+
+        Args:
+            project_id (int): ID of the project.
+
+        Returns:
+            NextTaskIndex: Ordering of the project's open tasks.
+
+        Raises:
+            _ToolError: If the project's tasks cannot be loaded.
+        """
+        index = self._next_indexes.get(project_id)
+        if index is None:
+            rows = self._db.list_task_rows(project_id, 'open')
+            if rows is None:
+                raise _ToolError('Error: Could not load tasks for ordering.')
+            index = NextTaskIndex((row[0], row[4], row[5]) for row in rows)
+            self._next_indexes[project_id] = index
+        return index
+
+    def _rank_candidates(
+        self, project: Project, query: str, limit: int
+    ) -> List[Tuple[Task, float]]:
+        """Rank the tasks of a project by trigram similarity to a query.
+
+        Args:
+            project (Project): Project to search.
+            query (str): Free-text query.
+            limit (int): Maximum number of candidates.
+
+        Returns:
+            List[Tuple[Task, float]]: Tasks with their scores, best first.
+        """
+        project_id = self._project_id(project)
+        index = self._get_trigram_index(project_id)
+        candidates = []
+        for task_id, score in index.search(query, limit):
+            task = self._db.get_task(project_id, task_id)
+            if task is not None:
+                candidates.append((task, score))
+        return candidates
+
+    def _resolve_task(
+        self, project: Project, identifier: str, *, strict: bool = True
+    ) -> Task:
+        """Resolve a task ID or description to a single task.
+
+        An identifier made of digits is a task ID only. Otherwise a unique
+        substring of the description or, among several matches, an exact
+        match is accepted. Every tool that writes relies on this strict
+        resolution; read-only tools may also accept the only open task among
+        several matches and a fuzzy trigram match that clearly beats the
+        other candidates.
+
+        Args:
+            project (Project): Project containing the task.
+            identifier (str): Task ID or part of its description.
+            strict (bool, optional): Whether to return candidates instead of
+                guessing among several open and completed matches or from a
+                fuzzy match. Defaults to True; pass False for reads only.
+
+        Returns:
+            Task: The resolved task.
+
+        Raises:
+            _ToolError: If no task or more than one task matches. The
+                message lists the best-ranked candidates with their scores.
+        """
+        project_id = self._project_id(project)
+        if identifier.isdigit():
+            task = self._db.get_task(project_id, int(identifier))
+            if task is None:
+                raise _ToolError(
+                    f"Error: Task '{identifier}' not found in '{project.project_name}'."
+                )
+            return task
+
+        matches = self._db.find_tasks_by_description(project_id, identifier)
+        if matches is None:
+            raise _ToolError(f"Error: Could not look up task '{identifier}'.")
+        if len(matches) > 1:
+            folded = identifier.casefold()
+            exact = [t for t in matches if t.description.casefold() == folded]
+            open_tasks = [] if strict else [t for t in matches if t.status == 'open']
+            for narrowed in (exact, open_tasks):
+                if len(narrowed) == 1:
+                    return narrowed[0]
+            ranked = sorted(
+                ((task, similarity(identifier, task.description)) for task in matches),
+                key=lambda item: (-item[1], self._task_id(item[0])),
+            )[:FUZZY_CANDIDATES]
+            raise _ToolError(
+                f"Error: Task '{identifier}' is ambiguous in "
+                f"'{project.project_name}'. Candidates: {format_candidates(ranked)}"
+            )
+        if matches:
+            return matches[0]
+
+        candidates = self._rank_candidates(project, identifier, FUZZY_CANDIDATES)
+        if candidates:
+            best_score = candidates[0][1]
+            runner_up = candidates[1][1] if len(candidates) > 1 else 0.0
+            if (
+                not strict
+                and best_score >= FUZZY_ACCEPT_SCORE
+                and best_score - runner_up >= FUZZY_ACCEPT_MARGIN
+            ):
+                return candidates[0][0]
+        message = f"Error: Task '{identifier}' not found in '{project.project_name}'."
+        if candidates:
+            message += f' Closest matches: {format_candidates(candidates)}'
+        raise _ToolError(message)
@@ -0,0 +1,289 @@
+"""Record and replay of MCP request traffic.
+
+:class:`TrafficRecorder` wraps the request handlers of a FastMCP server
+and appends every incoming JSON-RPC request to a log, one compact JSON
+array per line::
+
+    [arrival offset in seconds, method, params]
+
+:func:`replay` sends a recorded log to a fresh server, in-process or over
+stdio, at the recorded pace (speed 1), N times faster, or as fast as
+possible (speed None), and returns a :class:`ReplayReport` with latency
+percentiles and errors per method. Requests the client makes itself, such
+as ``initialize``, are skipped.
+"""
+
+import asyncio
+import json
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO, Tuple
+
+from fastmcp import Client, FastMCP
+from mcp import types
+
+from .formatting import dumps
+
+RecordedRequest = Tuple[float, str, Optional[Dict[str, Any]]]
+
+RESULT_TYPES: Dict[str, Any] = {
+    'ping': types.EmptyResult,
+    'tools/list': types.ListToolsResult,
+    'tools/call': types.CallToolResult,
+    'resources/list': types.ListResourcesResult,
+    'resources/templates/list': types.ListResourceTemplatesResult,
+    'resources/read': types.ReadResourceResult,
+    'resources/subscribe': types.EmptyResult,
+    'resources/unsubscribe': types.EmptyResult,
+}
+
+
+class TrafficRecorder:
+    """Appends the requests received by a server to a traffic log."""
+
+    def __init__(
+        self, path: str, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Open the log for writing.
+
+        Args:
+            path (str): Path of the log file; an existing file is replaced.
+            clock (Callable[[], float], optional): Monotonic clock in
+                seconds. Defaults to time.monotonic.
+        """
+        self.recorded = 0
+        self._clock = clock
+        self._started = clock()
+        self._file: TextIO = open(path, 'w', encoding='utf-8', buffering=1)
+
+    def install(self, mcp: FastMCP[Any]) -> None:
+        """Record every request handled by a server.
+
+        Call after all tools and resources are registered.
+
+        Args:
+            mcp (FastMCP): The FastMCP server to record.
+        """
+        handlers = mcp._mcp_server.request_handlers
+        for request_type, handler in list(handlers.items()):
+            handlers[request_type] = self._recording(handler)
+
+    def record(self, request: Any) -> None:
+        """Append one request to the log.
+
+        Args:
+            request (Any): Typed MCP request, e.g. ``types.CallToolRequest``.
+        """
+        offset = round(self._clock() - self._started, 6)
+        message = request.model_dump(by_alias=True, mode='json', exclude_none=True)
+        self._file.write(
+            dumps([offset, message['method'], message.get('params')]) + '\n'
+        )
+        self.recorded += 1
+
+    def close(self) -> None:
+        """Close the log."""
+        self._file.close()
+
+    def _recording(
+        self, handler: Callable[[Any], Awaitable[Any]]
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a request handler to record its requests.
+
+        Args:
+            handler (Callable[[Any], Awaitable[Any]]): Original handler.
+
+        Returns:
+            Callable[[Any], Awaitable[Any]]: Recording handler.
+        """
+
+        async def recording_handler(request: Any) -> Any:
+            self.record(request)
+            return await handler(request)
+
+        return recording_handler
+
+
+def load_traffic(path: str) -> List[RecordedRequest]:
+    """Read a traffic log.
+
+    Args:
+        path (str): Path of the log file.
+
+    Returns:
+        List[RecordedRequest]: Recorded requests in arrival order.
+    """
+    with open(path, encoding='utf-8') as log:
+        return [
+            (offset, method, params)
+            for offset, method, params in (
+                json.loads(line) for line in log if line.strip()
+            )
+        ]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return a nearest-rank percentile.
+
+    Args:
+        values (List[float]): Values sorted in ascending order.
+        fraction (float): Percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, or 0.0 for no values.
+    """
+    if not values:
+        return 0.0
+    rank = math.ceil(fraction * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+class ReplayReport:
+    """Latencies and errors of a replay, per method."""
+
+    def __init__(self) -> None:
+        """Initialize an empty report."""
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def add(self, key: str, latency_ms: float, failed: bool) -> None:
+        """Record the outcome of one request.
+
+        Args:
+            key (str): Method, with the tool name for tool calls.
+            latency_ms (float): Time until the response, in milliseconds.
+            failed (bool): Whether the request failed.
+        """
+        self.latencies.setdefault(key, []).append(latency_ms)
+        self.errors[key] = self.errors.get(key, 0) + failed
+
+    def summary(self) -> List[Tuple[str, int, int, float, float, float, float]]:
+        """Summarise the latency distribution of each method.
+
+        Returns:
+            List[Tuple[str, int, int, float, float, float, float]]: Rows of
+                key, count, errors, p50, p90, p99 and max latency in ms,
+                ordered by key.
+        """
+        rows = []
+        for key in sorted(self.latencies):
+            values = sorted(self.latencies[key])
+            rows.append(
+                (
+                    key,
+                    len(values),
+                    self.errors[key],
+                    percentile(values, 0.5),
+                    percentile(values, 0.9),
+                    percentile(values, 0.99),
+                    values[-1],
+                )
+            )
+        return rows
+
+    def format(self) -> str:
+        """Render the summary as a table.
+
+        Returns:
+            str: One line per method, after a header.
+        """
+        lines = [
+            f'{"method":<28}{"count":>7}{"errors":>7}'
+            f'{"p50":>9}{"p90":>9}{"p99":>9}{"max":>9}'
+        ]
+        for key, count, errors, p50, p90, p99, worst in self.summary():
+            lines.append(
+                f'{key:<28}{count:>7}{errors:>7}'
+                f'{p50:>9.2f}{p90:>9.2f}{p99:>9.2f}{worst:>9.2f}'
+            )
+        lines.append(f'{self.elapsed:.3f} s elapsed, {self.skipped} skipped')
+        return '\n'.join(lines)
+
+
+async def replay(
+    target: Any, requests: List[RecordedRequest], *, speed: Optional[float] = 1.0
+) -> ReplayReport:
+    """Send recorded requests to a server and measure the responses.
+
+    Requests are sent at their recorded offsets divided by speed, without
+    waiting for earlier responses, so the server sees the recorded
+    concurrency.
+
+    Args:
+        target (Any): What ``fastmcp.Client`` connects to: a FastMCP server
+            for in-process replay, or a client transport such as
+            ``StdioTransport``.
+        requests (List[RecordedRequest]): Recorded requests.
+        speed (Optional[float], optional): Replay speed relative to the
+            recording; None sends every request at once.
+            Defaults to 1.0.
+
+    Returns:
+        ReplayReport: Latencies and errors per method.
+
+    Raises:
+        ValueError: If speed is not positive.
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError('Replay speed must be positive')
+    report = ReplayReport()
+    loop = asyncio.get_running_loop()
+    async with Client(target) as client:
+        session = client.session
+        started = loop.time()
+        pending = []
+        for offset, method, params in requests:
+            result_type = RESULT_TYPES.get(method)
+            if result_type is None:
+                report.skipped += 1
+                continue
+            if speed is not None:
+                delay = started + offset / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            pending.append(
+                asyncio.ensure_future(
+                    _send(session, method, params, result_type, report)
+                )
+            )
+        await asyncio.gather(*pending)
+        report.elapsed = loop.time() - started
+    return report
+
+
+async def _send(
+    session: Any,
+    method: str,
+    params: Optional[Dict[str, Any]],
+    result_type: Any,
+    report: ReplayReport,
+) -> None:
+    """Send one recorded request and add its outcome to a report.
+
+    Tool calls answering with an ``Error:`` message count as failed.
+
+    Args:
+        session (Any): Initialized MCP client session.
+        method (str): JSON-RPC method.
+        params (Optional[Dict[str, Any]]): Recorded parameters.
+        result_type (Any): Expected result model.
+        report (ReplayReport): Report to add the outcome to.
+    """
+    message: Dict[str, Any] = {'method': method}
+    if params is not None:
+        message['params'] = params
+    key = f"{method}:{params['name']}" if method == 'tools/call' and params else method
+    started = time.perf_counter()
+    try:
+        result = await session.send_request(
+            types.ClientRequest.model_validate(message), result_type
+        )
+        failed = bool(getattr(result, 'isError', False)) or any(
+            getattr(content, 'text', '').startswith('Error:')
+            for content in getattr(result, 'content', ())
+        )
+    except Exception:
+        failed = True
+    report.add(key, (time.perf_counter() - started) * 1000, failed)
@@ -34,6 +34,25 @@ def temp_file(tmp_path: Path) -> Generator[Path, None, None]:
     yield temp_file
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the soak test options."""
+    parser.addoption(
+        '--soak-operations',
+        type=int,
+        default=1000,
+        help='number of tool calls made by the soak test (default: 1000)',
+    )
+
+
+@pytest.fixture  # type: ignore[misc]
+def soak_operations(request: pytest.FixtureRequest) -> int:
+    """Return the number of tool calls the soak test makes."""
+    operations: int = request.config.getoption('--soak-operations')
+    if operations < 10:
+        raise pytest.UsageError('--soak-operations must be at least 10')
+    return operations
+
+
 def pytest_configure(config: pytest.Config) -> None:
     """Configure custom markers."""
     markers = ['unit', 'integration', 'e2e', 'slow']
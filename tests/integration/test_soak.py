@@ -0,0 +1,212 @@
+"""Soak test of a long-running in-process server.
+
+The server is driven through an in-process MCP client with a steady mixed
+workload: every project starts full and holds at most ``MAX_OPEN_TASKS``
+live tasks, so after the warm-up the data, caches and indexes should stop
+growing. Memory is sampled with ``tracemalloc`` (Python allocations made
+after the warm-up, outside this module) and, where the platform reports
+it, the process' resident set size (RSS). The test fails if either grows
+past its bound, or if the p99 latency of the last quarter of the calls
+drifts above that of the first.
+
+Run it alone with ``pytest -m slow``; ``--soak-operations`` sets the
+length of the run.
+"""
+
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from fastmcp import Client
+
+from copilot_task_manager.server.health import percentile
+from copilot_task_manager.server.mcp_server import create_server
+
+PROJECT_COUNT = 10
+MAX_OPEN_TASKS = 30
+WARMUP_FRACTION = 0.2
+SAMPLES = 10
+
+# Growth allowed after the warm-up.
+MAX_TRACED_GROWTH = 2 * 1024 * 1024
+MAX_RSS_GROWTH = 16 * 1024 * 1024
+
+# The p99 of the last quarter of the measured calls may exceed that of the
+# first quarter by this factor plus a floor absorbing scheduler noise.
+DRIFT_STRETCHES = 4
+MAX_P99_DRIFT = 2.0
+P99_DRIFT_FLOOR_MS = 5.0
+
+
+def rss_bytes() -> Optional[int]:
+    """Read the resident set size of this process.
+
+    Returns:
+        Optional[int]: Current RSS in bytes, or None where the platform does
+            not expose it through ``/proc``.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class SoakWorkload:
+    """Seeded mix of add, list, complete and remove calls over many projects."""
+
+    def __init__(self, client: Client, seed: int = 0) -> None:
+        """Initialize the workload.
+
+        Args:
+            client (Client): Connected MCP client of the server under test.
+            seed (int, optional): Seed of the operation mix. Defaults to 0.
+        """
+        self.client = client
+        self.random = random.Random(seed)
+        self.open: Dict[str, List[str]] = {}
+        self.completed: Dict[str, List[str]] = {}
+        self.latencies: List[float] = []
+        self.errors: List[str] = []
+
+    async def call(self, tool: str, **arguments: Any) -> str:
+        """Call a tool, recording its latency and any error message.
+
+        Args:
+            tool (str): Tool name.
+            **arguments (Any): Tool arguments.
+
+        Returns:
+            str: The tool's text response.
+        """
+        started = time.perf_counter()
+        result = await self.client.call_tool(tool, arguments)
+        self.latencies.append(time.perf_counter() - started)
+        text = str(getattr(result[0], 'text', ''))
+        if text.startswith('Error:'):
+            self.errors.append(f'{tool}: {text}')
+        return text
+
+    async def setup(self) -> None:
+        """Create the projects, fill them to the task limit and list them."""
+        for number in range(PROJECT_COUNT):
+            name = f'Project {number}'
+            await self.call('createProjectList', projectName=name)
+            self.open[name] = []
+            self.completed[name] = []
+            for _ in range(MAX_OPEN_TASKS):
+                await self.add(name)
+            await self.call('listTasks', projectName=name, statusFilter='all')
+
+    async def add(self, name: str) -> None:
+        """Add a task with a random priority to a project.
+
+        Args:
+            name (str): Project name.
+        """
+        text = await self.call(
+            'addTask',
+            taskDescription=f'Task {len(self.latencies)} for {name}',
+            projectName=name,
+            priority=self.random.randint(1, 5),
+        )
+        self.open[name].append(text.split('(ID: ', 1)[1].split(')', 1)[0])
+
+    async def step(self) -> None:
+        """Run one operation on a random project."""
+        name = self.random.choice(list(self.open))
+        open_ids, completed_ids = self.open[name], self.completed[name]
+        live = len(open_ids) + len(completed_ids)
+        roll = self.random.random()
+        if (roll < 0.4 and live < MAX_OPEN_TASKS) or live == 0:
+            await self.add(name)
+        elif roll < 0.7:
+            await self.call('listTasks', projectName=name, statusFilter='all')
+        elif roll < 0.85 and open_ids:
+            task_id = open_ids.pop(self.random.randrange(len(open_ids)))
+            await self.call(
+                'markTaskComplete', taskIdOrDescription=task_id, projectName=name
+            )
+            completed_ids.append(task_id)
+        else:
+            pool = completed_ids if completed_ids else open_ids
+            task_id = pool.pop(self.random.randrange(len(pool)))
+            await self.call('removeTask', taskIdOrDescription=task_id, projectName=name)
+
+
+def p99_ms(latencies: List[float]) -> float:
+    """Return the p99 of latencies in seconds, in milliseconds."""
+    return percentile(sorted(latencies), 0.99) * 1000
+
+
+def traced_snapshot() -> tracemalloc.Snapshot:
+    """Snapshot the traced allocations still alive, except this module's."""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, __file__)]
+    )
+
+
+@pytest.mark.slow  # type: ignore[misc]
+@pytest.mark.integration  # type: ignore[misc]
+@pytest.mark.asyncio  # type: ignore[misc]
+async def test_long_running_server_stays_flat(
+    tmp_path: Path, soak_operations: int
+) -> None:
+    """Test memory and latency of a server under a long steady workload.
+
+    Given an in-process server on a SQLite file with full projects, warmed
+    up with a fifth of the operations
+    When running the rest of the mixed workload, sampling memory as it goes
+    Then traced memory and RSS should stay within their bounds and the p99
+    latency of the last quarter should not drift above the first
+    """
+    # Given
+    server = create_server(db_path=str(tmp_path / 'soak.db'), client_rate_limit=None)
+    samples: List[Tuple[int, int, Optional[int]]] = []
+    try:
+        async with Client(server.mcp) as client:
+            workload = SoakWorkload(client)
+            await workload.setup()
+            warmup = max(1, int(soak_operations * WARMUP_FRACTION))
+            for _ in range(warmup):
+                await workload.step()
+            first = len(workload.latencies)
+            rss_base = rss_bytes()
+            tracemalloc.start()
+
+            # When
+            remaining = soak_operations - warmup
+            every = max(1, remaining // SAMPLES)
+            for number in range(1, remaining + 1):
+                await workload.step()
+                if number % every == 0 or number == remaining:
+                    snapshot = traced_snapshot()
+                    traced = sum(stat.size for stat in snapshot.statistics('filename'))
+                    samples.append((number, traced, rss_bytes()))
+    finally:
+        tracemalloc.stop()
+        await server._release()
+
+    # Then
+    assert workload.errors == []
+    growth = '\n'.join(str(stat) for stat in snapshot.statistics('lineno')[:5])
+    assert samples[-1][1] <= MAX_TRACED_GROWTH, (
+        f'Traced memory grew by {samples[-1][1]} bytes after the warm-up; '
+        f'samples (operation, traced, RSS): {samples}\nLargest growth:\n{growth}'
+    )
+    if rss_base is not None and samples[-1][2] is not None:
+        rss_growth = samples[-1][2] - rss_base
+        assert rss_growth <= MAX_RSS_GROWTH, (
+            f'RSS grew by {rss_growth} bytes after the warm-up; '
+            f'samples (operation, traced, RSS): {samples}'
+        )
+    stretch = max(1, (len(workload.latencies) - first) // DRIFT_STRETCHES)
+    early = p99_ms(workload.latencies[first : first + stretch])
+    late = p99_ms(workload.latencies[-stretch:])
+    assert (
+        late <= early * MAX_P99_DRIFT + P99_DRIFT_FLOOR_MS
+    ), f'p99 latency drifted from {early:.2f} ms to {late:.2f} ms'
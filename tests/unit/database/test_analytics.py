@@ -0,0 +1,89 @@
+"""BDD-style tests for the progress analytics helpers."""
+
+from typing import Dict
+
+from copilot_task_manager.database.analytics import (
+    NEVER_COMPLETED,
+    FlowKey,
+    age_buckets,
+    age_percentile,
+    age_rows,
+    bucket_sums,
+    dense_flow,
+    flow_key,
+    flow_rows,
+)
+
+# Tasks per (created_day, completed_day): two created on day 8, one of them
+# completed on day 10; one created on day 10 and one on day 12, still open.
+ROLLUP: Dict[FlowKey, int] = {
+    (8, 10): 1,
+    (8, NEVER_COMPLETED): 1,
+    (10, NEVER_COMPLETED): 1,
+    (12, NEVER_COMPLETED): 1,
+}
+
+
+class TestAnalytics:
+    """Test suite for the burndown, throughput and aging helpers.
+
+    Following BDD style:
+    - Given a rollup of task creation and completion days
+    - When aggregating and summarising it
+    - Then the series should match the tasks day by day
+    """
+
+    def test_flow_key_uses_completion_day(self) -> None:
+        """Test the rollup key of open and completed tasks.
+
+        Given an open and a completed task row
+        When computing their rollup keys
+        Then open tasks should never complete
+        """
+        # Given
+        open_row = (1, 1, 'Open', 'open', None, None, 86400 * 8 + 5, 86400 * 9)
+        done_row = open_row[:3] + ('completed',) + open_row[4:]
+
+        # Then
+        assert flow_key(open_row) == (8, NEVER_COMPLETED)
+        assert flow_key(done_row) == (8, 9)
+
+    def test_flow_rows_carry_the_days_before_the_range(self) -> None:
+        """Test aggregating the rollup into a burndown and throughput.
+
+        Given the rollup
+        When aggregating it over days 10 to 13 and densifying the rows
+        Then earlier days should be carried into one row and every day of
+        the range should have a value
+        """
+        # When
+        rows = flow_rows(ROLLUP.items(), 10, 13)
+        before, created, completed, open_tasks = dense_flow(rows, 10, 13)
+
+        # Then
+        assert rows == [(9, 2, 0, 2), (10, 1, 1, 2), (12, 1, 0, 3)]
+        assert before == 2
+        assert created == [1, 0, 1, 0]
+        assert completed == [1, 0, 0, 0]
+        assert open_tasks == [2, 2, 3, 3]
+        assert bucket_sums(created, 3) == [2, 0]
+        assert dense_flow([], 10, 11) == (0, [0, 0], [0, 0], [0, 0])
+
+    def test_age_rows_and_summaries(self) -> None:
+        """Test ageing the open tasks at the end of a day.
+
+        Given the rollup
+        When ageing the tasks open at the end of days 9 and 12
+        Then completed and not yet created tasks should be left out
+        """
+        # When
+        on_day_9 = age_rows(ROLLUP.items(), 9)
+        on_day_12 = age_rows(ROLLUP.items(), 12)
+
+        # Then
+        assert on_day_9 == [(1, 2, 2)]
+        assert on_day_12 == [(0, 1, 1), (2, 1, 2), (4, 1, 3)]
+        assert age_percentile(on_day_12, 0.5) == 2
+        assert age_percentile(on_day_12, 0.9) == 4
+        assert age_percentile([], 0.5) == 0
+        assert age_buckets(on_day_12 + [(45, 2, 5), (400, 1, 6)]) == [1, 2, 0, 2, 1]
@@ -0,0 +1,52 @@
+"""BDD-style tests for the integer encoding of dates and timestamps."""
+
+from datetime import datetime
+
+import pytest
+
+from copilot_task_manager.database.dates import (
+    decode_date,
+    decode_timestamp,
+    encode_date,
+    timestamp_date,
+)
+
+
+class TestDates:
+    """Test suite for date and timestamp encoding.
+
+    Following BDD style:
+    - Given dates and timestamps
+    - When encoding and decoding them
+    - Then they should round-trip through plain integers
+    """
+
+    def test_dates_round_trip_as_epoch_days(self) -> None:
+        """Test encoding due dates as days since the epoch.
+
+        Given dates around the epoch and a missing date
+        When encoding and decoding them
+        Then they should round-trip and order like the dates
+        """
+        # Given
+        dates = ['1969-12-31', '1970-01-01', '2025-06-01', '2025-07-01']
+
+        # When
+        days = [encode_date(value) for value in dates]
+
+        # Then
+        assert days[:3] == [-1, 0, 20240]
+        assert [decode_date(day) for day in days] == dates
+        assert encode_date(None) is None and decode_date(None) is None
+        assert encode_date('2025-6-1') == 20240
+
+    def test_invalid_date_is_rejected(self) -> None:
+        """Test that text not in YYYY-MM-DD format is refused."""
+        with pytest.raises(ValueError):
+            encode_date('06/01/2025')
+
+    def test_timestamps_decode_to_utc(self) -> None:
+        """Test decoding epoch seconds into naive UTC datetimes and dates."""
+        assert decode_timestamp(1746185400) == datetime(2025, 5, 2, 11, 30)
+        assert timestamp_date(1746185400) == '2025-05-02'
+        assert decode_timestamp(None) is None and timestamp_date(None) is None
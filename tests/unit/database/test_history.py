@@ -0,0 +1,124 @@
+"""BDD-style tests for replaying and pruning the audit log."""
+
+from typing import List
+
+from copilot_task_manager.database.history import (
+    HistoryEvent,
+    decode_delta,
+    encode_delta,
+    fold,
+    plan_prune,
+    rows_as_of,
+)
+
+EVENTS: List[HistoryEvent] = [
+    (1, 1, 100, 'add', encode_delta({'d': 'Write docs', 'p': 2, 'u': 20240})),
+    (2, 2, 110, 'add', encode_delta({'d': 'Ship'})),
+    (3, 1, 120, 'tag', encode_delta({'t': ['docs', 'ui']})),
+    (4, 2, 130, 'depend', encode_delta({'o': 1})),
+    (5, 1, 140, 'untag', encode_delta({'t': ['ui']})),
+    (6, 1, 150, 'complete', None),
+    (7, 3, 160, 'add', encode_delta({'d': 'Scratch'})),
+    (8, 3, 170, 'remove', None),
+]
+
+
+class TestHistory:
+    """Test suite for the audit log helpers.
+
+    Following BDD style:
+    - Given the events of a project
+    - When replaying, folding or pruning them
+    - Then the tasks should be reconstructed as they were
+    """
+
+    def test_deltas_leave_out_missing_fields(self) -> None:
+        """Test encoding event deltas.
+
+        Given changed fields with and without values
+        When encoding them
+        Then only the present fields should be stored, compactly
+        """
+        # When
+        delta = encode_delta({'d': 'Ship', 'p': None, 'u': None})
+
+        # Then
+        assert delta == '{"d":"Ship"}'
+        assert encode_delta({'p': None}) is None
+        assert decode_delta(None) == {}
+
+    def test_rows_as_of_replay_the_events(self) -> None:
+        """Test reconstructing listings at points in time.
+
+        Given the events of a project
+        When replaying them up to several times
+        Then the rows should match the tasks at each time
+        """
+        # When
+        before_completion = rows_as_of(7, EVENTS[:5], 'all')
+        after = rows_as_of(7, EVENTS, 'all')
+        while_scratch_existed = rows_as_of(7, EVENTS[:7], 'open')
+
+        # Then
+        assert before_completion == [
+            (1, 7, 'Write docs', 'open', 2, 20240, 100, 100),
+            (2, 7, 'Ship', 'open', None, None, 110, 110),
+        ]
+        assert after[0] == (1, 7, 'Write docs', 'completed', 2, 20240, 100, 150)
+        assert [row[0] for row in after] == [1, 2]
+        assert [row[0] for row in while_scratch_existed] == [2, 3]
+        assert rows_as_of(7, EVENTS, 'completed') == after[:1]
+
+    def test_fold_keeps_the_full_state(self) -> None:
+        """Test folding the events of one task into a baseline.
+
+        Given the events of a completed, tagged task and a removed task
+        When folding them
+        Then the baseline should replay to the same state
+        """
+        # When
+        folded = fold([event for event in EVENTS if event[1] == 1])
+        removed = fold([event for event in EVENTS if event[1] == 3])
+
+        # Then
+        assert folded is not None and removed is None
+        at, action, delta = folded
+        assert (at, action) == (150, 'baseline')
+        assert decode_delta(delta) == {
+            'd': 'Write docs',
+            'p': 2,
+            'u': 20240,
+            's': 'completed',
+            'c': 100,
+            'm': 150,
+            't': ['docs'],
+        }
+        assert rows_as_of(7, [(6, 1, at, action, delta)], 'all') == rows_as_of(
+            7, EVENTS, 'completed'
+        )
+
+    def test_plan_prune_folds_old_events(self) -> None:
+        """Test planning a retention prune.
+
+        Given the events of a project older than a cutoff
+        When planning the prune
+        Then each surviving task should keep one baseline at its last event,
+        removed tasks should lose all events and later replays should not
+        change
+        """
+        # When
+        deleted, rewrites = plan_prune(EVENTS)
+
+        # Then
+        assert sorted(deleted) == [1, 2, 3, 5, 7, 8]
+        assert [(event_id, at) for event_id, at, _, _ in rewrites] == [
+            (6, 150),
+            (4, 130),
+        ]
+        task_of = {event[0]: event[1] for event in EVENTS}
+        pruned = sorted(
+            (event_id, task_of[event_id], at, action, delta)
+            for event_id, at, action, delta in rewrites
+        )
+        assert rows_as_of(7, pruned, 'all') == rows_as_of(7, EVENTS, 'all')
+        assert plan_prune(pruned) == ([], [])
@@ -0,0 +1,264 @@
+"""BDD-style tests for the in-memory storage engine."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List
+from unittest.mock import ANY
+
+import pytest
+
+from copilot_task_manager.database import (
+    InMemoryTaskDatabase,
+    ShardedTaskDatabase,
+    TaskDatabase,
+    TaskStore,
+)
+from copilot_task_manager.database.dates import now_seconds
+
+
+class TestInMemoryTaskDatabase:
+    """Test suite for InMemoryTaskDatabase.
+
+    Following BDD style:
+    - Given an in-memory store
+    - When writing, snapshotting and reloading it
+    - Then its indexes and snapshot should stay consistent
+    """
+
+    def test_engines_implement_task_store(self, tmp_path: Path) -> None:
+        """Test that every engine satisfies the TaskStore protocol."""
+        for store in (
+            InMemoryTaskDatabase(),
+            TaskDatabase(':memory:'),
+            ShardedTaskDatabase(str(tmp_path)),
+        ):
+            assert isinstance(store, TaskStore)
+
+    def test_status_indexes_follow_completion(self) -> None:
+        """Test the sorted per-status indexes.
+
+        Given three open tasks
+        When the middle one is completed and the first removed
+        Then listings should stay ordered by task ID
+        """
+        # Given
+        db = InMemoryTaskDatabase()
+        project_id = db.create_project('Alpha')
+        assert project_id is not None
+        ids = [db.add_task(project_id, f'Task {i}') for i in range(3)]
+
+        # When
+        db.mark_task_complete(project_id, ids[1])
+        db.mark_task_complete(project_id, ids[0])
+        db.remove_task(project_id, ids[0])
+
+        # Then
+        open_rows = db.list_task_rows(project_id, 'open') or []
+        all_rows = db.list_task_rows(project_id, 'all') or []
+        assert [row[0] for row in open_rows] == [ids[2]]
+        assert [row[0] for row in all_rows] == ids[1:]
+        assert db.get_task(project_id + 1, ids[1]) is None
+
+    def test_snapshot_round_trip(self, tmp_path: Path) -> None:
+        """Test persisting through a snapshot file.
+
+        Given a store with a snapshot file
+        When it is closed and a new store loads the snapshot
+        Then the data should be restored and new IDs should not be reused
+        """
+        # Given
+        path = str(tmp_path / 'tasks.json')
+        first = InMemoryTaskDatabase(path)
+        project_id = first.create_project('Alpha')
+        assert project_id is not None
+        removed = first.add_task(project_id, 'Removed', priority=1)
+        kept = first.add_task(project_id, 'Kept', due_date='2025-06-01')
+        assert removed is not None and kept is not None
+        first.remove_task(project_id, removed)
+        blocked = first.add_task(project_id, 'Blocked')
+        assert blocked is not None
+        first.add_dependency(project_id, blocked, kept)
+        first.add_tags(project_id, kept, ['docs'])
+
+        # When
+        first.close()
+        second = InMemoryTaskDatabase(path)
+
+        # Then
+        task = second.get_task(project_id, kept)
+        assert task is not None
+        assert task.due_date == '2025-06-01'
+        assert task.created_at is not None
+        assert second.list_dependencies(project_id) == [(blocked, kept)]
+        assert second.list_tags(project_id) == [(kept, 'docs')]
+        history = second.list_history(project_id)
+        assert history is not None and history == first.list_history(project_id)
+        assert second.add_task(project_id, 'New') == blocked + 1
+        assert second.list_history(project_id, blocked + 1) == [
+            (len(history) + 1, blocked + 1, ANY, 'add', '{"d":"New"}')
+        ]
+        assert second.create_project('Beta') == project_id + 1
+
+    def test_version_1_snapshot_is_converted(self, tmp_path: Path) -> None:
+        """Test loading a snapshot holding text dates and timestamps."""
+        path = tmp_path / 'tasks.json'
+        path.write_text(
+            json.dumps(
+                {
+                    'version': 1,
+                    'next_project_id': 2,
+                    'next_task_id': 2,
+                    'projects': [[1, 'Alpha', '2025-05-01 10:00:00']],
+                    'tasks': [
+                        [
+                            1,
+                            1,
+                            'Dated',
+                            'open',
+                            None,
+                            '2025-06-01',
+                            '2025-05-01 10:00:00',
+                            '2025-05-02 11:30:00',
+                        ]
+                    ],
+                }
+            )
+        )
+
+        db = InMemoryTaskDatabase(str(path))
+
+        assert db.list_task_rows(1) == [
+            (1, 1, 'Dated', 'open', None, 20240, 1746093600, 1746185400)
+        ]
+        task = db.get_task(1, 1)
+        assert task is not None and task.due_date == '2025-06-01'
+        project = db.get_project_by_name('Alpha')
+        assert project is not None
+        assert project.created_at == datetime(2025, 5, 1, 10, 0)
+
+    def test_periodic_snapshot(self, tmp_path: Path) -> None:
+        """Test that writes snapshot once the interval has elapsed."""
+        path = tmp_path / 'tasks.json'
+        db = InMemoryTaskDatabase(str(path), snapshot_interval=0)
+        db.create_project('Alpha')
+        assert path.exists()
+        assert db.dirty is False
+
+        lazy = InMemoryTaskDatabase(str(tmp_path / 'lazy.json'))
+        lazy.create_project('Alpha')
+        assert lazy.dirty is True
+        assert not (tmp_path / 'lazy.json').exists()
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_snapshot_is_written_off_the_event_loop(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test snapshots taken while an event loop runs.
+
+        Given a store snapshotting after every write, in a running event loop
+        When two writes happen before the snapshot task runs, then a third
+        after it finished
+        Then one synced snapshot holding the first two writes should be
+        written on a worker thread, and the third write should start another
+        """
+        # Given
+        path = tmp_path / 'tasks.json'
+        db = InMemoryTaskDatabase(str(path), snapshot_interval=0)
+        synced: List[int] = []
+        monkeypatch.setattr(
+            'copilot_task_manager.database.memory.os.fsync', synced.append
+        )
+
+        # When
+        db.create_project('Alpha')
+        db.create_project('Beta')
+        task = db._snapshot_task
+        assert task is not None
+        written = await task
+
+        # Then
+        assert written is True
+        assert len(synced) == 2  # the file, then its directory
+        assert [row[1] for row in json.loads(path.read_text())['projects']] == [
+            'Alpha',
+            'Beta',
+        ]
+        db.create_project('Gamma')
+        assert db._snapshot_task is not task
+        await db._snapshot_task
+
+    def test_older_snapshot_does_not_replace_newer(self, tmp_path: Path) -> None:
+        """Test that a superseded snapshot is not written."""
+        path = tmp_path / 'tasks.json'
+        db = InMemoryTaskDatabase(str(path))
+        db.create_project('Alpha')
+        older = db._take_snapshot()
+        db.create_project('Beta')
+        assert db.snapshot() is True
+        assert db._write_snapshot(*older) is True
+        assert len(json.loads(path.read_text())['projects']) == 2
+
+    def test_close_writes_a_snapshot_still_in_flight(self, tmp_path: Path) -> None:
+        """Test closing while a background snapshot is not on disk yet.
+
+        Given a store whose data was captured for a snapshot that the
+        worker thread has not written
+        When the store is closed
+        Then the data should be snapshotted, and the late write skipped
+        """
+        # Given
+        path = tmp_path / 'tasks.json'
+        db = InMemoryTaskDatabase(str(path))
+        db.create_project('Alpha')
+        in_flight = db._take_snapshot()
+        assert db.dirty is False and not path.exists()
+
+        # When
+        db.close()
+
+        # Then
+        assert json.loads(path.read_text())['projects'][0][1] == 'Alpha'
+        path.unlink()
+        assert db._write_snapshot(*in_flight) is True
+        assert not path.exists()
+
+    def test_prune_that_only_rewrites_is_snapshotted(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a prune rewriting events without deleting any is dirty.
+
+        Given a snapshotted store and a prune plan with only a rewrite
+        When the history is pruned
+        Then the rewritten event should be pending for the next snapshot
+        """
+        # Given
+        db = InMemoryTaskDatabase(str(tmp_path / 'tasks.json'))
+        alpha = db.create_project('Alpha')
+        assert alpha is not None
+        db.add_task(alpha, 'First')
+        db.snapshot()
+        event_id = db._history[alpha][0][0]
+        monkeypatch.setattr(
+            'copilot_task_manager.database.memory.plan_prune',
+            lambda events: ([], [(event_id, 1, 'baseline', None)]),
+        )
+
+        # When
+        removed = db.prune_history(now_seconds() + 1)
+
+        # Then
+        assert removed == 0
+        assert db._history[alpha][0][2:] == (1, 'baseline', None)
+        assert db.dirty is True
+
+    def test_invalid_configuration(self, tmp_path: Path) -> None:
+        """Test rejection of bad settings and snapshot files."""
+        bad = tmp_path / 'bad.json'
+        bad.write_text('{"version": 99}')
+        with pytest.raises(ValueError, match='Unsupported snapshot'):
+            InMemoryTaskDatabase(str(bad))
+        with pytest.raises(ValueError, match='cannot be negative'):
+            InMemoryTaskDatabase(snapshot_interval=-1)
+        with pytest.raises(ValueError, match='retention must be positive'):
+            InMemoryTaskDatabase(history_retention=0)
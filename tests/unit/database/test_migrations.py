@@ -0,0 +1,205 @@
+"""BDD-style tests for versioned schema migrations."""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.database.history import decode_delta
+from copilot_task_manager.database.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    migrate,
+    schema_version,
+    split_statements,
+)
+
+
+class TestMigrations:
+    """Test suite for schema migrations.
+
+    Following BDD style:
+    - Given databases at different schema versions
+    - When they are opened
+    - Then pending migrations should be applied atomically, and current
+      databases only checked
+    """
+
+    def test_unversioned_database_is_adopted(self, tmp_path: Path) -> None:
+        """Test migrating a database created before versioning.
+
+        Given a database with the original tables and a task, at version 0
+        When it is opened
+        Then it should reach the latest version and keep its data
+        """
+        # Given
+        path = str(tmp_path / 'legacy.db')
+        conn = sqlite3.connect(path)
+        conn.executescript(MIGRATIONS[0][1])
+        conn.execute("INSERT INTO Projects (project_name) VALUES ('Alpha')")
+        conn.execute("INSERT INTO Tasks (project_id, description) VALUES (1, 'Kept')")
+        conn.commit()
+        conn.close()
+
+        # When
+        db = TaskDatabase(path)
+        version = schema_version(db.connection)
+
+        # Then
+        assert version == SCHEMA_VERSION
+        task = db.get_task(1, 1)
+        assert task is not None and task.description == 'Kept'
+        assert db.list_dependencies(1) == []
+        db.close()
+
+    def test_text_dates_are_converted_to_integers(self, tmp_path: Path) -> None:
+        """Test migrating text dates and timestamps to integer encodings.
+
+        Given a version 2 database with text dates and a dependency
+        When it is opened
+        Then the columns should hold integers decoding to the same values,
+        the dependency should survive, the audit log, task flow rollup and
+        search index should be seeded and updates should stamp integers
+        """
+        # Given
+        path = str(tmp_path / 'text.db')
+        conn = sqlite3.connect(path)
+        for script in (MIGRATIONS[0][1], MIGRATIONS[1][1]):
+            conn.executescript(script)
+        conn.execute(
+            'INSERT INTO Projects (project_name, created_at) '
+            "VALUES ('Alpha', '2025-05-01 10:00:00')"
+        )
+        conn.executemany(
+            'INSERT INTO Tasks (project_id, description, due_date, created_at, '
+            'updated_at) VALUES (1, ?, ?, ?, ?)',
+            [
+                ('Dated', '2025-06-01', '2025-05-01 10:00:00', '2025-05-02 11:30:00'),
+                ('Undated', None, '2025-05-01 10:00:00', '2025-05-01 10:00:00'),
+            ],
+        )
+        conn.execute('INSERT INTO TaskDependencies VALUES (2, 1)')
+        conn.execute('PRAGMA user_version = 2')
+        conn.commit()
+        conn.close()
+
+        # When
+        db = TaskDatabase(path)
+        seeded = db.list_history(1)
+        types = db.connection.execute(
+            'SELECT typeof(due_date), typeof(created_at), typeof(updated_at) '
+            'FROM Tasks WHERE task_id = 1'
+        ).fetchone()
+
+        # Then
+        assert types == ('integer', 'integer', 'integer')
+        task = db.get_task(1, 1)
+        assert task is not None
+        assert task.due_date == '2025-06-01'
+        assert task.updated_at == datetime(2025, 5, 2, 11, 30)
+        undated = db.get_task(1, 2)
+        assert undated is not None and undated.due_date is None
+        project = db.get_project_by_name('Alpha')
+        assert project is not None
+        assert project.created_at == datetime(2025, 5, 1, 10, 0)
+        assert db.list_dependencies(1) == [(2, 1)]
+        assert seeded is not None
+        assert [(task_id, action) for _, task_id, _, action, _ in seeded] == [
+            (1, 'add'),
+            (2, 'add'),
+        ]
+        assert decode_delta(seeded[0][4]) == {'d': 'Dated', 'u': 20240}
+        assert seeded[0][2] == 1746093600
+        assert db.task_flow(1, 20209, 20210) == [(20209, 2, 0, 2)]
+        found = db.search_tasks(['undat'], 'all')
+        assert found is not None and [row[1] for row in found] == [2]
+        assert db.mark_task_complete(1, 1)
+        stamped = db.connection.execute(
+            'SELECT typeof(updated_at) FROM Tasks WHERE task_id = 1'
+        ).fetchone()
+        assert stamped == ('integer',)
+        db.close()
+
+    def test_moving_a_task_keeps_its_timestamp(self) -> None:
+        """Test which updates refresh ``updated_at``.
+
+        Given a task last updated long ago
+        When moving it to another project, then completing it
+        Then only the completion should refresh its timestamp
+        """
+        # Given
+        db = TaskDatabase(':memory:')
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        task_id = db.add_task(alpha, 'Old task')
+        assert task_id is not None
+        conn = db.connection
+        with conn:
+            conn.execute('UPDATE Tasks SET created_at = 100, updated_at = 100')
+
+        # When
+        with conn:
+            conn.execute('UPDATE Tasks SET project_id = ?', (beta,))
+        moved = conn.execute('SELECT updated_at FROM Tasks').fetchone()
+        db.mark_task_complete(beta, task_id)
+        completed = conn.execute('SELECT updated_at FROM Tasks').fetchone()
+
+        # Then
+        assert moved == (100,)
+        assert completed[0] > 100
+        db.close()
+
+    def test_current_database_costs_one_pragma(self) -> None:
+        """Test that an up-to-date schema is only checked."""
+        conn = sqlite3.connect(':memory:')
+        assert migrate(conn) == len(MIGRATIONS)
+        statements: List[str] = []
+        conn.set_trace_callback(statements.append)
+        assert migrate(conn) == 0
+        assert statements == ['PRAGMA user_version']
+        conn.close()
+
+    def test_failed_migration_rolls_back(self) -> None:
+        """Test that a failing migration leaves the previous version.
+
+        Given a current database and a new migration failing half-way
+        When migrating
+        Then the error should surface and nothing of it be applied
+        """
+        # Given
+        conn = sqlite3.connect(':memory:')
+        migrate(conn)
+        broken = MIGRATIONS + (
+            (SCHEMA_VERSION + 1, 'CREATE TABLE Extra (id INTEGER);\nNOT SQL;\n'),
+        )
+
+        # When
+        with pytest.raises(sqlite3.OperationalError):
+            migrate(conn, broken)
+
+        # Then
+        assert schema_version(conn) == SCHEMA_VERSION
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'Extra'"
+        ).fetchall()
+        assert tables == []
+        conn.close()
+
+    def test_newer_database_is_rejected(self) -> None:
+        """Test that a database from a newer release is not opened."""
+        conn = sqlite3.connect(':memory:')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION + 1}')
+        with pytest.raises(sqlite3.DatabaseError, match='newer than'):
+            migrate(conn)
+        conn.close()
+
+    def test_split_statements_keeps_triggers_whole(self) -> None:
+        """Test splitting a script with a trigger body."""
+        statements = list(split_statements(MIGRATIONS[0][1]))
+        assert len(statements) == 3
+        assert statements[2].startswith('CREATE TRIGGER')
+        assert statements[2].endswith('END;')
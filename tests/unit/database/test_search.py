@@ -0,0 +1,62 @@
+"""BDD-style tests for the full-text search helpers."""
+
+from copilot_task_manager.database.search import WordIndex, fts_query, search_terms
+
+
+class TestSearchTerms:
+    """Test suite for splitting queries and descriptions into words."""
+
+    def test_terms_ignore_case_accents_and_punctuation(self) -> None:
+        """Test the words of a piece of text.
+
+        Given text with capitals, accents, punctuation and repeats
+        When splitting it into search terms
+        Then the distinct folded words should remain in order
+        """
+        assert search_terms('Café-Docs: re_view DOCS naïve 42') == [
+            'cafe',
+            'docs',
+            're',
+            'view',
+            'naive',
+            '42',
+        ]
+        assert search_terms('?!') == []
+        assert fts_query(['and', 'doc']) == '"and"* "doc"*'
+
+
+class TestWordIndex:
+    """Test suite for WordIndex.
+
+    Following BDD style:
+    - Given indexed task descriptions
+    - When matching word prefixes
+    - Then tasks having a word with every prefix should match
+    """
+
+    def test_prefix_match_of_every_term(self) -> None:
+        """Test matching and unindexing.
+
+        Given three indexed descriptions
+        When matching prefixes before and after removing a task
+        Then only tasks with every prefix should match
+        """
+        # Given
+        index = WordIndex()
+        index.add(1, 'Write the docs')
+        index.add(2, 'Docstring review')
+        index.add(3, 'Review release notes')
+
+        # When
+        before = index.match(['doc'])
+        both = index.match(['rev', 'doc'])
+        index.remove(2, 'Docstring review')
+
+        # Then
+        assert before == {1, 2}
+        assert both == {2}
+        assert index.match(['doc']) == {1}
+        assert index.match(['rev']) == {3}
+        assert index.match(['docstring']) == set()
+        assert index.match(['zzz', 'doc']) == set()
+        assert index.match([]) == set()
@@ -0,0 +1,200 @@
+"""BDD-style tests for sharded multi-database storage."""
+
+from pathlib import Path
+
+import pytest
+
+from copilot_task_manager.database import ShardedTaskDatabase
+from copilot_task_manager.database.sharding import DEFAULT_MAX_OPEN_SHARDS
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class TestShardedLayout:
+    """Test suite for the sharded storage layout.
+
+    Following BDD style:
+    - Given a shard directory
+    - When creating projects and tasks
+    - Then each project should live in its own shard file
+    """
+
+    def test_one_shard_file_per_project(self, tmp_path: Path) -> None:
+        """Test the per-project layout.
+
+        Given a sharded database without buckets
+        When creating two projects with tasks
+        Then each project should get its own shard file and task IDs
+        """
+        # Given
+        db = ShardedTaskDatabase(str(tmp_path))
+
+        # When
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        alpha_task = db.add_task(alpha, 'Alpha task')
+        beta_task = db.add_task(beta, 'Beta task')
+        db.close()
+
+        # Then
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ['catalog.db', 'shard_project_1.db', 'shard_project_2.db']
+        assert alpha_task == beta_task == 1
+
+    def test_hash_buckets_group_projects(self, tmp_path: Path) -> None:
+        """Test the hash-bucket layout.
+
+        Given a sharded database with a single bucket
+        When creating several projects
+        Then they should all share one shard file
+        """
+        # Given
+        db = ShardedTaskDatabase(str(tmp_path), buckets=1)
+
+        # When
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            db.create_project(name)
+        db.close()
+
+        # Then
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            'catalog.db',
+            'shard_bucket_0.db',
+        ]
+
+    def test_catalog_survives_restart(self, tmp_path: Path) -> None:
+        """Test that projects are found again after reopening.
+
+        Given a project with a task in a sharded database
+        When the database is closed and reopened
+        Then the project and its task should be found via the catalog
+        """
+        # Given
+        first = ShardedTaskDatabase(str(tmp_path))
+        project_id = first.create_project('Alpha')
+        assert project_id is not None
+        first.add_task(project_id, 'Persistent task')
+        first.close()
+
+        # When
+        second = ShardedTaskDatabase(str(tmp_path))
+        project = second.get_project_by_name('Alpha')
+
+        # Then
+        assert project is not None and project.project_id == project_id
+        tasks = second.list_tasks(project_id, 'all')
+        assert tasks is not None
+        assert [t.description for t in tasks] == ['Persistent task']
+        second.close()
+
+    def test_duplicate_and_unknown_projects(self, tmp_path: Path) -> None:
+        """Test catalog uniqueness and unknown project IDs."""
+        db = ShardedTaskDatabase(str(tmp_path))
+        db.create_project('Alpha')
+        assert db.create_project('Alpha') is None
+        assert db.add_task(999, 'Orphan') is None
+        assert db.list_tasks(999) is None
+        assert db.remove_task(999, 1) is False
+        db.close()
+
+
+class TestShardHandleCache:
+    """Test suite for the LRU of open shard handles."""
+
+    def test_least_recently_used_shard_is_closed(self, tmp_path: Path) -> None:
+        """Test LRU eviction.
+
+        Given a sharded database keeping at most two shards open
+        When three projects are used in turn
+        Then the least recently used shard should be closed and reopen lazily
+        """
+        # Given
+        db = ShardedTaskDatabase(str(tmp_path), max_open_shards=2)
+        ids = [db.create_project(name) for name in ('A', 'B', 'C')]
+        assert None not in ids
+
+        # When
+        db.add_task(1, 'Touch A')
+
+        # Then
+        assert db.open_shards == ['project_3', 'project_1']
+        tasks = db.list_tasks(2, 'all')
+        assert tasks == []
+        assert db.open_shards == ['project_1', 'project_2']
+        db.close()
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        'kwargs', [{'buckets': 0}, {'max_open_shards': 0}]
+    )
+    def test_invalid_configuration(self, tmp_path: Path, kwargs: dict) -> None:
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError, match='must be positive'):
+            ShardedTaskDatabase(str(tmp_path), **kwargs)
+
+    def test_default_open_shard_limit(self, tmp_path: Path) -> None:
+        """Test the default LRU size."""
+        db = ShardedTaskDatabase(str(tmp_path))
+        assert db.max_open_shards == DEFAULT_MAX_OPEN_SHARDS
+
+
+class TestShardedTools:
+    """Test suite running the task tools on sharded storage."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_tools_work_across_shards(self, tmp_path: Path) -> None:
+        """Test the tool layer on top of sharded storage.
+
+        Given the task tools on sharded storage
+        When managing tasks in two projects
+        Then each project should only see its own tasks
+        """
+        # Given
+        db = ShardedTaskDatabase(str(tmp_path))
+        tools = TaskTools(db)
+        tools.create_project_list('Alpha')
+        tools.create_project_list('Beta')
+
+        # When
+        tools.add_task('Alpha work', projectName='Alpha')
+        tools.add_task('Beta work', projectName='Beta')
+        completed = tools.mark_task_complete('1', projectName='Beta')
+
+        # Then
+        assert completed == "Task '(ID: 1) Beta work' in 'Beta' marked as complete."
+        assert await tools.list_tasks('Alpha') == '[ ] (ID: 1) Alpha work'
+        assert (
+            await tools.list_tasks('Beta') == "No open tasks found for project 'Beta'."
+        )
+        db.close()
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_move_tasks_across_shards(self, tmp_path: Path) -> None:
+        """Test moving tasks between project shards.
+
+        Given two projects with one task each, in separate shard files
+        When moving Alpha's task to Beta
+        Then it should be renumbered after Beta's task, keeping its tags
+        """
+        # Given
+        db = ShardedTaskDatabase(str(tmp_path))
+        tools = TaskTools(db)
+        tools.create_project_list('Alpha')
+        tools.create_project_list('Beta')
+        tools.add_task('Alpha work', projectName='Alpha')
+        tools.tag_task('1', ['ops'], projectName='Alpha')
+        tools.add_task('Beta work', projectName='Beta')
+
+        # When
+        moved = tools.move_tasks('Beta', projectName='Alpha')
+
+        # Then
+        assert moved == ("Moved 1 task from 'Alpha' to 'Beta'. New task IDs: 1 -> 2.")
+        assert await tools.list_tasks('Beta') == (
+            '[ ] (ID: 1) Beta work\n[ ] (ID: 2) Alpha work'
+        )
+        assert tools.list_tags('Beta') == "Tags in 'Beta': ops (1)"
+        assert (
+            await tools.list_tasks('Alpha')
+            == "No open tasks found for project 'Alpha'."
+        )
+        db.close()
@@ -0,0 +1,582 @@
+"""BDD-style conformance tests for the task storage engines.
+
+Every test taking the ``db`` fixture runs against each TaskStore engine.
+"""
+
+from pathlib import Path
+from typing import Any, Generator, List
+
+import pytest
+
+from copilot_task_manager.database import (
+    InMemoryTaskDatabase,
+    MoveResult,
+    ShardedTaskDatabase,
+    TaskDatabase,
+    TaskStore,
+)
+from copilot_task_manager.database.dates import SECONDS_PER_DAY, now_seconds
+from copilot_task_manager.database.history import decode_delta, rows_as_of
+
+
+@pytest.fixture(params=['sqlite', 'memory', 'sharded'])  # type: ignore[misc]
+def db(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Generator[TaskStore, None, None]:
+    """Create an empty store for each storage engine.
+
+    Returns:
+        Generator[TaskStore, None, None]: The storage engine.
+    """
+    store: TaskStore
+    if request.param == 'sqlite':
+        store = TaskDatabase(':memory:')
+    elif request.param == 'memory':
+        store = InMemoryTaskDatabase()
+    else:
+        store = ShardedTaskDatabase(str(tmp_path / 'shards'))
+    yield store
+    store.close()
+
+
+class TestProjectOperations:
+    """Test suite for project operations.
+
+    Following BDD style:
+    - Given an empty database
+    - When managing projects
+    - Then they should be stored and retrievable by name
+    """
+
+    def test_create_and_get_project(self, db: TaskStore) -> None:
+        """Test creating a project and looking it up by name.
+
+        Given an empty database
+        When creating a project
+        Then it should be retrievable by name with its new ID
+        """
+        # When
+        project_id = db.create_project('Alpha')
+
+        # Then
+        project = db.get_project_by_name('Alpha')
+        assert project is not None
+        assert project.project_id == project_id
+        assert project.created_at is not None
+
+    def test_create_duplicate_project_fails(self, db: TaskStore) -> None:
+        """Test that project names are unique.
+
+        Given an existing project
+        When creating another project with the same name
+        Then creation should fail with None
+        """
+        # Given
+        db.create_project('Alpha')
+
+        # When/Then
+        assert db.create_project('Alpha') is None
+
+    def test_get_unknown_project(self, db: TaskStore) -> None:
+        """Test looking up a missing project.
+
+        Given an empty database
+        When looking up an unknown project
+        Then None should be returned
+        """
+        assert db.get_project_by_name('Missing') is None
+
+
+class TestTaskOperations:
+    """Test suite for task operations.
+
+    Following BDD style:
+    - Given a project in the database
+    - When managing its tasks
+    - Then the changes should be persisted
+    """
+
+    def test_add_and_get_task(self, db: TaskStore) -> None:
+        """Test adding a task with all fields.
+
+        Given a project
+        When adding a task with priority and due date
+        Then the task should be retrievable with those fields
+        """
+        # Given
+        project_id = db.create_project('Alpha')
+        assert project_id is not None
+
+        # When
+        task_id = db.add_task(project_id, 'Write docs', 2, '2025-06-01')
+
+        # Then
+        assert task_id is not None
+        task = db.get_task(project_id, task_id)
+        assert task is not None
+        assert task.description == 'Write docs'
+        assert task.status == 'open'
+        assert task.priority == 2
+        assert task.due_date == '2025-06-01'
+
+    def test_list_tasks_by_status(self, db: TaskStore) -> None:
+        """Test listing tasks with each status filter.
+
+        Given a project with an open and a completed task
+        When listing with each status filter
+        Then only the matching tasks should be returned
+        """
+        # Given
+        project_id = db.create_project('Alpha')
+        assert project_id is not None
+        open_id = db.add_task(project_id, 'Open task')
+        done_id = db.add_task(project_id, 'Done task')
+        assert done_id is not None
+        db.mark_task_complete(project_id, done_id)
+
+        # When/Then
+        open_tasks = db.list_tasks(project_id, 'open')
+        completed = db.list_tasks(project_id, 'completed')
+        every = db.list_tasks(project_id, 'all')
+        assert open_tasks is not None and completed is not None
+        assert every is not None
+        assert [t.task_id for t in open_tasks] == [open_id]
+        assert [t.task_id for t in completed] == [done_id]
+        assert [t.task_id for t in every] == [open_id, done_id]
+
+    def test_list_tasks_with_invalid_filter(self, db: TaskStore) -> None:
+        """Test that an invalid status filter is rejected.
+
+        Given a database
+        When listing with an unknown status filter
+        Then a ValueError should be raised
+        """
+        with pytest.raises(ValueError, match='Invalid status filter'):
+            db.list_tasks(1, 'pending')
+
+    def test_find_tasks_by_description(self, db: TaskStore) -> None:
+        """Test substring search treats LIKE wildcards literally.
+
+        Given tasks whose descriptions contain wildcard characters
+        When searching by a fragment
+        Then only literal, case-insensitive matches should be returned
+        """
+        # Given
+        project_id = db.create_project('Alpha')
+        assert project_id is not None
+        db.add_task(project_id, 'Reach 100% coverage')
+        db.add_task(project_id, 'Reach 1000 users')
+
+        # When
+        matches = db.find_tasks_by_description(project_id, '100%')
+        folded = db.find_tasks_by_description(project_id, 'reach')
+
+        # Then
+        assert matches is not None and folded is not None
+        assert [t.description for t in matches] == ['Reach 100% coverage']
+        assert len(folded) == 2
+
+    def test_search_tasks(self, db: TaskStore) -> None:
+        """Test searching task descriptions across projects.
+
+        Given matching tasks in two projects, one completed and one removed
+        When searching by word prefixes, by status and page by page
+        Then matches should be grouped by project and pages should continue
+        after the previous one
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        docs = db.add_task(alpha, 'Write the Docs')
+        db.add_task(alpha, 'Unrelated')
+        review = db.add_task(beta, 'Review café docs')
+        done = db.add_task(beta, 'Docstring fixes')
+        gone = db.add_task(alpha, 'Old docs')
+        assert None not in (docs, review, done, gone)
+        db.mark_task_complete(beta, done)  # type: ignore[arg-type]
+        db.remove_task(alpha, gone)  # type: ignore[arg-type]
+
+        # When
+        everything = db.search_tasks(['doc'], 'all')
+        accented = db.search_tasks(['cafe', 'doc'])
+        completed = db.search_tasks(['doc'], 'completed')
+        first = db.search_tasks(['doc'], 'all', limit=1)
+        assert first is not None
+        rest = db.search_tasks(['doc'], 'all', after=(first[0][2], first[0][1]))
+
+        # Then
+        assert everything is not None
+        assert [(row[0], row[1]) for row in everything] == [
+            ('Alpha', docs),
+            ('Beta', review),
+            ('Beta', done),
+        ]
+        assert everything[0][1:] == db.list_task_rows(alpha)[0]  # type: ignore
+        assert accented is not None and [row[1] for row in accented] == [review]
+        assert completed is not None and [row[1] for row in completed] == [done]
+        assert rest is not None and [row[1] for row in rest] == [review, done]
+        assert db.search_tasks([], 'all') == []
+        with pytest.raises(ValueError):
+            db.search_tasks(['doc'], 'closed')
+
+    def test_remove_task(self, db: TaskStore) -> None:
+        """Test removing a task.
+
+        Given a task
+        When removing it twice
+        Then the first removal should succeed and the second should not
+        """
+        # Given
+        project_id = db.create_project('Alpha')
+        assert project_id is not None
+        task_id = db.add_task(project_id, 'Temporary')
+        assert task_id is not None
+
+        # When/Then
+        assert db.remove_task(project_id, task_id) is True
+        assert db.remove_task(project_id, task_id) is False
+        assert db.get_task(project_id, task_id) is None
+
+    def test_move_tasks(self, db: TaskStore) -> None:
+        """Test moving tasks between projects.
+
+        Given tagged, linked and completed tasks of a project
+        When moving some of them and an unknown ID, then only some of them,
+        to another project
+        Then nothing should move the first time; the second time they should
+        be listed, tagged, linked, searched and counted in the target with
+        their timestamps, dependencies on the tasks left behind should be
+        dropped and reported, and the history of both projects should
+        replay to their current tasks
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        first, second, third, kept = (
+            db.add_task(alpha, name, priority=1)
+            for name in ('Spec', 'Docs', 'Ship', 'Keep')
+        )
+        assert first and second and third and kept
+        db.add_tags(alpha, first, ['ui'])
+        db.add_dependency(alpha, second, first)
+        db.add_dependency(alpha, third, kept)
+        db.add_dependency(alpha, kept, second)
+        db.mark_task_complete(alpha, second)
+        before = {row[0]: row for row in db.list_task_rows(alpha, 'all') or []}
+        today = now_seconds() // SECONDS_PER_DAY
+
+        # When
+        refused = db.move_tasks(alpha, [first, 999, second, 998], beta)
+        result = db.move_tasks(alpha, [first, second, third], beta)
+
+        # Then
+        assert refused == MoveResult(missing=[998, 999])
+        assert result is not None
+        pairs = result.pairs
+        assert [old for old, _ in pairs] == [first, second, third]
+        assert result.dropped == [(third, kept), (kept, second)]
+        ids = dict(pairs)
+        moved = db.list_task_rows(beta, 'all')
+        assert moved is not None
+        assert [row[0] for row in moved] == [ids[first], ids[second], ids[third]]
+        assert [row[2:] for row in moved] == [
+            before[task_id][2:] for task_id in (first, second, third)
+        ]
+        assert [row[0] for row in db.list_task_rows(alpha, 'all') or []] == [kept]
+        assert db.list_tags(beta) == [(ids[first], 'ui')]
+        assert db.list_dependencies(beta) == [(ids[second], ids[first])]
+        assert db.list_dependencies(alpha) == []
+        found = db.search_tasks(['docs'], 'all')
+        assert found is not None and [(row[0], row[1]) for row in found] == [
+            ('Beta', ids[second])
+        ]
+        assert db.task_flow(beta, today, today) == [(today, 3, 1, 2)]
+        assert db.task_flow(alpha, today, today) == [(today, 1, 0, 1)]
+        for project_id in (alpha, beta):
+            rows = rows_as_of(project_id, db.list_history(project_id) or [], 'all')
+            assert rows == db.list_task_rows(project_id, 'all')
+        assert db.move_tasks(alpha, [kept], 999) is None
+
+    def test_move_tasks_by_status_and_tags(self, db: TaskStore) -> None:
+        """Test selecting the tasks to move in the storage engine.
+
+        Given open and completed tasks with various tags
+        When moving by status, required, alternative and excluded tags
+        Then only the matching tasks should move each time
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        ui, both, done, api, plain = (
+            db.add_task(alpha, name) for name in ('UI', 'Both', 'Done', 'API', 'Plain')
+        )
+        assert ui and both and done and api and plain
+        db.add_tags(alpha, ui, ['ui'])
+        db.add_tags(alpha, both, ['ui', 'api'])
+        db.add_tags(alpha, done, ['ui'])
+        db.add_tags(alpha, api, ['api'])
+        db.mark_task_complete(alpha, done)
+
+        def moved(*args: Any, **kwargs: Any) -> List[int]:
+            result = db.move_tasks(alpha, *args, **kwargs)
+            assert result is not None and not result.missing
+            return [old for old, _ in result.pairs]
+
+        # When/Then
+        assert moved(
+            None, beta, status_filter='open', all_of=['ui'], none_of=['api']
+        ) == [ui]
+        assert moved(None, beta, any_of=['api', 'missing']) == [both, api]
+        assert moved([done, plain], beta, status_filter='open') == [plain]
+        assert moved(None, beta, all_of=['ui', 'ui']) == [done]
+        assert moved(None, beta) == []
+
+    def test_copy_project(self, db: TaskStore) -> None:
+        """Test copying a project.
+
+        Given a project with tagged, linked and completed tasks
+        When copying it to a new project, to a taken name and copying an
+        unknown project
+        Then the copy should hold new tasks with the same fields, tags and
+        dependencies, and the failed copies should return None
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        assert alpha is not None
+        first = db.add_task(alpha, 'Spec', priority=2, due_date='2025-06-01')
+        second = db.add_task(alpha, 'Build')
+        assert first and second
+        db.add_tags(alpha, first, ['ui', 'api'])
+        db.add_dependency(alpha, second, first)
+        db.mark_task_complete(alpha, first)
+
+        # When
+        copy_id = db.copy_project(alpha, 'Alpha copy')
+
+        # Then
+        assert copy_id is not None and copy_id != alpha
+        project = db.get_project_by_name('Alpha copy')
+        assert project is not None and project.project_id == copy_id
+        originals = db.list_task_rows(alpha, 'all')
+        copies = db.list_task_rows(copy_id, 'all')
+        assert originals is not None and copies is not None
+        assert [row[2:6] for row in copies] == [row[2:6] for row in originals]
+        new_first, new_second = (row[0] for row in copies)
+        assert db.list_tags(copy_id) == [(new_first, 'api'), (new_first, 'ui')]
+        assert db.list_dependencies(copy_id) == [(new_second, new_first)]
+        assert db.list_task_rows(alpha, 'all') == originals
+        history = db.list_history(copy_id)
+        assert history is not None
+        assert rows_as_of(copy_id, history, 'all') == copies
+        assert db.copy_project(alpha, 'Alpha copy') is None
+        assert db.copy_project(999, 'Missing copy') is None
+        assert db.get_project_by_name('Missing copy') is None
+
+    def test_dependencies(self, db: TaskStore) -> None:
+        """Test storing dependencies between tasks.
+
+        Given three tasks of a project and a task of another project
+        When adding dependencies, a duplicate and a cross-project one,
+        then removing a prerequisite
+        Then only the valid edges should be listed, without the removed task
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        first, second, third = (db.add_task(alpha, name) for name in 'ABC')
+        other = db.add_task(beta, 'Elsewhere')
+        assert first and second and third and other
+
+        # When
+        assert db.add_dependency(alpha, second, first) is True
+        assert db.add_dependency(alpha, third, first) is True
+        assert db.add_dependency(alpha, third, second) is True
+        assert db.add_dependency(alpha, third, second) is False
+        assert db.add_dependency(alpha, third, other) is False
+        listed = db.list_dependencies(alpha)
+        db.remove_task(alpha, first)
+
+        # Then
+        assert listed == [(second, first), (third, first), (third, second)]
+        assert db.list_dependencies(alpha) == [(third, second)]
+        assert db.list_dependencies(beta) == []
+
+    def test_tags(self, db: TaskStore) -> None:
+        """Test storing task tags.
+
+        Given two tasks of a project and a task of another project
+        When tagging, re-tagging, untagging, tagging an unknown task and
+        removing a task
+        Then only the remaining tags of the project's tasks should be listed
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        first, second = (db.add_task(alpha, name) for name in 'AB')
+        other = db.add_task(beta, 'Elsewhere')
+        assert first and second and other
+
+        # When
+        assert db.add_tags(alpha, first, ['ui', 'bug']) is True
+        assert db.add_tags(alpha, first, ['bug']) is True
+        assert db.add_tags(alpha, second, ['bug', 'api']) is True
+        assert db.add_tags(alpha, 999, ['bug']) is False
+        assert db.remove_tags(alpha, 999, ['bug']) is False
+        assert db.remove_tags(alpha, second, ['api', 'missing']) is True
+        listed = db.list_tags(alpha)
+        db.remove_task(alpha, first)
+
+        # Then
+        assert listed == [(first, 'bug'), (first, 'ui'), (second, 'bug')]
+        assert db.list_tags(alpha) == [(second, 'bug')]
+        assert db.list_tags(beta) == []
+
+    def test_analytics(self, db: TaskStore) -> None:
+        """Test counting task flow and ages.
+
+        Given tasks added today, one completed, one removed while open and
+        one removed after completion, and a task of another project
+        When counting the flow and ages of today and yesterday
+        Then only the remaining tasks of the project should be counted
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        beta = db.create_project('Beta')
+        assert alpha is not None and beta is not None
+        ids = [db.add_task(alpha, name) for name in 'ABCD']
+        db.add_task(beta, 'Elsewhere')
+        db.mark_task_complete(alpha, ids[0])
+        db.mark_task_complete(alpha, ids[1])
+        db.remove_task(alpha, ids[1])
+        db.remove_task(alpha, ids[2])
+        today = now_seconds() // SECONDS_PER_DAY
+
+        # When
+        flow = db.task_flow(alpha, today - 1, today)
+        before = db.task_flow(alpha, today - 3, today - 1)
+        ages = db.task_ages(alpha, today)
+        yesterday = db.task_ages(alpha, today - 1)
+
+        # Then
+        assert flow == [(today, 2, 1, 1)]
+        assert before == []
+        assert ages == [(0, 1, 1)]
+        assert yesterday == []
+
+    def test_history(self, db: TaskStore) -> None:
+        """Test recording and pruning the audit log.
+
+        Given a project whose tasks are added, tagged, linked, completed and
+        removed
+        When listing its history and pruning everything
+        Then every change should be listed in order, and the prune should
+        fold each surviving task into one baseline event
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        assert alpha is not None
+        first = db.add_task(alpha, 'Write docs', priority=2, due_date='2025-06-01')
+        second = db.add_task(alpha, 'Ship')
+        scratch = db.add_task(alpha, 'Scratch')
+        assert first and second and scratch
+        db.add_tags(alpha, first, ['docs'])
+        db.remove_tags(alpha, first, ['docs'])
+        db.add_dependency(alpha, second, first)
+        db.mark_task_complete(alpha, first)
+        db.remove_task(alpha, scratch)
+        db.mark_task_complete(alpha, 999)
+
+        # When
+        history = db.list_history(alpha)
+        of_first = db.list_history(alpha, first)
+        before = db.list_task_rows(alpha, 'all')
+        deleted = db.prune_history(now_seconds() + 1)
+
+        # Then
+        assert history is not None and of_first is not None
+        assert [(event[1], event[3]) for event in history] == [
+            (first, 'add'),
+            (second, 'add'),
+            (scratch, 'add'),
+            (first, 'tag'),
+            (first, 'untag'),
+            (second, 'depend'),
+            (first, 'complete'),
+            (scratch, 'remove'),
+        ]
+        assert decode_delta(of_first[0][4]) == {'d': 'Write docs', 'p': 2, 'u': 20240}
+        assert db.list_history(alpha, until=0) == []
+        assert deleted == 6
+        pruned = db.list_history(alpha)
+        assert pruned is not None
+        assert [(event[1], event[3]) for event in pruned] == [
+            (second, 'baseline'),
+            (first, 'baseline'),
+        ]
+        rows = rows_as_of(alpha, pruned, 'all')
+        assert [row[:6] for row in rows] == [row[:6] for row in before or []]
+
+    def test_history_records_effective_tag_changes(self, db: TaskStore) -> None:
+        """Test that tagging without a change leaves the audit log alone.
+
+        Given a task tagged 'ui'
+        When tagging it 'ui' again, tagging it 'ui' and 'bug', untagging a
+        tag it does not have and untagging 'bug' twice
+        Then only the added 'bug' and its removal should be recorded
+        """
+        # Given
+        alpha = db.create_project('Alpha')
+        assert alpha is not None
+        task_id = db.add_task(alpha, 'Login form')
+        assert task_id is not None
+        db.add_tags(alpha, task_id, ['ui'])
+        before = db.list_history(alpha)
+        assert before is not None
+
+        # When
+        assert db.add_tags(alpha, task_id, ['ui']) is True
+        unchanged = db.list_history(alpha)
+        db.add_tags(alpha, task_id, ['ui', 'bug', 'bug'])
+        assert db.remove_tags(alpha, task_id, ['missing']) is True
+        for _ in range(2):
+            db.remove_tags(alpha, task_id, ['bug'])
+
+        # Then
+        assert unchanged == before
+        history = db.list_history(alpha)
+        assert history is not None
+        assert [(event[3], decode_delta(event[4])) for event in history[2:]] == [
+            ('tag', {'t': ['bug']}),
+            ('untag', {'t': ['bug']}),
+        ]
+        assert db.list_tags(alpha) == [(task_id, 'ui')]
+
+    def test_data_persists_across_connections(self, tmp_path: Path) -> None:
+        """Test that data survives reopening the database file.
+
+        Given a task stored in a database file
+        When the database is closed and reopened
+        Then the task should still be there
+        """
+        # Given
+        path = str(tmp_path / 'tasks.db')
+        first = TaskDatabase(path)
+        project_id = first.create_project('Alpha')
+        assert project_id is not None
+        task_id = first.add_task(project_id, 'Persistent task')
+        first.close()
+
+        # When
+        second = TaskDatabase(path)
+        assert task_id is not None
+        task = second.get_task(project_id, task_id)
+        second.close()
+
+        # Then
+        assert task is not None
+        assert task.description == 'Persistent task'
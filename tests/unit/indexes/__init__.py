@@ -0,0 +1 @@
+"""Indexes tests package."""
@@ -0,0 +1,69 @@
+"""BDD-style tests for the task dependency graph."""
+
+import pytest
+
+from copilot_task_manager.indexes import DependencyCycleError, DependencyGraph
+
+
+class TestDependencyGraph:
+    """Test suite for DependencyGraph.
+
+    Following BDD style:
+    - Given tasks linked by dependencies
+    - When tasks are completed, removed or linked
+    - Then the ready set should follow incrementally
+    """
+
+    def test_ready_set_follows_completion(self) -> None:
+        """Test readiness as prerequisites are completed.
+
+        Given a chain 3 -> 2 -> 1 and a task 4 depending on 1 and a done task
+        When completing task 1, then task 2
+        Then each completion should release exactly its dependents
+        """
+        # Given
+        graph = DependencyGraph(
+            [(1, True), (2, True), (3, True), (4, True), (5, False)],
+            [(2, 1), (3, 2), (4, 1), (4, 5)],
+        )
+        assert graph.ready() == [1]
+
+        # When/Then
+        graph.complete(1)
+        assert graph.ready() == [2, 4]
+        graph.complete(2)
+        graph.complete(2)
+        assert graph.ready() == [3, 4]
+        assert graph.prerequisites(4) == [1, 5]
+
+    def test_remove_and_unlink_release_dependents(self) -> None:
+        """Test that removing a task or an edge unblocks its dependents."""
+        graph = DependencyGraph([(1, True), (2, True), (3, True)])
+        graph.add_dependency(2, 1)
+        graph.add_dependency(3, 2)
+        graph.remove(1)
+        assert graph.ready() == [2]
+        assert 1 not in graph
+        graph.remove_dependency(3, 2)
+        assert graph.ready() == [2, 3]
+        assert not graph.has_dependency(3, 2)
+
+    def test_cycles_are_rejected(self) -> None:
+        """Test cycle detection on insert.
+
+        Given a chain 3 -> 2 -> 1
+        When 1 is made to depend on 3, or a task on itself
+        Then the edge should be rejected with the cycle's path
+        """
+        # Given
+        graph = DependencyGraph([(1, True), (2, True), (3, True)], [(2, 1), (3, 2)])
+
+        # When/Then
+        with pytest.raises(DependencyCycleError) as cycle:
+            graph.add_dependency(1, 3)
+        assert cycle.value.path == [1, 3, 2, 1]
+        with pytest.raises(DependencyCycleError):
+            graph.add_dependency(2, 2)
+        with pytest.raises(KeyError):
+            graph.add_dependency(1, 99)
+        assert graph.ready() == [1]
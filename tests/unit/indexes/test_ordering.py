@@ -0,0 +1,58 @@
+"""BDD-style tests for the open-task ordering index."""
+
+from copilot_task_manager.indexes import NextTaskIndex
+
+
+class TestNextTaskIndex:
+    """Test suite for NextTaskIndex.
+
+    Following BDD style:
+    - Given open tasks with priorities and due dates
+    - When asking for the next tasks
+    - Then they should come in priority, due date and ID order
+    """
+
+    def test_top_orders_by_priority_due_date_and_id(self) -> None:
+        """Test the ordering of the top tasks.
+
+        Given tasks with and without priorities and due dates
+        When asking for every task
+        Then missing details should sort last and ties by ID
+        """
+        # Given
+        index = NextTaskIndex(
+            [
+                (1, None, None),
+                (2, 2, 20240),
+                (3, 1, None),
+                (4, 1, 20270),
+                (5, None, 20089),
+                (6, 1, 20270),
+            ]
+        )
+
+        # When/Then
+        assert index.top(10) == [4, 6, 3, 2, 5, 1]
+        assert index.top(2) == [4, 6]
+        assert index.top(0) == []
+
+    def test_incremental_updates(self) -> None:
+        """Test adding, re-adding and removing tasks.
+
+        Given an index with two tasks
+        When a task is added, one is re-prioritised and one removed
+        Then the ordering should reflect every change
+        """
+        # Given
+        index = NextTaskIndex([(1, 3, None), (2, 2, None)])
+
+        # When
+        index.add(3, 1, None)
+        index.add(1, 0, None)
+        index.remove(2)
+        index.remove(99)
+
+        # Then
+        assert index.top(5) == [1, 3]
+        assert len(index) == 2
+        assert 2 not in index
@@ -0,0 +1,77 @@
+"""BDD-style tests for the tag bitmap index."""
+
+from copilot_task_manager.indexes import TagIndex
+from copilot_task_manager.indexes.tags import bitmap_members
+
+
+class TestTagIndex:
+    """Test suite for TagIndex.
+
+    Following BDD style:
+    - Given tasks carrying tags
+    - When selecting by required, alternative and excluded tags
+    - Then the set algebra should match the tags of each task
+    """
+
+    def test_select_combines_tags(self) -> None:
+        """Test AND, OR and NOT selections.
+
+        Given tasks tagged by area and sprint
+        When selecting with each kind of filter and a combination
+        Then the matching IDs and exclusions should be returned
+        """
+        # Given
+        index = TagIndex(
+            [(1, 'ui'), (1, 's1'), (2, 'api'), (2, 's1'), (3, 's2'), (130, 's1')]
+        )
+
+        # When/Then
+        assert index.select(all_of=['s1']) == ({1, 2, 130}, set())
+        assert index.select(all_of=['s1', 'api']) == ({2}, set())
+        assert index.select(any_of=['ui', 's2']) == ({1, 3}, set())
+        assert index.select(all_of=['s1'], none_of=['ui']) == ({2, 130}, set())
+        assert index.select(none_of=['s1']) == (None, {1, 2, 130})
+        assert index.select(all_of=['missing']) == (set(), set())
+
+    def test_incremental_updates(self) -> None:
+        """Test adding, discarding and removing tags."""
+        index = TagIndex([(1, 'ui'), (2, 'ui')])
+
+        assert index.add(1, 'ui') is False
+        assert index.add(1, 'bug') is True
+        assert index.discard(2, 'ui') is True
+        assert index.discard(2, 'ui') is False
+        index.remove(1)
+        index.remove(99)
+
+        assert index.select(any_of=['ui', 'bug']) == (set(), set())
+        assert index.tags() == []
+        assert len(index) == 0
+
+    def test_tags_and_members(self) -> None:
+        """Test tag listings and bitmap decoding."""
+        index = TagIndex([(3, 'ui'), (1, 'ui'), (1, 'bug')])
+        assert index.tags() == [('bug', 1), ('ui', 2)]
+        assert index.tags_of(1) == ['bug', 'ui']
+        assert index.tags_of(2) == []
+        assert bitmap_members(0b100101) == {0, 2, 5}
+        assert bitmap_members(0) == set()
+
+    def test_bitmaps_do_not_grow_with_task_ids(self) -> None:
+        """Test tasks with large IDs.
+
+        Given two tagged tasks with IDs around ten million
+        When one loses its tag and a task with a larger ID is tagged
+        Then the bitmaps should stay two bits wide and select by task ID
+        """
+        # Given
+        index = TagIndex([(10_000_000, 'ui'), (10_000_001, 'bug')])
+
+        # When
+        index.remove(10_000_000)
+        index.add(20_000_000, 'ui')
+
+        # Then
+        assert index.select(any_of=['ui', 'bug']) == ({10_000_001, 20_000_000}, set())
+        assert index.select(none_of=['ui']) == (None, {20_000_000})
+        assert max(index._bitmaps.values()).bit_length() <= 2
@@ -0,0 +1,109 @@
+"""BDD-style tests for the trigram index."""
+
+from copilot_task_manager.indexes import TrigramIndex
+from copilot_task_manager.indexes.trigram import similarity, trigrams
+
+
+class TestTrigrams:
+    """Test suite for trigram extraction and similarity."""
+
+    def test_trigrams_are_padded_per_word(self) -> None:
+        """Test that trigrams are lower-cased and padded per word.
+
+        Given a short two-word text
+        When computing its trigrams
+        Then each word should contribute its padded trigrams
+        """
+        assert trigrams('Ab C') == {'  a', ' ab', 'ab ', '  c', ' c '}
+
+    def test_similarity_of_typo_is_high(self) -> None:
+        """Test that a typo keeps most of the similarity.
+
+        Given a description and a misspelled copy
+        When computing their similarity
+        Then the score should be well above an unrelated text's score
+        """
+        typo = similarity('Implment feature X', 'Implement feature X')
+        unrelated = similarity('Implment feature X', 'Fix bug Y')
+        assert typo > 0.8
+        assert unrelated < 0.2
+
+    def test_similarity_of_empty_text_is_zero(self) -> None:
+        """Test that empty text never matches."""
+        assert similarity('', 'anything') == 0.0
+
+
+class TestTrigramIndex:
+    """Test suite for the incremental trigram index.
+
+    Following BDD style:
+    - Given an index over task descriptions
+    - When searching or updating it
+    - Then candidates should be ranked by similarity
+    """
+
+    def test_search_ranks_closest_task_first(self) -> None:
+        """Test ranking of candidates.
+
+        Given an index with several tasks
+        When searching with a misspelled description
+        Then the intended task should be ranked first with its score
+        """
+        # Given
+        index = TrigramIndex(
+            [
+                (1, 'Implement login page'),
+                (2, 'Fix logout bug'),
+                (3, 'Write release notes'),
+            ]
+        )
+
+        # When
+        results = index.search('implemnt logn page', limit=2)
+
+        # Then
+        assert len(results) == 2
+        assert results[0][0] == 1
+        assert results[0][1] > results[1][1]
+
+    def test_search_respects_limit_and_min_score(self) -> None:
+        """Test limiting results.
+
+        Given an index with several similar tasks
+        When searching with a limit and a minimum score
+        Then at most limit results above the minimum should be returned
+        """
+        # Given
+        index = TrigramIndex((i, f'task number {i}') for i in range(10))
+
+        # When
+        limited = index.search('task number', limit=3)
+        strict = index.search('unrelated words', min_score=0.5)
+
+        # Then
+        assert len(limited) == 3
+        assert strict == []
+
+    def test_incremental_add_and_remove(self) -> None:
+        """Test that the index is maintained incrementally.
+
+        Given an indexed task
+        When it is replaced and then removed
+        Then searches should reflect each change
+        """
+        # Given
+        index = TrigramIndex([(1, 'Deploy staging')])
+
+        # When replaced
+        index.add(1, 'Rotate credentials')
+        # Then
+        assert len(index) == 1
+        assert index.search('deploy staging') == []
+        assert index.search('rotate credentials')[0][0] == 1
+
+        # When removed
+        index.remove(1)
+        index.remove(1)
+        # Then
+        assert 1 not in index
+        assert index.search('rotate credentials') == []
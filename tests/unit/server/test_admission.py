@@ -0,0 +1,290 @@
+"""BDD-style tests for admission control of tool calls."""
+
+import asyncio
+import gc
+from typing import Any, Dict, List
+
+import pytest
+from fastmcp import FastMCP
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.admission import (
+    AdmissionController,
+    ServerBusy,
+    TokenBucket,
+    session_id,
+)
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class FakeSession:
+    """Stand-in for an MCP session object."""
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_bucket_refills_at_rate(self) -> None:
+        """Test burst, exhaustion and refill.
+
+        Given a bucket of two tokens refilled at 10 per second
+        When taking three tokens at once and one after 100 ms
+        Then the third should wait 100 ms and the fourth succeed
+        """
+        bucket = TokenBucket(rate=10, capacity=2, now=0.0)
+        assert bucket.take(0.0) == 0.0
+        assert bucket.take(0.0) == 0.0
+        assert bucket.take(0.0) == pytest.approx(0.1)
+        assert bucket.take(0.1) == 0.0
+        assert bucket.is_full(10.0)
+
+
+class TestAdmissionController:
+    """Test suite for AdmissionController.
+
+    Following BDD style:
+    - Given limits on concurrency, queueing and client rate
+    - When calls arrive faster than they are served
+    - Then excess calls should be shed with a retry hint
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_rate_limit_is_per_client(self) -> None:
+        """Test that one client's burst does not limit another."""
+        clock = FakeClock()
+        admission = AdmissionController(client_rate=1, client_burst=1, clock=clock)
+        async with admission.slot('greedy'):
+            pass
+        with pytest.raises(ServerBusy) as busy:
+            await admission.acquire('greedy')
+        assert busy.value.retry_after_ms == 1000
+        assert 'retry after 1000 ms' in str(busy.value)
+        async with admission.slot('polite'):
+            pass
+        assert admission.rejected == 1
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_full_queue_sheds_writes_before_reads(self) -> None:
+        """Test queue bounds and read priority.
+
+        Given one running call and a queue of two holding two writes
+        When a read arrives, then another write, then the slot frees
+        Then the read should displace a write, the late write be shed and
+        the read run first
+        """
+        # Given
+        admission = AdmissionController(max_concurrent=1, max_queue=2, client_rate=None)
+        await admission.acquire('a')
+        order: List[str] = []
+
+        async def call(name: str, write: bool) -> str:
+            try:
+                async with admission.slot(name, write=write):
+                    order.append(name)
+                return name
+            except ServerBusy:
+                return f'{name} busy'
+
+        first_write = asyncio.create_task(call('w1', True))
+        second_write = asyncio.create_task(call('w2', True))
+        await asyncio.sleep(0)
+
+        # When
+        read = asyncio.create_task(call('r', False))
+        await asyncio.sleep(0)
+        late_write = await call('w3', True)
+        admission.release()
+        results = await asyncio.gather(first_write, second_write, read)
+
+        # Then
+        assert late_write == 'w3 busy'
+        assert results == ['w1', 'w2 busy', 'r']
+        assert order == ['r', 'w1']
+        assert (admission.active, admission.queued) == (0, 0)
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_write_waiting_for_its_turn_is_displaced(self) -> None:
+        """Test that reads displace writes that have not had their turn.
+
+        Given one running call and a queue of two holding a write waiting
+        for its turn behind a read
+        When another read arrives, then the turn and the slot free
+        Then the write should be shed without running, and both reads run
+        """
+        # Given
+        admission = AdmissionController(max_concurrent=1, max_queue=2, client_rate=None)
+        await admission.acquire('a')
+        turn = asyncio.Lock()
+        await turn.acquire()
+        order: List[str] = []
+
+        async def call(name: str, write: bool, ordered: bool) -> str:
+            try:
+                async with admission.slot(
+                    name, write=write, turn=turn if ordered else None
+                ):
+                    order.append(name)
+                return name
+            except ServerBusy:
+                return f'{name} busy'
+
+        first_read = asyncio.create_task(call('r1', False, False))
+        write = asyncio.create_task(call('w', True, True))
+        await asyncio.sleep(0)
+        assert admission.queued == 2
+
+        # When
+        second_read = asyncio.create_task(call('r2', False, False))
+        await asyncio.sleep(0)
+        turn.release()
+        admission.release()
+        results = await asyncio.gather(first_read, write, second_read)
+
+        # Then
+        assert results == ['r1', 'w busy', 'r2']
+        assert order == ['r1', 'r2']
+        assert (admission.active, admission.queued, admission.rejected) == (0, 0, 1)
+
+    def test_invalid_limits(self) -> None:
+        """Test that out-of-range limits are rejected."""
+        for kwargs, message in (
+            ({'max_concurrent': 0}, 'must be positive'),
+            ({'max_queue': -1}, 'cannot be negative'),
+            ({'client_rate': 0}, 'must be positive'),
+        ):
+            with pytest.raises(ValueError, match=message):
+                AdmissionController(**kwargs)
+
+
+class TestAdmittedTools:
+    """Test suite for admission of registered tool calls."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_registered_tools_report_server_busy(self) -> None:
+        """Test the busy message of a rate-limited tool call.
+
+        Given tools registered with a one-call burst
+        When a client makes two calls in a row
+        Then the second should return a server busy error
+        """
+        # Given
+        registered: Dict[str, Any] = {}
+
+        class Registry:
+            def add_tool(self, fn: Any, name: str, description: str) -> None:
+                registered[name] = fn
+
+        db = TaskDatabase(':memory:')
+        admission = AdmissionController(client_rate=0.5, client_burst=1)
+        tools = TaskTools(db, admission=admission)
+        tools.register(Registry())  # type: ignore[arg-type]
+
+        # When
+        created = await registered['createProjectList'](projectName='Alpha')
+        rejected = await registered['listTasks'](projectName='Alpha')
+
+        # Then
+        assert created.startswith("Project list 'Alpha' created")
+        assert rejected.startswith('Error: Server busy, retry after ')
+        assert registered['listTasks'].__wrapped__ == tools.list_tasks
+        db.close()
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_calls_waiting_for_their_turn_count_as_queued(self) -> None:
+        """Test that ordered calls are bounded by the queue.
+
+        Given tools with one slot and a queue of two
+        When a client pipelines ten listings interleaved with ten writes
+        Then the first write, queued behind the running listing, should be
+        displaced by a later listing, three listings served and every other
+        call shed
+        """
+        # Given
+        registered: Dict[str, Any] = {}
+
+        class Registry:
+            def add_tool(self, fn: Any, name: str, description: str) -> None:
+                registered[name] = fn
+
+        db = TaskDatabase(':memory:')
+        admission = AdmissionController(max_concurrent=1, max_queue=2, client_rate=None)
+        tools = TaskTools(db, admission=admission)
+        tools.register(Registry())  # type: ignore[arg-type]
+        await registered['createProjectList'](projectName='Alpha')
+        calls = []
+        for number in range(10):
+            calls.append(registered['listTasks'](projectName='Alpha'))
+            calls.append(
+                registered['addTask'](
+                    taskDescription=f'Task {number}', projectName='Alpha'
+                )
+            )
+
+        # When
+        results = await asyncio.gather(*calls)
+
+        # Then
+        busy = [result.startswith('Error: Server busy') for result in results]
+        assert busy == [False, True, False, True, False] + [True] * 15
+        assert results[2] == "No open tasks found for project 'Alpha'."
+        assert db.list_task_rows(1, 'all') == []
+        assert (admission.active, admission.queued, admission.rejected) == (0, 0, 17)
+        assert len(tools.call_order) == 0
+        db.close()
+
+
+def test_fastmcp_sees_handler_signature() -> None:
+    """Test that admitted handlers keep their tool schemas."""
+    mcp: FastMCP[Any] = FastMCP('Test')
+    db = TaskDatabase(':memory:')
+    TaskTools(db, admission=AdmissionController()).register(mcp)
+    tools = asyncio.run(mcp.get_tools())
+    assert set(tools['addTask'].parameters['properties']) == {
+        'taskDescription',
+        'projectName',
+        'priority',
+        'dueDate',
+    }
+    db.close()
+
+
+def test_session_state_is_dropped_with_the_session() -> None:
+    """Test session IDs and the cleanup of per-session state.
+
+    Given a session with an active project and a rate limit bucket
+    When the session is garbage-collected and a new session arrives
+    Then its state should be gone and the new session get another ID
+    """
+    # Given
+    db = TaskDatabase(':memory:')
+    admission = AdmissionController(client_rate=1.0, client_burst=1)
+    tools = TaskTools(db, admission=admission)
+    session = FakeSession()
+    key = session_id(session)
+    tools.sessions.set(key, 1, 'Alpha')
+    admission._check_rate(key)
+    assert session_id(session) == key
+    assert len(tools.sessions) == 1 and key in admission._buckets
+
+    # When
+    del session
+    gc.collect()
+    newcomer = session_id(FakeSession())
+
+    # Then
+    assert newcomer != key and newcomer.startswith('session-')
+    assert len(tools.sessions) == 0
+    assert key not in admission._buckets
+    db.close()
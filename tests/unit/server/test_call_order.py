@@ -0,0 +1,164 @@
+"""BDD-style tests for arrival-order sequencing of tool calls."""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from copilot_task_manager.database import InMemoryTaskDatabase
+from copilot_task_manager.server.call_order import CallOrder
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class TestCallOrder:
+    """Test suite for CallOrder.
+
+    Following BDD style:
+    - Given calls that arrive together, such as a batch
+    - When they finish in a different order than they arrived
+    - Then writes should follow every earlier call and reads the last write
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_reads_overlap_and_writes_keep_arrival_order(self) -> None:
+        """Test the order in which calls start and finish.
+
+        Given a slow read, a write, two reads and a second write arriving
+        in that order
+        When they run
+        Then the write should wait for the slow read, the two reads should
+        run together after the write, and the second write should run last
+        """
+        # Given
+        order = CallOrder()
+        events: List[str] = []
+        release = asyncio.Event()
+
+        async def call(name: str, write: bool, slow: bool = False) -> None:
+            async with order.call(write):
+                events.append(f'{name} start')
+                if slow:
+                    await release.wait()
+                await asyncio.sleep(0)
+                events.append(f'{name} end')
+
+        # When
+        tasks = [
+            asyncio.create_task(call('r1', False, slow=True)),
+            asyncio.create_task(call('w1', True)),
+            asyncio.create_task(call('r2', False)),
+            asyncio.create_task(call('r3', False)),
+            asyncio.create_task(call('w2', True)),
+        ]
+        await asyncio.sleep(0.01)
+        assert events == ['r1 start']
+        release.set()
+        await asyncio.gather(*tasks)
+
+        # Then
+        assert events == [
+            'r1 start',
+            'r1 end',
+            'w1 start',
+            'w1 end',
+            'r2 start',
+            'r3 start',
+            'r2 end',
+            'r3 end',
+            'w2 start',
+            'w2 end',
+        ]
+        assert order.waited == 4
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_failed_call_releases_its_turn(self) -> None:
+        """Test that an error does not block later calls.
+
+        Given a write that raises
+        When a read arrives after it
+        Then the read should still run
+        """
+        # Given
+        order = CallOrder()
+
+        async def failing_write() -> None:
+            async with order.call(True):
+                await asyncio.sleep(0)
+                raise RuntimeError('boom')
+
+        async def read() -> str:
+            async with order.call(False):
+                return 'read'
+
+        # When
+        results = await asyncio.gather(failing_write(), read(), return_exceptions=True)
+
+        # Then
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == 'read'
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_sessions_are_ordered_independently(self) -> None:
+        """Test that one session's write does not hold up another's reads.
+
+        Given a slow write of session A
+        When a read of session A and a read of session B arrive
+        Then B's read should run at once and A's wait for the write
+        """
+        # Given
+        order = CallOrder()
+        events: List[str] = []
+        release = asyncio.Event()
+
+        async def call(name: str, session: str, write: bool) -> None:
+            async with order.call(write, session):
+                events.append(f'{name} start')
+                if write:
+                    await release.wait()
+                events.append(f'{name} end')
+
+        # When
+        tasks = [
+            asyncio.create_task(call('a-write', 'a', True)),
+            asyncio.create_task(call('a-read', 'a', False)),
+            asyncio.create_task(call('b-read', 'b', False)),
+        ]
+        await asyncio.sleep(0.01)
+        running = list(events)
+        release.set()
+        await asyncio.gather(*tasks)
+
+        # Then
+        assert running == ['a-write start', 'b-read start', 'b-read end']
+        assert events[3:] == ['a-write end', 'a-read start', 'a-read end']
+        assert len(order) == 0
+
+
+@pytest.mark.asyncio  # type: ignore[misc]
+async def test_concurrent_tool_calls_see_earlier_writes() -> None:
+    """Test that registered tools keep pipelined calls in order.
+
+    Given tools registered on a server
+    When creating a project, adding a task and listing concurrently
+    Then the listing should include the task
+    """
+    # Given
+    registered: Dict[str, Any] = {}
+
+    class Registry:
+        def add_tool(self, fn: Any, name: str, description: str) -> None:
+            registered[name] = fn
+
+    tools = TaskTools(InMemoryTaskDatabase())
+    tools.register(Registry())  # type: ignore[arg-type]
+
+    # When
+    _, added, listed = await asyncio.gather(
+        registered['createProjectList'](projectName='Alpha'),
+        registered['addTask'](taskDescription='Write docs', projectName='Alpha'),
+        registered['listTasks'](projectName='Alpha'),
+    )
+
+    # Then
+    assert added.startswith("Task added to 'Alpha' (ID: 1)")
+    assert listed == '[ ] (ID: 1) Write docs'
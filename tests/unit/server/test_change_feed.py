@@ -0,0 +1,156 @@
+"""BDD-style tests for the change feed and resource notifications."""
+
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import AnyUrl
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.change_feed import ChangeEvent, ChangeFeed
+from copilot_task_manager.server.notifications import ResourceNotifier
+from copilot_task_manager.server.resources import task_resource_uri
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+def event(project_id: int, version: int) -> ChangeEvent:
+    """Create a task_added event of a project."""
+    return ChangeEvent(project_id, f'P{project_id}', version, 'task_added')
+
+
+class FakeSession:
+    """Session stand-in recording resource-update notifications."""
+
+    def __init__(self) -> None:
+        """Initialize the record."""
+        self.updated: List[str] = []
+
+    async def send_resource_updated(self, uri: AnyUrl) -> None:
+        """Record a notification."""
+        self.updated.append(str(uri))
+
+
+class TestChangeFeed:
+    """Test suite for ChangeFeed.
+
+    Following BDD style:
+    - Given subscribers with bounded buffers
+    - When events are published faster than they are consumed
+    - Then each buffer should apply its overflow policy
+    """
+
+    def test_fan_out_with_overflow_policies(self) -> None:
+        """Test drop and coalesce policies.
+
+        Given a dropping and a coalescing subscriber with two slots
+        When four events of two projects are published
+        Then the dropping one should keep the newest two and the coalescing
+        one the latest event per project
+        """
+        # Given
+        feed = ChangeFeed()
+        dropping = feed.subscribe(2)
+        coalescing = feed.subscribe(2, policy='coalesce')
+
+        # When
+        for published in (event(1, 1), event(2, 1), event(1, 2), event(1, 3)):
+            feed.publish(published)
+
+        # Then
+        assert [dropping.get_nowait(), dropping.get_nowait()] == [
+            event(1, 2),
+            event(1, 3),
+        ]
+        assert dropping.dropped == 2
+        assert [coalescing.get_nowait(), coalescing.get_nowait()] == [
+            event(2, 1),
+            event(1, 3),
+        ]
+        assert (coalescing.coalesced, coalescing.dropped) == (2, 0)
+        assert coalescing.get_nowait() is None
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_iteration_ends_when_closed(self) -> None:
+        """Test waiting consumers and closing a subscription."""
+        feed = ChangeFeed()
+        subscription = feed.subscribe()
+        received: List[ChangeEvent] = []
+
+        async def consume() -> None:
+            async for change in subscription:
+                received.append(change)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        feed.publish(event(1, 1))
+        subscription.close()
+        feed.publish(event(1, 2))
+        await consumer
+        assert received == [event(1, 1)]
+        assert feed.subscribers == 0
+        with pytest.raises(ValueError, match='Unknown overflow policy'):
+            feed.subscribe(policy='block')
+
+    def test_tools_publish_writes(self) -> None:
+        """Test that successful writes are published with their version.
+
+        Given tools attached to a feed
+        When a project is created, a task added, completed and a failed
+        write attempted
+        Then one event per successful write should be published
+        """
+        # Given
+        db = TaskDatabase(':memory:')
+        feed = ChangeFeed()
+        subscription = feed.subscribe()
+        tools = TaskTools(db, change_feed=feed)
+
+        # When
+        tools.create_project_list('Alpha')
+        tools.add_task('First', projectName='Alpha')
+        tools.mark_task_complete('1', projectName='Alpha')
+        tools.remove_task('9', projectName='Alpha')
+
+        # Then
+        events = [subscription.get_nowait() for _ in range(len(subscription))]
+        assert events == [
+            ChangeEvent(1, 'Alpha', 1, 'project_created'),
+            ChangeEvent(1, 'Alpha', 2, 'task_added', 1),
+            ChangeEvent(1, 'Alpha', 3, 'task_completed', 1),
+        ]
+        db.close()
+
+
+class TestResourceNotifier:
+    """Test suite for ResourceNotifier."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_subscribed_sessions_are_notified(self) -> None:
+        """Test notifications of subscribed resources only.
+
+        Given a session subscribed to one project's resource
+        When that project and another one change
+        Then the session should be notified once per resource of its project
+        """
+        # Given
+        feed = ChangeFeed()
+        notifier = ResourceNotifier(feed)
+        session = FakeSession()
+        notifier.subscribe(task_resource_uri('P1'), session)
+        notifier.subscribe(task_resource_uri('P1', 'all') + '/etag', session)
+
+        # When
+        feed.publish(event(1, 1))
+        feed.publish(event(2, 1))
+        await asyncio.sleep(0.01)
+        notifier.unsubscribe(task_resource_uri('P1'), session)
+        feed.publish(event(1, 2))
+        await notifier.close()
+
+        # Then
+        assert session.updated == [
+            'tasks://P1/open',
+            'tasks://P1/all/etag',
+            'tasks://P1/all/etag',
+        ]
+        assert task_resource_uri('Q3 plan/A') == 'tasks://Q3%20plan%2FA/open'
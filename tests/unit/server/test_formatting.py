@@ -0,0 +1,68 @@
+"""BDD-style tests for JSON encoding of tool responses."""
+
+import json
+from typing import Any
+
+import pytest
+
+from copilot_task_manager.server import formatting
+from copilot_task_manager.server.formatting import JSON_COLUMNS, dumps
+
+PAYLOAD = {
+    'project': 'Café ✓',
+    'columns': JSON_COLUMNS,
+    'tasks': [
+        (1, 'Write "docs"\n', 'open', None, '2025-06-01', None),
+        (2, 'Ship 🚀', 'completed', 3, None, '2025-05-02'),
+    ],
+    'score': 0.1 + 0.2,
+}
+
+
+def stdlib_dumps(payload: Any) -> str:
+    """Encode like the standard library fallback."""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+class TestDumps:
+    """Test suite for dumps.
+
+    Following BDD style:
+    - Given a listing payload of tuple rows
+    - When encoding it with the fast encoder or the fallback
+    - Then the text should be the same compact JSON
+    """
+
+    def test_encoders_agree(self, monkeypatch: Any) -> None:
+        """Test the fast encoder against the fallback.
+
+        Given a payload with non-ASCII text, escapes, None and floats
+        When encoding it with and without the fast encoder
+        Then both should produce the standard library's compact text
+        """
+        # When
+        fast = dumps(PAYLOAD)
+        monkeypatch.setattr(formatting, '_fast_dumps', None)
+        fallback = dumps(PAYLOAD)
+
+        # Then
+        assert fast == fallback == stdlib_dumps(PAYLOAD)
+        assert json.loads(fast)['tasks'][1][1] == 'Ship 🚀'
+
+    def test_unencodable_payload_falls_back(self) -> None:
+        """Test payloads beyond the fast encoder.
+
+        Given integers beyond 64 bits and integer keys
+        When encoding them
+        Then the text should match the standard library
+        """
+        # Given
+        payload = {'big': 2**70, 'counts': {1: 2}}
+
+        # Then
+        assert dumps(payload) == stdlib_dumps(payload)
+
+    def test_unserializable_payload_raises(self) -> None:
+        """Test that invalid payloads still fail."""
+        with pytest.raises(TypeError):
+            dumps({'when': object()})
@@ -0,0 +1,237 @@
+"""BDD-style tests for health and SLO reporting."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from copilot_task_manager.database import (
+    InMemoryTaskDatabase,
+    ShardedTaskDatabase,
+    TaskDatabase,
+)
+from copilot_task_manager.server.admission import AdmissionController
+from copilot_task_manager.server.health import (
+    HealthMonitor,
+    LatencyWindow,
+    LoopLagProbe,
+    file_sizes,
+    percentile,
+)
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestMeasurements:
+    """Test suite for latency windows, lag probes and SLO checks.
+
+    Following BDD style:
+    - Given recorded latencies and event loop lags
+    - When computing percentiles and comparing them with SLO targets
+    - Then the most recent measurements should decide the status
+    """
+
+    def test_percentiles_cover_the_recent_window(self) -> None:
+        """Test rolling nearest-rank percentiles.
+
+        Given a window of 100 latencies that saw 150 calls
+        When computing the p50, p95 and p99
+        Then only the last 100 calls should count
+        """
+        # Given
+        window = LatencyWindow(100)
+        for ms in range(1, 151):
+            window.record(ms / 1000)
+
+        # When
+        p50, p95, p99 = window.percentiles() or []
+
+        # Then
+        assert (round(p50 * 1000), round(p95 * 1000), round(p99 * 1000)) == (
+            100,
+            145,
+            149,
+        )
+        assert (len(window), window.count) == (100, 150)
+        assert LatencyWindow().percentiles() is None
+        assert percentile([1.0], 0.99) == 1.0
+        with pytest.raises(ValueError):
+            LatencyWindow(0)
+
+    def test_breaches_compare_with_slo_targets(self) -> None:
+        """Test the SLO comparison.
+
+        Given a monitor with a 50 ms p99 and 20 ms lag target
+        When latencies and lags stay below, then exceed the targets
+        Then each missed target should be listed
+        """
+        # Given
+        clock = FakeClock()
+        health = HealthMonitor(slo_p99_ms=50, slo_loop_lag_ms=20, clock=clock)
+        for _ in range(99):
+            health.latencies.record(0.01)
+        health.loop_lag.record(0.005)
+        clock.now = 90.0
+
+        # When
+        healthy = health.breaches()
+        for _ in range(2):
+            health.latencies.record(0.2)
+        health.loop_lag.record(0.03)
+
+        # Then
+        assert healthy == []
+        assert health.breaches() == [
+            'p99 latency 200.0 ms > 50 ms',
+            'event loop lag 30.0 ms > 20 ms',
+        ]
+        assert health.uptime == 90.0
+        with pytest.raises(ValueError):
+            HealthMonitor(slo_p99_ms=0)
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_lag_probe_sees_a_blocked_loop(self) -> None:
+        """Test measuring event loop lag.
+
+        Given a probe waking every 10 ms
+        When a callback blocks the event loop for 50 ms
+        Then the probe should record a lag of about that long
+        """
+        # Given
+        probe = LoopLagProbe(0.01)
+        probe.start()
+        await asyncio.sleep(0.03)
+
+        # When
+        time.sleep(0.05)
+        await asyncio.sleep(0.03)
+        await probe.stop()
+
+        # Then
+        assert probe.worst is not None and probe.worst >= 0.03
+        assert probe.last is not None
+        assert not probe.running
+
+    def test_file_sizes_split_write_ahead_logs(self, tmp_path: Path) -> None:
+        """Test summing storage file sizes."""
+        (tmp_path / 'a.db').write_bytes(b'x' * 10)
+        (tmp_path / 'a.db-wal').write_bytes(b'x' * 3)
+        (tmp_path / 'b.db').write_bytes(b'x' * 5)
+        paths = [str(tmp_path / name) for name in ('a.db', 'b.db', 'missing.db')]
+        assert file_sizes(paths) == (15, 3)
+
+
+def test_engines_list_their_storage_files(tmp_path: Path) -> None:
+    """Test which files each storage engine reports."""
+    sqlite = TaskDatabase(str(tmp_path / 'tasks.db'))
+    sharded = ShardedTaskDatabase(str(tmp_path / 'shards'))
+    sharded.create_project('Alpha')
+    memory = InMemoryTaskDatabase(str(tmp_path / 'snapshot.json'))
+    assert sqlite.storage_files() == [str(tmp_path / 'tasks.db')]
+    assert TaskDatabase(':memory:').storage_files() == []
+    assert sharded.storage_files() == [
+        str(tmp_path / 'shards' / 'catalog.db'),
+        str(tmp_path / 'shards' / 'shard_project_1.db'),
+    ]
+    assert memory.storage_files() == [str(tmp_path / 'snapshot.json')]
+    assert InMemoryTaskDatabase().storage_files() == []
+    sharded.close()
+
+
+class TestGetHealth:
+    """Test suite for the getHealth tool.
+
+    Following BDD style:
+    - Given registered tools on a file database
+    - When calls are made and health is requested
+    - Then the report should cover every measurement
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_report_covers_every_measurement(self, tmp_path: Path) -> None:
+        """Test the health report after a few calls.
+
+        Given registered tools with admission control and a 1 ms p99 target
+        When a project is created, listed twice and a slow call is recorded
+        Then the report should show the calls, cache hits, storage size and
+        the missed latency target
+        """
+        # Given
+        registered: Dict[str, Any] = {}
+
+        class Registry:
+            def add_tool(self, fn: Any, name: str, description: str) -> None:
+                registered[name] = fn
+
+        db = TaskDatabase(str(tmp_path / 'tasks.db'))
+        health = HealthMonitor(slo_p99_ms=1)
+        tools = TaskTools(db, admission=AdmissionController(), health=health)
+        tools.register(Registry())  # type: ignore[arg-type]
+        initial = tools.get_health()
+
+        # When
+        await registered['createProjectList'](projectName='Alpha')
+        await registered['addTask'](taskDescription='Write report', projectName='Alpha')
+        for _ in range(2):
+            await registered['listTasks'](projectName='Alpha')
+        health.latencies.record(0.5)
+        report = (await registered['getHealth']()).split('\n')
+
+        # Then
+        assert initial.split('\n')[0] == 'Status: ok'
+        assert 'Latency: no calls yet' in initial
+        assert report[0].startswith('Status: degraded: p99 latency 500.0 ms > 1 ms')
+        assert report[1].startswith('Uptime: 00:00:')
+        assert report[2] == 'Event loop lag: not measured yet'
+        assert report[3] == 'Queue: 0/8 running, 0/64 queued, 0 rejected'
+        size = (tmp_path / 'tasks.db').stat().st_size
+        assert report[4] == f'Storage: {size} bytes, WAL 0 bytes'
+        assert (
+            report[5] == 'Cache hit ratios: lines 50.0% (1 cached), shared reads 0.0%'
+        )
+        assert report[6].startswith('Latency of the last 5 of 5 calls: p50 ')
+        assert report[6].endswith('p99 500.0 ms (SLO p99 1 ms)')
+        db.close()
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_health_is_reported_when_saturated(self) -> None:
+        """Test that getHealth bypasses admission control.
+
+        Given a client over its rate limit
+        When it asks for the server's health
+        Then the report should be returned and count the rejected call
+        """
+        # Given
+        registered: Dict[str, Any] = {}
+
+        class Registry:
+            def add_tool(self, fn: Any, name: str, description: str) -> None:
+                registered[name] = fn
+
+        db = InMemoryTaskDatabase()
+        admission = AdmissionController(client_rate=0.5, client_burst=1)
+        tools = TaskTools(db, admission=admission)
+        tools.register(Registry())  # type: ignore[arg-type]
+        await registered['createProjectList'](projectName='Alpha')
+        rejected = await registered['listTasks'](projectName='Alpha')
+
+        # When
+        report = await registered['getHealth']()
+
+        # Then
+        assert rejected.startswith('Error: Server busy')
+        assert 'Queue: 0/8 running, 0/64 queued, 1 rejected' in report
+        assert 'Storage: 0 bytes, WAL 0 bytes' in report
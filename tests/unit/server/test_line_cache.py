@@ -0,0 +1,116 @@
+"""BDD-style tests for the cache of rendered listTasks lines."""
+
+import pytest
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.line_cache import LineCache, raw_task_row
+from copilot_task_manager.server.task_tools import TaskTools
+
+OPEN_ROW = (1, 1, 'Write docs', 'open', 2, 20240, 1746093600, 1746093600)
+
+
+class TestLineCache:
+    """Test suite for LineCache.
+
+    Following BDD style:
+    - Given rendered lines stored in the cache
+    - When looking up rows
+    - Then only rows with an unchanged version should hit
+    """
+
+    def test_raw_task_row_uses_completion_date(self) -> None:
+        """Test conversion of raw rows into render rows."""
+        done = OPEN_ROW[:3] + ('completed',) + OPEN_ROW[4:]
+        assert raw_task_row(OPEN_ROW) == (
+            1,
+            'Write docs',
+            'open',
+            2,
+            '2025-06-01',
+            None,
+        )
+        assert raw_task_row(done)[5] == '2025-05-01'
+
+    def test_lookup_hits_only_unchanged_versions(self) -> None:
+        """Test version checks on lookup.
+
+        Given a cached line for a task
+        When looking it up unchanged, with a new status and in another project
+        Then only the unchanged row should hit
+        """
+        # Given
+        cache = LineCache()
+        cache.store(1, OPEN_ROW, 'line')
+        completed = OPEN_ROW[:3] + ('completed',) + OPEN_ROW[4:]
+
+        # When
+        lines, missing = cache.lookup(1, [OPEN_ROW, completed])
+        other_lines, other_missing = cache.lookup(2, [OPEN_ROW])
+
+        # Then
+        assert lines == ['line', None]
+        assert missing == [1]
+        assert other_missing == [0]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_oldest_entries_are_evicted(self) -> None:
+        """Test the size bound.
+
+        Given a cache holding at most two lines
+        When a third line is stored
+        Then the oldest line should be evicted
+        """
+        cache = LineCache(max_entries=2)
+        for task_id in (1, 2, 3):
+            cache.store(1, (task_id,) + OPEN_ROW[1:], f'line {task_id}')
+        assert len(cache) == 2
+        _, missing = cache.lookup(1, [(t,) + OPEN_ROW[1:] for t in (1, 2, 3)])
+        assert missing == [0]
+
+    def test_invalidate_and_clear(self) -> None:
+        """Test explicit invalidation."""
+        cache = LineCache()
+        cache.store(1, OPEN_ROW, 'line')
+        cache.invalidate(1, 1)
+        assert len(cache) == 0
+        cache.store(1, OPEN_ROW, 'line')
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_size(self) -> None:
+        """Test that a non-positive size is rejected."""
+        with pytest.raises(ValueError, match='must be positive'):
+            LineCache(max_entries=0)
+
+
+class TestListTasksCaching:
+    """Test suite for listTasks on top of the line cache."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_repeated_listing_is_served_from_cache(self) -> None:
+        """Test cache use and refresh on writes.
+
+        Given a project with tasks listed once
+        When listing again, then completing a task and listing all tasks
+        Then the second listing should hit and the completion should show
+        """
+        # Given
+        db = TaskDatabase(':memory:')
+        tools = TaskTools(db)
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+        tools.add_task('First')
+        tools.add_task('Second')
+        first = await tools.list_tasks(statusFilter='all')
+
+        # When
+        second = await tools.list_tasks(statusFilter='all')
+        tools.mark_task_complete('1')
+        after = await tools.list_tasks(statusFilter='all')
+
+        # Then
+        assert first == second == '[ ] (ID: 1) First\n[ ] (ID: 2) Second'
+        assert tools.line_cache.hits >= 2
+        assert after.startswith('[x] (ID: 1) First (Completed: ')
+        assert after.endswith('\n[ ] (ID: 2) Second')
+        db.close()
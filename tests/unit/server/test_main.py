@@ -0,0 +1,70 @@
+"""BDD-style tests for the server entry point."""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+from copilot_task_manager.server.__main__ import parse_args, serve
+from copilot_task_manager.server.health import (
+    DEFAULT_SLO_LOOP_LAG_MS,
+    DEFAULT_SLO_P99_MS,
+)
+from copilot_task_manager.server.mcp_server import create_server
+
+
+def test_snapshot_path_is_an_option() -> None:
+    """Test that the in-memory engine's snapshot file can be set."""
+    args = parse_args(['--storage', 'memory', '--snapshot-path', 'tasks.json'])
+    assert (args.storage, args.snapshot_path) == ('memory', 'tasks.json')
+    assert parse_args([]).snapshot_path is None
+
+
+def test_slo_targets_are_options() -> None:
+    """Test that both getHealth objectives can be set."""
+    args = parse_args(['--slo-p99-ms', '500', '--slo-loop-lag-ms', '20'])
+    assert (args.slo_p99_ms, args.slo_loop_lag_ms) == (500.0, 20.0)
+    defaults = parse_args([])
+    assert (defaults.slo_p99_ms, defaults.slo_loop_lag_ms) == (
+        DEFAULT_SLO_P99_MS,
+        DEFAULT_SLO_LOOP_LAG_MS,
+    )
+
+
+@pytest.mark.asyncio  # type: ignore[misc]
+async def test_sigterm_releases_the_storage(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test stopping the server with a signal.
+
+    Given an in-memory server with a snapshot file, waiting for input that
+    never comes, and a project written since the last snapshot
+    When the process receives SIGTERM
+    Then serving should end and the project should be in the snapshot
+    """
+    # Given
+    read_end, write_end = os.pipe()
+    monkeypatch.setattr(sys, 'stdin', open(read_end))
+    monkeypatch.setattr(sys, 'stdout', open(tmp_path / 'stdout', 'w'))
+    snapshot = tmp_path / 'tasks.json'
+    server = create_server(
+        storage='memory', snapshot_path=str(snapshot), snapshot_interval=None
+    )
+    serving = asyncio.ensure_future(serve(server))
+    await asyncio.sleep(0.05)
+    server.db.create_project('Alpha')
+
+    # When
+    os.kill(os.getpid(), signal.SIGTERM)
+    stopped = await asyncio.wait_for(serving, 5)
+
+    # Then
+    assert stopped
+    assert not server._is_running
+    assert 'Alpha' in json.dumps(json.loads(snapshot.read_text()))
+    os.close(write_end)
+    sys.stdin.close()
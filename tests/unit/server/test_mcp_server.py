@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from fastmcp import FastMCP
 
+from copilot_task_manager.database import InMemoryTaskDatabase, TaskDatabase
 from copilot_task_manager.server.mcp_server import (  # noqa: E501
     TaskManagerMCPServer,
     create_server,
@@ -29,6 +30,7 @@ def mocked_mcp(mocker: Any) -> Any:
 
     mock.start = AsyncMock(side_effect=async_start)
     mock.stop = AsyncMock()
+    mock._mcp_server = MagicMock()
 
     # Mock FastMCP constructor to return our mock
     mcp_path = 'copilot_task_manager.server.mcp_server.FastMCP'
@@ -182,6 +184,18 @@ class TestMCPServerConfiguration:
         assert server.host == '127.0.0.1'
         assert server.debug is True
 
+    def test_server_storage_engine(self) -> None:
+        """Test selecting the storage engine.
+
+        Given the storage engine names
+        When creating servers with them
+        Then the matching engine should be used and unknown names rejected
+        """
+        assert isinstance(create_server().db, TaskDatabase)
+        assert isinstance(create_server(storage='memory').db, InMemoryTaskDatabase)
+        with pytest.raises(ValueError, match='Unknown storage engine'):
+            create_server(storage='redis')
+
     @pytest.mark.asyncio  # type: ignore[misc]
     async def test_server_runtime_configuration_changes(
         self,
@@ -0,0 +1,95 @@
+"""BDD-style tests for the process pool used to render large listings."""
+
+from typing import List
+
+import pytest
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.formatting import TaskRow, render_task_lines
+from copilot_task_manager.server.render_pool import RenderPool
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+def make_rows(count: int) -> List[TaskRow]:
+    """Build task rows for rendering.
+
+    Args:
+        count (int): Number of rows.
+
+    Returns:
+        List[TaskRow]: Alternating open and completed rows.
+    """
+    return [
+        (i, f'Task {i}', 'completed' if i % 2 else 'open', i % 3, None, None)
+        for i in range(count)
+    ]
+
+
+class TestRenderPool:
+    """Test suite for RenderPool.
+
+    Following BDD style:
+    - Given a render pool
+    - When rendering task rows
+    - Then the output should match inline rendering
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_small_listing_is_rendered_inline(self) -> None:
+        """Test that listings below the threshold never start workers.
+
+        Given a pool with the default offload threshold
+        When rendering a small listing
+        Then it should be rendered inline without starting worker processes
+        """
+        pool = RenderPool(2)
+        rows = make_rows(10)
+        assert await pool.render_task_lines(rows) == render_task_lines(rows)
+        assert not pool.started
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_large_listing_is_offloaded_in_order(self) -> None:
+        """Test offloading to worker processes.
+
+        Given a pool with a low offload threshold
+        When rendering a listing split across workers
+        Then the joined output should equal inline rendering
+        """
+        pool = RenderPool(2, min_offload_rows=5)
+        rows = make_rows(11)
+        try:
+            assert await pool.render_task_lines(rows) == render_task_lines(rows)
+            assert pool.started
+        finally:
+            pool.shutdown()
+        assert not pool.started
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        'workers, min_rows', [(0, 1), (1, 0)]
+    )
+    def test_invalid_configuration(self, workers: int, min_rows: int) -> None:
+        """Test that non-positive settings are rejected."""
+        with pytest.raises(ValueError, match='must be positive'):
+            RenderPool(workers, min_offload_rows=min_rows)
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_list_tasks_uses_pool(self) -> None:
+        """Test that listTasks renders through the pool when configured.
+
+        Given task tools with a render pool
+        When listing more tasks than the offload threshold
+        Then the listing should be rendered by the worker processes
+        """
+        db = TaskDatabase(':memory:')
+        pool = RenderPool(1, min_offload_rows=2)
+        tools = TaskTools(db, pool)
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+        tools.add_task('First')
+        tools.add_task('Second')
+        try:
+            assert await tools.list_tasks() == '[ ] (ID: 1) First\n[ ] (ID: 2) Second'
+            assert pool.started
+        finally:
+            pool.shutdown()
+            db.close()
@@ -0,0 +1,72 @@
+"""BDD-style tests for the task listing resources."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from fastmcp import FastMCP
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.resources import TaskResources, task_resource_uri
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+def read(mcp: FastMCP[Any], uri: str) -> Any:
+    """Read a resource through the MCP read handler."""
+    return asyncio.run(mcp._mcp_read_resource(uri))[0].content
+
+
+class TestTaskResources:
+    """Test suite for TaskResources.
+
+    Following BDD style:
+    - Given a project exposed as resources
+    - When a client reads a listing and later revalidates its etag
+    - Then the etag should only change after a write to the project
+    """
+
+    def test_etag_revalidation(self) -> None:
+        """Test listings, etags and their change on writes.
+
+        Given a project with one task and a second project
+        When reading the open listing, its etag, and writing to each project
+        Then only the write to the listed project should change the etag
+        """
+        # Given
+        db = TaskDatabase(':memory:')
+        tools = TaskTools(db)
+        tools.create_project_list('Q3 plan')
+        tools.create_project_list('Other')
+        tools.add_task('Draft', projectName='Q3 plan')
+        mcp: FastMCP[Any] = FastMCP('Test')
+        TaskResources(db, tools).register(mcp)
+        uri = task_resource_uri('Q3 plan')
+
+        # When
+        listing = json.loads(read(mcp, uri))
+        etag = read(mcp, f'{uri}/etag')
+        tools.add_task('Elsewhere', projectName='Other')
+        unchanged = read(mcp, f'{uri}/etag')
+        tools.add_task('Review', projectName='Q3 plan')
+        changed = read(mcp, f'{uri}/etag')
+
+        # Then
+        assert listing['etag'] == etag == unchanged != changed
+        assert listing['project'] == 'Q3 plan'
+        description = listing['columns'].index('description')
+        assert [task[description] for task in listing['tasks']] == ['Draft']
+        assert json.loads(read(mcp, uri))['etag'] == changed
+        db.close()
+
+    def test_unknown_project_or_status(self) -> None:
+        """Test that bad URIs are rejected."""
+        db = TaskDatabase(':memory:')
+        tools = TaskTools(db)
+        tools.create_project_list('Alpha')
+        resources = TaskResources(db, tools)
+        with pytest.raises(ValueError, match="Project 'Missing' not found"):
+            asyncio.run(resources.read_tasks('Missing', 'open'))
+        with pytest.raises(ValueError, match="Invalid status 'done'"):
+            asyncio.run(resources.read_etag('Alpha', 'done'))
+        db.close()
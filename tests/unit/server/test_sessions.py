@@ -0,0 +1,95 @@
+"""BDD-style tests for per-session state."""
+
+import pytest
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server import task_tools
+from copilot_task_manager.server.sessions import SessionStore
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestSessionStore:
+    """Test suite for SessionStore.
+
+    Following BDD style:
+    - Given sessions with active projects
+    - When time passes or too many sessions arrive
+    - Then idle and least recently used sessions should be evicted
+    """
+
+    def test_idle_sessions_are_evicted(self) -> None:
+        """Test idle eviction and refresh on access.
+
+        Given two sessions
+        When one is used shortly before the idle timeout expires
+        Then only the unused one should be evicted
+        """
+        # Given
+        clock = FakeClock()
+        store = SessionStore(max_idle=10, clock=clock)
+        store.set('a', 1, 'Alpha')
+        store.set('b', 2, 'Beta')
+
+        # When
+        clock.now = 8
+        assert store.get('a') == (1, 'Alpha')
+        clock.now = 12
+
+        # Then
+        assert store.get('b') is None
+        assert store.get('a') == (1, 'Alpha')
+        assert (len(store), store.evicted) == (1, 1)
+
+    def test_session_cap_evicts_least_recently_used(self) -> None:
+        """Test the maximum number of sessions and invalid limits."""
+        store = SessionStore(max_idle=None, max_sessions=2)
+        store.set('a', 1, 'Alpha')
+        store.set('b', 2, 'Beta')
+        store.get('a')
+        store.set('c', 3, 'Gamma')
+        assert [store.get(key) for key in 'abc'] == [(1, 'Alpha'), None, (3, 'Gamma')]
+        store.discard('a')
+        assert len(store) == 1
+        with pytest.raises(ValueError, match='must be positive'):
+            SessionStore(max_idle=0)
+
+
+def test_active_project_is_per_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that clients do not share their active project.
+
+    Given two projects
+    When two clients each activate a different one and add a task
+    Then each task should land in its client's project
+    """
+    # Given
+    db = TaskDatabase(':memory:')
+    tools = TaskTools(db)
+    tools.create_project_list('Alpha')
+    tools.create_project_list('Beta')
+
+    # When
+    for client, project in (('one', 'Alpha'), ('two', 'Beta')):
+        monkeypatch.setattr(task_tools, 'current_client_id', lambda: client)
+        tools.set_active_project(project)
+    monkeypatch.setattr(task_tools, 'current_client_id', lambda: 'one')
+    added = tools.add_task('First')
+    monkeypatch.setattr(task_tools, 'current_client_id', lambda: 'three')
+    missing = tools.add_task('Lost')
+
+    # Then
+    assert added.startswith("Task added to 'Alpha'")
+    assert missing == task_tools.NO_PROJECT_ERROR
+    assert len(tools.sessions) == 2
+    db.close()
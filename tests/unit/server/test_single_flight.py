@@ -0,0 +1,122 @@
+"""BDD-style tests for single-flight coalescing of reads."""
+
+import asyncio
+from typing import List, Sequence
+
+import pytest
+
+from copilot_task_manager.database import TaskDatabase
+from copilot_task_manager.server.formatting import TaskRow, render_task_lines
+from copilot_task_manager.server.single_flight import SingleFlight
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+class SlowRenderPool:
+    """Render pool stand-in that yields to the event loop while rendering."""
+
+    def __init__(self) -> None:
+        """Initialize the call counter."""
+        self.calls = 0
+
+    async def render_task_lines(self, rows: Sequence[TaskRow]) -> List[str]:
+        """Render rows after giving other requests a chance to run."""
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return render_task_lines(rows)
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight.
+
+    Following BDD style:
+    - Given concurrent callers
+    - When they run work under the same or different keys
+    - Then callers with the same key should share one run
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_identical_keys_share_one_run(self) -> None:
+        """Test coalescing of concurrent calls.
+
+        Given a slow read
+        When five callers run it under one key and one under another
+        Then the read should run twice and every caller get its result
+        """
+        # Given
+        flight = SingleFlight()
+        runs: List[str] = []
+
+        async def read(value: str) -> str:
+            runs.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        # When
+        results = await asyncio.gather(
+            *(flight.run('a', lambda: read('a')) for _ in range(5)),
+            flight.run('b', lambda: read('b')),
+        )
+
+        # Then
+        assert results == ['a'] * 5 + ['b']
+        assert runs == ['a', 'b']
+        assert (flight.calls, flight.shared, flight.in_flight) == (2, 4, 0)
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_failures_reach_every_caller(self) -> None:
+        """Test that an error is shared and the key is released.
+
+        Given a read that fails
+        When two callers share it and a third runs after it finished
+        Then both sharers should see the error and the third run anew
+        """
+        flight = SingleFlight()
+
+        async def fail() -> str:
+            await asyncio.sleep(0)
+            raise RuntimeError('boom')
+
+        results = await asyncio.gather(
+            flight.run('k', fail), flight.run('k', fail), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [RuntimeError] * 2
+
+        async def succeed() -> str:
+            return 'ok'
+
+        assert await flight.run('k', succeed) == 'ok'
+        assert flight.calls == 2
+
+
+class TestListTasksCoalescing:
+    """Test suite for coalesced listTasks calls."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_concurrent_listings_share_one_render(self) -> None:
+        """Test a thundering-herd refresh.
+
+        Given a project whose listing yields to the event loop
+        When several clients list it at once, then after a write
+        Then the burst should render once and the write start a new read
+        """
+        # Given
+        db = TaskDatabase(':memory:')
+        pool = SlowRenderPool()
+        tools = TaskTools(db, pool)  # type: ignore[arg-type]
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+        tools.add_task('First')
+
+        # When
+        burst = await asyncio.gather(*(tools.list_tasks() for _ in range(4)))
+        version = tools.project_version(1)
+        tools.add_task('Second')
+        after = await tools.list_tasks()
+
+        # Then
+        assert burst == ['[ ] (ID: 1) First'] * 4
+        assert pool.calls == 2
+        assert tools.reads.shared == 3
+        assert tools.project_version(1) == version + 1
+        assert after.endswith('(ID: 2) Second')
+        db.close()
@@ -0,0 +1,216 @@
+"""BDD-style tests for the stdio transport."""
+
+import asyncio
+import io
+import json
+import os
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+from copilot_task_manager.server.mcp_server import create_server
+from copilot_task_manager.server.stdio import RequestTracker, thread_lines
+
+
+class FakeStdin:
+    """Async iterable of input lines."""
+
+    def __init__(self, messages: List[Any]) -> None:
+        """Serialize one message or batch per line."""
+        self.lines = [json.dumps(message) + '\n' for message in messages]
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        """Yield the lines."""
+        for line in self.lines:
+            yield line
+
+
+class FakeStdout:
+    """Records writes and flushes."""
+
+    def __init__(self) -> None:
+        """Start empty."""
+        self.writes: List[str] = []
+        self.flushes = 0
+
+    async def write(self, text: str) -> None:
+        """Record a write."""
+        self.writes.append(text)
+
+    async def flush(self) -> None:
+        """Record a flush."""
+        self.flushes += 1
+
+    def messages(self) -> List[Any]:
+        """Return every output line, parsed."""
+        return [json.loads(line) for line in ''.join(self.writes).splitlines()]
+
+
+def call(request_id: int, name: str, **arguments: Any) -> Dict[str, Any]:
+    """Build a tools/call request."""
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'tools/call',
+        'params': {'name': name, 'arguments': arguments},
+    }
+
+
+def response(request_id: int) -> SessionMessage:
+    """Build an empty result response."""
+    return SessionMessage(
+        types.JSONRPCMessage(
+            types.JSONRPCResponse(jsonrpc='2.0', id=request_id, result={})
+        )
+    )
+
+
+HANDSHAKE = [
+    {
+        'jsonrpc': '2.0',
+        'id': 0,
+        'method': 'initialize',
+        'params': {
+            'protocolVersion': '2025-03-26',
+            'capabilities': {},
+            'clientInfo': {'name': 'test', 'version': '1'},
+        },
+    },
+    {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+]
+
+
+class TestRequestTracker:
+    """Test suite for RequestTracker.
+
+    Following BDD style:
+    - Given lines read from a client
+    - When the server answers the requests in any order
+    - Then batched responses should be written as one array
+    """
+
+    def test_batch_response_waits_for_every_request(self) -> None:
+        """Test grouping the responses of a batch.
+
+        Given a batch of two requests, a notification and an invalid entry
+        When the requests are answered in reverse order
+        Then nothing should be written until the last response, which
+        completes the batch with the invalid entry's error
+        """
+        # Given
+        tracker = RequestTracker()
+        batch = [
+            call(1, 'listTasks'),
+            {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+            {'id': 7, 'method': 5},
+            call(2, 'listTasks'),
+        ]
+
+        # When
+        messages, immediate = tracker.read(json.dumps(batch))
+        second = tracker.write(response(2))
+        first = tracker.write(response(1))
+
+        # Then
+        assert len(messages) == 3
+        assert immediate == ''
+        assert second == ''
+        assert [entry['id'] for entry in json.loads(first)] == [7, 2, 1]
+        assert json.loads(first)[0]['error']['code'] == types.INVALID_REQUEST
+        assert tracker.write(response(3)).endswith('}\n')
+
+    def test_invalid_lines(self) -> None:
+        """Test lines that reach the server as errors or not at all.
+
+        Given malformed JSON, an empty batch and a batch of invalid entries
+        When reading them
+        Then malformed JSON should reach the server as an exception and the
+        batches should be answered at once
+        """
+        # Given
+        tracker = RequestTracker()
+
+        # When
+        malformed, _ = tracker.read('{"jsonrpc": ')
+        _, empty = tracker.read('[]')
+        _, invalid = tracker.read('[1, {"id": true}]')
+
+        # Then
+        assert isinstance(malformed[0], Exception)
+        assert json.loads(empty)['error']['code'] == types.INVALID_REQUEST
+        assert [entry['id'] for entry in json.loads(invalid)] == [None, None]
+
+
+class TestStdioServer:
+    """Test suite for serving over the stdio transport."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_batch_runs_in_order_and_answers_in_one_line(self) -> None:
+        """Test a batch of writes and reads.
+
+        Given a server and a client sending a batch that creates a project,
+        adds two tasks and lists them, then a pipelined listing
+        When serving until the input ends
+        Then the batch should be answered in one line with the tasks listed,
+        and the pipelined call after the input ended should be answered
+        """
+        # Given
+        server = create_server(storage='memory')
+        batch = [
+            call(1, 'createProjectList', projectName='Alpha'),
+            call(2, 'addTask', taskDescription='One', projectName='Alpha'),
+            call(3, 'addTask', taskDescription='Two', projectName='Alpha'),
+            call(4, 'listTasks', projectName='Alpha'),
+        ]
+        stdout: Any = FakeStdout()
+
+        # When
+        await server.serve_stdio(
+            FakeStdin(HANDSHAKE + [batch, call(5, 'listTags', projectName='Alpha')]),
+            stdout,
+        )
+
+        # Then
+        initialized, *answers = stdout.messages()
+        (batched,) = [answer for answer in answers if isinstance(answer, list)]
+        (pipelined,) = [answer for answer in answers if isinstance(answer, dict)]
+        assert initialized['id'] == 0
+        results = {entry['id']: entry['result'] for entry in batched}
+        assert sorted(results) == [1, 2, 3, 4]
+        listing = results[4]['content'][0]['text']
+        assert listing == '[ ] (ID: 1) One\n[ ] (ID: 2) Two'
+        assert pipelined['id'] == 5
+        assert 'result' in pipelined
+        assert stdout.flushes == len(stdout.writes) <= 3
+        assert not server._is_running
+
+
+class TestThreadLines:
+    """Test suite for reading a blocking stream on a daemon thread."""
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_lines_are_read_until_the_stream_ends(self) -> None:
+        """Test reading a stream to its end."""
+        lines = [line async for line in thread_lines(io.StringIO('a\nb\n'))]
+        assert lines == ['a\n', 'b\n']
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_waiting_for_input_can_be_cancelled(self) -> None:
+        """Test cancelling a read that never completes.
+
+        Given a pipe nobody writes to
+        When waiting for its first line with a timeout
+        Then the wait should be cancelled on time
+        """
+        # Given
+        read_end, write_end = os.pipe()
+        stream = open(read_end)
+
+        # When
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(thread_lines(stream).__anext__(), 0.05)
+
+        # Then
+        os.close(write_end)
@@ -0,0 +1,1094 @@
+"""BDD-style tests for the task management tool handlers."""
+
+import json
+from datetime import date
+from typing import Callable, Generator, List
+
+import pytest
+
+from copilot_task_manager.database import InMemoryTaskDatabase, TaskDatabase
+from copilot_task_manager.database.dates import SECONDS_PER_DAY
+from copilot_task_manager.server.task_tools import TaskTools
+
+
+@pytest.fixture  # type: ignore[misc]
+def tools() -> Generator[TaskTools, None, None]:
+    """Create tool handlers backed by an in-memory database.
+
+    Returns:
+        Generator[TaskTools, None, None]: The tool handlers.
+    """
+    db = TaskDatabase(':memory:')
+    yield TaskTools(db)
+    db.close()
+
+
+@pytest.fixture  # type: ignore[misc]
+def active_tools(tools: TaskTools) -> TaskTools:
+    """Create tool handlers with an active project named 'Alpha'.
+
+    Returns:
+        TaskTools: The tool handlers.
+    """
+    tools.create_project_list('Alpha')
+    tools.set_active_project('Alpha')
+    return tools
+
+
+class TestProjectTools:
+    """Test suite for createProjectList and setActiveProject.
+
+    Following BDD style:
+    - Given the task management tools
+    - When managing projects
+    - Then the API specification messages should be returned
+    """
+
+    def test_create_project_list(self, tools: TaskTools) -> None:
+        """Test creating a project and a duplicate.
+
+        Given no projects
+        When creating a project twice
+        Then the first call should succeed and the second should fail
+        """
+        assert tools.create_project_list('Alpha') == (
+            "Project list 'Alpha' created successfully with ID: 1."
+        )
+        assert tools.create_project_list('Alpha') == (
+            "Error: Project list 'Alpha' already exists (ID: 1)."
+        )
+        assert tools.create_project_list('  ') == (
+            'Error: Project name cannot be empty.'
+        )
+
+    def test_set_active_project(self, tools: TaskTools) -> None:
+        """Test activating existing and missing projects.
+
+        Given one project
+        When setting it and a missing project as active
+        Then only the existing project should be accepted
+        """
+        tools.create_project_list('Alpha')
+        assert tools.set_active_project('Alpha') == (
+            "Project 'Alpha' is now the active project."
+        )
+        assert tools.set_active_project('Beta') == (
+            "Error: Project 'Beta' not found. Cannot set as active."
+        )
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_task_tools_require_a_project(self, tools: TaskTools) -> None:
+        """Test that task tools need an explicit or active project.
+
+        Given no active project
+        When adding a task without a project name
+        Then a 'no project' error should be returned
+        """
+        assert tools.add_task('Task').startswith(
+            'Error: No project specified and no active project set.'
+        )
+        assert (
+            await tools.list_tasks('Missing') == "Error: Project 'Missing' not found."
+        )
+
+
+class TestTaskTools:
+    """Test suite for addTask, listTasks, markTaskComplete and removeTask.
+
+    Following BDD style:
+    - Given an active project
+    - When calling the task tools
+    - Then the API specification messages should be returned
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_add_and_list_tasks(self, active_tools: TaskTools) -> None:
+        """Test adding tasks and listing them.
+
+        Given an active project
+        When adding tasks and listing open tasks
+        Then each task should be rendered as a to-do line
+        """
+        # When
+        added = active_tools.add_task('Implement feature X', priority=1)
+        active_tools.add_task('Fix bug Y', dueDate='2024-12-01')
+
+        # Then
+        assert added == (
+            "Task added to 'Alpha' (ID: 1): [ ] Implement feature X "
+            '(Priority: 1, Due: None).'
+        )
+        assert await active_tools.list_tasks() == (
+            '[ ] (ID: 1) Implement feature X (Priority: 1)\n'
+            '[ ] (ID: 2) Fix bug Y (Due: 2024-12-01)'
+        )
+
+    def test_add_task_rejects_invalid_due_date(self, active_tools: TaskTools) -> None:
+        """Test due date validation."""
+        assert active_tools.add_task('Task', dueDate='tomorrow') == (
+            "Error: Invalid due date 'tomorrow'. Expected format YYYY-MM-DD."
+        )
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_list_tasks_messages(self, active_tools: TaskTools) -> None:
+        """Test the empty and invalid-filter messages of listTasks."""
+        assert (
+            await active_tools.list_tasks()
+            == "No open tasks found for project 'Alpha'."
+        )
+        invalid = await active_tools.list_tasks(statusFilter='done')
+        assert invalid.startswith("Error: Invalid status filter 'done'.")
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_mark_task_complete_by_id(self, active_tools: TaskTools) -> None:
+        """Test completing a task by ID, twice.
+
+        Given an open task
+        When marking it complete by ID twice
+        Then it should be completed and then reported as already complete
+        """
+        active_tools.add_task('Ship release')
+        assert active_tools.mark_task_complete('1') == (
+            "Task '(ID: 1) Ship release' in 'Alpha' marked as complete."
+        )
+        assert active_tools.mark_task_complete('1') == (
+            "Info: Task '(ID: 1) Ship release' in 'Alpha' is already marked "
+            'as complete.'
+        )
+        completed = await active_tools.list_tasks(statusFilter='completed')
+        assert completed.startswith('[x] (ID: 1) Ship release (Completed: ')
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_remove_task_by_description(self, active_tools: TaskTools) -> None:
+        """Test removing a task by a unique part of its description."""
+        active_tools.add_task('Write changelog')
+        assert active_tools.remove_task('changelog') == (
+            "Task '(ID: 1) Write changelog' removed from 'Alpha'."
+        )
+        assert (
+            await active_tools.list_tasks()
+            == "No open tasks found for project 'Alpha'."
+        )
+
+
+class TestTaskIdentifierResolution:
+    """Test suite for resolving taskIdOrDescription.
+
+    Following BDD style:
+    - Given tasks with similar descriptions
+    - When identifying a task by an inexact description
+    - Then it should resolve in one call or return ranked candidates
+    """
+
+    def test_substring_prefers_single_open_task(self, active_tools: TaskTools) -> None:
+        """Test that open tasks win among several substring matches.
+
+        Given a completed and an open task matching the same substring
+        When reading the history of and then removing a task by that
+        substring
+        Then the open task's history should be shown, but the removal should
+        return the candidates and remove nothing
+        """
+        # Given
+        active_tools.add_task('Review pull request')
+        active_tools.mark_task_complete('1')
+        active_tools.add_task('Review design doc')
+
+        # When
+        history = active_tools.get_task_history('Review')
+        removed = active_tools.remove_task('Review')
+
+        # Then
+        assert history.startswith("History of task (ID: 2) in 'Alpha':")
+        assert removed.startswith("Error: Task 'Review' is ambiguous in 'Alpha'.")
+        assert active_tools.find_tasks('Review').count('\n') == 1
+
+    def test_ambiguous_substring_lists_candidates(
+        self, active_tools: TaskTools
+    ) -> None:
+        """Test that ambiguous substrings return ranked candidates."""
+        active_tools.add_task('Update docs')
+        active_tools.add_task('Update dependencies')
+        result = active_tools.mark_task_complete('Update')
+        assert result.startswith("Error: Task 'Update' is ambiguous in 'Alpha'.")
+        assert '(ID: 1) Update docs [' in result
+        assert '(ID: 2) Update dependencies [' in result
+
+    def test_typo_resolves_on_first_attempt(self, active_tools: TaskTools) -> None:
+        """Test that a clear fuzzy winner is accepted, except to change it.
+
+        Given tasks with distinct descriptions
+        When reading the history of and completing a task by a misspelled
+        description
+        Then the intended task's history should be shown, but completing it
+        should return the closest matches and leave it open
+        """
+        # Given
+        active_tools.add_task('Implement feature X')
+        active_tools.add_task('Fix bug Y')
+
+        # When
+        history = active_tools.get_task_history('Implment featur X')
+        completed = active_tools.mark_task_complete('Implment featur X')
+
+        # Then
+        assert history.startswith("History of task (ID: 1) in 'Alpha':")
+        assert completed.startswith(
+            "Error: Task 'Implment featur X' not found in 'Alpha'. "
+            'Closest matches: (ID: 1) Implement feature X ['
+        )
+        assert active_tools.get_next_tasks().startswith('[ ] (ID: 1) Implement')
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        'write',
+        [
+            lambda tools, task: tools.mark_task_complete(task),
+            lambda tools, task: tools.remove_task(task),
+            lambda tools, task: tools.add_dependency(task, '3'),
+            lambda tools, task: tools.add_dependency('3', task),
+            lambda tools, task: tools.tag_task(task, ['docs']),
+            lambda tools, task: tools.untag_task(task, ['docs']),
+        ],
+        ids=[
+            'markTaskComplete',
+            'removeTask',
+            'addDependency',
+            'addDependency prerequisite',
+            'tagTask',
+            'untagTask',
+        ],
+    )
+    def test_every_write_resolves_strictly(
+        self, active_tools: TaskTools, write: Callable[[TaskTools, str], str]
+    ) -> None:
+        """Test that no tool writing to a task guesses it.
+
+        Given a completed and an open task matching 'Review' and a task only
+        a misspelled description comes close to
+        When a write tool is given the ambiguous or the misspelled
+        description
+        Then it should return the candidates
+        """
+        # Given
+        active_tools.add_task('Review pull request')
+        active_tools.mark_task_complete('1')
+        active_tools.add_task('Review design doc')
+        active_tools.add_task('Implement feature X')
+
+        # When
+        ambiguous = write(active_tools, 'Review')
+        fuzzy = write(active_tools, 'Implment featur X')
+
+        # Then
+        assert ambiguous.startswith("Error: Task 'Review' is ambiguous in 'Alpha'.")
+        assert fuzzy.startswith(
+            "Error: Task 'Implment featur X' not found in 'Alpha'. Closest matches: "
+        )
+
+    def test_digits_are_only_task_ids(self, active_tools: TaskTools) -> None:
+        """Test that an unknown numeric ID does not match descriptions.
+
+        Given task 1 whose description contains '12'
+        When removing or tagging task '12', which does not exist
+        Then both should report it as not found
+        """
+        # Given
+        active_tools.add_task('Rotate 12 keys')
+
+        # When
+        removed = active_tools.remove_task('12')
+        tagged = active_tools.tag_task('12', ['ops'])
+
+        # Then
+        assert removed == "Error: Task '12' not found in 'Alpha'."
+        assert tagged == removed
+        assert active_tools.remove_task('1').startswith("Task '(ID: 1) Rotate")
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_unclear_fuzzy_match_returns_candidates(
+        self, active_tools: TaskTools
+    ) -> None:
+        """Test that close fuzzy candidates are not guessed."""
+        active_tools.add_task('Refactor parser module')
+        active_tools.add_task('Refactor printer module')
+        result = active_tools.remove_task('Refactor p module')
+        assert result.startswith(
+            "Error: Task 'Refactor p module' not found in 'Alpha'. Closest matches: "
+        )
+        remaining = await active_tools.list_tasks()
+        assert remaining.count('\n') == 1
+
+    def test_index_tracks_added_and_removed_tasks(
+        self, active_tools: TaskTools
+    ) -> None:
+        """Test that the lazily built index is maintained on writes."""
+        # Given a built index
+        active_tools.add_task('Seed task')
+        assert active_tools.find_tasks('seed').startswith('[ ] (ID: 1) Seed task')
+
+        # When tasks are added and removed
+        active_tools.add_task('Benchmark cache')
+        active_tools.remove_task('1')
+
+        # Then the index reflects both writes
+        assert active_tools.find_tasks('benchmark cach').startswith(
+            '[ ] (ID: 2) Benchmark cache'
+        )
+        assert active_tools.find_tasks('seed task') == (
+            "No tasks matching 'seed task' found in 'Alpha'."
+        )
+
+    def test_find_tasks_validates_limit(self, active_tools: TaskTools) -> None:
+        """Test the limit bounds of findTasks."""
+        assert active_tools.find_tasks('x', limit=0) == (
+            'Error: Limit must be between 1 and 50.'
+        )
+
+
+class TestResponseFormats:
+    """Test suite for the compact and JSON listing formats.
+
+    Following BDD style:
+    - Given a project with tasks
+    - When listing with another response format
+    - Then the same tasks should be returned in that format
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_list_tasks_formats(self, active_tools: TaskTools) -> None:
+        """Test compact and JSON listings.
+
+        Given an open task with details and a completed task
+        When listing all tasks as compact rows and as JSON
+        Then both should carry the task details
+        """
+        # Given
+        active_tools.add_task('Write docs', priority=2, dueDate='2025-06-01')
+        active_tools.add_task('Ship it')
+        active_tools.mark_task_complete('2')
+
+        # When
+        compact = await active_tools.list_tasks(statusFilter='all', format='compact')
+        payload = json.loads(
+            await active_tools.list_tasks(statusFilter='all', format='JSON')
+        )
+
+        # Then
+        assert compact.split('\n')[:2] == [
+            'id\tdone\tpriority\tdue\tdescription',
+            '1\t-\t2\t2025-06-01\tWrite docs',
+        ]
+        assert compact.split('\n')[2] == '2\tx\t\t\tShip it'
+        assert payload['project'] == 'Alpha'
+        assert payload['columns'][:3] == ['id', 'description', 'status']
+        assert payload['tasks'][0] == [1, 'Write docs', 'open', 2, '2025-06-01', None]
+        assert payload['tasks'][1][5] is not None
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_server_wide_format_and_errors(self) -> None:
+        """Test the server-wide default and invalid formats.
+
+        Given tools configured for JSON output
+        When listing an empty project and asking for an unknown format
+        Then JSON should be the default and the unknown format an error
+        """
+        db = TaskDatabase(':memory:')
+        tools = TaskTools(db, response_format='json')
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+
+        listing = json.loads(await tools.list_tasks())
+        error = await tools.list_tasks(format='xml')
+
+        assert listing['project'] == 'Alpha'
+        assert listing['tasks'] == []
+        assert error.startswith("Error: Invalid format 'xml'.")
+        assert json.loads(tools.find_tasks('docs'))['matches'] == []
+        with pytest.raises(ValueError, match='Unknown response format'):
+            TaskTools(db, response_format='xml')
+        db.close()
+
+
+class TestNextTasks:
+    """Test suite for getNextTasks.
+
+    Following BDD style:
+    - Given open tasks with priorities and due dates
+    - When asking for the next tasks
+    - Then the most urgent open tasks should be returned first
+    """
+
+    def test_next_tasks_follow_writes(self, active_tools: TaskTools) -> None:
+        """Test the ordering and its maintenance on writes.
+
+        Given tasks of different urgency listed once
+        When a task is added, one completed and one removed
+        Then getNextTasks should reflect every change
+        """
+        # Given
+        active_tools.add_task('Later')
+        active_tools.add_task('Soon', priority=2, dueDate='2025-06-01')
+        active_tools.add_task('Urgent', priority=1)
+        assert active_tools.get_next_tasks(k=2) == (
+            '[ ] (ID: 3) Urgent (Priority: 1)\n'
+            '[ ] (ID: 2) Soon (Priority: 2, Due: 2025-06-01)'
+        )
+
+        # When
+        active_tools.add_task('Sooner', priority=2, dueDate='2025-05-01')
+        active_tools.mark_task_complete('3')
+        active_tools.remove_task('Soon')
+
+        # Then
+        compact = active_tools.get_next_tasks(format='compact')
+        assert compact.split('\n')[1:] == [
+            '4\t-\t2\t2025-05-01\tSooner',
+            '1\t-\t\t\tLater',
+        ]
+
+    def test_next_tasks_messages(self, active_tools: TaskTools) -> None:
+        """Test empty results and invalid k."""
+        assert active_tools.get_next_tasks() == (
+            "No open tasks found for project 'Alpha'."
+        )
+        assert active_tools.get_next_tasks(k=0) == (
+            'Error: k must be between 1 and 50.'
+        )
+        assert json.loads(active_tools.get_next_tasks(format='json'))['tasks'] == []
+
+
+class TestSearchTasks:
+    """Test suite for searchTasks.
+
+    Following BDD style:
+    - Given tasks in several projects
+    - When searching them with one call
+    - Then matches should be grouped by project and paginated
+    """
+
+    def test_search_groups_and_pages(self, active_tools: TaskTools) -> None:
+        """Test grouping, pagination and formats.
+
+        Given matching tasks in two projects and a non-matching one
+        When searching two matches at a time
+        Then each page should group its matches by project and point to
+        the next page until the last
+        """
+        # Given
+        active_tools.add_task('Write docs', priority=1)
+        active_tools.add_task('Unrelated')
+        active_tools.create_project_list('Beta')
+        active_tools.add_task('Review the Docs', projectName='Beta')
+        active_tools.add_task('Docstring fixes', projectName='Beta')
+
+        # When
+        first = active_tools.search_tasks('doc', limit=2)
+        second = active_tools.search_tasks('doc', limit=2, cursor='2:3')
+        compact = active_tools.search_tasks('DOCS', format='compact')
+        payload = json.loads(active_tools.search_tasks('doc', limit=2, format='json'))
+
+        # Then
+        assert first == (
+            "Project 'Alpha':\n"
+            '[ ] (ID: 1) Write docs (Priority: 1)\n'
+            "Project 'Beta':\n"
+            '[ ] (ID: 3) Review the Docs\n'
+            "More matches: pass cursor '2:3'."
+        )
+        assert second == "Project 'Beta':\n[ ] (ID: 4) Docstring fixes"
+        assert compact.split('\n') == [
+            'project\tid\tdone\tpriority\tdue\tdescription',
+            'Alpha\t1\t-\t1\t\tWrite docs',
+            'Beta\t3\t-\t\t\tReview the Docs',
+            'Beta\t4\t-\t\t\tDocstring fixes',
+        ]
+        assert [group['project'] for group in payload['projects']] == [
+            'Alpha',
+            'Beta',
+        ]
+        assert payload['projects'][1]['tasks'] == [
+            [3, 'Review the Docs', 'open', None, None, None]
+        ]
+        assert payload['nextCursor'] == '2:3'
+
+    def test_search_follows_status_and_writes(self, active_tools: TaskTools) -> None:
+        """Test status filters and index maintenance.
+
+        Given a task that is completed and one that is removed
+        When searching open, completed and all tasks
+        Then the completed task should only match completed or all tasks,
+        and the removed one none
+        """
+        # Given
+        active_tools.add_task('Ship release')
+        active_tools.add_task('Release notes')
+        active_tools.mark_task_complete('1')
+        active_tools.remove_task('2')
+
+        # Then
+        assert active_tools.search_tasks('release') == (
+            "No open tasks matching 'release' found."
+        )
+        assert active_tools.search_tasks('rel', statusFilter='completed') == (
+            "Project 'Alpha':\n[x] (ID: 1) Ship release"
+            f' (Completed: {date.today().isoformat()})'
+        )
+
+    def test_search_messages(self, active_tools: TaskTools) -> None:
+        """Test invalid arguments."""
+        assert active_tools.search_tasks(' ') == 'Error: Query cannot be empty.'
+        assert active_tools.search_tasks('!?') == (
+            'Error: Query must contain at least one word.'
+        )
+        assert active_tools.search_tasks('a', limit=0) == (
+            'Error: Limit must be between 1 and 200.'
+        )
+        assert active_tools.search_tasks('a', cursor='next') == (
+            "Error: Invalid cursor 'next'."
+        )
+        assert active_tools.search_tasks('a', statusFilter='done').startswith(
+            "Error: Invalid status filter 'done'."
+        )
+
+
+class TestTaskTags:
+    """Test suite for tagTask, untagTask, listTags and tag filters.
+
+    Following BDD style:
+    - Given tagged tasks of a project
+    - When listing tasks with tag filters
+    - Then only the tasks matching the tag algebra should be listed
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_list_tasks_filters_by_tags(self, active_tools: TaskTools) -> None:
+        """Test AND, OR and NOT tag filters.
+
+        Given three tasks tagged by area and sprint
+        When listing with required, alternative and excluded tags
+        Then each listing should hold the matching tasks only
+        """
+        # Given
+        for description in ('Login form', 'Token API', 'Release notes'):
+            active_tools.add_task(description)
+        assert active_tools.tag_task('1', ['UI', ' sprint-1 ']) == (
+            "Task '(ID: 1) Login form' in 'Alpha' tags: sprint-1, ui."
+        )
+        active_tools.tag_task('Token API', ['api', 'sprint-1'])
+        active_tools.tag_task('3', ['sprint-2'])
+
+        # When
+        both = await active_tools.list_tasks(tags=['sprint-1', 'api'])
+        either = await active_tools.list_tasks(anyTags=['ui', 'sprint-2'])
+        without = await active_tools.list_tasks(excludeTags=['sprint-1'])
+        combined = await active_tools.list_tasks(
+            tags=['sprint-1'], excludeTags=['ui'], format='json'
+        )
+        none = await active_tools.list_tasks(tags=['missing'])
+
+        # Then
+        assert both == '[ ] (ID: 2) Token API'
+        assert either == '[ ] (ID: 1) Login form\n[ ] (ID: 3) Release notes'
+        assert without == '[ ] (ID: 3) Release notes'
+        payload = json.loads(combined)
+        assert [task[0] for task in payload['tasks']] == [2]
+        assert payload['tagFilter'] == {
+            'tags': ['sprint-1'],
+            'anyTags': [],
+            'excludeTags': ['ui'],
+        }
+        assert none == (
+            "No open tasks matching the tag filter found for project 'Alpha'."
+        )
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_tag_writes_refresh_listings(self, active_tools: TaskTools) -> None:
+        """Test that untagging and removing tasks update filtered listings."""
+        active_tools.add_task('Login form')
+        active_tools.add_task('Token API')
+        active_tools.tag_task('1', ['ui'])
+        active_tools.tag_task('2', ['ui'])
+        assert active_tools.list_tags() == "Tags in 'Alpha': ui (2)"
+        assert await active_tools.list_tasks(tags=['ui']) == (
+            '[ ] (ID: 1) Login form\n[ ] (ID: 2) Token API'
+        )
+
+        assert active_tools.untag_task('1', ['ui']) == (
+            "Task '(ID: 1) Login form' in 'Alpha' tags: none."
+        )
+        active_tools.remove_task('Token API')
+
+        assert await active_tools.list_tasks(tags=['ui']) == (
+            "No open tasks matching the tag filter found for project 'Alpha'."
+        )
+        assert active_tools.list_tags() == "No tags found for project 'Alpha'."
+
+    def test_tag_messages(self, active_tools: TaskTools) -> None:
+        """Test empty, overlong and unknown tag arguments."""
+        active_tools.add_task('Login form')
+        assert active_tools.tag_task('1', []) == 'Error: No tags given.'
+        assert active_tools.tag_task('1', [' ']) == 'Error: Tags cannot be empty.'
+        assert active_tools.tag_task('1', ['x' * 65]).startswith('Error: Tag ')
+        assert active_tools.tag_task('', ['ui']) == (
+            'Error: Task identifier cannot be empty.'
+        )
+        assert active_tools.tag_task('9', ['ui']).startswith('Error: ')
+
+    @pytest.mark.parametrize('engine', ['sqlite', 'memory'])  # type: ignore[misc]
+    def test_guessed_tasks_are_not_tagged(self, engine: str) -> None:
+        """Test that tagTask and untagTask do not guess the task.
+
+        Given a storage engine with a completed and an open task matching
+        'Review' and a tagged task only a misspelled description comes
+        close to, and a built tag index
+        When tagging by the ambiguous and untagging by the misspelled
+        description
+        Then the candidates should be returned and the stored tags, the tag
+        index and the history should be unchanged
+        """
+        # Given
+        db = TaskDatabase(':memory:') if engine == 'sqlite' else InMemoryTaskDatabase()
+        tools = TaskTools(db)
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+        for description in ('Review pull request', 'Review design doc'):
+            tools.add_task(description)
+        tools.mark_task_complete('1')
+        tools.add_task('Implement feature X')
+        tools.tag_task('3', ['ui'])
+        index = tools._get_tag_index(1)
+        bitmaps = dict(index._bitmaps)
+        history = db.list_history(1)
+
+        # When
+        tagged = tools.tag_task('Review', ['docs'])
+        untagged = tools.untag_task('Implment featur X', ['ui'])
+
+        # Then
+        assert tagged.startswith("Error: Task 'Review' is ambiguous in 'Alpha'.")
+        assert untagged.startswith(
+            "Error: Task 'Implment featur X' not found in 'Alpha'. Closest matches: "
+        )
+        assert db.list_tags(1) == [(3, 'ui')]
+        assert tools._get_tag_index(1) is index and index._bitmaps == bitmaps
+        assert db.list_history(1) == history
+        db.close()
+
+
+class TestTaskHistory:
+    """Test suite for getTaskHistory and listTasks asOf.
+
+    Following BDD style:
+    - Given tasks changed at known times
+    - When reading their history or listing them as of a time
+    - Then the changes and past listings should be returned
+    """
+
+    @pytest.fixture  # type: ignore[misc]
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> List[int]:
+        """Stamp audit log events from a settable clock.
+
+        Returns:
+            List[int]: One-element list holding the epoch seconds to stamp.
+        """
+        now = [1746093600]
+        monkeypatch.setattr(
+            'copilot_task_manager.database.task_db.now_seconds', lambda: now[0]
+        )
+        return now
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_history_and_as_of_listing(
+        self, active_tools: TaskTools, clock: List[int]
+    ) -> None:
+        """Test reading the history of a task and past listings.
+
+        Given a task added, tagged and completed an hour apart and a task
+        removed later
+        When reading the history and listing as of times in between
+        Then each change should be listed and the listings should show the
+        tasks as they were
+        """
+        # Given
+        active_tools.add_task('Write docs', priority=2, dueDate='2025-06-01')
+        active_tools.add_task('Scratch')
+        clock[0] += 3600
+        active_tools.tag_task('1', ['docs'])
+        clock[0] += 3600
+        active_tools.mark_task_complete('Write docs')
+        active_tools.remove_task('Scratch')
+
+        # When
+        history = active_tools.get_task_history('Write docs')
+        removed = active_tools.get_task_history('2')
+        at_start = await active_tools.list_tasks(asOf='2025-05-01T10:30:00')
+        at_end = await active_tools.list_tasks(statusFilter='all', asOf='2025-05-01')
+        before = await active_tools.list_tasks(asOf='2025-04-30', format='json')
+
+        # Then
+        assert history == (
+            "History of task (ID: 1) in 'Alpha':\n"
+            '2025-05-01 10:00:00 created: [ ] (ID: 1) Write docs '
+            '(Priority: 2, Due: 2025-06-01)\n'
+            '2025-05-01 11:00:00 tagged: docs\n'
+            '2025-05-01 12:00:00 completed'
+        )
+        assert removed.splitlines()[1:] == [
+            '2025-05-01 10:00:00 created: [ ] (ID: 2) Scratch',
+            '2025-05-01 12:00:00 removed',
+        ]
+        assert at_start == (
+            '[ ] (ID: 1) Write docs (Priority: 2, Due: 2025-06-01)\n'
+            '[ ] (ID: 2) Scratch'
+        )
+        assert at_end == (
+            '[x] (ID: 1) Write docs (Priority: 2, Due: 2025-06-01, '
+            'Completed: 2025-05-01)'
+        )
+        payload = json.loads(before)
+        assert payload['asOf'] == '2025-04-30T23:59:59'
+        assert payload['tasks'] == []
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_history_messages(self, active_tools: TaskTools) -> None:
+        """Test empty, unknown and invalid history arguments."""
+        assert active_tools.get_task_history(' ') == (
+            'Error: Task identifier cannot be empty.'
+        )
+        assert active_tools.get_task_history('7') == (
+            "No history found for task (ID: 7) in 'Alpha'."
+        )
+        assert active_tools.get_task_history('missing').startswith('Error: ')
+        assert await active_tools.list_tasks(asOf='yesterday') == (
+            "Error: Invalid asOf 'yesterday'. Expected an ISO 8601 date or time "
+            'such as 2025-05-01T12:00:00.'
+        )
+        assert await active_tools.list_tasks(asOf='2025-05-01', tags=['ui']) == (
+            'Error: asOf cannot be combined with tag filters.'
+        )
+        assert await active_tools.list_tasks(asOf='2000-01-01') == (
+            "No open tasks found for project 'Alpha' as of 2000-01-01T23:59:59."
+        )
+
+
+class TestAnalyticsTools:
+    """Test suite for getBurndown, getThroughput and getTaskAging.
+
+    Following BDD style:
+    - Given tasks created and completed on known days
+    - When reporting progress over a date range
+    - Then compact series computed by the storage engine should be returned
+    """
+
+    @pytest.fixture  # type: ignore[misc]
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> List[int]:
+        """Stamp writes and today from a settable clock.
+
+        Returns:
+            List[int]: One-element list holding the epoch seconds to stamp.
+        """
+        now = [1746093600]
+        for module in ('database.memory', 'server.task_tools'):
+            monkeypatch.setattr(
+                f'copilot_task_manager.{module}.now_seconds', lambda: now[0]
+            )
+        return now
+
+    @pytest.fixture  # type: ignore[misc]
+    def progress_tools(self, clock: List[int]) -> TaskTools:
+        """Create tools over tasks added on 2025-05-01 and 2025-05-03.
+
+        Two tasks are added on 2025-05-01, one completed on 2025-05-03 and
+        another added then; today is 2025-05-04.
+
+        Returns:
+            TaskTools: Tool handlers backed by an in-memory store.
+        """
+        tools = TaskTools(InMemoryTaskDatabase())
+        tools.create_project_list('Alpha')
+        tools.set_active_project('Alpha')
+        tools.add_task('Write docs')
+        tools.add_task('Ship')
+        clock[0] += 2 * SECONDS_PER_DAY
+        tools.mark_task_complete('Write docs')
+        tools.add_task('Announce')
+        clock[0] += SECONDS_PER_DAY
+        return tools
+
+    def test_burndown_and_throughput(self, progress_tools: TaskTools) -> None:
+        """Test daily and weekly series.
+
+        Given the progress tools
+        When reporting the burndown and throughput of date ranges
+        Then each day of the range should have a value
+        """
+        # When
+        burndown = progress_tools.get_burndown('2025-05-02', '2025-05-04')
+        daily = progress_tools.get_throughput('2025-05-01', '2025-05-04')
+        weekly = progress_tools.get_throughput(interval='week')
+
+        # Then
+        assert burndown == (
+            "Burndown of 'Alpha' from 2025-05-02 to 2025-05-04, open tasks at "
+            'the end of each day (2 before):\n2, 2, 2'
+        )
+        assert daily == (
+            "Throughput of 'Alpha' per day from 2025-05-01 to 2025-05-04:\n"
+            'created: 2, 0, 1, 0\n'
+            'completed: 0, 0, 1, 0\n'
+            'total: 3 created, 1 completed'
+        )
+        assert weekly.splitlines()[0] == (
+            "Throughput of 'Alpha' per week from 2025-04-21 to 2025-05-04:"
+        )
+        assert weekly.splitlines()[1] == 'created: 0, 3'
+
+    def test_task_aging(self, progress_tools: TaskTools) -> None:
+        """Test ageing the open tasks.
+
+        Given the progress tools
+        When ageing the open tasks today and before any task existed
+        Then the ages should count whole days since creation
+        """
+        assert progress_tools.get_task_aging() == (
+            "Aging of the 2 open tasks in 'Alpha' at the end of 2025-05-04, "
+            'in days since creation:\n'
+            'p50: 1, p90: 3, max: 3\n'
+            '0-1: 1, 2-7: 1, 8-30: 0, 31-90: 0, >90: 0'
+        )
+        assert progress_tools.get_task_aging('2025-04-30') == (
+            "No open tasks in 'Alpha' at the end of 2025-04-30."
+        )
+
+    def test_analytics_messages(self, progress_tools: TaskTools) -> None:
+        """Test invalid dates, ranges and intervals."""
+        assert progress_tools.get_burndown('May 1') == (
+            "Error: Invalid startDate 'May 1'. Expected format YYYY-MM-DD."
+        )
+        assert progress_tools.get_burndown('2025-05-04', '2025-05-01') == (
+            'Error: startDate must not be after endDate.'
+        )
+        assert progress_tools.get_throughput('2024-01-01', '2025-01-01') == (
+            'Error: Date ranges are limited to 366 days.'
+        )
+        assert progress_tools.get_throughput(interval='month') == (
+            "Error: Invalid interval 'month'. Use one of: day, week"
+        )
+        assert progress_tools.get_task_aging('2025-13-01').startswith(
+            "Error: Invalid asOfDate '2025-13-01'."
+        )
+
+
+class TestTaskDependencies:
+    """Test suite for addDependency and listReadyTasks.
+
+    Following BDD style:
+    - Given tasks of a project
+    - When recording dependencies between them and completing tasks
+    - Then only tasks without open prerequisites should be ready
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_ready_tasks_follow_writes(self, active_tools: TaskTools) -> None:
+        """Test the ready set and its maintenance on writes.
+
+        Given a design, build and ship task chained by dependencies
+        When design is completed and a new task added
+        Then build and the new task should become ready
+        """
+        # Given
+        for description in ('Design', 'Build', 'Ship'):
+            active_tools.add_task(description)
+        assert active_tools.add_dependency('Build', 'Design') == (
+            "Task '(ID: 2) Build' in 'Alpha' now depends on '(ID: 1) Design'."
+        )
+        active_tools.add_dependency('3', '2')
+        assert await active_tools.list_ready_tasks() == '[ ] (ID: 1) Design'
+
+        # When
+        active_tools.mark_task_complete('Design')
+        active_tools.add_task('Document')
+
+        # Then
+        assert await active_tools.list_ready_tasks() == (
+            '[ ] (ID: 2) Build\n[ ] (ID: 4) Document'
+        )
+        payload = json.loads(await active_tools.list_ready_tasks(format='json'))
+        assert [task[0] for task in payload['tasks']] == [2, 4]
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_dependency_messages(self, active_tools: TaskTools) -> None:
+        """Test duplicate, self, cyclic and unknown dependencies."""
+        assert await active_tools.list_ready_tasks() == (
+            "No ready tasks found for project 'Alpha'."
+        )
+        active_tools.add_task('Design')
+        active_tools.add_task('Build')
+        active_tools.add_dependency('2', '1')
+        assert active_tools.add_dependency('2', '1') == (
+            "Info: Task '(ID: 2) Build' already depends on '(ID: 1) Design'."
+        )
+        assert active_tools.add_dependency('1', '1') == (
+            'Error: Dependency would create a cycle: (ID: 1) -> (ID: 1).'
+        )
+        assert active_tools.add_dependency('1', '2') == (
+            'Error: Dependency would create a cycle: ' '(ID: 1) -> (ID: 2) -> (ID: 1).'
+        )
+        assert active_tools.add_dependency('', '1') == (
+            'Error: Task identifier cannot be empty.'
+        )
+        assert active_tools.add_dependency('9', '1').startswith('Error: ')
+        active_tools.remove_task('Design')
+        assert await active_tools.list_ready_tasks() == '[ ] (ID: 2) Build'
+
+    def test_dependency_on_a_guessed_task_is_refused(
+        self, active_tools: TaskTools
+    ) -> None:
+        """Test that addDependency does not guess either task.
+
+        Given a completed and an open task matching 'Review', and a task
+        only a misspelled description comes close to
+        When adding dependencies by the ambiguous and the misspelled
+        description
+        Then the candidates should be returned and no dependency stored
+        """
+        # Given
+        active_tools.add_task('Review pull request')
+        active_tools.mark_task_complete('1')
+        active_tools.add_task('Review design doc')
+        active_tools.add_task('Implement feature X')
+
+        # When
+        ambiguous = active_tools.add_dependency('Review', '3')
+        fuzzy = active_tools.add_dependency('2', 'Implment featur X')
+
+        # Then
+        assert ambiguous.startswith("Error: Task 'Review' is ambiguous in 'Alpha'.")
+        assert '(ID: 2) Review design doc [' in ambiguous
+        assert fuzzy.startswith(
+            "Error: Task 'Implment featur X' not found in 'Alpha'. "
+            'Closest matches: (ID: 3) Implement feature X ['
+        )
+        assert active_tools._db.list_dependencies(1) == []
+
+
+class TestBulkOperations:
+    """Test suite for moveTasks and copyProject.
+
+    Following BDD style:
+    - Given tasks of a project with tags, dependencies and warm caches
+    - When moving a filtered subset or copying the whole project
+    - Then every listing of both projects should reflect the change
+    """
+
+    @pytest.fixture  # type: ignore[misc]
+    def planned_tools(self, active_tools: TaskTools) -> TaskTools:
+        """Create a Design, Build and Ship chain with Build tagged 'ui'.
+
+        Returns:
+            TaskTools: The tool handlers, with Alpha active and a Beta project.
+        """
+        for description in ('Design', 'Build', 'Ship'):
+            active_tools.add_task(description, priority=2)
+        active_tools.add_dependency('Build', 'Design')
+        active_tools.add_dependency('Ship', 'Build')
+        active_tools.tag_task('Build', ['ui'])
+        active_tools.create_project_list('Beta')
+        return active_tools
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_move_tasks_refreshes_caches(self, planned_tools: TaskTools) -> None:
+        """Test moving a tag-filtered task.
+
+        Given listings, the next tasks, ready tasks and tags read once
+        When moving the 'ui' task to Beta
+        Then both projects' listings should follow, and its dependencies on
+        tasks left behind should be dropped
+        """
+        # Given
+        tools = planned_tools
+        assert await tools.list_tasks() != ''
+        assert await tools.list_ready_tasks() == '[ ] (ID: 1) Design (Priority: 2)'
+        tools.get_next_tasks()
+        tools.list_tags()
+        versions = (tools.project_version(1), tools.project_version(2))
+
+        # When
+        moved = tools.move_tasks('Beta', tags=['ui'])
+
+        # Then
+        assert moved == (
+            "Moved 1 task from 'Alpha' to 'Beta'. "
+            'Dropped 2 dependencies on tasks left behind.'
+        )
+        assert await tools.list_tasks() == (
+            '[ ] (ID: 1) Design (Priority: 2)\n[ ] (ID: 3) Ship (Priority: 2)'
+        )
+        assert await tools.list_tasks('Beta') == '[ ] (ID: 2) Build (Priority: 2)'
+        assert await tools.list_ready_tasks() == (
+            '[ ] (ID: 1) Design (Priority: 2)\n[ ] (ID: 3) Ship (Priority: 2)'
+        )
+        assert tools.list_tags() == "No tags found for project 'Alpha'."
+        assert tools.list_tags('Beta') == "Tags in 'Beta': ui (1)"
+        assert tools.get_next_tasks('Beta') == '[ ] (ID: 2) Build (Priority: 2)'
+        assert tools.mark_task_complete('Build', 'Beta') == (
+            "Task '(ID: 2) Build' in 'Beta' marked as complete."
+        )
+        assert (tools.project_version(1), tools.project_version(2)) == (
+            versions[0] + 1,
+            versions[1] + 2,
+        )
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_copy_project(self, planned_tools: TaskTools) -> None:
+        """Test copying a project as a template.
+
+        Given the Alpha chain with Design completed
+        When copying Alpha to a new project
+        Then the copy should have new tasks with the same status, tags and
+        dependencies, and Alpha should be unchanged
+        """
+        # Given
+        tools = planned_tools
+        tools.mark_task_complete('Design')
+        before = await tools.list_tasks(statusFilter='all')
+
+        # When
+        copied = tools.copy_project('Gamma')
+
+        # Then
+        assert copied == "Project 'Alpha' copied to 'Gamma' (ID: 3) with 3 tasks."
+        assert await tools.list_tasks('Gamma') == (
+            '[ ] (ID: 5) Build (Priority: 2)\n[ ] (ID: 6) Ship (Priority: 2)'
+        )
+        assert (
+            await tools.list_ready_tasks('Gamma') == '[ ] (ID: 5) Build (Priority: 2)'
+        )
+        assert tools.list_tags('Gamma') == "Tags in 'Gamma': ui (1)"
+        assert await tools.list_tasks(statusFilter='all') == before
+
+    def test_bulk_operation_messages(self, planned_tools: TaskTools) -> None:
+        """Test invalid and empty selections and names."""
+        tools = planned_tools
+        assert tools.move_tasks(' ') == 'Error: Target project name cannot be empty.'
+        assert tools.move_tasks('Alpha') == "Error: Tasks are already in 'Alpha'."
+        assert tools.move_tasks('Delta') == "Error: Project 'Delta' not found."
+        assert tools.move_tasks('Beta', taskIds=[1, 9]) == (
+            "Error: Task (ID: 9) not found in 'Alpha'."
+        )
+        assert tools.move_tasks('Beta', statusFilter='completed') == (
+            "No tasks matching the filter found in 'Alpha'."
+        )
+        assert tools.move_tasks('Beta', statusFilter='done').startswith(
+            "Error: Invalid status filter 'done'."
+        )
+        assert tools.move_tasks('Beta', taskIds=[1, 2, 3]) == (
+            "Moved 3 tasks from 'Alpha' to 'Beta'."
+        )
+        assert tools.copy_project('') == 'Error: Project name cannot be empty.'
+        assert tools.copy_project('Beta') == (
+            "Error: Project list 'Beta' already exists (ID: 2)."
+        )
+        assert tools.copy_project('Empty') == (
+            "Project 'Alpha' copied to 'Empty' (ID: 3) with 0 tasks."
+        )
@@ -0,0 +1,81 @@
+"""BDD-style tests for recording and replaying request traffic."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+
+from copilot_task_manager.server.mcp_server import create_server
+from copilot_task_manager.server.traffic import (
+    TrafficRecorder,
+    load_traffic,
+    percentile,
+    replay,
+)
+
+
+class TestTraffic:
+    """Test suite for traffic recording and replay.
+
+    Following BDD style:
+    - Given a server recording its requests
+    - When a client session is replayed against a fresh server
+    - Then the replay should report latencies and errors per method
+    """
+
+    @pytest.mark.asyncio  # type: ignore[misc]
+    async def test_record_and_replay(self, tmp_path: Path) -> None:
+        """Test a recorded session replayed in-process at full speed.
+
+        Given a recorded session of four tool calls and a resource read
+        When the log is replayed against a fresh server
+        Then every request should be replayed, with the failing call counted
+        """
+        # Given
+        log = str(tmp_path / 'traffic.log')
+        server = create_server(storage='memory')
+        recorder = TrafficRecorder(log)
+        recorder.install(server.mcp)
+        async with Client(server.mcp) as client:
+            await client.call_tool('createProjectList', {'projectName': 'Alpha'})
+            await client.call_tool(
+                'addTask', {'taskDescription': 'First', 'projectName': 'Alpha'}
+            )
+            await client.call_tool('listTasks', {'projectName': 'Alpha'})
+            await client.call_tool('listTasks', {'projectName': 'Missing'})
+            await client.read_resource('tasks://Alpha/open')
+        recorder.close()
+        requests = load_traffic(log)
+
+        # When
+        report = await replay(create_server(storage='memory').mcp, requests, speed=None)
+
+        # Then
+        assert recorder.recorded == len(requests) == 5
+        assert requests[0][1:] == (
+            'tools/call',
+            {'name': 'createProjectList', 'arguments': {'projectName': 'Alpha'}},
+        )
+        assert all(a[0] <= b[0] for a, b in zip(requests, requests[1:]))
+        rows = {row[0]: row[1:3] for row in report.summary()}
+        assert rows == {
+            'resources/read': (1, 0),
+            'tools/call:addTask': (1, 0),
+            'tools/call:createProjectList': (1, 0),
+            'tools/call:listTasks': (2, 1),
+        }
+        assert 'tools/call:listTasks' in report.format()
+
+    def test_percentile_and_speed(self) -> None:
+        """Test nearest-rank percentiles and speed validation."""
+        values = [float(value) for value in range(1, 101)]
+        assert [percentile(values, p) for p in (0.5, 0.9, 0.99, 1.0)] == [
+            50.0,
+            90.0,
+            99.0,
+            100.0,
+        ]
+        assert percentile([], 0.5) == 0.0
+        with pytest.raises(ValueError, match='must be positive'):
+            asyncio.run(replay(None, [], speed=0))